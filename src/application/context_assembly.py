@@ -0,0 +1,173 @@
+"""
+Context assembly.
+
+Turns the retrieved chunks into the prompt CONTEXT with less repeated text.
+Neighbouring chunks of a page share up to CHUNK_OVERLAP characters (the
+splitter repeats the end of one chunk at the start of the next), so chunks of
+the same source and page whose end and start overlap are merged into one
+passage that carries the shared text once. Chunks carry no offsets, so
+neighbours are recognised by that overlap itself. A passage whose word
+3-grams mostly appear in a better-ranked passage (the same paragraph in two
+documents, a chunk inside a merged passage) is dropped.
+
+Passages keep the retrieval order of their best-ranked chunk. Savings are
+reported in estimated tokens (about four characters per token) rather than
+with a provider tokenizer, so one figure serves every LLM provider.
+"""
+from dataclasses import dataclass, field
+
+from src.domain.entities.document import DocumentChunk
+
+
+# Shorter shared runs are treated as coincidence, not splitter overlap.
+MIN_OVERLAP_CHARS = 20
+
+# Rough characters per token for the savings estimate.
+CHARS_PER_TOKEN = 4
+
+_SHINGLE_WORDS = 3
+
+
+@dataclass
+class AssembledContext:
+    """Prompt CONTEXT built from retrieved chunks, with what assembly saved."""
+
+    text: str
+    passages: list[DocumentChunk] = field(default_factory=list)
+    # Chunks folded into a neighbour or dropped as near-duplicates.
+    chunks_merged: int = 0
+    chunks_dropped: int = 0
+    # Estimated tokens the plain concatenation would have cost on top.
+    tokens_saved: int = 0
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of text (CHARS_PER_TOKEN characters per token)."""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def format_docs(chunks: list[DocumentChunk]) -> str:
+    """Render retrieved chunks as the prompt CONTEXT, tagging each with its source."""
+    formatted = []
+    for i, chunk in enumerate(chunks):
+        source = chunk.metadata.get("source_file", "unknown")
+        formatted.append(
+            f'<document source="{source}" id={i}>\n{chunk.content}\n</document>'
+        )
+    return "\n".join(formatted)
+
+
+def overlap_length(head: str, tail: str, max_overlap: int) -> int:
+    """Length of the longest end of head that tail starts with (up to max_overlap
+    characters, at least MIN_OVERLAP_CHARS), or 0."""
+    window = head[-max_overlap:] if max_overlap else ""
+    probe = tail[:MIN_OVERLAP_CHARS]
+    if len(probe) < MIN_OVERLAP_CHARS:
+        return 0
+    start = window.find(probe)
+    while start != -1:
+        if tail.startswith(window[start:]):
+            return len(window) - start
+        start = window.find(probe, start + 1)
+    return 0
+
+
+def _merge_neighbours(chunks: list[DocumentChunk], max_overlap: int) -> tuple[list[DocumentChunk], int]:
+    """Fold chunks of the same source and page that overlap into one passage each.
+
+    Returns the passages, in the order of their best-ranked chunk, and how
+    many chunks were folded into another.
+    """
+    groups: dict[tuple, list[int]] = {}
+    for i, chunk in enumerate(chunks):
+        groups.setdefault((chunk.source_file, chunk.page_number), []).append(i)
+
+    successor: dict[int, tuple[int, int]] = {}
+    has_predecessor: set[int] = set()
+
+    def chain_reaches(start: int, target: int) -> bool:
+        while start in successor:
+            start = successor[start][0]
+            if start == target:
+                return True
+        return False
+
+    for members in groups.values():
+        for a in members:
+            for b in members:
+                if a == b or a in successor or b in has_predecessor or chain_reaches(b, a):
+                    continue
+                overlap = overlap_length(chunks[a].content, chunks[b].content, max_overlap)
+                if overlap:
+                    successor[a] = (b, overlap)
+                    has_predecessor.add(b)
+
+    passages: list[tuple[int, DocumentChunk]] = []
+    for first in range(len(chunks)):
+        if first in has_predecessor:
+            continue
+        parts = [chunks[first].content]
+        rank = current = first
+        while current in successor:
+            current, overlap = successor[current]
+            parts.append(chunks[current].content[overlap:])
+            rank = min(rank, current)
+        if len(parts) == 1:
+            passages.append((rank, chunks[first]))
+        else:
+            merged = DocumentChunk(content="".join(parts), metadata=chunks[first].metadata)
+            passages.append((rank, merged))
+
+    passages.sort(key=lambda item: item[0])
+    return [passage for _, passage in passages], len(successor)
+
+
+def _shingles(text: str) -> set[tuple[str, ...]]:
+    words = text.lower().split()
+    if len(words) < _SHINGLE_WORDS:
+        return {tuple(words)} if words else set()
+    return {tuple(words[i:i + _SHINGLE_WORDS]) for i in range(len(words) - _SHINGLE_WORDS + 1)}
+
+
+def _drop_near_duplicates(
+    passages: list[DocumentChunk], threshold: float
+) -> tuple[list[DocumentChunk], int]:
+    """Drop passages whose shingles are at least `threshold` contained in a kept,
+    better-ranked passage."""
+    kept: list[DocumentChunk] = []
+    kept_shingles: list[set] = []
+    for passage in passages:
+        shingles = _shingles(passage.content)
+        if shingles and any(len(shingles & other) >= threshold * len(shingles) for other in kept_shingles):
+            continue
+        kept.append(passage)
+        kept_shingles.append(shingles)
+    return kept, len(passages) - len(kept)
+
+
+def assemble_context(
+    chunks: list[DocumentChunk],
+    max_overlap: int,
+    dedup_threshold: float = 0.9,
+) -> AssembledContext:
+    """
+    Build the prompt CONTEXT for chunks: merge overlapping neighbours, drop
+    near-duplicates, then render the passages with format_docs.
+
+    Args:
+        chunks: Retrieved chunks, best first.
+        max_overlap: Longest shared text between neighbours (CHUNK_OVERLAP).
+        dedup_threshold: Share of a passage's word 3-grams found in a
+            better-ranked passage to drop it; above 1.0 disables dropping.
+    """
+    passages, merged = _merge_neighbours(chunks, max_overlap)
+    passages, dropped = _drop_near_duplicates(passages, dedup_threshold)
+    text = format_docs(passages)
+    saved = max(0, estimate_tokens(format_docs(chunks)) - estimate_tokens(text))
+    return AssembledContext(
+        text=text,
+        passages=passages,
+        chunks_merged=merged,
+        chunks_dropped=dropped,
+        tokens_saved=saved,
+    )
@@ -0,0 +1,86 @@
+"""
+Latency metrics.
+
+In-process recorders for user-facing latencies. TIME_TO_FIRST_TOKEN is fed by
+SearchDocumentsUseCase.stream / astream: the time from receiving a question
+to the first answer token, which is what a streaming UI makes users wait for.
+
+LLM_CALLS_AVOIDED counts questions SearchDocumentsUseCase answered with the
+canned refusal because no retrieved chunk reached RELEVANCE_FLOOR.
+
+CONTEXT_TOKENS_SAVED adds up the estimated prompt tokens context assembly
+saved by merging overlapping chunks and dropping near-duplicates.
+"""
+import statistics
+import threading
+from collections import deque
+from dataclasses import dataclass
+
+
+@dataclass
+class LatencyStats:
+    """Summary of the most recent samples of a LatencyRecorder (seconds)."""
+
+    count: int = 0
+    last: float | None = None
+    p50: float | None = None
+    p95: float | None = None
+
+
+class LatencyRecorder:
+    """Thread-safe rolling window of latency samples."""
+
+    def __init__(self, window: int = 1000):
+        self._samples: deque[float] = deque(maxlen=window)
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+            self._count += 1
+
+    def stats(self) -> LatencyStats:
+        """Sample count since start, plus last / p50 / p95 over the window."""
+        with self._lock:
+            samples = list(self._samples)
+            count = self._count
+        if not samples:
+            return LatencyStats()
+        if len(samples) == 1:
+            p50 = p95 = samples[0]
+        else:
+            cuts = statistics.quantiles(samples, n=20, method="inclusive")
+            p50, p95 = cuts[9], cuts[18]
+        return LatencyStats(count=count, last=samples[-1], p50=p50, p95=p95)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+            self._count = 0
+
+
+class EventCounter:
+    """Thread-safe count of events since start."""
+
+    def __init__(self):
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def increment(self, n: int = 1) -> None:
+        with self._lock:
+            self._value += n
+
+    @property
+    def value(self) -> int:
+        with self._lock:
+            return self._value
+
+    def reset(self) -> None:
+        with self._lock:
+            self._value = 0
+
+
+TIME_TO_FIRST_TOKEN = LatencyRecorder()
+LLM_CALLS_AVOIDED = EventCounter()
+CONTEXT_TOKENS_SAVED = EventCounter()
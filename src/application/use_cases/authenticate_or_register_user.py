@@ -38,6 +38,37 @@ class AuthenticateOrRegisterUserUseCase:
         self._hasher = password_hasher
 
     def execute(self, identifier: str, password: str) -> User:
+        identifier = self._validate(identifier, password)
+
+        existing = self._users.get_by_identifier(identifier)
+        if existing is not None:
+            if not self._hasher.verify(password, existing.password_hash):
+                raise InvalidCredentialsError("Invalid username or password.")
+            return existing
+
+        self._check_strength(password)
+        new_user = self._new_user(identifier, self._hasher.hash(password))
+        self._users.create(new_user)
+        return new_user
+
+    async def aexecute(self, identifier: str, password: str) -> User:
+        """Async execute: lookups and hashing are awaited through the ports' async methods."""
+        identifier = self._validate(identifier, password)
+
+        existing = await self._users.aget_by_identifier(identifier)
+        if existing is not None:
+            if not await self._hasher.averify(password, existing.password_hash):
+                raise InvalidCredentialsError("Invalid username or password.")
+            return existing
+
+        self._check_strength(password)
+        new_user = self._new_user(identifier, await self._hasher.ahash(password))
+        await self._users.acreate(new_user)
+        return new_user
+
+    @staticmethod
+    def _validate(identifier: str, password: str) -> str:
+        """Return the normalized identifier, or raise for a malformed login attempt."""
         identifier = (identifier or "").strip()
         if not _USERNAME_RE.match(identifier):
             raise InvalidUsernameError(
@@ -45,22 +76,15 @@ class AuthenticateOrRegisterUserUseCase:
             )
         if not password:
             raise InvalidCredentialsError("Password is required.")
+        return identifier
 
-        existing = self._users.get_by_identifier(identifier)
-        if existing is not None:
-            if not self._hasher.verify(password, existing.password_hash):
-                raise InvalidCredentialsError("Invalid username or password.")
-            return existing
-
+    @staticmethod
+    def _check_strength(password: str) -> None:
         if len(password) < _MIN_PASSWORD_LEN:
             raise WeakPasswordError(
                 f"Password must be at least {_MIN_PASSWORD_LEN} characters."
             )
 
-        new_user = User(
-            id=uuid.uuid4().hex,
-            identifier=identifier,
-            password_hash=self._hasher.hash(password),
-        )
-        self._users.create(new_user)
-        return new_user
+    @staticmethod
+    def _new_user(identifier: str, password_hash: str) -> User:
+        return User(id=uuid.uuid4().hex, identifier=identifier, password_hash=password_hash)
@@ -2,76 +2,742 @@
 Ingest Document Use Case.
 Handles document ingestion with chunking and storage.
 """
+import asyncio
+import hashlib
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
+from typing import Callable, Iterator
 
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 from src.config.settings import get_settings
-from src.domain.entities.document import Document, DocumentChunk
+from src.domain.entities.document import (
+    BatchIngestResult,
+    BatchSyncResult,
+    Document,
+    DocumentChunk,
+    DocumentRecord,
+    SyncResult,
+)
 from src.domain.ports.repository import RepositoryPort
 from src.domain.ports.document_loader import DocumentLoaderPort
+from src.domain.ports.embeddings import EmbeddingsPort
+from src.domain.ports.document_registry import DocumentRegistryPort
 from src.domain.exceptions import IngestionError, InvalidDocumentError, UnsupportedFormatError
 
 
+logger = logging.getLogger(__name__)
+
+
+# Metadata that places a chunk in its document. Loader metadata such as the
+# file path (`source`), `moddate` or `total_pages` changes with every upload
+# path or re-save and must not make an unchanged chunk look new.
+HASHED_METADATA = ("source_file", "page")
+
+
+def chunk_hash(content: str, metadata: dict, occurrence: int = 0) -> str:
+    """SHA-256 (hex) identifying a chunk within its document.
+
+    Covers the chunk's position (HASHED_METADATA) too, so a chunk whose page
+    moved is replaced; the occurrence number tells apart identical chunks of
+    the same document.
+    """
+    position = {key: metadata.get(key) for key in HASHED_METADATA}
+    payload = json.dumps([content, position, occurrence], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def file_hash(file_path: str, chunk_size: int, chunk_overlap: int) -> str:
+    """SHA-256 (hex) of the file bytes and the chunking settings that split it."""
+    with open(file_path, "rb") as f:
+        digest = hashlib.file_digest(f, "sha256")
+    digest.update(f"|{chunk_size}|{chunk_overlap}".encode())
+    return digest.hexdigest()
+
+
+def iter_chunks(
+    document_loader: DocumentLoaderPort,
+    text_splitter: RecursiveCharacterTextSplitter,
+    file_path: str,
+    source_name: str,
+) -> Iterator[DocumentChunk]:
+    """Yield a document's chunks tagged with source_file and chunk_hash, loading
+    and splitting one page at a time.
+
+    split_documents splits each page on its own, so this yields exactly the
+    chunks of splitting the whole page list, without holding it in memory.
+    """
+    empty = True
+    seen: dict[str, int] = {}
+    for page in document_loader.lazy_load(file_path, file_name=source_name):
+        empty = False
+        for lc_chunk in text_splitter.split_documents([page]):
+            metadata = dict(lc_chunk.metadata)
+            metadata["source_file"] = source_name
+            base = chunk_hash(lc_chunk.page_content, metadata)
+            occurrence = seen.get(base, 0)
+            seen[base] = occurrence + 1
+            metadata["chunk_hash"] = (
+                base if not occurrence else chunk_hash(lc_chunk.page_content, metadata, occurrence)
+            )
+            yield DocumentChunk(
+                content=lc_chunk.page_content,
+                metadata=metadata
+            )
+
+    if empty:
+        raise InvalidDocumentError(f"Document '{source_name}' is empty")
+
+
+def split_document(
+    document_loader: DocumentLoaderPort,
+    text_splitter: RecursiveCharacterTextSplitter,
+    file_path: str,
+    source_name: str,
+) -> list[DocumentChunk]:
+    """Load a document and split it into chunks tagged with source_file."""
+    return list(iter_chunks(document_loader, text_splitter, file_path, source_name))
+
+
+def _next_batch(chunks: Iterator[DocumentChunk], size: int) -> list[DocumentChunk]:
+    return list(itertools.islice(chunks, size))
+
+
+def _split_in_worker(
+    document_loader: DocumentLoaderPort,
+    chunk_size: int,
+    chunk_overlap: int,
+    file_path: str,
+    source_name: str,
+) -> list[DocumentChunk]:
+    """split_document for a parse worker process (the splitter is rebuilt there)."""
+    splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    return split_document(document_loader, splitter, file_path, source_name)
+
+
+def _parse_pool(workers: int) -> Executor:
+    """Parse workers: spawned processes (safe next to the app's threads and pools),
+    or one thread when INGEST_PARSE_WORKERS is 0."""
+    if workers <= 0:
+        return ThreadPoolExecutor(max_workers=1, thread_name_prefix="ingest-parse")
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
 class IngestDocumentUseCase:
     """Use case for ingesting documents."""
 
-    def __init__(self, repository: RepositoryPort, document_loader: DocumentLoaderPort):
+    def __init__(
+        self,
+        repository: RepositoryPort,
+        document_loader: DocumentLoaderPort,
+        parse_executor_factory: Callable[[int], Executor] | None = None,
+        registry: DocumentRegistryPort | None = None,
+        embeddings: EmbeddingsPort | None = None,
+    ):
         self._repository = repository
         self._document_loader = document_loader
+        self._registry = registry
+        # Lets the next batch be embedded while the current one is inserted;
+        # without it the repository embeds each batch as it stores it.
+        self._embeddings = embeddings
         self._settings = get_settings()
         self._text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=self._settings.chunk_size,
             chunk_overlap=self._settings.chunk_overlap,
         )
+        self._parse_executor_factory = parse_executor_factory or _parse_pool
 
     def execute(
         self,
         file_path: str,
         source_name: str | None = None,
-        clear_existing: bool = False
+        clear_existing: bool = False,
+        on_progress: Callable[[int], None] | None = None,
     ) -> Document:
         """
         Ingest a document.
 
+        Pages are loaded and split one at a time and the chunks are embedded
+        and stored INGEST_BATCH_SIZE at a time, so memory stays flat however
+        large the file is; with an embeddings port the next batch is embedded
+        while the current one is inserted. A failed batch is retried
+        INGEST_BATCH_RETRIES times; if it still fails, the batches of this
+        document already stored are deleted again.
+
+        With a document registry, adding (clear_existing=False) goes through
+        sync: an unchanged file is skipped and a changed one only has its
+        differing chunks replaced, so ingesting a file twice never
+        duplicates it.
+
+        Replacing the collection (clear_existing=True) loads the document
+        into a shadow collection and publishes it once every batch is
+        stored, when the repository supports rebuilds; searches meanwhile
+        keep reading the old collection.
+
         Args:
             file_path: Path to the document file.
             source_name: Optional name for the source (defaults to filename).
-            clear_existing: If True, clear existing documents first.
+            clear_existing: If True, the document replaces the collection.
+            on_progress: Called with the running stored-chunk count after each batch.
 
         Returns:
-            Document entity with the ingested chunks.
+            Document entity with the stored chunk count (chunks are not kept).
 
         Raises:
             UnsupportedFormatError: If the file format is not supported.
             IngestionError: If ingestion fails.
             InvalidDocumentError: If the document is invalid.
         """
+        if source_name is None:
+            source_name = Path(file_path).name
+        if self._registry is not None and not clear_existing:
+            result = self.sync(file_path, source_name, on_progress=on_progress)
+            return Document(name=source_name, stored_chunks=result.chunk_count)
+
+        stored = 0
+        hashes: list[str] = []
+        rebuild = None
+        try:
+            rebuild = self._repository.begin_rebuild() if clear_existing else None
+            fingerprint = self._begin_replace(file_path, clear_existing and rebuild is None)
+            chunks = self._iter_chunks(file_path, source_name)
+            for batch, embeddings in self._embedded_batches(chunks):
+                self._store_batch(batch, clear_existing and rebuild is None and not stored, rebuild, embeddings)
+                stored += len(batch)
+                hashes.extend(chunk.metadata["chunk_hash"] for chunk in batch)
+                if on_progress is not None:
+                    on_progress(stored)
+            if rebuild is not None:
+                self._finish_rebuild(rebuild, bool(stored), [self._record(file_path, source_name, fingerprint, hashes)])
+            else:
+                self._register(file_path, source_name, fingerprint, hashes)
+
+            return Document(name=source_name, stored_chunks=stored)
+
+        except (InvalidDocumentError, UnsupportedFormatError):
+            self._discard_partial(source_name, hashes, rebuild)
+            raise
+        except Exception as e:
+            self._discard_partial(source_name, hashes, rebuild)
+            raise IngestionError(f"Failed to ingest '{file_path}': {str(e)}") from e
+
+    async def aexecute(
+        self,
+        file_path: str,
+        source_name: str | None = None,
+        clear_existing: bool = False,
+        on_progress: Callable[[int], None] | None = None,
+    ) -> Document:
+        """
+        Async execute: each batch is loaded and split in a worker thread (that
+        is CPU/disk bound), then embedded and stored through aadd_documents.
+
+        Raises the same exceptions as execute.
+        """
+        if source_name is None:
+            source_name = Path(file_path).name
+        if self._registry is not None and not clear_existing:
+            result = await asyncio.to_thread(self.sync, file_path, source_name, on_progress)
+            return Document(name=source_name, stored_chunks=result.chunk_count)
+
+        stored = 0
+        hashes: list[str] = []
+        rebuild = None
+        try:
+            if clear_existing:
+                rebuild = await asyncio.to_thread(self._repository.begin_rebuild)
+            fingerprint = await asyncio.to_thread(
+                self._begin_replace, file_path, clear_existing and rebuild is None
+            )
+            chunks = self._iter_chunks(file_path, source_name)
+            while batch := await asyncio.to_thread(_next_batch, chunks, self._batch_size):
+                await self._astore_batch(batch, clear_existing and rebuild is None and not stored, rebuild)
+                stored += len(batch)
+                hashes.extend(chunk.metadata["chunk_hash"] for chunk in batch)
+                if on_progress is not None:
+                    on_progress(stored)
+            if rebuild is not None:
+                records = [self._record(file_path, source_name, fingerprint, hashes)]
+                await asyncio.to_thread(self._finish_rebuild, rebuild, bool(stored), records)
+            else:
+                await asyncio.to_thread(self._register, file_path, source_name, fingerprint, hashes)
+
+            return Document(name=source_name, stored_chunks=stored)
+
+        except (InvalidDocumentError, UnsupportedFormatError):
+            await self._adiscard_partial(source_name, hashes, rebuild)
+            raise
+        except Exception as e:
+            await self._adiscard_partial(source_name, hashes, rebuild)
+            raise IngestionError(f"Failed to ingest '{file_path}': {str(e)}") from e
+
+    def execute_many(
+        self,
+        files: list[str | tuple[str, str]],
+        clear_existing: bool = False
+    ) -> BatchIngestResult:
+        """
+        Ingest several documents as a pipeline.
+
+        Files are parsed and split in INGEST_PARSE_WORKERS processes; as soon
+        as a file is split, it is embedded and stored on one of
+        INGEST_EMBED_WORKERS threads, so parsing, embedding and inserts of
+        different files overlap. Each file is stored INGEST_BATCH_SIZE chunks
+        at a time, embedding the next batch while the current one is
+        inserted (see execute). A file that fails is reported and skipped
+        without affecting the others. With a document registry and without
+        clear_existing, unchanged files are skipped before parsing and changed
+        ones are diffed as in sync.
+
+        Args:
+            files: Paths, or (path, source_name) pairs.
+            clear_existing: If True, the files replace the collection. With
+                rebuild support they are all loaded into a shadow collection
+                published at the end; otherwise the first file stored
+                replaces the collection and the rest are added after it.
+
+        Returns:
+            BatchIngestResult with documents in input order.
+        """
+        started = time.perf_counter()
+        items = [
+            (item, Path(item).name) if isinstance(item, str) else tuple(item)
+            for item in files
+        ]
+        documents: list[Document | None] = [None] * len(items)
+        errors: dict[int, str] = {}
+        fingerprints: list[str | None] = [None] * len(items)
+        records: list[DocumentRecord | None] = [None] * len(items)
+        rebuilt: list[DocumentRecord] = []
+        pending = list(range(len(items)))
+        rebuild = self._repository.begin_rebuild() if clear_existing else None
+
+        if self._registry is not None:
+            if clear_existing and rebuild is None:
+                self._registry.clear()
+            pending = []
+            for i, (file_path, source_name) in enumerate(items):
+                try:
+                    fingerprints[i] = self._file_hash(file_path)
+                    records[i] = None if clear_existing else self._registry.get(source_name)
+                except Exception as e:
+                    errors[i] = f"Failed to ingest '{file_path}': {e}"
+                    continue
+                if records[i] is not None and records[i].file_hash == fingerprints[i]:
+                    documents[i] = Document(name=source_name, stored_chunks=len(records[i].chunk_hashes))
+                else:
+                    pending.append(i)
+
+        def store(i: int, chunks: list[DocumentChunk], clear: bool) -> bool:
+            file_path, source_name = items[i]
+            hashes = [chunk.metadata["chunk_hash"] for chunk in chunks]
+            stored = 0
+            try:
+                if self._registry is not None and not clear and rebuild is None:
+                    result = self._apply_changes(file_path, source_name, fingerprints[i], records[i], iter(chunks))
+                    documents[i] = Document(name=source_name, stored_chunks=result.chunk_count)
+                    return True
+                for batch, embeddings in self._embedded_batches(iter(chunks)):
+                    self._store_batch(batch, clear and not stored, rebuild, embeddings)
+                    stored += len(batch)
+                if rebuild is not None:
+                    if (record := self._record(file_path, source_name, fingerprints[i], hashes)) is not None:
+                        rebuilt.append(record)
+                else:
+                    self._register(file_path, source_name, fingerprints[i], hashes)
+            except Exception as e:
+                if rebuild is None:
+                    self._discard_partial(source_name, hashes[:stored])
+                errors[i] = e.args[0] if isinstance(e, IngestionError) else f"Failed to ingest '{file_path}': {e}"
+                return False
+            documents[i] = Document(name=source_name, chunks=chunks)
+            return True
+
+        # Spawning workers costs an interpreter start and the loader imports;
+        # a single file is parsed on a thread instead.
+        parse_workers = min(self._settings.ingest_parse_workers, len(pending)) if len(pending) > 1 else 0
+        with self._parse_executor_factory(parse_workers) as parse_pool, \
+             ThreadPoolExecutor(
+                 max_workers=max(1, self._settings.ingest_embed_workers),
+                 thread_name_prefix="ingest-embed",
+             ) as embed_pool:
+            parsing = {
+                parse_pool.submit(
+                    _split_in_worker,
+                    self._document_loader,
+                    self._settings.chunk_size,
+                    self._settings.chunk_overlap,
+                    *items[i],
+                ): i
+                for i in pending
+            }
+            storing = []
+            clear_pending = clear_existing and rebuild is None
+            for future in as_completed(parsing):
+                i = parsing[future]
+                try:
+                    chunks = future.result()
+                except (InvalidDocumentError, UnsupportedFormatError) as e:
+                    errors[i] = str(e)
+                    continue
+                except Exception as e:
+                    errors[i] = f"Failed to ingest '{items[i][0]}': {e}"
+                    continue
+
+                if clear_pending:
+                    # Replace the collection once, before any other file lands in it.
+                    clear_pending = not store(i, chunks, clear=True)
+                else:
+                    storing.append(embed_pool.submit(store, i, chunks, False))
+            for future in storing:
+                future.result()
+
+        if rebuild is not None:
+            stored = [i for i, document in enumerate(documents) if document is not None]
+            try:
+                self._finish_rebuild(rebuild, bool(stored), rebuilt)
+            except Exception as e:
+                self._discard_rebuild(rebuild)
+                for i in stored:
+                    documents[i] = None
+                    errors[i] = f"Failed to publish the rebuilt collection: {e}"
+
+        result = BatchIngestResult(
+            documents=documents,
+            errors=dict(sorted(errors.items())),
+            elapsed_seconds=time.perf_counter() - started,
+        )
+        logger.info(
+            "Ingested %d/%d file(s), %d chunk(s) in %.2fs: %.2f files/s, %.1f chunks/s",
+            len(items) - len(errors), len(items), result.chunk_count,
+            result.elapsed_seconds, result.files_per_second, result.chunks_per_second,
+        )
+        return result
+
+    async def aexecute_many(
+        self,
+        files: list[str | tuple[str, str]],
+        clear_existing: bool = False
+    ) -> BatchIngestResult:
+        """Async execute_many for event-loop callers (Chainlit); the pipeline runs in a worker thread."""
+        return await asyncio.to_thread(self.execute_many, files, clear_existing)
+
+    def sync(
+        self,
+        file_path: str,
+        source_name: str | None = None,
+        on_progress: Callable[[int], None] | None = None,
+    ) -> SyncResult:
+        """
+        Re-ingest a document incrementally against the document registry.
+
+        A file whose hash matches its registry entry is skipped without being
+        parsed. Otherwise only chunks whose chunk_hash is new are embedded and
+        inserted, and chunks no longer produced are deleted. A document not
+        in the registry replaces whatever is stored under its name. If
+        anything fails, the chunks inserted by this call are removed again.
+
+        Args:
+            file_path: Path to the document file.
+            source_name: Optional name for the source (defaults to filename).
+            on_progress: Called with the running inserted-chunk count after each batch.
+
+        Returns:
+            SyncResult with the inserted, deleted and total chunk counts.
+
+        Raises:
+            IngestionError: If there is no registry or the sync fails.
+            UnsupportedFormatError: If the file format is not supported.
+            InvalidDocumentError: If the document is invalid.
+        """
+        if self._registry is None:
+            raise IngestionError("Incremental ingestion needs a document registry")
+        if source_name is None:
+            source_name = Path(file_path).name
+
         try:
-            if source_name is None:
-                source_name = Path(file_path).name
+            fingerprint = self._file_hash(file_path)
+            record = self._registry.get(source_name)
+        except Exception as e:
+            raise IngestionError(f"Failed to ingest '{file_path}': {str(e)}") from e
+        if record is not None and record.file_hash == fingerprint:
+            return SyncResult(name=source_name, unchanged=True, chunk_count=len(record.chunk_hashes))
+
+        return self._apply_changes(
+            file_path, source_name, fingerprint, record, self._iter_chunks(file_path, source_name), on_progress
+        )
+
+    def sync_many(
+        self,
+        files: list[str | tuple[str, str]],
+        prune: bool = False,
+    ) -> BatchSyncResult:
+        """
+        Sync several documents on INGEST_EMBED_WORKERS threads.
+
+        Unchanged files cost one hash and one registry lookup each. A file
+        that fails is reported without affecting the others.
+
+        Args:
+            files: Paths, or (path, source_name) pairs.
+            prune: If True, registered documents that are not among files are
+                deleted (a file that failed to sync is kept).
+
+        Returns:
+            BatchSyncResult with results in input order.
+        """
+        if self._registry is None:
+            raise IngestionError("Incremental ingestion needs a document registry")
+        started = time.perf_counter()
+        items = [
+            (item, Path(item).name) if isinstance(item, str) else tuple(item)
+            for item in files
+        ]
+        results: list[SyncResult | None] = [None] * len(items)
+        errors: dict[int, str] = {}
 
-            pages = self._document_loader.load(file_path, file_name=source_name)
+        def run(i: int) -> None:
+            try:
+                results[i] = self.sync(*items[i])
+            except Exception as e:
+                errors[i] = str(e)
 
-            if not pages:
-                raise InvalidDocumentError(f"Document '{source_name}' is empty")
+        with ThreadPoolExecutor(
+            max_workers=max(1, self._settings.ingest_embed_workers),
+            thread_name_prefix="ingest-sync",
+        ) as pool:
+            list(pool.map(run, range(len(items))))
 
-            langchain_chunks = self._text_splitter.split_documents(pages)
+        pruned = []
+        if prune:
+            keep = {source_name for _, source_name in items}
+            for source_name in self._registry.sources():
+                if source_name not in keep:
+                    self._repository.delete_by_source(source_name)
+                    self._registry.delete(source_name)
+                    pruned.append(source_name)
 
-            chunks = []
-            for lc_chunk in langchain_chunks:
-                metadata = dict(lc_chunk.metadata)
-                metadata["source_file"] = source_name
-                chunks.append(DocumentChunk(
-                    content=lc_chunk.page_content,
-                    metadata=metadata
-                ))
+        result = BatchSyncResult(
+            results=results,
+            errors=dict(sorted(errors.items())),
+            pruned=pruned,
+            elapsed_seconds=time.perf_counter() - started,
+        )
+        logger.info(
+            "Synced %d file(s) in %.2fs: %d unchanged, %d chunk(s) added, %d removed, %d pruned, %d failed",
+            len(items), result.elapsed_seconds, result.unchanged, result.added, result.removed,
+            len(pruned), len(errors),
+        )
+        return result
+
+    @property
+    def _batch_size(self) -> int:
+        return max(1, self._settings.ingest_batch_size)
+
+    def _iter_chunks(self, file_path: str, source_name: str) -> Iterator[DocumentChunk]:
+        """Stream the document's chunks tagged with source_file."""
+        return iter_chunks(self._document_loader, self._text_splitter, file_path, source_name)
+
+    def _file_hash(self, file_path: str) -> str:
+        return file_hash(file_path, self._settings.chunk_size, self._settings.chunk_overlap)
+
+    def _begin_replace(self, file_path: str, clear_existing: bool) -> str | None:
+        """Registry side of a non-incremental ingestion: the file hash to record
+        afterwards. A collection replaced in place (no rebuild support) forgets
+        every entry up front, so the registry never lists documents that are gone."""
+        if self._registry is None:
+            return None
+        if clear_existing:
+            self._registry.clear()
+        return self._file_hash(file_path)
+
+    def _record(
+        self, file_path: str, source_name: str, fingerprint: str | None, hashes: list[str]
+    ) -> DocumentRecord | None:
+        if self._registry is None or fingerprint is None:
+            return None
+        return DocumentRecord(
+            source_file=source_name,
+            file_hash=fingerprint,
+            chunk_hashes=hashes,
+            size_bytes=os.path.getsize(file_path),
+        )
+
+    def _register(self, file_path: str, source_name: str, fingerprint: str | None, hashes: list[str]) -> None:
+        if (record := self._record(file_path, source_name, fingerprint, hashes)) is not None:
+            self._registry.save(record)
 
-            self._repository.add_documents(chunks, clear_existing=clear_existing)
+    def _finish_rebuild(self, rebuild: str, stored: bool, records: list[DocumentRecord | None]) -> None:
+        """Publish a shadow collection (or drop it when nothing was stored in it),
+        then make the registry describe the new live collection. The registry is
+        only touched after the swap, so an abandoned rebuild leaves it as it was."""
+        if not stored:
+            self._discard_rebuild(rebuild)
+            return
+        self._repository.publish_rebuild(rebuild)
+        if self._registry is not None:
+            self._registry.clear()
+            for record in records:
+                if record is not None:
+                    self._registry.save(record)
 
-            return Document(name=source_name, chunks=chunks)
+    def _discard_rebuild(self, rebuild: str) -> None:
+        """Best effort: drop an unpublished shadow collection."""
+        try:
+            self._repository.discard_rebuild(rebuild)
+        except Exception as e:
+            logger.warning("Could not drop shadow collection '%s': %s", rebuild, e)
+
+    def _apply_changes(
+        self,
+        file_path: str,
+        source_name: str,
+        fingerprint: str,
+        record: DocumentRecord | None,
+        chunks: Iterator[DocumentChunk],
+        on_progress: Callable[[int], None] | None = None,
+    ) -> SyncResult:
+        """Store the chunks missing from record, delete the ones no longer in chunks,
+        then save the new record."""
+        previous = set(record.chunk_hashes) if record is not None else set()
+        hashes: list[str] = []
+        added: list[str] = []
+
+        def new_chunks() -> Iterator[DocumentChunk]:
+            for chunk in chunks:
+                hashes.append(chunk.metadata["chunk_hash"])
+                if hashes[-1] not in previous:
+                    yield chunk
+
+        try:
+            if record is None:
+                # Unregistered: replace anything stored under this name (ingested
+                # before the registry existed, or added twice).
+                self._repository.delete_by_source(source_name)
+            for batch, embeddings in self._embedded_batches(new_chunks()):
+                self._store_batch(batch, False, embeddings=embeddings)
+                added.extend(chunk.metadata["chunk_hash"] for chunk in batch)
+                if on_progress is not None:
+                    on_progress(len(added))
+            stale = sorted(previous.difference(hashes))
+            removed = self._repository.delete_chunks(source_name, stale) if stale else 0
+            self._register(file_path, source_name, fingerprint, hashes)
 
         except (InvalidDocumentError, UnsupportedFormatError):
+            self._discard_added(source_name, added)
             raise
         except Exception as e:
+            self._discard_added(source_name, added)
             raise IngestionError(f"Failed to ingest '{file_path}': {str(e)}") from e
+
+        return SyncResult(name=source_name, added=len(added), removed=removed, chunk_count=len(hashes))
+
+    def _discard_added(self, source_name: str, added: list[str]) -> None:
+        """Best effort: remove the chunks a failed run inserted (by chunk_hash),
+        leaving what was stored before it, e.g. the document as its registry
+        entry describes (minus any chunks a sync deleted)."""
+        if not added:
+            return
+        try:
+            self._repository.delete_chunks(source_name, added)
+        except Exception as e:
+            logger.warning("Could not remove partially ingested '%s': %s", source_name, e)
+
+    def _retry_delay(self, attempt: int) -> float:
+        return self._settings.ingest_retry_backoff_seconds * 2 ** attempt
+
+    def _embedded_batches(
+        self, chunks: Iterator[DocumentChunk]
+    ) -> Iterator[tuple[list[DocumentChunk], list[list[float]] | None]]:
+        """Yield (batch, embeddings) INGEST_BATCH_SIZE chunks at a time.
+
+        With an embeddings port, a helper thread reads and embeds the next
+        batch while the caller stores the one just yielded; it never runs
+        more than one batch ahead, so memory stays bounded. Without one,
+        embeddings is None and add_documents embeds the batch itself.
+        """
+        if self._embeddings is None:
+            while batch := _next_batch(chunks, self._batch_size):
+                yield batch, None
+            return
+
+        def produce() -> tuple[list[DocumentChunk], list[list[float]] | None]:
+            batch = _next_batch(chunks, self._batch_size)
+            if not batch:
+                return batch, None
+            return batch, self._with_retries(
+                "Embedding a batch", self._embeddings.embed_documents, [chunk.content for chunk in batch]
+            )
+
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="ingest-embed-ahead") as pool:
+            ahead = pool.submit(produce)
+            while True:
+                batch, embeddings = ahead.result()
+                if not batch:
+                    return
+                ahead = pool.submit(produce)
+                yield batch, embeddings
+
+    def _with_retries(self, what: str, call: Callable, *args, **kwargs):
+        """call, retried with exponential backoff (embedding APIs rate limit)."""
+        retries = max(0, self._settings.ingest_batch_retries)
+        for attempt in range(retries + 1):
+            try:
+                return call(*args, **kwargs)
+            except Exception as e:
+                if attempt == retries:
+                    raise
+                logger.warning("%s failed (attempt %d/%d), retrying: %s", what, attempt + 1, retries + 1, e)
+                time.sleep(self._retry_delay(attempt))
+
+    def _store_batch(
+        self,
+        batch: list[DocumentChunk],
+        clear: bool,
+        collection: str | None = None,
+        embeddings: list[list[float]] | None = None,
+    ) -> None:
+        """add_documents, retried with exponential backoff."""
+        self._with_retries(
+            "Storing a batch",
+            self._repository.add_documents,
+            batch,
+            clear_existing=clear,
+            collection=collection,
+            embeddings=embeddings,
+        )
+
+    async def _astore_batch(self, batch: list[DocumentChunk], clear: bool, collection: str | None = None) -> None:
+        """Async _store_batch."""
+        retries = max(0, self._settings.ingest_batch_retries)
+        for attempt in range(retries + 1):
+            try:
+                await self._repository.aadd_documents(batch, clear_existing=clear, collection=collection)
+                return
+            except Exception as e:
+                if attempt == retries:
+                    raise
+                logger.warning("Storing a batch failed (attempt %d/%d), retrying: %s", attempt + 1, retries + 1, e)
+                await asyncio.sleep(self._retry_delay(attempt))
+
+    def _discard_partial(self, source_name: str, stored: list[str], rebuild: str | None = None) -> None:
+        """Best effort: remove the batches a failed ingestion stored, by their
+        chunk_hash, so chunks of the document stored before this run stay
+        (with a rebuild, the whole shadow collection goes instead)."""
+        if rebuild is not None:
+            self._discard_rebuild(rebuild)
+            return
+        self._discard_added(source_name, stored)
+
+    async def _adiscard_partial(self, source_name: str, stored: list[str], rebuild: str | None = None) -> None:
+        """Async _discard_partial."""
+        if rebuild is not None:
+            await asyncio.to_thread(self._discard_rebuild, rebuild)
+            return
+        await asyncio.to_thread(self._discard_added, source_name, stored)
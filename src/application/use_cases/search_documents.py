@@ -2,17 +2,32 @@
 Search Documents Use Case.
 Handles RAG-based semantic search.
 """
+import dataclasses
+import logging
+import time
+from typing import AsyncIterator, Iterator
+
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.runnables import RunnablePassthrough
 
+from src.application.context_assembly import AssembledContext, assemble_context, format_docs
+from src.application.metrics import CONTEXT_TOKENS_SAVED, LLM_CALLS_AVOIDED, TIME_TO_FIRST_TOKEN
 from src.config.settings import get_settings
-from src.domain.entities.document import SearchResult
+from src.domain.entities.document import BatchSearchResult, DocumentChunk, ScoredChunk, SearchResult
 from src.domain.ports.repository import RepositoryPort
 from src.domain.ports.llm import LLMPort
+from src.domain.ports.answer_cache import AnswerCachePort
+from src.domain.ports.embeddings import EmbeddingsPort
 from src.domain.exceptions import SearchError
 
 
+logger = logging.getLogger(__name__)
+
+
+# What PROMPT_TEMPLATE tells the model to answer when the context does not
+# support an answer; also returned directly below RELEVANCE_FLOOR.
+NO_ANSWER = "Não tenho informações necessárias para responder sua pergunta."
+
 PROMPT_TEMPLATE = """
 CONTEXTO:
 {context}
@@ -40,42 +55,69 @@ PERGUNTA DO USUÁRIO:
 RESPONDA A "PERGUNTA DO USUÁRIO"
 """
 
+
+@dataclasses.dataclass
+class _Prepared:
+    """A question ready for generation, or already answered without the LLM."""
+
+    query: str
+    corpus_version: int | None
+    # Set when no LLM call is needed: a cached answer or the refusal.
+    result: SearchResult | None = None
+    cached: bool = False
+    chunks: list[DocumentChunk] = dataclasses.field(default_factory=list)
+    context: AssembledContext | None = None
+    # The question's embedding when it was computed up front (execute_many).
+    embedding: list[float] | None = None
+
+    @property
+    def inputs(self) -> dict:
+        """Prompt variables for the generation chain."""
+        return {"context": self.context.text, "question": self.query}
+
+    def result_for(self, answer: str | None, ttft: float | None = None) -> SearchResult:
+        """The known result, or one built from the generated answer."""
+        if self.result is not None:
+            return self.result
+        return SearchResult(
+            query=self.query,
+            answer=answer,
+            sources=self.chunks,
+            time_to_first_token=ttft,
+            context_tokens_saved=self.context.tokens_saved,
+        )
+
+
 class SearchDocumentsUseCase:
     """Use case for searching documents using RAG."""
 
-    def __init__(self, repository: RepositoryPort, llm: LLMPort):
+    def __init__(
+        self,
+        repository: RepositoryPort,
+        llm: LLMPort,
+        answer_cache: AnswerCachePort | None = None,
+        embeddings: EmbeddingsPort | None = None,
+    ):
         self._repository = repository
         self._llm = llm
+        self._answer_cache = answer_cache
+        # Lets execute_many embed each slice once for the cache and retrieval.
+        self._embeddings = embeddings
         self._settings = get_settings()
         self._chain = self._build_chain()
 
     def _build_chain(self):
-        """Build the RAG chain with optimized formatting."""
-        retriever = self._repository.get_retriever(k=self._settings.retriever_k)
+        """Build the generation chain (prompt -> LLM -> text).
+
+        Retrieval is deliberately not part of the chain: `execute` retrieves
+        once and feeds the same chunks to the prompt and to the result sources,
+        so each question costs a single query embedding and a single MMR search.
+        """
         prompt = ChatPromptTemplate.from_template(PROMPT_TEMPLATE)
         llm = self._llm.get_langchain_llm()
-        
-        def format_docs(docs):
-            formatted = []
-            for i, doc in enumerate(docs):
-                source = doc.metadata.get("source_file", "unknown")
-                formatted.append(
-                    f'<document source="{source}" id={i}>\n{doc.page_content}\n</document>'
-                )
-            return "\n".join(formatted)
-        
-        chain = (
-            {
-                "context": retriever | format_docs, 
-                "question": RunnablePassthrough()
-            }
-            | prompt
-            | llm
-            | StrOutputParser()
-        )
-        
-        return chain
-    
+
+        return prompt | llm | StrOutputParser()
+
     def execute(self, query: str) -> SearchResult:
         """
         Search documents and generate response.
@@ -90,20 +132,313 @@ class SearchDocumentsUseCase:
             SearchError: If search fails.
         """
         try:
-            # Get relevant chunks
-            chunks = self._repository.search(query, k=self._settings.retriever_k)
-            
-            # Generate response
-            answer = self._chain.invoke(query)
-            
-            return SearchResult(
-                query=query,
-                answer=answer,
-                sources=chunks
-            )
-            
+            prepared = self._prepare(query)
+            if prepared.result is not None:
+                return self._finalize(prepared)
+            return self._finalize(prepared, self._chain.invoke(prepared.inputs))
+        except Exception as e:
+            raise SearchError(f"Search failed: {str(e)}") from e
+
+    async def aexecute(self, query: str) -> SearchResult:
+        """
+        Async execute for event-loop callers (Chainlit).
+
+        Cache lookup, retrieval and generation are awaited through the ports'
+        async methods, so concurrent questions share the loop instead of each
+        holding a worker thread for the whole LLM call.
+
+        Raises:
+            SearchError: If search fails.
+        """
+        try:
+            prepared = await self._aprepare(query)
+            if prepared.result is not None:
+                return await self._afinalize(prepared)
+            return await self._afinalize(prepared, await self._chain.ainvoke(prepared.inputs))
+        except Exception as e:
+            raise SearchError(f"Search failed: {str(e)}") from e
+
+    def execute_many(self, queries: list[str]) -> BatchSearchResult:
+        """
+        Answer a batch of questions.
+
+        Questions are handled in slices of SEARCH_BATCH_SIZE. With an
+        embeddings port, each slice is embedded in one call whose vectors
+        serve both the answer-cache lookup/store and retrieval. Cached
+        answers are reused; the rest are retrieved in one database round
+        trip per slice, then generated with at most LLM_MAX_CONCURRENCY
+        LLM calls in flight. A failing question does not fail the batch: its
+        slot in `results` is None and the error is reported under its index.
+
+        Args:
+            queries: User questions.
+
+        Returns:
+            BatchSearchResult with results in input order.
+
+        Raises:
+            SearchError: If the corpus version or retrieval fails.
+        """
+        started = time.perf_counter()
+        results: list[SearchResult | None] = [None] * len(queries)
+        errors: dict[int, str] = {}
+        cached = 0
+        try:
+            corpus_version = self._corpus_version()
+            batch_size = max(1, self._settings.search_batch_size)
+            for start in range(0, len(queries), batch_size):
+                batch = queries[start:start + batch_size]
+                embeddings = (
+                    self._embeddings.embed_queries(batch)
+                    if self._embeddings is not None else [None] * len(batch)
+                )
+                pending: list[tuple[int, list[float] | None]] = []
+                for i, query, embedding in zip(range(start, start + len(batch)), batch, embeddings):
+                    if corpus_version is not None:
+                        results[i] = self._answer_cache.lookup(query, corpus_version, embedding)
+                    if results[i] is None:
+                        pending.append((i, embedding))
+                    else:
+                        cached += 1
+                if not pending:
+                    continue
+
+                retrieved = self._retrieve_many(
+                    [queries[i] for i, _ in pending],
+                    [embedding for _, embedding in pending] if self._embeddings is not None else None,
+                )
+                generate: list[tuple[int, _Prepared]] = []
+                for (i, embedding), chunks in zip(pending, retrieved):
+                    prepared = self._prepared(queries[i], corpus_version, chunks)
+                    prepared.embedding = embedding
+                    if prepared.result is not None:
+                        results[i] = self._finalize(prepared)
+                    else:
+                        generate.append((i, prepared))
+                answers = self._chain.batch(
+                    [prepared.inputs for _, prepared in generate],
+                    config={"max_concurrency": self._settings.llm_max_concurrency},
+                    return_exceptions=True,
+                )
+                for (i, prepared), answer in zip(generate, answers):
+                    if isinstance(answer, Exception):
+                        errors[i] = f"Search failed: {answer}"
+                        continue
+                    results[i] = self._finalize(prepared, answer)
+
+        except Exception as e:
+            raise SearchError(f"Search failed: {str(e)}") from e
+
+        batch_result = BatchSearchResult(
+            results=results,
+            errors=errors,
+            elapsed_seconds=time.perf_counter() - started,
+        )
+        logger.info(
+            "Answered %d question(s) (%d cached, %d failed) in %.2fs: %.1f questions/s",
+            len(queries), cached, len(errors),
+            batch_result.elapsed_seconds, batch_result.questions_per_second,
+        )
+        return batch_result
+
+    def stream(self, query: str) -> Iterator[str | SearchResult]:
+        """
+        Search documents and stream the answer as the LLM generates it.
+
+        Yields answer tokens (str), then one final SearchResult with the full
+        answer, the sources and time_to_first_token. A cached answer (or the
+        refusal below RELEVANCE_FLOOR) is yielded as a single token.
+
+        Raises:
+            SearchError: If search fails (possibly after some tokens).
+        """
+        started = time.perf_counter()
+        try:
+            prepared = self._prepare(query)
+            if prepared.result is not None:
+                yield prepared.result.answer
+                yield self._finish(self._finalize(prepared), started)
+                return
+
+            parts: list[str] = []
+            ttft = None
+            for token in self._chain.stream(prepared.inputs):
+                if not token:
+                    continue
+                if ttft is None:
+                    ttft = self._first_token(started)
+                parts.append(token)
+                yield token
+            yield self._finalize(prepared, "".join(parts), ttft)
+
+        except Exception as e:
+            raise SearchError(f"Search failed: {str(e)}") from e
+
+    async def astream(self, query: str) -> AsyncIterator[str | SearchResult]:
+        """Async stream for event-loop callers (Chainlit); same items as stream."""
+        started = time.perf_counter()
+        try:
+            prepared = await self._aprepare(query)
+            if prepared.result is not None:
+                yield prepared.result.answer
+                yield self._finish(await self._afinalize(prepared), started)
+                return
+
+            parts: list[str] = []
+            ttft = None
+            async for token in self._chain.astream(prepared.inputs):
+                if not token:
+                    continue
+                if ttft is None:
+                    ttft = self._first_token(started)
+                parts.append(token)
+                yield token
+            yield await self._afinalize(prepared, "".join(parts), ttft)
+
         except Exception as e:
             raise SearchError(f"Search failed: {str(e)}") from e
+
+    def _prepare(self, query: str) -> _Prepared:
+        """Everything before generation: cache lookup, retrieval and context.
+
+        Returns a _Prepared whose result is already set when no LLM call is
+        needed (a cached answer or the refusal below RELEVANCE_FLOOR).
+        """
+        corpus_version = self._corpus_version()
+        if corpus_version is not None:
+            cached = self._answer_cache.lookup(query, corpus_version)
+            if cached is not None:
+                return _Prepared(query, corpus_version, result=cached, cached=True)
+        # Retrieve once; the same chunks ground the answer and are returned as sources
+        return self._prepared(query, corpus_version, self._retrieve(query))
+
+    async def _aprepare(self, query: str) -> _Prepared:
+        """Async _prepare."""
+        corpus_version = await self._acorpus_version()
+        if corpus_version is not None:
+            cached = await self._answer_cache.alookup(query, corpus_version)
+            if cached is not None:
+                return _Prepared(query, corpus_version, result=cached, cached=True)
+        return self._prepared(query, corpus_version, await self._aretrieve(query))
+
+    def _prepared(
+        self, query: str, corpus_version: int | None, chunks: list[DocumentChunk] | None
+    ) -> _Prepared:
+        """_Prepared for retrieved chunks: the refusal when retrieval was gated out,
+        otherwise the chunks and their prompt CONTEXT."""
+        if chunks is None:
+            return _Prepared(query, corpus_version, result=self._refusal(query))
+        return _Prepared(query, corpus_version, chunks=chunks, context=self._context(chunks))
+
+    def _finalize(
+        self, prepared: _Prepared, answer: str | None = None, ttft: float | None = None
+    ) -> SearchResult:
+        """The SearchResult for a prepared question (built from the generated
+        answer unless it was known up front), stored in the answer cache."""
+        result = prepared.result_for(answer, ttft)
+        if prepared.corpus_version is not None and not prepared.cached:
+            self._answer_cache.store(
+                prepared.query, prepared.corpus_version, result, embedding=prepared.embedding
+            )
+        return result
+
+    async def _afinalize(
+        self, prepared: _Prepared, answer: str | None = None, ttft: float | None = None
+    ) -> SearchResult:
+        """Async _finalize."""
+        result = prepared.result_for(answer, ttft)
+        if prepared.corpus_version is not None and not prepared.cached:
+            await self._answer_cache.astore(prepared.query, prepared.corpus_version, result)
+        return result
+
+    def _retrieve(self, query: str) -> list[DocumentChunk] | None:
+        """Chunks for the prompt, or None when none reaches RELEVANCE_FLOOR."""
+        k = self._settings.retriever_k
+        if self._settings.relevance_floor is None:
+            return self._repository.search(query, k=k)
+        return self._gate(self._repository.search_with_scores(query, k=k))
+
+    async def _aretrieve(self, query: str) -> list[DocumentChunk] | None:
+        """Async _retrieve."""
+        k = self._settings.retriever_k
+        if self._settings.relevance_floor is None:
+            return await self._repository.asearch(query, k=k)
+        return self._gate(await self._repository.asearch_with_scores(query, k=k))
+
+    def _retrieve_many(
+        self, queries: list[str], embeddings: list[list[float]] | None = None
+    ) -> list[list[DocumentChunk] | None]:
+        """_retrieve for a batch, in one search_many round trip."""
+        k = self._settings.retriever_k
+        if self._settings.relevance_floor is None:
+            return self._repository.search_many(queries, k=k, query_embeddings=embeddings)
+        return [
+            self._gate(scored)
+            for scored in self._repository.search_many_with_scores(queries, k=k, query_embeddings=embeddings)
+        ]
+
+    def _gate(self, scored: list[ScoredChunk]) -> list[DocumentChunk] | None:
+        """Drop a retrieval whose best similarity is below RELEVANCE_FLOOR.
+
+        The prompt would only make the LLM answer NO_ANSWER from such a
+        context, so the call is skipped and counted in LLM_CALLS_AVOIDED.
+        """
+        best = max((chunk.score for chunk in scored), default=None)
+        if best is None or best < self._settings.relevance_floor:
+            LLM_CALLS_AVOIDED.increment()
+            logger.info(
+                "Best similarity %s below relevance floor %.2f; answering without the LLM",
+                "n/a" if best is None else f"{best:.3f}", self._settings.relevance_floor,
+            )
+            return None
+        return scored
+
+    def _context(self, chunks: list[DocumentChunk]) -> AssembledContext:
+        """The prompt CONTEXT for chunks; overlapping neighbours merged and
+        near-duplicates dropped unless CONTEXT_ASSEMBLY_ENABLED is off."""
+        if not self._settings.context_assembly_enabled:
+            return AssembledContext(text=format_docs(chunks), passages=chunks)
+        context = assemble_context(
+            chunks, self._settings.chunk_overlap, self._settings.context_dedup_threshold
+        )
+        CONTEXT_TOKENS_SAVED.increment(context.tokens_saved)
+        logger.info(
+            "Context assembly: %d chunk(s) -> %d passage(s) (%d merged, %d near-duplicate(s) dropped), "
+            "~%d prompt token(s) saved",
+            len(chunks), len(context.passages), context.chunks_merged, context.chunks_dropped,
+            context.tokens_saved,
+        )
+        return context
+
+    @staticmethod
+    def _refusal(query: str) -> SearchResult:
+        """The out-of-context answer, with no sources (nothing retrieved was relevant)."""
+        return SearchResult(query=query, answer=NO_ANSWER, sources=[])
+
+    @staticmethod
+    def _first_token(started: float) -> float:
+        """Record and return the time to first token for a stream started at `started`."""
+        ttft = time.perf_counter() - started
+        TIME_TO_FIRST_TOKEN.record(ttft)
+        logger.info("Time to first token: %.0f ms", ttft * 1000)
+        return ttft
+
+    def _finish(self, cached: SearchResult, started: float) -> SearchResult:
+        """An answer known up front (cached, or the refusal) streamed as one token:
+        its first token is the whole answer."""
+        return dataclasses.replace(cached, time_to_first_token=self._first_token(started))
+
+    def _corpus_version(self) -> int | None:
+        """Corpus version to key the answer cache with (None disables caching)."""
+        if self._answer_cache is None:
+            return None
+        return self._repository.corpus_version()
+
+    async def _acorpus_version(self) -> int | None:
+        """Async _corpus_version."""
+        if self._answer_cache is None:
+            return None
+        return await self._repository.acorpus_version()
     
     def search_sync(self, query: str) -> str:
         """
@@ -0,0 +1,140 @@
+"""
+Benchmark: login throughput, connection per login vs. pooled connections.
+
+`PostgresUserRepository` used to open a new psycopg connection for every
+lookup, so a burst of logins paid TCP (+TLS) setup and authentication each
+time. It now runs on the shared pool from `adapters/postgres_pool.py`. This
+script seeds throwaway users in the Chainlit `User` table, replays concurrent
+logins through `AuthenticateOrRegisterUserUseCase` against both repository
+variants and reports logins per second. The seeded users are deleted at the end.
+
+Password verification is stubbed by default so the numbers isolate database
+cost; pass --argon2 to include the real hasher.
+
+Requires the database from .env with the Chainlit schema
+(`python3 src/scripts/init_chainlit_db.py`).
+
+Usage (from project root):
+    python -m src.benchmarks.logins                          # 2000 logins, 32 concurrent
+    python -m src.benchmarks.logins --logins 5000 --concurrency 64
+    python -m src.benchmarks.logins --argon2
+"""
+import argparse
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import psycopg
+from dotenv import load_dotenv
+
+from src.application.use_cases.authenticate_or_register_user import (
+    AuthenticateOrRegisterUserUseCase,
+)
+from src.config.settings import get_settings
+from src.domain.entities.user import User
+from src.domain.ports.password_hasher import PasswordHasherPort
+from src.domain.ports.user_repository import UserRepositoryPort
+from src.infrastructure.adapters.argon2_password_hasher import Argon2PasswordHasher
+from src.infrastructure.adapters.postgres_pool import close_pools, get_pool
+from src.infrastructure.adapters.postgres_user_repository import (
+    _CREATE,
+    _GET_BY_IDENTIFIER,
+    PostgresUserRepository,
+    _to_user,
+)
+
+
+PREFIX = "bench-login-"
+PASSWORD = "benchmark-password"
+
+
+class ConnectPerCallUserRepository(UserRepositoryPort):
+    """The previous behaviour: one psycopg.connect per lookup."""
+
+    def __init__(self, dsn: str):
+        self._dsn = dsn
+
+    def get_by_identifier(self, identifier: str) -> User | None:
+        with psycopg.connect(self._dsn) as conn:
+            row = conn.execute(_GET_BY_IDENTIFIER, (identifier,)).fetchone()
+        return _to_user(row)
+
+    def create(self, user: User) -> None:
+        with psycopg.connect(self._dsn) as conn:
+            conn.execute(_CREATE, (user.id, user.identifier, user.password_hash))
+
+
+class AcceptingHasher(PasswordHasherPort):
+    """Hasher that accepts every password, to measure the database path only."""
+
+    def hash(self, password: str) -> str:
+        return "bench"
+
+    def verify(self, password: str, hashed: str) -> bool:
+        return True
+
+
+def _seed(users: int, password_hash: str) -> list[str]:
+    identifiers = [f"{PREFIX}{i}" for i in range(users)]
+    with get_pool().connection() as conn:
+        with conn.cursor() as cur:
+            cur.executemany(
+                'INSERT INTO "User" ("id", "identifier", "passwordHash") VALUES (%s, %s, %s) '
+                'ON CONFLICT ("identifier") DO UPDATE SET "passwordHash" = EXCLUDED."passwordHash"',
+                [(uuid.uuid4().hex, identifier, password_hash) for identifier in identifiers],
+            )
+    return identifiers
+
+
+def _cleanup() -> None:
+    with get_pool().connection() as conn:
+        conn.execute('DELETE FROM "User" WHERE "identifier" LIKE %s', (PREFIX + "%",))
+
+
+def _run(repository: UserRepositoryPort, hasher: PasswordHasherPort, identifiers: list[str],
+         logins: int, concurrency: int) -> float:
+    """Return logins per second."""
+    use_case = AuthenticateOrRegisterUserUseCase(repository, hasher)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(
+            lambda i: use_case.execute(identifiers[i % len(identifiers)], PASSWORD),
+            range(logins),
+        ))
+    return logins / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=2000, help="logins per variant (default: 2000)")
+    parser.add_argument("--concurrency", type=int, default=32, help="concurrent logins (default: 32)")
+    parser.add_argument("--users", type=int, default=200, help="distinct seeded users (default: 200)")
+    parser.add_argument("--argon2", action="store_true", help="verify passwords with the real Argon2 hasher")
+    args = parser.parse_args()
+
+    load_dotenv()
+    settings = get_settings()
+    hasher = Argon2PasswordHasher() if args.argon2 else AcceptingHasher()
+
+    identifiers = _seed(args.users, hasher.hash(PASSWORD))
+    try:
+        print(
+            f"{args.logins} logins, {args.concurrency} concurrent, pool "
+            f"{settings.db_pool_min_size}-{settings.db_pool_max_size} "
+            f"({'argon2' if args.argon2 else 'verification stubbed'})"
+        )
+        variants = (
+            ("connect per login", ConnectPerCallUserRepository(settings.database_url)),
+            ("pooled", PostgresUserRepository()),
+        )
+        for name, repository in variants:
+            rate = _run(repository, hasher, identifiers, args.logins, args.concurrency)
+            print(f"{name:>18}: {rate:8.0f} logins/s")
+        print(f"pool stats: {get_pool().get_stats()}")
+    finally:
+        _cleanup()
+        close_pools()
+
+
+if __name__ == "__main__":
+    main()
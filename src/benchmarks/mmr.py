@@ -0,0 +1,80 @@
+"""
+Benchmark: MMR candidate decoding and selection.
+
+The LangChain path reads candidate embeddings as text (`[0.1,0.2,...]`),
+parses them into Python lists and runs MMR as a loop over per-candidate
+similarity rows. The repositories now read them over a binary cursor as
+float32 arrays and run the vectorized MMR in `adapters/mmr.py`. This script
+times both stages separately on synthetic candidates, so no database or
+embedding provider is needed.
+
+Usage (from project root):
+    python -m src.benchmarks.mmr                       # fetch_k 30..1000, dim 1536, k 10
+    python -m src.benchmarks.mmr --dim 768 --repeat 50
+"""
+import argparse
+import statistics
+import time
+
+import numpy as np
+from langchain_postgres.vectorstores import maximal_marginal_relevance as langchain_mmr
+from pgvector.utils import Vector
+
+from src.infrastructure.adapters.mmr import maximal_marginal_relevance
+
+
+def _time_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def _bench(fetch_k: int, dim: int, k: int, repeat: int, rng: np.random.Generator) -> dict[str, float]:
+    vectors = rng.normal(size=(fetch_k, dim)).astype(np.float32)
+    query = rng.normal(size=dim).astype(np.float32)
+    text_rows = [Vector._to_db(v) for v in vectors]
+    binary_rows = [Vector._to_db_binary(v) for v in vectors]
+
+    def text_decode():
+        return [Vector._from_db(row).tolist() for row in text_rows]
+
+    def binary_decode():
+        return np.stack([Vector._from_db_binary(row) for row in binary_rows])
+
+    as_lists = text_decode()
+    as_matrix = binary_decode()
+
+    return {
+        "text decode": _time_ms(text_decode, repeat),
+        "langchain mmr": _time_ms(lambda: langchain_mmr(query, as_lists, k=k, lambda_mult=0.5), repeat),
+        "binary decode": _time_ms(binary_decode, repeat),
+        "numpy mmr": _time_ms(lambda: maximal_marginal_relevance(query, as_matrix, k=k), repeat),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fetch-k", type=int, nargs="+", default=[30, 100, 300, 1000])
+    parser.add_argument("--dim", type=int, default=1536, help="embedding dimensions (default: 1536)")
+    parser.add_argument("--k", type=int, default=10, help="chunks selected (default: 10)")
+    parser.add_argument("--repeat", type=int, default=20, help="runs per measurement, median reported")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"dim={args.dim} k={args.k} (median ms of {args.repeat} runs)")
+    print(f"{'fetch_k':>8} {'text dec':>9} {'lc mmr':>9} {'bin dec':>9} {'np mmr':>9} {'old total':>10} {'new total':>10} {'speedup':>8}")
+    for fetch_k in args.fetch_k:
+        r = _bench(fetch_k, args.dim, args.k, args.repeat, rng)
+        old = r["text decode"] + r["langchain mmr"]
+        new = r["binary decode"] + r["numpy mmr"]
+        print(
+            f"{fetch_k:>8} {r['text decode']:>9.2f} {r['langchain mmr']:>9.2f} "
+            f"{r['binary decode']:>9.2f} {r['numpy mmr']:>9.2f} {old:>10.2f} {new:>10.2f} {old / new:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
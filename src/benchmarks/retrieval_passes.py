@@ -0,0 +1,272 @@
+"""
+Benchmark: single-pass vs. two-pass retrieval per question.
+
+`SearchDocumentsUseCase.execute` used to call `repository.search()` for the
+sources and then run the retriever a second time inside the chain, so every
+question paid for two query embeddings and two MMR searches. This script
+replays both paths with the LLM stubbed out (generation cost is the same on
+both sides) and reports the retrieval latency and embedding spend per question.
+
+Usage (from project root):
+    python -m src.benchmarks.retrieval_passes                        # simulated latencies, no services
+    python -m src.benchmarks.retrieval_passes --embed-latency-ms 250 # slower embedding API
+    python -m src.benchmarks.retrieval_passes --live                 # real embeddings + pgvector from .env
+"""
+import argparse
+import hashlib
+import statistics
+import time
+from dataclasses import dataclass
+from unittest.mock import patch
+
+from langchain_core.documents import Document as LangchainDocument
+from langchain_core.embeddings import Embeddings
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+from src.application.use_cases.search_documents import SearchDocumentsUseCase, format_docs
+from src.config.settings import get_settings
+from src.domain.entities.document import DocumentChunk, ScoredChunk
+from src.domain.ports.embeddings import EmbeddingsPort
+from src.domain.ports.llm import LLMPort
+from src.domain.ports.repository import RepositoryPort
+
+
+QUESTIONS = [
+    "Qual o faturamento da empresa SuperTechIABrazil?",
+    "Quais empresas foram fundadas em 2020?",
+    "Qual é o tema principal do documento?",
+    "Liste as empresas do setor de varejo.",
+    "Quantas empresas têm faturamento acima de 1 bilhão?",
+]
+
+# OpenAI text-embedding-3-small list price (USD per 1M input tokens).
+DEFAULT_PRICE_PER_1M_TOKENS = 0.02
+
+
+@dataclass
+class EmbeddingUsage:
+    """Embedding API usage accumulated by CountingEmbeddings."""
+
+    calls: int = 0
+    chars: int = 0
+
+    @property
+    def approx_tokens(self) -> int:
+        # ~4 characters per token is the usual rule of thumb for BPE tokenizers.
+        return self.chars // 4
+
+
+class CountingEmbeddings(Embeddings):
+    """LangChain embeddings wrapper that counts provider calls and input size."""
+
+    def __init__(self, inner: Embeddings):
+        self._inner = inner
+        self.usage = EmbeddingUsage()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        self.usage.calls += 1
+        self.usage.chars += sum(len(t) for t in texts)
+        return self._inner.embed_documents(texts)
+
+    def embed_query(self, text: str) -> list[float]:
+        self.usage.calls += 1
+        self.usage.chars += len(text)
+        return self._inner.embed_query(text)
+
+
+class CountingEmbeddingsPort(EmbeddingsPort):
+    """EmbeddingsPort whose LangChain object is the counting wrapper.
+
+    PGVector calls the LangChain object directly, so counting has to happen
+    there to see the queries it embeds.
+    """
+
+    def __init__(self, inner: Embeddings):
+        self._counting = CountingEmbeddings(inner)
+
+    @property
+    def usage(self) -> EmbeddingUsage:
+        return self._counting.usage
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self._counting.embed_documents(texts)
+
+    def embed_query(self, text: str) -> list[float]:
+        return self._counting.embed_query(text)
+
+    def get_langchain_embeddings(self) -> CountingEmbeddings:
+        return self._counting
+
+
+class _SimulatedEmbeddings(Embeddings):
+    """Deterministic fake embedding API with a fixed network latency."""
+
+    def __init__(self, latency_s: float, dims: int = 8):
+        self._latency_s = latency_s
+        self._dims = dims
+
+    def _vector(self, text: str) -> list[float]:
+        digest = hashlib.sha256(text.encode("utf-8")).digest()
+        return [b / 255 for b in digest[: self._dims]]
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        time.sleep(self._latency_s)
+        return [self._vector(t) for t in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        time.sleep(self._latency_s)
+        return self._vector(text)
+
+
+class _SimulatedRepository(RepositoryPort):
+    """In-memory repository: one query embedding plus a fixed DB/MMR latency per search."""
+
+    def __init__(self, embeddings: EmbeddingsPort, db_latency_s: float):
+        self._embeddings = embeddings
+        self._db_latency_s = db_latency_s
+        self._chunks = [
+            DocumentChunk(content=f"Trecho {i} " + "texto " * 150, metadata={"source_file": "document.pdf", "page": i})
+            for i in range(50)
+        ]
+
+    def add_documents(self, chunks, clear_existing=False, collection=None, embeddings=None) -> int:
+        self._chunks = list(chunks) if clear_existing else self._chunks + list(chunks)
+        return len(chunks)
+
+    def search(self, query: str, k: int = 10) -> list[DocumentChunk]:
+        self._embeddings.get_langchain_embeddings().embed_query(query)
+        time.sleep(self._db_latency_s)
+        return self._chunks[:k]
+
+    def search_with_scores(self, query: str, k: int = 10, include_vectors: bool = False) -> list[ScoredChunk]:
+        return [
+            ScoredChunk.from_chunk(c, score=1.0 - i / 100, id=str(i))
+            for i, c in enumerate(self.search(query, k))
+        ]
+
+    def delete_by_source(self, source_file: str) -> int:
+        kept = [c for c in self._chunks if c.metadata.get("source_file") != source_file]
+        deleted, self._chunks = len(self._chunks) - len(kept), kept
+        return deleted
+
+    def delete_chunks(self, source_file: str, chunk_hashes: list[str]) -> int:
+        doomed = set(chunk_hashes)
+        kept = [
+            c for c in self._chunks
+            if c.metadata.get("source_file") != source_file or c.metadata.get("chunk_hash") not in doomed
+        ]
+        deleted, self._chunks = len(self._chunks) - len(kept), kept
+        return deleted
+
+    def publish_rebuild(self, collection: str) -> None:
+        pass
+
+    def discard_rebuild(self, collection: str) -> None:
+        pass
+
+    def rollback_rebuild(self) -> str | None:
+        return None
+
+    def get_retriever(self, k: int = 10):
+        return RunnableLambda(
+            lambda q: [
+                LangchainDocument(page_content=c.content, metadata=c.metadata)
+                for c in self.search(q, k=k)
+            ]
+        )
+
+
+class _StubLLM(LLMPort):
+    """LLM that answers instantly; generation is not what this benchmark measures."""
+
+    def generate(self, prompt: str) -> str:
+        return "ok"
+
+    def get_langchain_llm(self):
+        return RunnableLambda(lambda _prompt: AIMessage(content="ok"))
+
+
+def _two_pass(repository: RepositoryPort, retriever, k: int, query: str) -> None:
+    """The previous execute(): search for sources, then retrieve again in the chain."""
+    repository.search(query, k=k)
+    docs = retriever.invoke(query)
+    format_docs([DocumentChunk(content=d.page_content, metadata=d.metadata) for d in docs])
+
+
+def _measure(fn, questions: list[str], embeddings: CountingEmbeddingsPort) -> tuple[list[float], EmbeddingUsage]:
+    before = EmbeddingUsage(embeddings.usage.calls, embeddings.usage.chars)
+    latencies = []
+    for q in questions:
+        start = time.perf_counter()
+        fn(q)
+        latencies.append((time.perf_counter() - start) * 1000)
+    after = embeddings.usage
+    return latencies, EmbeddingUsage(after.calls - before.calls, after.chars - before.chars)
+
+
+def _build(args) -> tuple[RepositoryPort, CountingEmbeddingsPort]:
+    if args.live:
+        from dotenv import load_dotenv
+
+        from src.infrastructure.adapters.pgvector_repository import PGVectorRepository
+        from src.infrastructure.factories.provider_factory import ProviderFactory
+
+        load_dotenv()
+        provider = ProviderFactory.get_embeddings()
+        # Count real provider calls: bypass the query embedding cache.
+        provider = getattr(provider, "inner", provider)
+        embeddings = CountingEmbeddingsPort(provider.get_langchain_embeddings())
+        return PGVectorRepository(embeddings), embeddings
+
+    embeddings = CountingEmbeddingsPort(_SimulatedEmbeddings(args.embed_latency_ms / 1000))
+    return _SimulatedRepository(embeddings, args.db_latency_ms / 1000), embeddings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--live", action="store_true", help="use the configured provider and database")
+    parser.add_argument("--questions", type=int, default=20, help="questions per path (default: 20)")
+    parser.add_argument("--k", type=int, default=10, help="chunks per question (default: 10)")
+    parser.add_argument("--embed-latency-ms", type=float, default=150.0, help="simulated embedding API latency")
+    parser.add_argument("--db-latency-ms", type=float, default=25.0, help="simulated MMR query latency")
+    parser.add_argument("--price-per-1m-tokens", type=float, default=DEFAULT_PRICE_PER_1M_TOKENS)
+    args = parser.parse_args()
+
+    repository, embeddings = _build(args)
+    questions = [QUESTIONS[i % len(QUESTIONS)] for i in range(args.questions)]
+
+    retriever = repository.get_retriever(k=args.k)
+    # SearchDocumentsUseCase reads retriever_k from settings; keep both paths on the same k.
+    settings = get_settings().model_copy(update={"retriever_k": args.k})
+    with patch("src.application.use_cases.search_documents.get_settings", return_value=settings):
+        use_case = SearchDocumentsUseCase(repository, _StubLLM())
+
+    rows = {
+        "two-pass": _measure(lambda q: _two_pass(repository, retriever, args.k, q), questions, embeddings),
+        "single-pass": _measure(use_case.execute, questions, embeddings),
+    }
+
+    n = len(questions)
+    print(f"{'path':<12} {'p50 ms':>9} {'mean ms':>9} {'embed calls/q':>14} {'~tokens/q':>10} {'USD/1k q':>10}")
+    summary = {}
+    for name, (latencies, usage) in rows.items():
+        per_q_tokens = usage.approx_tokens / n
+        usd_per_1k = per_q_tokens * 1000 * args.price_per_1m_tokens / 1_000_000
+        mean = statistics.fmean(latencies)
+        summary[name] = (mean, usage.calls / n, usd_per_1k)
+        print(
+            f"{name:<12} {statistics.median(latencies):>9.1f} {mean:>9.1f} "
+            f"{usage.calls / n:>14.1f} {per_q_tokens:>10.1f} {usd_per_1k:>10.6f}"
+        )
+
+    old, new = summary["two-pass"], summary["single-pass"]
+    print(
+        f"\nsaved per question: {old[0] - new[0]:.1f} ms retrieval latency "
+        f"({(1 - new[0] / old[0]) * 100:.0f}%), {old[1] - new[1]:.1f} embedding call(s), "
+        f"${old[2] - new[2]:.6f} per 1k questions"
+    )
+
+
+if __name__ == "__main__":
+    main()
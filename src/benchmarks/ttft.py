@@ -0,0 +1,141 @@
+"""
+Benchmark: time to first token, streamed vs. blocking answers.
+
+`SearchDocumentsUseCase.execute` returns only after the LLM has produced the
+whole answer, so the user stares at an empty message for the full generation
+time. `stream` yields tokens as they arrive. This script runs both paths with
+a simulated retrieval latency and a fake chat model that emits tokens at a
+fixed rate, and reports when the user sees the first word and the last.
+
+Usage (from project root):
+    python -m src.benchmarks.ttft                                  # 200 tokens at 40 tok/s
+    python -m src.benchmarks.ttft --tokens 600 --tokens-per-s 80
+"""
+import argparse
+import statistics
+import time
+from typing import Any, Iterator
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from src.application.use_cases.search_documents import SearchDocumentsUseCase
+from src.domain.entities.document import DocumentChunk, ScoredChunk, SearchResult
+from src.domain.ports.llm import LLMPort
+from src.domain.ports.repository import RepositoryPort
+from src.infrastructure.adapters.repository_retriever import RepositoryRetriever
+
+
+class PacedChatModel(BaseChatModel):
+    """Chat model emitting `tokens` words, one every `interval` seconds."""
+
+    tokens: int
+    interval: float
+    first_token_delay: float
+
+    @property
+    def _llm_type(self) -> str:
+        return "paced-fake"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        text = "".join(chunk.message.content for chunk in self._stream(messages))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        time.sleep(self.first_token_delay)
+        for i in range(self.tokens):
+            if i:
+                time.sleep(self.interval)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=f"palavra{i} "))
+
+
+class _Repository(RepositoryPort):
+    def __init__(self, latency: float):
+        self._latency = latency
+
+    def add_documents(self, chunks, clear_existing=False, collection=None, embeddings=None) -> int:
+        return 0
+
+    def search(self, query: str, k: int = 10) -> list[DocumentChunk]:
+        return list(self.search_with_scores(query, k))
+
+    def search_with_scores(self, query: str, k: int = 10, include_vectors: bool = False) -> list[ScoredChunk]:
+        time.sleep(self._latency)
+        return [
+            ScoredChunk(content=f"trecho {i}", metadata={"source_file": "doc.pdf"}, score=1.0 - i / 100, id=str(i))
+            for i in range(k)
+        ]
+
+    def delete_by_source(self, source_file: str) -> int:
+        return 0
+
+    def delete_chunks(self, source_file: str, chunk_hashes: list[str]) -> int:
+        return 0
+
+    def publish_rebuild(self, collection: str) -> None:
+        pass
+
+    def discard_rebuild(self, collection: str) -> None:
+        pass
+
+    def rollback_rebuild(self) -> str | None:
+        return None
+
+    def get_retriever(self, k: int = 10):
+        return RepositoryRetriever(repository=self, k=k)
+
+
+class _LLM(LLMPort):
+    def __init__(self, model: BaseChatModel):
+        self._model = model
+
+    def generate(self, prompt: str) -> str:
+        return self._model.invoke(prompt).content
+
+    def get_langchain_llm(self):
+        return self._model
+
+
+def _run(use_case: SearchDocumentsUseCase, question: str, streamed: bool) -> tuple[float, float]:
+    """Return (seconds until the user sees text, seconds until the answer is complete)."""
+    start = time.perf_counter()
+    if not streamed:
+        use_case.execute(question)
+        total = time.perf_counter() - start
+        return total, total
+
+    first = None
+    for item in use_case.stream(question):
+        if first is None and not isinstance(item, SearchResult):
+            first = time.perf_counter() - start
+    return first, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tokens", type=int, default=200, help="answer length in tokens (default: 200)")
+    parser.add_argument("--tokens-per-s", type=float, default=40.0, help="generation rate (default: 40)")
+    parser.add_argument("--first-token-ms", type=float, default=400.0, help="LLM latency to first token (default: 400)")
+    parser.add_argument("--retrieval-ms", type=float, default=120.0, help="embedding + search latency (default: 120)")
+    parser.add_argument("--repeat", type=int, default=3, help="questions per path, median reported")
+    args = parser.parse_args()
+
+    model = PacedChatModel(
+        tokens=args.tokens,
+        interval=1 / args.tokens_per_s,
+        first_token_delay=args.first_token_ms / 1000,
+    )
+    use_case = SearchDocumentsUseCase(_Repository(args.retrieval_ms / 1000), _LLM(model))
+
+    print(f"{args.tokens} tokens at {args.tokens_per_s:g} tok/s (median of {args.repeat} runs)")
+    print(f"{'path':>10} {'first text':>11} {'complete':>10}")
+    for name, streamed in (("execute", False), ("stream", True)):
+        runs = [_run(use_case, "Qual o faturamento?", streamed) for _ in range(args.repeat)]
+        first = statistics.median(r[0] for r in runs) * 1000
+        total = statistics.median(r[1] for r in runs) * 1000
+        print(f"{name:>10} {first:>9.0f}ms {total:>8.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
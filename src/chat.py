@@ -5,9 +5,18 @@ Asks questions against documents already ingested by `src/ingest.py`.
 Usage (from project root, after ingesting):
     python3 src/chat.py                       # interactive chat
     python3 src/chat.py "Your question here"  # one-shot: answer and exit
+    python3 src/chat.py --batch questions.txt # batch: one JSON line per question on stdout
+    python3 src/chat.py --batch questions.jsonl --concurrency 16 --output answers.jsonl
+
+Batch input is a .txt file with one question per line, or a .jsonl file whose
+lines are {"question": "...", "id": ...} objects (id is optional and echoed
+back). Each output line carries the answer, the source ids and the latency.
 """
+import argparse
+import json
 import os
 import sys
+import time
 
 # Add project root to path
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -32,6 +41,8 @@ def build_search_use_case():
     return SearchDocumentsUseCase(
         ProviderFactory.get_repository(),
         ProviderFactory.get_llm(),
+        answer_cache=ProviderFactory.get_answer_cache(),
+        embeddings=ProviderFactory.get_embeddings(),
     )
 
 
@@ -40,6 +51,117 @@ def ask(search_use_case, question: str) -> str:
     return search_use_case.execute(question).answer
 
 
+def stream_answer(search_use_case, question: str):
+    """Print the answer token by token as it is generated; return the final SearchResult."""
+    from src.domain.entities.document import SearchResult
+
+    print("\n🧠 DocMind:")
+    result = None
+    for item in search_use_case.stream(question):
+        if isinstance(item, SearchResult):
+            result = item
+        else:
+            print(item, end="", flush=True)
+    print()
+    if result is not None and result.time_to_first_token is not None:
+        print(f"⏱️  First token after {result.time_to_first_token * 1000:.0f} ms")
+    if result is not None and result.context_tokens_saved:
+        print(f"✂️  Context assembly saved ~{result.context_tokens_saved} prompt tokens")
+    return result
+
+
+def read_questions(path: str) -> list[dict]:
+    """Read batch questions as {"question": ..., ["id": ...]} records.
+
+    .jsonl lines are objects with a "question" key (or bare JSON strings);
+    any other file is read as one question per line. Blank lines are skipped.
+    """
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            if not path.endswith(".jsonl"):
+                records.append({"question": line})
+                continue
+            item = json.loads(line)
+            if isinstance(item, str):
+                item = {"question": item}
+            if not isinstance(item, dict) or not str(item.get("question", "")).strip():
+                raise ValueError(f"{path}:{line_number}: expected an object with a \"question\"")
+            records.append(item)
+    return records
+
+
+def source_id(chunk) -> str:
+    """Identify a source chunk as `file` or `file#page=N`."""
+    source = chunk.metadata.get("source_file", "unknown")
+    page = chunk.metadata.get("page")
+    return source if page is None else f"{source}#page={page}"
+
+
+def answer_record(search_use_case, index: int, record: dict) -> dict:
+    """Answer one batch question; failures are reported in the record, not raised."""
+    out = {"index": index}
+    if "id" in record:
+        out["id"] = record["id"]
+    out["question"] = record["question"]
+    started = time.perf_counter()
+    try:
+        result = search_use_case.execute(record["question"])
+        out["answer"] = result.answer
+        out["sources"] = [source_id(chunk) for chunk in result.sources]
+    except Exception as e:
+        out["error"] = str(e)
+    out["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return out
+
+
+def run_batch(search_use_case, records: list[dict], concurrency: int, output) -> dict:
+    """Answer records with at most `concurrency` in flight, writing JSONL in input order.
+
+    Each line is flushed as soon as it and every earlier line are answered.
+    Returns a summary with the question, error and throughput counts.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    started = time.perf_counter()
+    errors = 0
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        results = executor.map(
+            lambda item: answer_record(search_use_case, *item), enumerate(records)
+        )
+        for out in results:
+            errors += "error" in out
+            output.write(json.dumps(out, ensure_ascii=False) + "\n")
+            output.flush()
+    elapsed = time.perf_counter() - started
+    return {
+        "questions": len(records),
+        "errors": errors,
+        "seconds": round(elapsed, 2),
+        "questions_per_second": round(len(records) / elapsed, 2) if elapsed > 0 else 0.0,
+    }
+
+
+def batch_main(search_use_case, path: str, concurrency: int, output_path: str | None):
+    """Batch mode: JSONL results on stdout (or output_path), progress on stderr."""
+    records = read_questions(path)
+    print(f"🔍 Answering {len(records)} question(s), {concurrency} at a time", file=sys.stderr)
+    if output_path:
+        with open(output_path, "w", encoding="utf-8") as output:
+            summary = run_batch(search_use_case, records, concurrency, output)
+    else:
+        summary = run_batch(search_use_case, records, concurrency, sys.stdout)
+    print(
+        f"✅ {summary['questions']} question(s), {summary['errors']} error(s) in "
+        f"{summary['seconds']}s ({summary['questions_per_second']} questions/s)",
+        file=sys.stderr,
+    )
+    return summary
+
+
 def chat_loop(search_use_case):
     """Interactive chat loop. Type 'exit' to quit."""
     print("💬 Chat started! Type 'exit' to quit.\n")
@@ -57,33 +179,64 @@ def chat_loop(search_use_case):
             break
 
         print("🔍 Searching...")
-        print(f"\n🧠 DocMind:\n{ask(search_use_case, question)}\n")
+        stream_answer(search_use_case, question)
+        print()
 
 
-def main():
-    _ensure_venv_python()
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Ask questions against the ingested documents.")
+    parser.add_argument("question", nargs="*", help="one-shot question (omit for interactive chat)")
+    parser.add_argument("--batch", metavar="FILE", help="answer every question in a .txt or .jsonl file")
+    parser.add_argument(
+        "--concurrency", type=int, default=None,
+        help="questions answered at once in batch mode (default: LLM_MAX_CONCURRENCY)",
+    )
+    parser.add_argument("--output", "-o", metavar="FILE", help="write batch JSONL here instead of stdout")
+    parser.add_argument("--no-daemon", action="store_true", help="answer in-process even if the chat daemon is running")
+    return parser.parse_args(argv)
 
-    question = " ".join(sys.argv[1:]).strip()
+
+def main():
+    args = parse_args(sys.argv[1:])
+    question = " ".join(args.question).strip()
+    # In batch mode stdout carries the JSONL results; messages go to stderr.
+    messages = sys.stderr if args.batch else sys.stdout
+
+    # A running daemon already has everything loaded: no venv re-exec, no setup.
+    daemon = None
+    if not args.batch and not args.no_daemon:
+        from src.chat_daemon import connect_daemon
+        daemon = connect_daemon()
+    if daemon is None:
+        _ensure_venv_python()
 
     try:
-        from dotenv import load_dotenv
-        load_dotenv(os.path.join(PROJECT_ROOT, ".env"))
+        if daemon is not None:
+            search_use_case = daemon
+        else:
+            from dotenv import load_dotenv
+            load_dotenv(os.path.join(PROJECT_ROOT, ".env"))
+
+            search_use_case = build_search_use_case()
 
-        search_use_case = build_search_use_case()
+        if args.batch:
+            from src.config.settings import get_settings
 
-        if question:
+            concurrency = args.concurrency or get_settings().llm_max_concurrency
+            batch_main(search_use_case, args.batch, concurrency, args.output)
+        elif question:
             print(f"🔍 Question: {question}")
-            print(f"\n🧠 DocMind:\n{ask(search_use_case, question)}")
+            stream_answer(search_use_case, question)
         else:
             chat_loop(search_use_case)
 
     except ModuleNotFoundError as e:
-        print(f"❌ Missing dependency: {e}")
-        print("💡 Install dependencies first: run `python3 main.py` (option 1)")
+        print(f"❌ Missing dependency: {e}", file=messages)
+        print("💡 Install dependencies first: run `python3 main.py` (option 1)", file=messages)
         sys.exit(1)
     except Exception as e:
-        print(f"❌ Error: {e}")
-        print("💡 Did you run `python3 src/ingest.py` first? Is Docker up (`docker compose up -d`)?")
+        print(f"❌ Error: {e}", file=messages)
+        print("💡 Did you run `python3 src/ingest.py` first? Is Docker up (`docker compose up -d`)?", file=messages)
         sys.exit(1)
 
 
@@ -0,0 +1,199 @@
+"""
+Chat query daemon.
+Keeps a warm SearchDocumentsUseCase behind a Unix domain socket, so
+`src/chat.py` one-shot and interactive runs skip the venv re-exec, the
+LangChain/provider imports and the PGVector setup.
+
+Usage (from project root, after ingesting):
+    python3 src/chat_daemon.py            # serve until Ctrl+C
+    python3 src/chat.py "Your question"   # answered by the daemon when it is running
+
+The socket path is CHAT_DAEMON_SOCKET (default: <tmp>/docmind-chat-<uid>.sock);
+the socket is created with mode 0600. `src/chat.py --no-daemon` always answers
+in-process, and so does `--batch`.
+
+Protocol: one connection per question. The client sends one JSON line
+{"question": ...}; the daemon replies with {"token": ...} lines as the answer
+is generated, then one {"result": {...}} or {"error": ...} line.
+
+Only the standard library is imported at module level: src/chat.py imports
+the client half before deciding whether it needs the venv at all.
+"""
+import json
+import os
+import socket
+import sys
+import tempfile
+from typing import Iterator
+
+# Add project root to path
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+
+def _ensure_venv_python():
+    """Re-exec with the project venv interpreter when invoked with system Python."""
+    venv_dir = os.path.join(PROJECT_ROOT, "venv")
+    bin_dir = "Scripts" if sys.platform == "win32" else "bin"
+    exe = "python.exe" if sys.platform == "win32" else "python"
+    venv_python = os.path.join(venv_dir, bin_dir, exe)
+    in_project_venv = os.path.realpath(sys.prefix) == os.path.realpath(venv_dir)
+    if not in_project_venv and os.path.exists(venv_python):
+        os.execv(venv_python, [venv_python, os.path.abspath(__file__), *sys.argv[1:]])
+
+def socket_path() -> str:
+    """CHAT_DAEMON_SOCKET, or a per-user socket in the temp directory."""
+    user = os.getuid() if hasattr(os, "getuid") else os.environ.get("USERNAME", "user")
+    default = os.path.join(tempfile.gettempdir(), f"docmind-chat-{user}.sock")
+    return os.environ.get("CHAT_DAEMON_SOCKET") or default
+
+
+def result_to_json(result) -> dict:
+    """Serialize a SearchResult for the wire."""
+    return {
+        "query": result.query,
+        "answer": result.answer,
+        "sources": [{"content": c.content, "metadata": c.metadata} for c in result.sources],
+        "time_to_first_token": result.time_to_first_token,
+        "context_tokens_saved": result.context_tokens_saved,
+    }
+
+
+def result_from_json(data: dict):
+    """Rebuild the SearchResult sent by result_to_json."""
+    from src.domain.entities.document import DocumentChunk, SearchResult
+
+    return SearchResult(
+        query=data["query"],
+        answer=data["answer"],
+        sources=[DocumentChunk(content=s["content"], metadata=s["metadata"]) for s in data["sources"]],
+        time_to_first_token=data.get("time_to_first_token"),
+        context_tokens_saved=data.get("context_tokens_saved", 0),
+    )
+
+
+class DaemonClient:
+    """Stands in for SearchDocumentsUseCase (execute / stream) over the daemon socket."""
+
+    def __init__(self, path: str):
+        self._path = path
+
+    def stream(self, question: str) -> Iterator:
+        """Yield answer tokens, then the SearchResult, as SearchDocumentsUseCase.stream does."""
+        from src.domain.exceptions import SearchError
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(self._path)
+            sock.sendall((json.dumps({"question": question}) + "\n").encode("utf-8"))
+            with sock.makefile("r", encoding="utf-8") as replies:
+                for line in replies:
+                    message = json.loads(line)
+                    if "token" in message:
+                        yield message["token"]
+                    elif "result" in message:
+                        yield result_from_json(message["result"])
+                        return
+                    else:
+                        raise SearchError(message.get("error", "Malformed daemon reply"))
+        raise SearchError("Chat daemon closed the connection before answering")
+
+    def execute(self, question: str):
+        """Return the final SearchResult of stream()."""
+        result = None
+        for item in self.stream(question):
+            if not isinstance(item, str):
+                result = item
+        return result
+
+
+def connect_daemon(path: str | None = None) -> DaemonClient | None:
+    """Return a client if a daemon is listening on the socket, else None."""
+    path = path or socket_path()
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(path):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(0.5)
+            sock.connect(path)
+    except OSError:
+        return None
+    return DaemonClient(path)
+
+
+def create_server(use_case, path: str):
+    """Bind a threaded Unix socket server answering questions with use_case.
+
+    A stale socket file left by a crashed daemon is replaced; a live one
+    means another daemon is already serving and is an error.
+    """
+    import socketserver
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            line = self.rfile.readline()
+            if not line.strip():
+                return  # liveness probe from connect_daemon
+            try:
+                question = json.loads(line)["question"]
+            except (ValueError, KeyError, TypeError):
+                self._send({"error": 'Expected one JSON line {"question": ...}'})
+                return
+            try:
+                for item in use_case.stream(question):
+                    if isinstance(item, str):
+                        self._send({"token": item})
+                    else:
+                        self._send({"result": result_to_json(item)})
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # client went away
+            except Exception as e:
+                self._send({"error": str(e)})
+
+        def _send(self, message: dict) -> None:
+            self.wfile.write((json.dumps(message, ensure_ascii=False, default=str) + "\n").encode("utf-8"))
+            self.wfile.flush()
+
+    if os.path.exists(path):
+        if connect_daemon(path) is not None:
+            raise RuntimeError(f"A chat daemon is already listening on {path}")
+        os.unlink(path)
+
+    server = socketserver.ThreadingUnixStreamServer(path, Handler, bind_and_activate=False)
+    server.daemon_threads = True
+    old_umask = os.umask(0o177)
+    try:
+        server.server_bind()
+    finally:
+        os.umask(old_umask)
+    server.server_activate()
+    return server
+
+
+def main():
+    _ensure_venv_python()
+
+    path = socket_path()
+    try:
+        from dotenv import load_dotenv
+        load_dotenv(os.path.join(PROJECT_ROOT, ".env"))
+
+        from src.chat import build_search_use_case
+
+        server = create_server(build_search_use_case(), path)
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    print(f"🟢 Chat daemon listening on {path} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Chat daemon stopped")
+    finally:
+        server.server_close()
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
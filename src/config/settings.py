@@ -2,6 +2,8 @@
 Configuration module using Pydantic BaseSettings.
 Centralizes all environment variable configuration.
 """
+import os
+import tempfile
 from functools import lru_cache
 from typing import Literal
 
@@ -23,6 +25,16 @@ class Settings(BaseSettings):
     # Database
     database_url: str
     pg_vector_collection_name: str = "document_chunks"
+    # "langchain": PGVector ORM adapter; "psycopg": native adapter with COPY bulk insert
+    vector_store_backend: Literal["langchain", "psycopg"] = "langchain"
+    db_pool_min_size: int = 1
+    db_pool_max_size: int = 10
+    # Seconds a caller waits for a free pooled connection before PoolTimeout
+    db_pool_timeout: float = 30.0
+    # Pooled connections idle longer than this are closed (down to min size)
+    db_pool_max_idle: float = 600.0
+    # Verify each connection on checkout, replacing ones dropped by the server
+    db_pool_check: bool = True
 
     # Default document for CLI ingestion (`python src/ingest.py`)
     pdf_path: str = "document.pdf"
@@ -42,6 +54,93 @@ class Settings(BaseSettings):
     chunk_overlap: int = 150
     retriever_k: int = 10
     llm_timeout: int = 60
+    # execute_many: questions retrieved per embedding call / database round trip,
+    # and LLM calls in flight at once
+    search_batch_size: int = 128
+    llm_max_concurrency: int = 8
+    # MMR: 1.0 = pure relevance, 0.0 = pure diversity; fetch_k defaults to 3 × k
+    mmr_lambda: float = 0.5
+    mmr_fetch_k: int | None = None
+    # Adaptive k: cut the chunks at the largest drop in their similarity curve
+    # (at least ADAPTIVE_K_MIN_GAP) instead of always sending retriever_k,
+    # which becomes the maximum; never fewer than adaptive_k_min
+    adaptive_k: bool = False
+    adaptive_k_min: int = 3
+    adaptive_k_min_gap: float = 0.05
+    # Questions whose closest chunk has a cosine similarity below this get the
+    # prompt's refusal without calling the LLM (unset = always call the LLM)
+    relevance_floor: float | None = None
+    # Context assembly: merge overlapping neighbour chunks of a page and drop
+    # passages whose word 3-grams are at least this share of a better-ranked
+    # one's before they reach the prompt
+    context_assembly_enabled: bool = True
+    context_dedup_threshold: float = 0.9
+    # "hybrid" fuses full-text and vector candidates with reciprocal rank fusion
+    retrieval_mode: Literal["vector", "hybrid"] = "vector"
+    hybrid_rrf_k: int = 60
+    # Candidates per side before fusion; defaults to 3 × k
+    hybrid_candidates: int | None = None
+
+    # In-process query embedding cache (LRU + TTL)
+    embedding_cache_enabled: bool = True
+    embedding_cache_max_entries: int = 1024
+    embedding_cache_max_mb: int = 64
+    embedding_cache_ttl_seconds: int = 3600
+    # Semantic answer cache: reuse answers to near-identical questions
+    answer_cache_enabled: bool = True
+    answer_cache_threshold: float = 0.97
+    answer_cache_max_entries: int = 512
+    answer_cache_ttl_seconds: int = 86400
+
+    # Persistent chunk embedding cache (Postgres table keyed by model + SHA-256)
+    document_embedding_cache_enabled: bool = True
+    embedding_batch_size: int = 256
+
+    # Multi-file ingestion: processes parsing and splitting files (0 = one
+    # thread in this process) and threads embedding + storing parsed files
+    ingest_parse_workers: int = 2
+    ingest_embed_workers: int = 4
+    # Single-file ingestion streams pages and embeds + stores this many chunks at a time
+    ingest_batch_size: int = 256
+    # Document registry (file + chunk hashes): re-ingesting skips unchanged files and
+    # only replaces the chunks that changed
+    document_registry_enabled: bool = True
+    # Deleting a document's chunks commits every this many rows, so large files
+    # never hold one long transaction
+    delete_batch_size: int = 5000
+    # A failed batch is retried this many times, backing off 1x, 2x, 4x... these seconds
+    ingest_batch_retries: int = 2
+    ingest_retry_backoff_seconds: float = 1.0
+    # Background ingestion (python -m src.workers.ingest): Chainlit uploads are copied
+    # to the spool directory and queued in the ingest_job table instead of ingested in-process.
+    # Workers read the files from the same path, so it must be shared by every worker host
+    ingest_background: bool = False
+    ingest_spool_dir: str = os.path.join(tempfile.gettempdir(), "docmind-ingest")
+    # Attempts per job (retry n waits n x the delay); a running job without a
+    # heartbeat for INGEST_JOB_STALE_SECONDS is reclaimed
+    ingest_job_max_attempts: int = 3
+    ingest_job_retry_delay_seconds: float = 30.0
+    ingest_job_stale_seconds: int = 600
+
+    # Argon2 login hashing: dedicated worker processes (0 = run in the caller's
+    # thread) and how many logins may wait for one before new ones are rejected
+    password_hash_workers: int = 2
+    password_hash_max_queue: int = 32
+
+    # Vector index (pgvector ANN) on langchain_pg_embedding.embedding
+    vector_index_type: Literal["hnsw", "ivfflat", "none"] = "hnsw"
+    vector_index_auto_create: bool = True
+    # Required by HNSW/IVFFlat; inferred from stored rows when unset
+    embedding_dimensions: int | None = None
+    hnsw_m: int = 16
+    hnsw_ef_construction: int = 64
+    # Search-time floors; each search raises them to its candidate count
+    hnsw_ef_search: int = 40
+    ivfflat_lists: int = 100
+    ivfflat_probes: int = 10
+    # Keep scanning the index until enough rows of the searched collection
+    # are found (pgvector >= 0.8; "off" for older versions)
+    vector_iterative_scan: Literal["off", "relaxed_order", "strict_order"] = "relaxed_order"
 
     @property
     def sqlalchemy_database_url(self) -> str:
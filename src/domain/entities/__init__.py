@@ -1,4 +1,28 @@
 """Domain entities."""
-from src.domain.entities.document import Document, DocumentChunk, SearchResult
+from src.domain.entities.document import (
+    BatchIngestResult,
+    BatchSearchResult,
+    BatchSyncResult,
+    CatalogEntry,
+    Document,
+    DocumentChunk,
+    DocumentRecord,
+    ScoredChunk,
+    SearchResult,
+    SyncResult,
+)
+from src.domain.entities.ingest_job import IngestJob
 
-__all__ = ["Document", "DocumentChunk", "SearchResult"]
+__all__ = [
+    "BatchIngestResult",
+    "BatchSearchResult",
+    "BatchSyncResult",
+    "CatalogEntry",
+    "Document",
+    "DocumentChunk",
+    "DocumentRecord",
+    "IngestJob",
+    "ScoredChunk",
+    "SearchResult",
+    "SyncResult",
+]
@@ -3,7 +3,8 @@ Domain entities module.
 Contains core business objects.
 """
 from dataclasses import dataclass, field
-from typing import Any
+from datetime import datetime
+from typing import Any, Sequence
 
 
 @dataclass
@@ -24,16 +25,47 @@ class DocumentChunk:
         return self.metadata.get("page")
 
 
+@dataclass
+class ScoredChunk(DocumentChunk):
+    """A retrieved chunk with its relevance to the query and its stored row id.
+
+    A DocumentChunk itself, so it goes wherever chunks go (prompt context,
+    result sources). The metadata dict is the one read from the row, never
+    copied.
+    """
+
+    # Cosine similarity to the query (1 - cosine distance); higher is closer.
+    score: float = 0.0
+    # Row id in the vector store.
+    id: str | None = None
+    # Stored embedding; only read when the search asked for vectors.
+    embedding: Sequence[float] | None = field(default=None, compare=False, repr=False)
+
+    @property
+    def distance(self) -> float:
+        """Cosine distance to the query, as pgvector's `<=>` reports it."""
+        return 1.0 - self.score
+
+    @classmethod
+    def from_chunk(cls, chunk: DocumentChunk, score: float, id: str | None = None) -> "ScoredChunk":
+        """Score an existing chunk, sharing its metadata dict."""
+        return cls(content=chunk.content, metadata=chunk.metadata, score=score, id=id)
+
+
 @dataclass
 class Document:
     """Represents a document with its chunks."""
     
     name: str
     chunks: list[DocumentChunk] = field(default_factory=list)
+    # Set by streaming ingestion, which stores chunks in batches instead of keeping them.
+    stored_chunks: int | None = None
     
     @property
     def chunk_count(self) -> int:
         """Get the number of chunks in this document."""
+        if self.stored_chunks is not None:
+            return self.stored_chunks
         return len(self.chunks)
 
 
@@ -44,3 +76,123 @@ class SearchResult:
     query: str
     answer: str
     sources: list[DocumentChunk] = field(default_factory=list)
+    # Seconds from question to first answer token; set by streamed searches only.
+    time_to_first_token: float | None = None
+    # Estimated prompt tokens context assembly saved for this answer.
+    context_tokens_saved: int = 0
+
+
+@dataclass
+class BatchSearchResult:
+    """Results of a batch of questions, in input order."""
+
+    # None where the question failed; its message is in `errors` under the same index.
+    results: list[SearchResult | None] = field(default_factory=list)
+    errors: dict[int, str] = field(default_factory=dict)
+    elapsed_seconds: float = 0.0
+
+    @property
+    def questions_per_second(self) -> float:
+        """Aggregate throughput over the whole batch."""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return len(self.results) / self.elapsed_seconds
+
+
+@dataclass
+class BatchIngestResult:
+    """Results of ingesting several files, in input order."""
+
+    # None where the file failed; its message is in `errors` under the same index.
+    documents: list[Document | None] = field(default_factory=list)
+    errors: dict[int, str] = field(default_factory=dict)
+    elapsed_seconds: float = 0.0
+
+    @property
+    def chunk_count(self) -> int:
+        """Chunks stored across the files that succeeded."""
+        return sum(document.chunk_count for document in self.documents if document is not None)
+
+    @property
+    def files_per_second(self) -> float:
+        """Files processed (stored or failed) per second."""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return len(self.documents) / self.elapsed_seconds
+
+    @property
+    def chunks_per_second(self) -> float:
+        """Chunks stored per second."""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.chunk_count / self.elapsed_seconds
+
+
+@dataclass
+class DocumentRecord:
+    """Registry entry of an ingested document, used to re-ingest only what changed."""
+
+    source_file: str
+    # SHA-256 of the file bytes and the chunking settings.
+    file_hash: str
+    # chunk_hash metadata of every stored chunk, in document order.
+    chunk_hashes: list[str] = field(default_factory=list)
+    # Size of the ingested file.
+    size_bytes: int = 0
+
+
+@dataclass
+class CatalogEntry:
+    """One ingested document as listed by the catalog (without its chunk hashes)."""
+
+    source_file: str
+    chunk_count: int
+    size_bytes: int
+    file_hash: str
+    ingested_at: datetime | None = None
+
+
+@dataclass
+class SyncResult:
+    """Outcome of re-ingesting one document against its registry entry."""
+
+    name: str
+    # True when the file hash matched and nothing was parsed or embedded.
+    unchanged: bool = False
+    added: int = 0
+    removed: int = 0
+    chunk_count: int = 0
+
+
+@dataclass
+class BatchSyncResult:
+    """Results of syncing several files, in input order."""
+
+    # None where the file failed; its message is in `errors` under the same index.
+    results: list[SyncResult | None] = field(default_factory=list)
+    errors: dict[int, str] = field(default_factory=dict)
+    # Registered documents deleted because their file was not part of the sync.
+    pruned: list[str] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+
+    @property
+    def unchanged(self) -> int:
+        """Files skipped because their hash matched the registry."""
+        return sum(1 for result in self.results if result is not None and result.unchanged)
+
+    @property
+    def added(self) -> int:
+        """Chunks embedded and inserted."""
+        return sum(result.added for result in self.results if result is not None)
+
+    @property
+    def removed(self) -> int:
+        """Chunks deleted from changed documents."""
+        return sum(result.removed for result in self.results if result is not None)
+
+    @property
+    def files_per_second(self) -> float:
+        """Files processed (checked, updated or failed) per second."""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return len(self.results) / self.elapsed_seconds
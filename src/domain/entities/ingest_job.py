@@ -0,0 +1,30 @@
+"""
+Ingest job entity.
+A document queued for ingestion by a background worker.
+"""
+from dataclasses import dataclass
+
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+@dataclass
+class IngestJob:
+    """One file to ingest, with the progress reported by the worker running it."""
+
+    id: str
+    file_path: str
+    source_name: str
+    clear_existing: bool = False
+    status: str = QUEUED
+    chunks_stored: int = 0
+    attempts: int = 0
+    error: str | None = None
+
+    @property
+    def finished(self) -> bool:
+        """True once the job is done or has failed for good (no retry left)."""
+        return self.status in (DONE, FAILED)
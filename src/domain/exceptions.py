@@ -52,3 +52,8 @@ class InvalidUsernameError(DomainException):
 class WeakPasswordError(DomainException):
     """Raised when a password does not meet the strength policy."""
     pass
+
+
+class AuthBusyError(DomainException):
+    """Raised when password hashing is saturated and a login is rejected instead of queued."""
+    pass
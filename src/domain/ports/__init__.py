@@ -3,5 +3,9 @@ from src.domain.ports.embeddings import EmbeddingsPort
 from src.domain.ports.llm import LLMPort
 from src.domain.ports.repository import RepositoryPort
 from src.domain.ports.document_loader import DocumentLoaderPort
+from src.domain.ports.answer_cache import AnswerCachePort
+from src.domain.ports.ingest_job_queue import IngestJobQueuePort
+from src.domain.ports.document_registry import DocumentRegistryPort
 
-__all__ = ["EmbeddingsPort", "LLMPort", "RepositoryPort", "DocumentLoaderPort"]
+__all__ = ["EmbeddingsPort", "LLMPort", "RepositoryPort", "DocumentLoaderPort", "AnswerCachePort",
+           "IngestJobQueuePort", "DocumentRegistryPort"]
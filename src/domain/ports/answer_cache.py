@@ -0,0 +1,64 @@
+"""
+Answer cache port (interface).
+Defines the contract for caching generated answers to similar questions.
+"""
+import asyncio
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
+from src.domain.entities.document import SearchResult
+
+
+@dataclass
+class AnswerCacheStats:
+    """Counters used to tune an answer cache's similarity threshold."""
+
+    hits: int = 0
+    misses: int = 0
+    # Misses whose closest cached question scored just below the threshold.
+    near_misses: int = 0
+    stores: int = 0
+    invalidations: int = 0
+    entries: int = 0
+    threshold: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class AnswerCachePort(ABC):
+    """Abstract interface for a question -> answer cache."""
+
+    @abstractmethod
+    def lookup(
+        self, query: str, corpus_version: int, embedding: list[float] | None = None
+    ) -> SearchResult | None:
+        """Return a cached result for an equivalent question on the same corpus version.
+
+        `embedding` is the question's embedding when the caller already has
+        one; a cache that matches by embedding then skips computing it.
+        """
+
+    @abstractmethod
+    def store(
+        self,
+        query: str,
+        corpus_version: int,
+        result: SearchResult,
+        embedding: list[float] | None = None,
+    ) -> None:
+        """Cache the result generated for a question on a corpus version (see lookup for `embedding`)."""
+
+    @abstractmethod
+    def stats(self) -> AnswerCacheStats:
+        """Return a snapshot of the cache counters."""
+
+    async def alookup(self, query: str, corpus_version: int) -> SearchResult | None:
+        """Async variant of lookup (worker thread unless overridden)."""
+        return await asyncio.to_thread(self.lookup, query, corpus_version)
+
+    async def astore(self, query: str, corpus_version: int, result: SearchResult) -> None:
+        """Async variant of store (worker thread unless overridden)."""
+        await asyncio.to_thread(self.store, query, corpus_version, result)
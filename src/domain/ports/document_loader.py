@@ -3,6 +3,7 @@ Document loader port (interface).
 Defines the contract for loading documents from various file formats.
 """
 from abc import ABC, abstractmethod
+from typing import Iterator
 
 
 class DocumentLoaderPort(ABC):
@@ -24,6 +25,22 @@ class DocumentLoaderPort(ABC):
         """
         pass
 
+    def lazy_load(self, file_path: str, file_name: str | None = None) -> Iterator:
+        """
+        Load a document one part (page, row) at a time.
+
+        Yields the same objects as load, without holding all of them in
+        memory. Falls back to load unless the adapter overrides it.
+
+        Args:
+            file_path: Path to the document file on disk.
+            file_name: Original filename used to detect format.
+
+        Yields:
+            Loaded document objects.
+        """
+        yield from self.load(file_path, file_name=file_name)
+
     @abstractmethod
     def supported_extensions(self) -> set[str]:
         """
@@ -0,0 +1,43 @@
+"""
+Document registry port (interface).
+Defines the contract for tracking what was ingested, per document.
+
+It doubles as the catalog of the collection: one indexed row per document,
+so listing what was ingested never scans the embeddings.
+"""
+import asyncio
+from abc import ABC, abstractmethod
+
+from src.domain.entities.document import CatalogEntry, DocumentRecord
+
+
+class DocumentRegistryPort(ABC):
+    """Abstract interface for the registry of ingested documents and their chunk hashes."""
+
+    @abstractmethod
+    def get(self, source_file: str) -> DocumentRecord | None:
+        """Return the record of an ingested document, or None if it is not registered."""
+
+    @abstractmethod
+    def save(self, record: DocumentRecord) -> None:
+        """Insert or replace the record of a document."""
+
+    @abstractmethod
+    def delete(self, source_file: str) -> None:
+        """Forget a document (after its chunks were deleted)."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Forget every document of the live collection (after it was replaced)."""
+
+    @abstractmethod
+    def sources(self) -> list[str]:
+        """Return the names of all registered documents."""
+
+    @abstractmethod
+    def list_documents(self) -> list[CatalogEntry]:
+        """Return the catalog entry of every registered document, by name."""
+
+    async def alist_documents(self) -> list[CatalogEntry]:
+        """Async variant of list_documents (worker thread unless overridden)."""
+        return await asyncio.to_thread(self.list_documents)
@@ -2,6 +2,7 @@
 Embeddings port (interface).
 Defines the contract for embedding providers.
 """
+import asyncio
 from abc import ABC, abstractmethod
 from typing import List
 
@@ -35,6 +36,34 @@ class EmbeddingsPort(ABC):
         """
         pass
     
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate query embeddings for a batch of questions.
+        Calls embed_query per text unless the adapter overrides it with a
+        single batched provider request.
+        
+        Args:
+            texts: Query texts to embed.
+            
+        Returns:
+            Embedding vectors, in input order.
+        """
+        return [self.embed_query(text) for text in texts]
+    
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Async variant of embed_documents.
+        Runs the sync method in a worker thread unless the adapter overrides it.
+        """
+        return await asyncio.to_thread(self.embed_documents, texts)
+    
+    async def aembed_query(self, text: str) -> List[float]:
+        """
+        Async variant of embed_query.
+        Runs the sync method in a worker thread unless the adapter overrides it.
+        """
+        return await asyncio.to_thread(self.embed_query, text)
+    
     @abstractmethod
     def get_langchain_embeddings(self):
         """
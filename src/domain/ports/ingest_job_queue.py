@@ -0,0 +1,66 @@
+"""
+Ingest job queue port (interface).
+Defines the contract for the queue background ingestion workers consume.
+"""
+import asyncio
+from abc import ABC, abstractmethod
+
+from src.domain.entities.ingest_job import IngestJob
+
+
+class IngestJobQueuePort(ABC):
+    """Abstract interface for a durable queue of ingestion jobs."""
+
+    @abstractmethod
+    def enqueue(
+        self,
+        file_path: str,
+        source_name: str,
+        clear_existing: bool = False,
+        after: str | None = None,
+    ) -> IngestJob:
+        """Queue a file; with `after`, the job is not claimed before that job has finished."""
+
+    @abstractmethod
+    def claim(self, worker: str) -> IngestJob | None:
+        """Atomically take the oldest runnable job for `worker`, or None if there is none.
+
+        Concurrent workers never receive the same job. A running job whose
+        worker went silent is runnable again until its attempts run out.
+        """
+
+    @abstractmethod
+    def report_progress(self, job_id: str, worker: str, chunks_stored: int) -> bool:
+        """Record progress on a running job (also its liveness heartbeat).
+
+        Returns False, recording nothing, if `worker` no longer holds the job
+        (it was reclaimed as stale).
+        """
+
+    @abstractmethod
+    def complete(self, job_id: str, worker: str, chunks_stored: int) -> bool:
+        """Mark a running job done; False, changing nothing, if `worker` no longer holds it."""
+
+    @abstractmethod
+    def fail(self, job_id: str, worker: str, error: str, retry: bool = True) -> IngestJob | None:
+        """Record a failed attempt: the job is queued again while attempts remain
+        (and retry is True), otherwise it is marked failed. Returns the updated
+        job, or None if `worker` no longer holds it."""
+
+    @abstractmethod
+    def get(self, job_id: str) -> IngestJob | None:
+        """Return the job with the given id, or None."""
+
+    async def aenqueue(
+        self,
+        file_path: str,
+        source_name: str,
+        clear_existing: bool = False,
+        after: str | None = None,
+    ) -> IngestJob:
+        """Async enqueue; the default runs the sync method in a worker thread."""
+        return await asyncio.to_thread(self.enqueue, file_path, source_name, clear_existing, after)
+
+    async def aget(self, job_id: str) -> IngestJob | None:
+        """Async get; the default runs the sync method in a worker thread."""
+        return await asyncio.to_thread(self.get, job_id)
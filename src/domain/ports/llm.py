@@ -2,6 +2,7 @@
 LLM port (interface).
 Defines the contract for LLM providers.
 """
+import asyncio
 from abc import ABC, abstractmethod
 
 
@@ -21,6 +22,13 @@ class LLMPort(ABC):
         """
         pass
     
+    async def agenerate(self, prompt: str) -> str:
+        """
+        Async variant of generate.
+        Runs the sync method in a worker thread unless the adapter overrides it.
+        """
+        return await asyncio.to_thread(self.generate, prompt)
+    
     @abstractmethod
     def get_langchain_llm(self):
         """
@@ -2,6 +2,7 @@
 Password hasher port (interface).
 Defines the contract for hashing and verifying passwords.
 """
+import asyncio
 from abc import ABC, abstractmethod
 
 
@@ -15,3 +16,11 @@ class PasswordHasherPort(ABC):
     @abstractmethod
     def verify(self, password: str, hashed: str) -> bool:
         """Return True if the password matches the stored hash."""
+
+    async def ahash(self, password: str) -> str:
+        """Async hash; the default runs the sync method in a worker thread."""
+        return await asyncio.to_thread(self.hash, password)
+
+    async def averify(self, password: str, hashed: str) -> bool:
+        """Async verify; the default runs the sync method in a worker thread."""
+        return await asyncio.to_thread(self.verify, password, hashed)
@@ -2,10 +2,11 @@
 Repository port (interface).
 Defines the contract for document storage.
 """
+import asyncio
 from abc import ABC, abstractmethod
 from typing import List, Optional
 
-from src.domain.entities.document import DocumentChunk
+from src.domain.entities.document import DocumentChunk, ScoredChunk
 
 
 class RepositoryPort(ABC):
@@ -15,7 +16,9 @@ class RepositoryPort(ABC):
     def add_documents(
         self, 
         chunks: List[DocumentChunk], 
-        clear_existing: bool = False
+        clear_existing: bool = False,
+        collection: Optional[str] = None,
+        embeddings: Optional[List[List[float]]] = None,
     ) -> int:
         """
         Add document chunks to the repository.
@@ -23,6 +26,10 @@ class RepositoryPort(ABC):
         Args:
             chunks: List of document chunks to add.
             clear_existing: If True, clear existing documents first.
+            collection: Shadow collection from begin_rebuild to write into
+                instead of the live one.
+            embeddings: The chunks' embeddings, in order, when the caller
+                computed them already; the repository then only inserts.
             
         Returns:
             Number of chunks added.
@@ -43,6 +50,60 @@ class RepositoryPort(ABC):
         """
         pass
     
+    def search_many(
+        self,
+        queries: List[str],
+        k: int = 10,
+        query_embeddings: Optional[List[List[float]]] = None,
+    ) -> List[List[DocumentChunk]]:
+        """
+        Search for each of a batch of queries.
+
+        Runs search per query unless the adapter overrides it with batched
+        embedding and retrieval.
+
+        Args:
+            queries: Search queries.
+            k: Number of results per query.
+            query_embeddings: The queries' embeddings, when the caller already
+                has them; adapters that embed queries themselves skip that call.
+
+        Returns:
+            One list of matching chunks per query, in input order.
+        """
+        return [self.search(query, k) for query in queries]
+
+    @abstractmethod
+    def search_with_scores(
+        self, query: str, k: int = 10, include_vectors: bool = False
+    ) -> List[ScoredChunk]:
+        """
+        Search like `search`, with each chunk's relevance and stored row id.
+
+        The score is the cosine similarity of the chunk to the query
+        (1 - cosine distance): higher is closer, 1.0 is identical.
+        ScoredChunk.distance gives the cosine distance.
+
+        Args:
+            query: Search query.
+            k: Number of results to return.
+            include_vectors: Also return each chunk's stored embedding.
+
+        Returns:
+            ScoredChunks, in the same order as `search`.
+        """
+        pass
+
+    def search_many_with_scores(
+        self,
+        queries: List[str],
+        k: int = 10,
+        include_vectors: bool = False,
+        query_embeddings: Optional[List[List[float]]] = None,
+    ) -> List[List[ScoredChunk]]:
+        """search_many with scores; runs search_with_scores per query unless overridden."""
+        return [self.search_with_scores(query, k, include_vectors) for query in queries]
+
     @abstractmethod
     def delete_by_source(self, source_file: str) -> int:
         """
@@ -56,6 +117,73 @@ class RepositoryPort(ABC):
         """
         pass
     
+    @abstractmethod
+    def delete_chunks(self, source_file: str, chunk_hashes: List[str]) -> int:
+        """
+        Delete specific chunks of a source file.
+
+        Chunks are identified by the `chunk_hash` metadata ingestion tags them
+        with. Used by incremental re-ingestion and to discard the chunks of a
+        failed ingestion.
+
+        Args:
+            source_file: Name of the source file.
+            chunk_hashes: chunk_hash values of the chunks to delete.
+
+        Returns:
+            Number of chunks deleted.
+        """
+        pass
+
+    def begin_rebuild(self) -> Optional[str]:
+        """
+        Start a full rebuild in a new, empty shadow collection.
+
+        Write the documents with add_documents(..., collection=name) while
+        searches keep reading the live collection, then make it live with
+        publish_rebuild (or drop it with discard_rebuild). Adapters without
+        rebuild support keep this default, which returns None; callers then
+        replace the collection in place with clear_existing.
+
+        Returns:
+            Name of the shadow collection, or None.
+        """
+        return None
+
+    @abstractmethod
+    def publish_rebuild(self, collection: str) -> None:
+        """
+        Atomically make a shadow collection from begin_rebuild the live one.
+
+        The collection it replaces is kept for rollback_rebuild until the
+        next rebuild is published.
+
+        Args:
+            collection: Name returned by begin_rebuild.
+        """
+        pass
+
+    @abstractmethod
+    def discard_rebuild(self, collection: str) -> None:
+        """
+        Drop a shadow collection from begin_rebuild that will not be published.
+
+        Args:
+            collection: Name returned by begin_rebuild.
+        """
+        pass
+
+    @abstractmethod
+    def rollback_rebuild(self) -> Optional[str]:
+        """
+        Make the collection replaced by the last published rebuild live again.
+
+        Returns:
+            Name of the collection now live, or None if there is none to
+            roll back to.
+        """
+        pass
+
     @abstractmethod
     def get_retriever(self, k: int = 10):
         """
@@ -68,3 +196,47 @@ class RepositoryPort(ABC):
             LangChain Retriever instance.
         """
         pass
+
+    def corpus_version(self) -> int | None:
+        """
+        Get a counter that changes whenever the stored documents change.
+
+        Bumped by writes to the live collection and by publish_rebuild, so
+        caches of answers derived from the documents can detect staleness.
+
+        Returns:
+            Current version, or None if this repository does not track one
+            (callers must then treat derived caches as always stale).
+        """
+        return None
+
+    # Async variants. The defaults run the sync method in a worker thread;
+    # adapters with a native async driver override them.
+
+    async def aadd_documents(
+        self,
+        chunks: List[DocumentChunk],
+        clear_existing: bool = False,
+        collection: Optional[str] = None,
+        embeddings: Optional[List[List[float]]] = None,
+    ) -> int:
+        """Async variant of add_documents."""
+        return await asyncio.to_thread(self.add_documents, chunks, clear_existing, collection, embeddings)
+
+    async def asearch(self, query: str, k: int = 10) -> List[DocumentChunk]:
+        """Async variant of search."""
+        return await asyncio.to_thread(self.search, query, k)
+
+    async def asearch_with_scores(
+        self, query: str, k: int = 10, include_vectors: bool = False
+    ) -> List[ScoredChunk]:
+        """Async variant of search_with_scores."""
+        return await asyncio.to_thread(self.search_with_scores, query, k, include_vectors)
+
+    async def adelete_by_source(self, source_file: str) -> int:
+        """Async variant of delete_by_source."""
+        return await asyncio.to_thread(self.delete_by_source, source_file)
+
+    async def acorpus_version(self) -> int | None:
+        """Async variant of corpus_version."""
+        return await asyncio.to_thread(self.corpus_version)
@@ -2,6 +2,7 @@
 User repository port (interface).
 Defines the contract for user persistence.
 """
+import asyncio
 from abc import ABC, abstractmethod
 
 from src.domain.entities.user import User
@@ -17,3 +18,11 @@ class UserRepositoryPort(ABC):
     @abstractmethod
     def create(self, user: User) -> None:
         """Persist a new user. Implementations must be safe against identifier races."""
+
+    async def aget_by_identifier(self, identifier: str) -> User | None:
+        """Async get_by_identifier; the default runs the sync method in a worker thread."""
+        return await asyncio.to_thread(self.get_by_identifier, identifier)
+
+    async def acreate(self, user: User) -> None:
+        """Async create; the default runs the sync method in a worker thread."""
+        await asyncio.to_thread(self.create, user)
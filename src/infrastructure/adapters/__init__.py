@@ -1,16 +1,24 @@
 """Infrastructure adapters."""
 from src.infrastructure.adapters.openai_embeddings import OpenAIEmbeddingsAdapter
 from src.infrastructure.adapters.google_embeddings import GoogleEmbeddingsAdapter
+from src.infrastructure.adapters.cached_embeddings import CachedEmbeddings
 from src.infrastructure.adapters.openai_llm import OpenAILLMAdapter
 from src.infrastructure.adapters.google_llm import GoogleLLMAdapter
 from src.infrastructure.adapters.pgvector_repository import PGVectorRepository
+from src.infrastructure.adapters.psycopg_vector_repository import PsycopgVectorRepository
 from src.infrastructure.adapters.document_loader import MultiFormatDocumentLoader
+from src.infrastructure.adapters.semantic_answer_cache import InMemorySemanticAnswerCache
+from src.infrastructure.adapters.bounded_password_hasher import BoundedPasswordHasher
 
 __all__ = [
     "OpenAIEmbeddingsAdapter",
     "GoogleEmbeddingsAdapter",
+    "CachedEmbeddings",
     "OpenAILLMAdapter",
     "GoogleLLMAdapter",
     "PGVectorRepository",
+    "PsycopgVectorRepository",
     "MultiFormatDocumentLoader",
+    "InMemorySemanticAnswerCache",
+    "BoundedPasswordHasher",
 ]
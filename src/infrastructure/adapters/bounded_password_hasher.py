@@ -0,0 +1,147 @@
+"""
+Bounded password hasher.
+Decorates a PasswordHasherPort with a dedicated, size-capped process pool.
+
+Argon2 is CPU- and memory-hard by design. Run on the default thread pool,
+a login storm takes the threads that questions, uploads and deletes need.
+Here hashing gets its own `workers` processes. At most `max_queue` more
+calls may wait for a worker. Past that, new calls raise AuthBusyError at
+once, so Chainlit answers with a login error instead of holding the request
+open. stats() exposes the limits and the current queue depth.
+"""
+import asyncio
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable
+
+from src.domain.exceptions import AuthBusyError
+from src.domain.ports.password_hasher import PasswordHasherPort
+
+
+logger = logging.getLogger(__name__)
+
+# The wrapped hasher inside each worker process, installed by _init_worker.
+_worker_hasher: PasswordHasherPort | None = None
+
+
+def _init_worker(hasher: PasswordHasherPort) -> None:
+    global _worker_hasher
+    _worker_hasher = hasher
+
+
+def _hash(password: str) -> str:
+    return _worker_hasher.hash(password)
+
+
+def _verify(password: str, hashed: str) -> bool:
+    return _worker_hasher.verify(password, hashed)
+
+
+@dataclass
+class HashingStats:
+    """Limits and current load of a BoundedPasswordHasher."""
+
+    workers: int
+    max_queue: int
+    running: int = 0
+    queued: int = 0
+    peak_queued: int = 0
+    completed: int = 0
+    rejected: int = 0
+
+
+class BoundedPasswordHasher(PasswordHasherPort):
+    """PasswordHasherPort decorator running hash/verify on a bounded process pool."""
+
+    def __init__(
+        self,
+        inner: PasswordHasherPort,
+        workers: int = 2,
+        max_queue: int = 32,
+        executor_factory: Callable[[], Executor] | None = None,
+    ):
+        self._inner = inner
+        self._workers = max(1, workers)
+        self._max_queue = max(0, max_queue)
+        self._executor_factory = executor_factory or self._process_pool
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._stats = HashingStats(workers=self._workers, max_queue=self._max_queue)
+
+    def _process_pool(self) -> Executor:
+        # spawn, not fork: the parent holds DB pools and threads that must not
+        # be duplicated into the children.
+        return ProcessPoolExecutor(
+            max_workers=self._workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self._inner,),
+        )
+
+    def hash(self, password: str) -> str:
+        return self._submit(_hash, password).result()
+
+    def verify(self, password: str, hashed: str) -> bool:
+        return self._submit(_verify, password, hashed).result()
+
+    async def ahash(self, password: str) -> str:
+        return await asyncio.wrap_future(self._submit(_hash, password))
+
+    async def averify(self, password: str, hashed: str) -> bool:
+        return await asyncio.wrap_future(self._submit(_verify, password, hashed))
+
+    def stats(self) -> HashingStats:
+        """Snapshot of limits, running/queued calls and rejections."""
+        with self._lock:
+            return HashingStats(**vars(self._stats))
+
+    def close(self) -> None:
+        """Shut the worker processes down (a later call starts new ones)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, fn, *args) -> Future:
+        """Queue fn on the pool, or raise AuthBusyError when the queue is full."""
+        with self._lock:
+            if self._in_flight >= self._workers + self._max_queue:
+                self._stats.rejected += 1
+                logger.warning(
+                    "Password hashing saturated (%d running, %d queued); rejecting login",
+                    self._stats.running, self._stats.queued,
+                )
+                raise AuthBusyError("Too many logins in progress. Please try again in a moment.")
+            if self._executor is None:
+                self._executor = self._executor_factory()
+            self._in_flight += 1
+            self._update_load()
+            executor = self._executor
+
+        try:
+            future = executor.submit(fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, _future: Future) -> None:
+        self._release(completed=True)
+
+    def _release(self, completed: bool = False) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            if completed:
+                self._stats.completed += 1
+            self._update_load()
+
+    def _update_load(self) -> None:
+        """Derive running/queued from the in-flight count; caller holds the lock."""
+        self._stats.running = min(self._in_flight, self._workers)
+        self._stats.queued = self._in_flight - self._stats.running
+        self._stats.peak_queued = max(self._stats.peak_queued, self._stats.queued)
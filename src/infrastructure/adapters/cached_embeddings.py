@@ -0,0 +1,169 @@
+"""
+Query embedding cache.
+Decorates any EmbeddingsPort with an in-process LRU + TTL cache for embed_query.
+
+Repeated questions (and the fixed Chainlit starters) skip the embedding API
+entirely. Keys are normalized query text; vectors are stored as float32
+arrays, half the size of Python float lists. Document embeddings pass
+through to the wrapped port (PostgresEmbeddingCache caches those on disk).
+"""
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from src.domain.ports.embeddings import EmbeddingsPort
+from src.infrastructure.adapters.embeddings_bridge import PortEmbeddings
+
+
+def normalize_query(text: str) -> str:
+    """Canonical cache key: Unicode NFC with whitespace runs collapsed and trimmed."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+@dataclass
+class EmbeddingCacheStats:
+    """Counters and current size of a CachedEmbeddings instance."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class CachedEmbeddings(EmbeddingsPort):
+    """EmbeddingsPort decorator caching query vectors with LRU, TTL and byte limits."""
+
+    def __init__(
+        self,
+        inner: EmbeddingsPort,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: float | None = 3600,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._inner = inner
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._ttl = ttl_seconds
+        self._clock = clock
+        # key -> (expires_at, vector); ordered from least to most recently used
+        self._entries: OrderedDict[str, tuple[float, np.ndarray]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = EmbeddingCacheStats()
+        self._langchain = PortEmbeddings(self)
+
+    @property
+    def inner(self) -> EmbeddingsPort:
+        """The wrapped provider."""
+        return self._inner
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for documents (not cached)."""
+        return self._inner.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        """Return the cached vector for the normalized query, embedding it on a miss."""
+        key = normalize_query(text)
+        vector = self._get(key)
+        if vector is None:
+            # Computed outside the lock: a concurrent miss on the same key
+            # costs one extra API call, never a stalled request.
+            vector = np.asarray(self._inner.embed_query(key), dtype=np.float32)
+            self._put(key, vector)
+        return vector.tolist()
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Cached vectors for the hits; all misses embedded in one batched call."""
+        keys = [normalize_query(text) for text in texts]
+        vectors: dict[str, np.ndarray] = {}
+        misses: list[str] = []
+        for key in dict.fromkeys(keys):
+            vector = self._get(key)
+            if vector is None:
+                misses.append(key)
+            else:
+                vectors[key] = vector
+        if misses:
+            for key, embedding in zip(misses, self._inner.embed_queries(misses)):
+                vector = np.asarray(embedding, dtype=np.float32)
+                self._put(key, vector)
+                vectors[key] = vector
+        return [vectors[key].tolist() for key in keys]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for documents (not cached)."""
+        return await self._inner.aembed_documents(texts)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """Async embed_query: a hit never leaves the event loop."""
+        key = normalize_query(text)
+        vector = self._get(key)
+        if vector is None:
+            vector = np.asarray(await self._inner.aembed_query(key), dtype=np.float32)
+            self._put(key, vector)
+        return vector.tolist()
+
+    def get_langchain_embeddings(self) -> Embeddings:
+        """LangChain embeddings routed through this cache."""
+        return self._langchain
+
+    def stats(self) -> EmbeddingCacheStats:
+        """Snapshot of the hit/miss counters and current size."""
+        with self._lock:
+            return EmbeddingCacheStats(**vars(self._stats))
+
+    def clear(self) -> None:
+        """Drop every cached vector (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._stats.entries = 0
+            self._stats.bytes = 0
+
+    def _get(self, key: str) -> np.ndarray | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats.misses += 1
+                return None
+            expires_at, vector = entry
+            if expires_at <= self._clock():
+                self._remove(key)
+                self._stats.expirations += 1
+                self._stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return vector
+
+    def _put(self, key: str, vector: np.ndarray) -> None:
+        if vector.nbytes > self._max_bytes or self._max_entries <= 0:
+            return
+        expires_at = self._clock() + self._ttl if self._ttl else float("inf")
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires_at, vector)
+            self._stats.entries += 1
+            self._stats.bytes += vector.nbytes
+            while len(self._entries) > self._max_entries or self._stats.bytes > self._max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._stats.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        """Drop one entry; caller holds the lock."""
+        _, vector = self._entries.pop(key)
+        self._stats.entries -= 1
+        self._stats.bytes -= vector.nbytes
@@ -0,0 +1,115 @@
+"""
+Collection aliases for zero-downtime rebuilds.
+
+PG_VECTOR_COLLECTION_NAME is a logical name. When the `collection_alias`
+table has a row for it, searches, appends and deletes use the collection
+that row points at; otherwise the collection of that name, as before aliases
+existed. A full rebuild fills a fresh shadow collection while searches keep
+reading the live one, then one transaction repoints the alias: readers go
+from the complete old collection straight to the complete new one. The
+replaced collection stays as `previous` for rollback and is dropped by the
+next rebuild.
+
+The ANN index and the full-text column cover the whole embedding table, so
+shadow rows are indexed as they are inserted. Searches filter by collection
+after the index scan; see pgvector_queries for how they keep their depth.
+"""
+import uuid
+
+import psycopg
+
+
+ALIAS_TABLE = "collection_alias"
+
+COLLECTION_ALIAS_SCHEMA = f"""
+    CREATE TABLE IF NOT EXISTS {ALIAS_TABLE} (
+        alias VARCHAR PRIMARY KEY,
+        collection VARCHAR NOT NULL,
+        previous VARCHAR,
+        swapped_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    )
+"""
+
+# Physical collection name for a logical one. The parameter appears once, so
+# the fragment also fits statements with positional parameters.
+_RESOLVE = (
+    f"(SELECT coalesce(a.collection, n.name) FROM (SELECT CAST({{name}} AS VARCHAR) AS name) n "
+    f"LEFT JOIN {ALIAS_TABLE} a ON a.alias = n.name)"
+)
+
+_ANALYZE = "ANALYZE langchain_pg_embedding"
+
+_LOCK_ALIAS = f"SELECT collection, previous FROM {ALIAS_TABLE} WHERE alias = %s FOR UPDATE"
+
+_COLLECTION_EXISTS = "SELECT 1 FROM langchain_pg_collection WHERE name = %s"
+
+_SET_ALIAS = f"""
+    INSERT INTO {ALIAS_TABLE} (alias, collection, previous) VALUES (%s, %s, %s)
+    ON CONFLICT (alias) DO UPDATE SET
+        collection = EXCLUDED.collection,
+        previous = EXCLUDED.previous,
+        swapped_at = now()
+"""
+
+# SET expressions see the old row, so this swaps the two columns.
+_ROLLBACK = f"""
+    UPDATE {ALIAS_TABLE} SET collection = previous, previous = collection, swapped_at = now()
+    WHERE alias = %s
+      AND EXISTS (SELECT 1 FROM langchain_pg_collection WHERE name = {ALIAS_TABLE}.previous)
+    RETURNING collection
+"""
+
+# Never drops a collection an alias points at.
+_DROP_COLLECTION = f"""
+    DELETE FROM langchain_pg_collection
+    WHERE name = %s AND name NOT IN (SELECT collection FROM {ALIAS_TABLE})
+"""
+
+
+def resolve_collection_sql(name_param: str) -> str:
+    """SQL expression for the physical collection name behind the logical name
+    bound to name_param (e.g. `%s`, `%(collection)s` or `:name`)."""
+    return _RESOLVE.format(name=name_param)
+
+
+def collection_id_sql(name_param: str) -> str:
+    """Scalar subquery for the uuid of the collection behind a logical name."""
+    return f"(SELECT uuid FROM langchain_pg_collection WHERE name = {resolve_collection_sql(name_param)})"
+
+
+def shadow_collection_name(alias: str) -> str:
+    """A fresh physical collection name for a rebuild of alias."""
+    return f"{alias}__{uuid.uuid4().hex[:12]}"
+
+
+def swap_alias(conn: psycopg.Connection, alias: str, collection: str) -> str | None:
+    """
+    Point alias at collection in the caller's transaction.
+
+    The collection it replaces becomes `previous`. Returns the collection
+    that was `previous` until now (no longer reachable; the caller drops it
+    after committing), or None.
+    """
+    # Fresh planner statistics, so the first searches on the new rows get index plans.
+    conn.execute(_ANALYZE)
+    row = conn.execute(_LOCK_ALIAS, (alias,)).fetchone()
+    if row is not None:
+        current, stale = row
+    else:
+        # First swap: the live collection, if any, is the one named like the alias.
+        current = alias if conn.execute(_COLLECTION_EXISTS, (alias,)).fetchone() else None
+        stale = None
+    conn.execute(_SET_ALIAS, (alias, collection, current))
+    return stale if stale not in (collection, current) else None
+
+
+def rollback_alias(conn: psycopg.Connection, alias: str) -> str | None:
+    """Swap alias back to its previous collection; returns the now-live collection,
+    or None when there is nothing to roll back to."""
+    row = conn.execute(_ROLLBACK, (alias,)).fetchone()
+    return row[0] if row else None
+
+
+def drop_collection(conn: psycopg.Connection, collection: str) -> None:
+    """Delete a physical collection; its chunks go with it (ON DELETE CASCADE)."""
+    conn.execute(_DROP_COLLECTION, (collection,))
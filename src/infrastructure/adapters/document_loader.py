@@ -4,6 +4,7 @@ Implements DocumentLoaderPort for various file formats.
 """
 import json
 from pathlib import Path
+from typing import Iterator
 
 from langchain_community.document_loaders import (
     PyPDFLoader,
@@ -22,19 +23,32 @@ class MultiFormatDocumentLoader(DocumentLoaderPort):
     """Document loader supporting multiple file formats."""
 
     _LOADERS = {
-        "pdf": lambda path: PyPDFLoader(path).load(),
-        "txt": lambda path: TextLoader(path, autodetect_encoding=True).load(),
-        "csv": lambda path: CSVLoader(path).load(),
-        "html": lambda path: BSHTMLLoader(path).load(),
-        "htm": lambda path: BSHTMLLoader(path).load(),
-        "md": lambda path: TextLoader(path, autodetect_encoding=True).load(),
-        "docx": lambda path: Docx2txtLoader(path).load(),
+        "pdf": lambda path: PyPDFLoader(path),
+        "txt": lambda path: TextLoader(path, autodetect_encoding=True),
+        "csv": lambda path: CSVLoader(path),
+        "html": lambda path: BSHTMLLoader(path),
+        "htm": lambda path: BSHTMLLoader(path),
+        "md": lambda path: TextLoader(path, autodetect_encoding=True),
+        "docx": lambda path: Docx2txtLoader(path),
         "json": None,  # handled by _load_json
     }
 
     def load(self, file_path: str, file_name: str | None = None) -> list:
         """Load a document from file."""
-        ext_source = file_name or file_path
+        return list(self.lazy_load(file_path, file_name=file_name))
+
+    def lazy_load(self, file_path: str, file_name: str | None = None) -> Iterator[LangchainDocument]:
+        """Yield a document page by page (PDF) or row by row (CSV)."""
+        ext = self._extension(file_name or file_path)
+
+        if ext == "json":
+            yield from self._load_json(file_path)
+            return
+
+        yield from self._LOADERS[ext](file_path).lazy_load()
+
+    def _extension(self, ext_source: str) -> str:
+        """The file's loader key; raises UnsupportedFormatError for unknown extensions."""
         ext = Path(ext_source).suffix.lstrip(".").lower()
 
         if not ext or ext not in self._LOADERS:
@@ -42,11 +56,7 @@ class MultiFormatDocumentLoader(DocumentLoaderPort):
             raise UnsupportedFormatError(
                 f"Unsupported format '{Path(ext_source).suffix or '(none)'}'. Supported: {supported}"
             )
-
-        if ext == "json":
-            return self._load_json(file_path)
-
-        return self._LOADERS[ext](file_path)
+        return ext
 
     def supported_extensions(self) -> set[str]:
         """Return supported file extensions."""
@@ -0,0 +1,26 @@
+"""
+LangChain view of an EmbeddingsPort.
+
+PGVector embeds through the LangChain object returned by
+`get_langchain_embeddings()`. Decorators around a provider adapter (caches)
+return this bridge so those calls go through the decorator instead of
+straight to the provider.
+"""
+from typing import List
+
+from langchain_core.embeddings import Embeddings
+
+from src.domain.ports.embeddings import EmbeddingsPort
+
+
+class PortEmbeddings(Embeddings):
+    """LangChain Embeddings that delegates to an EmbeddingsPort."""
+
+    def __init__(self, port: EmbeddingsPort):
+        self._port = port
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._port.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._port.embed_query(text)
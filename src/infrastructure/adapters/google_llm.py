@@ -25,6 +25,11 @@ class GoogleLLMAdapter(LLMPort):
         response = self._llm.invoke(prompt)
         return response.content
     
+    async def agenerate(self, prompt: str) -> str:
+        """Generate response for prompt on the provider's async client."""
+        response = await self._llm.ainvoke(prompt)
+        return response.content
+    
     def get_langchain_llm(self) -> ChatGoogleGenerativeAI:
         """Get LangChain LLM object."""
         return self._llm
@@ -0,0 +1,72 @@
+"""
+Vectorized Maximal Marginal Relevance.
+
+Works on float32 matrices: candidates are normalized once, relevance is one
+matrix-vector product, and the redundancy of every candidate against the
+selected set is kept as a running maximum, so each selection step costs a
+single matvec instead of a Python loop over all candidates.
+"""
+import numpy as np
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def cosine_similarity(query: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+    """Cosine similarity of each candidate row to the query (1 - pgvector's `<=>`)."""
+    if candidates.ndim != 2 or candidates.shape[0] == 0:
+        return np.empty(0, dtype=np.float32)
+    query = np.asarray(query, dtype=np.float32)
+    query_norm = np.linalg.norm(query)
+    if query_norm:
+        query = query / query_norm
+    return _normalize_rows(np.asarray(candidates, dtype=np.float32)) @ query
+
+
+def maximal_marginal_relevance(
+    query: np.ndarray,
+    candidates: np.ndarray,
+    k: int,
+    lambda_mult: float = 0.5,
+) -> list[int]:
+    """
+    Select k candidates balancing relevance to the query and diversity.
+
+    Args:
+        query: Query embedding, shape (d,).
+        candidates: Candidate embeddings, shape (n, d).
+        k: Number of candidates to select.
+        lambda_mult: 1.0 ranks by relevance only, 0.0 by diversity only.
+
+    Returns:
+        Indices into `candidates`, in selection order.
+    """
+    n = candidates.shape[0] if candidates.ndim == 2 else 0
+    k = min(k, n)
+    if k <= 0:
+        return []
+
+    vectors = _normalize_rows(np.asarray(candidates, dtype=np.float32))
+    query = np.asarray(query, dtype=np.float32)
+    query_norm = np.linalg.norm(query)
+    if query_norm:
+        query = query / query_norm
+
+    relevance = vectors @ query
+    selected = [int(np.argmax(relevance))]
+    available = np.ones(n, dtype=bool)
+    available[selected[0]] = False
+    max_similarity = vectors @ vectors[selected[0]]
+
+    for _ in range(1, k):
+        scores = lambda_mult * relevance - (1 - lambda_mult) * max_similarity
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        np.maximum(max_similarity, vectors @ vectors[best], out=max_similarity)
+
+    return selected
@@ -28,6 +28,18 @@ class OpenAIEmbeddingsAdapter(EmbeddingsPort):
         """Generate embedding for a query."""
         return self._embeddings.embed_query(text)
     
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Embed a batch of queries in one request (OpenAI embeds queries and documents alike)."""
+        return self._embeddings.embed_documents(texts)
+    
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for documents on the provider's async client."""
+        return await self._embeddings.aembed_documents(texts)
+    
+    async def aembed_query(self, text: str) -> List[float]:
+        """Generate embedding for a query on the provider's async client."""
+        return await self._embeddings.aembed_query(text)
+    
     def get_langchain_embeddings(self) -> OpenAIEmbeddings:
         """Get LangChain embeddings object."""
         return self._embeddings
@@ -0,0 +1,419 @@
+"""
+pgvector ANN index management.
+
+`langchain_postgres.PGVector` creates `langchain_pg_embedding` without any
+vector index, so every search is a sequential scan over every collection.
+This module creates, inspects and rebuilds an HNSW or IVFFlat index on the
+`embedding` column using the parameters from Settings. It talks to Postgres
+through psycopg directly so it works with any RepositoryPort backed by the
+same tables, and from the `src/scripts/vector_index.py` CLI.
+
+For hybrid retrieval it also owns the full-text side: a `tsvector` column
+(Portuguese and English configs) kept current by a trigger, with a GIN
+index. It is set up online from the CLI, never on the request path: adding
+the nullable column is a catalog change, existing rows are filled in
+batches, and the index is built CONCURRENTLY.
+
+Per-document deletes and the document catalog filter on
+`cmetadata->>'source_file'`, which the JSONB GIN index cannot serve, so a
+btree expression index on (collection_id, source_file) is kept as well.
+"""
+import logging
+import math
+from dataclasses import dataclass
+
+import psycopg
+
+from src.config.settings import Settings, get_settings
+
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_TABLE = "langchain_pg_embedding"
+INDEX_NAME = "langchain_pg_embedding_embedding_ann_idx"
+TEXT_SEARCH_COLUMN = "document_tsv"
+TEXT_SEARCH_INDEX_NAME = "langchain_pg_embedding_document_tsv_idx"
+SOURCE_INDEX_NAME = "langchain_pg_embedding_source_file_idx"
+TEXT_SEARCH_FUNCTION = "langchain_pg_embedding_document_tsv"
+TEXT_SEARCH_TRIGGER = "langchain_pg_embedding_document_tsv_trg"
+
+_STATUS_SQL = """
+    SELECT i.indisvalid, am.amname, pg_get_indexdef(i.indexrelid), pg_relation_size(i.indexrelid)
+    FROM pg_class c
+    JOIN pg_index i ON i.indexrelid = c.oid
+    JOIN pg_am am ON am.oid = c.relam
+    WHERE c.relname = %s
+"""
+
+
+@dataclass
+class VectorIndexStatus:
+    """Snapshot of the ANN index as reported by the Postgres catalog."""
+
+    name: str
+    exists: bool
+    valid: bool = False
+    method: str | None = None
+    definition: str | None = None
+    size_bytes: int = 0
+    # Planner estimate (pg_class.reltuples); -1 until the table is analyzed.
+    table_rows: int = 0
+    dimensions: int | None = None
+
+
+def index_ddl(settings: Settings, name: str = INDEX_NAME, concurrently: bool = False) -> str | None:
+    """Build the CREATE INDEX statement for the configured index type (None when disabled)."""
+    if settings.vector_index_type == "hnsw":
+        params = f"m = {int(settings.hnsw_m)}, ef_construction = {int(settings.hnsw_ef_construction)}"
+    elif settings.vector_index_type == "ivfflat":
+        params = f"lists = {int(settings.ivfflat_lists)}"
+    else:
+        return None
+
+    return (
+        f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}IF NOT EXISTS {name} "
+        f"ON {EMBEDDING_TABLE} USING {settings.vector_index_type} "
+        f"(embedding vector_cosine_ops) WITH ({params})"
+    )
+
+
+def _tsvector_sql(document: str) -> str:
+    """Both configs are concatenated so Portuguese prose and English terms are
+    stemmed; exact tokens such as codes and names match under either one."""
+    return (
+        f"to_tsvector('portuguese', coalesce({document}, '')) || "
+        f"to_tsvector('english', coalesce({document}, ''))"
+    )
+
+
+def text_search_column_ddl() -> list[str]:
+    """Add the tsvector column and the trigger that fills it for new rows.
+
+    The column is nullable without a default, so adding it does not rewrite
+    the table; existing rows are filled by text_search_backfill_sql.
+    """
+    return [
+        f"ALTER TABLE {EMBEDDING_TABLE} ADD COLUMN IF NOT EXISTS {TEXT_SEARCH_COLUMN} tsvector",
+        f"CREATE OR REPLACE FUNCTION {TEXT_SEARCH_FUNCTION}() RETURNS trigger LANGUAGE plpgsql AS $$ "
+        f"BEGIN NEW.{TEXT_SEARCH_COLUMN} := {_tsvector_sql('NEW.document')}; RETURN NEW; END $$",
+        f"DROP TRIGGER IF EXISTS {TEXT_SEARCH_TRIGGER} ON {EMBEDDING_TABLE}",
+        f"CREATE TRIGGER {TEXT_SEARCH_TRIGGER} BEFORE INSERT OR UPDATE OF document ON {EMBEDDING_TABLE} "
+        f"FOR EACH ROW EXECUTE FUNCTION {TEXT_SEARCH_FUNCTION}()",
+    ]
+
+
+def text_search_backfill_sql() -> tuple[str, str]:
+    """(next batch bound, fill batch) for walking the table by primary key.
+
+    The first statement returns the last id of the next `limit` rows after
+    `after`; the second fills the rows up to it that have no tsvector yet.
+    """
+    bound = (
+        f"SELECT max(id) FROM (SELECT id FROM {EMBEDDING_TABLE} "
+        f"WHERE id > %(after)s ORDER BY id LIMIT %(limit)s) batch"
+    )
+    fill = (
+        f"UPDATE {EMBEDDING_TABLE} SET {TEXT_SEARCH_COLUMN} = {_tsvector_sql('document')} "
+        f"WHERE id > %(after)s AND id <= %(last)s AND {TEXT_SEARCH_COLUMN} IS NULL"
+    )
+    return bound, fill
+
+
+def text_search_index_ddl(concurrently: bool = True) -> str:
+    """CREATE INDEX for the GIN index hybrid search reads."""
+    return (
+        f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}IF NOT EXISTS {TEXT_SEARCH_INDEX_NAME} "
+        f"ON {EMBEDDING_TABLE} USING gin ({TEXT_SEARCH_COLUMN})"
+    )
+
+
+def source_index_ddl(concurrently: bool = False) -> str:
+    """CREATE INDEX for the per-document lookups (delete_by_source and friends)."""
+    return (
+        f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}IF NOT EXISTS {SOURCE_INDEX_NAME} "
+        f"ON {EMBEDDING_TABLE} (collection_id, (cmetadata->>'source_file'))"
+    )
+
+
+def search_connection_options(settings: Settings) -> str:
+    """libpq `options` that apply the search-time ANN knobs to every new connection.
+
+    Both index methods' GUCs are always sent so switching VECTOR_INDEX_TYPE
+    needs no other change; the ones for the unused method are simply ignored
+    by Postgres. The index covers every collection in the table (and a
+    rebuild keeps the previous one for rollback), so without an iterative
+    scan the collection filter can leave fewer rows than were asked for.
+    IVFFlat only has the relaxed order; the search queries re-sort either way.
+    """
+    options = (
+        f"-c hnsw.ef_search={int(settings.hnsw_ef_search)} "
+        f"-c ivfflat.probes={int(settings.ivfflat_probes)}"
+    )
+    if settings.vector_iterative_scan != "off":
+        options += (
+            f" -c hnsw.iterative_scan={settings.vector_iterative_scan}"
+            " -c ivfflat.iterative_scan=relaxed_order"
+        )
+    return options
+
+
+def scan_depth(settings: Settings, candidates: int) -> tuple[int, int]:
+    """
+    (hnsw.ef_search, ivfflat.probes) for a search that needs `candidates` rows.
+
+    An HNSW scan returns at most ef_search rows, so ef_search is raised to the
+    candidate count; probes grow by the same factor, capped at the list count.
+    HNSW_EF_SEARCH and IVFFLAT_PROBES are the floors.
+    """
+    ef_search = max(int(settings.hnsw_ef_search), candidates)
+    factor = ef_search / max(1, int(settings.hnsw_ef_search))
+    probes = min(
+        max(int(settings.ivfflat_lists), 1),
+        max(int(settings.ivfflat_probes), math.ceil(settings.ivfflat_probes * factor)),
+    )
+    return ef_search, probes
+
+
+class PGVectorIndexManager:
+    """Create, inspect and rebuild the ANN index on langchain_pg_embedding."""
+
+    def __init__(self, dsn: str | None = None, settings: Settings | None = None):
+        self._settings = settings or get_settings()
+        self._dsn = dsn or self._settings.database_url
+        self._source_index_ready = False
+
+    def _connect(self) -> psycopg.Connection:
+        # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction block.
+        return psycopg.connect(self._dsn, autocommit=True)
+
+    def status(self) -> VectorIndexStatus:
+        """Report whether the index exists, is valid, and how large it is."""
+        with self._connect() as conn:
+            if not self._table_exists(conn):
+                return VectorIndexStatus(name=INDEX_NAME, exists=False)
+            row = conn.execute(_STATUS_SQL, (INDEX_NAME,)).fetchone()
+            table_rows = conn.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)",
+                (EMBEDDING_TABLE,),
+            ).fetchone()[0]
+            dimensions = self._column_dimensions(conn)
+
+        if row is None:
+            return VectorIndexStatus(
+                name=INDEX_NAME, exists=False, table_rows=table_rows, dimensions=dimensions
+            )
+        return VectorIndexStatus(
+            name=INDEX_NAME,
+            exists=True,
+            valid=row[0],
+            method=row[1],
+            definition=row[2],
+            size_bytes=row[3],
+            table_rows=table_rows,
+            dimensions=dimensions,
+        )
+
+    def ensure_index(self, concurrently: bool = False) -> bool:
+        """
+        Create the index if it does not exist yet.
+
+        Args:
+            concurrently: Build without blocking writes (slower, no transaction).
+
+        Returns:
+            True if an index was created, False if it already existed or
+            cannot be built yet (no table, or no rows to infer dimensions from).
+        """
+        ddl = index_ddl(self._settings, concurrently=concurrently)
+        if ddl is None:
+            return False
+
+        with self._connect() as conn:
+            if not self._table_exists(conn):
+                return False
+            row = conn.execute(_STATUS_SQL, (INDEX_NAME,)).fetchone()
+            if row is not None:
+                if not row[0]:
+                    logger.warning(
+                        "Vector index %s is INVALID (interrupted concurrent build); "
+                        "run `python3 src/scripts/vector_index.py rebuild`", INDEX_NAME
+                    )
+                return False
+            if self._ensure_typed_column(conn) is None:
+                return False
+            logger.info("Creating %s vector index %s", self._settings.vector_index_type, INDEX_NAME)
+            conn.execute(ddl)
+        return True
+
+    def text_search_ready(self) -> bool:
+        """Whether hybrid search can run: the GIN index exists and is valid,
+        which the setup only reaches after the column is filled."""
+        with self._connect() as conn:
+            row = conn.execute(_STATUS_SQL, (TEXT_SEARCH_INDEX_NAME,)).fetchone()
+        return row is not None and row[0]
+
+    def ensure_text_search(self, concurrently: bool = True, batch_size: int = 5000) -> bool:
+        """
+        Set up the tsvector column and GIN index used by hybrid retrieval.
+
+        Each step is skipped once done, so an interrupted run can simply be
+        repeated: the column and trigger are added (brief locks, no table
+        rewrite), rows without a tsvector are filled batch_size at a time in
+        their own transactions, then the index is built. A column created as
+        GENERATED by earlier versions is kept and needs no backfill.
+
+        Args:
+            concurrently: Build the index without blocking writes.
+            batch_size: Rows updated per backfill transaction.
+
+        Returns:
+            True if anything was created or filled, False if the setup was
+            complete or the embeddings table does not exist yet.
+        """
+        with self._connect() as conn:
+            if not self._table_exists(conn):
+                return False
+            column = conn.execute(
+                "SELECT attgenerated FROM pg_attribute "
+                "WHERE attrelid = to_regclass(%s) AND attname = %s AND NOT attisdropped",
+                (EMBEDDING_TABLE, TEXT_SEARCH_COLUMN),
+            ).fetchone()
+            has_trigger = conn.execute(
+                "SELECT 1 FROM pg_trigger WHERE tgrelid = to_regclass(%s) AND tgname = %s",
+                (EMBEDDING_TABLE, TEXT_SEARCH_TRIGGER),
+            ).fetchone() is not None
+            index = conn.execute(_STATUS_SQL, (TEXT_SEARCH_INDEX_NAME,)).fetchone()
+            generated = column is not None and column[0] == "s"
+            if column is not None and (generated or has_trigger) and index is not None and index[0]:
+                return False
+
+            if not generated:
+                if column is None or not has_trigger:
+                    logger.info("Adding full-text column %s", TEXT_SEARCH_COLUMN)
+                    with conn.transaction():
+                        for statement in text_search_column_ddl():
+                            conn.execute(statement)
+                filled = self._backfill_text_search(conn, max(1, batch_size))
+                logger.info("Filled %s for %d row(s)", TEXT_SEARCH_COLUMN, filled)
+
+            mode = "CONCURRENTLY " if concurrently else ""
+            if index is not None and not index[0]:
+                # Left INVALID by an interrupted concurrent build; IF NOT EXISTS would keep it.
+                conn.execute(f"DROP INDEX {mode}IF EXISTS {TEXT_SEARCH_INDEX_NAME}")
+            logger.info("Creating full-text index %s", TEXT_SEARCH_INDEX_NAME)
+            conn.execute(text_search_index_ddl(concurrently=concurrently))
+        return True
+
+    @staticmethod
+    def _backfill_text_search(conn: psycopg.Connection, batch_size: int) -> int:
+        """Fill the tsvector of existing rows in primary-key order, one
+        autocommitted batch at a time, so no lock is held for long."""
+        bound, fill = text_search_backfill_sql()
+        after, filled = "", 0
+        while True:
+            last = conn.execute(bound, {"after": after, "limit": batch_size}).fetchone()[0]
+            if last is None:
+                return filled
+            filled += conn.execute(fill, {"after": after, "last": last}).rowcount
+            after = last
+
+    def ensure_source_index(self, concurrently: bool = False) -> bool:
+        """
+        Create the (collection_id, source_file) index if it does not exist yet.
+
+        Unlike the ANN index it needs no rows, so it is created as soon as
+        the embeddings table exists. Once seen, later calls skip the lookup.
+
+        Returns:
+            True if the index was created, False if it already existed or
+            the embeddings table does not exist yet.
+        """
+        if self._source_index_ready:
+            return False
+        with self._connect() as conn:
+            if not self._table_exists(conn):
+                return False
+            exists = conn.execute(
+                "SELECT to_regclass(%s) AS source_index", (SOURCE_INDEX_NAME,)
+            ).fetchone()[0] is not None
+            if not exists:
+                logger.info("Creating source file index %s", SOURCE_INDEX_NAME)
+                conn.execute(source_index_ddl(concurrently=concurrently))
+        self._source_index_ready = True
+        return not exists
+
+    def rebuild(self, concurrently: bool = True) -> None:
+        """
+        Rebuild the index with the current settings.
+
+        The replacement is built next to the live index and swapped in by
+        renaming, so searches keep using the old index until the new one is
+        ready. With concurrently=True neither searches nor inserts are blocked.
+
+        Raises:
+            ValueError: If VECTOR_INDEX_TYPE is "none".
+            RuntimeError: If the embeddings table is missing or empty.
+        """
+        new_name = f"{INDEX_NAME}_new"
+        old_name = f"{INDEX_NAME}_old"
+        ddl = index_ddl(self._settings, name=new_name, concurrently=concurrently)
+        if ddl is None:
+            raise ValueError("VECTOR_INDEX_TYPE is 'none'; nothing to rebuild")
+
+        mode = "CONCURRENTLY " if concurrently else ""
+        with self._connect() as conn:
+            if not self._table_exists(conn) or self._ensure_typed_column(conn) is None:
+                raise RuntimeError(
+                    f"{EMBEDDING_TABLE} is missing or empty; ingest a document first"
+                )
+            # Leftovers from an interrupted rebuild would make IF NOT EXISTS a no-op.
+            conn.execute(f"DROP INDEX {mode}IF EXISTS {new_name}")
+            conn.execute(f"DROP INDEX {mode}IF EXISTS {old_name}")
+
+            logger.info("Building %s (%s)", new_name, self._settings.vector_index_type)
+            conn.execute(ddl)
+
+            with conn.transaction():
+                conn.execute(f"ALTER INDEX IF EXISTS {INDEX_NAME} RENAME TO {old_name}")
+                conn.execute(f"ALTER INDEX {new_name} RENAME TO {INDEX_NAME}")
+            conn.execute(f"DROP INDEX {mode}IF EXISTS {old_name}")
+
+    @staticmethod
+    def _table_exists(conn: psycopg.Connection) -> bool:
+        return conn.execute("SELECT to_regclass(%s) IS NOT NULL", (EMBEDDING_TABLE,)).fetchone()[0]
+
+    @staticmethod
+    def _column_dimensions(conn: psycopg.Connection) -> int | None:
+        """Declared dimensions of the embedding column (pgvector stores them as the typmod)."""
+        row = conn.execute(
+            "SELECT atttypmod FROM pg_attribute "
+            "WHERE attrelid = to_regclass(%s) AND attname = 'embedding'",
+            (EMBEDDING_TABLE,),
+        ).fetchone()
+        return row[0] if row and row[0] > 0 else None
+
+    def _ensure_typed_column(self, conn: psycopg.Connection) -> int | None:
+        """Pin `embedding` to vector(n); ANN indexes reject untyped vector columns.
+
+        LangChain creates the column as plain `vector` unless embedding_length
+        is given. The dimensions come from settings or from a stored row; all
+        rows must share them, so one table cannot mix embedding models.
+        """
+        dimensions = self._column_dimensions(conn)
+        if dimensions is not None:
+            return dimensions
+
+        dimensions = self._settings.embedding_dimensions
+        if dimensions is None:
+            row = conn.execute(
+                f"SELECT vector_dims(embedding) FROM {EMBEDDING_TABLE} LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            dimensions = row[0]
+
+        logger.info("Typing %s.embedding as vector(%d)", EMBEDDING_TABLE, dimensions)
+        conn.execute(
+            f"ALTER TABLE {EMBEDDING_TABLE} ALTER COLUMN embedding TYPE vector({int(dimensions)})"
+        )
+        return dimensions
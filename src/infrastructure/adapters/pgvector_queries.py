@@ -0,0 +1,524 @@
+"""
+Shared pgvector queries for the repository adapters.
+
+Candidate rows are read over a binary cursor with the pgvector adapters
+registered, so embeddings arrive as float32 NumPy arrays instead of being
+parsed from their text representation.
+
+Hybrid retrieval runs the ANN and full-text candidate queries as CTEs of a
+single statement and fuses them in SQL with reciprocal rank fusion (RRF):
+score = Σ 1 / (rrf_k + rank) over the lists a chunk appears in.
+
+Scored results are ScoredChunks carrying the row id and the cosine
+similarity to the query (1 - cosine distance) in every retrieval mode, so a
+relevance floor means the same thing whether the chunks were picked by MMR
+or by fusion. Every candidate query already returns what scoring needs: the
+MMR candidates come with their vectors, and the fused statement computes the
+similarity of its k rows (and returns their vectors only when asked).
+
+With ADAPTIVE_K, k is an upper bound: the similarity curve is cut at its
+largest drop (score_gap_cutoff). MMR cuts the curve of its fetch_k
+candidates, so an early drop among them means fewer picks; hybrid search
+cuts the curve of its k fused rows.
+
+Collections are addressed by their logical name and resolved through
+collection_alias in the same statement, so a rebuild's alias swap costs
+searches no extra round trip.
+
+The ANN index covers every collection in the table, including the one a
+rebuild keeps for rollback, and the collection filter runs on the rows the
+index scan returns. Before each ANN query the scan depth (hnsw.ef_search,
+ivfflat.probes) is raised for the transaction to the number of candidates
+asked for, and with VECTOR_ITERATIVE_SCAN the scan goes on until enough rows
+of the searched collection are found. Relaxed-order scans may return rows
+slightly out of order, so every candidate query sorts its rows again.
+
+Both repositories bulk-load chunks with binary COPY (copy_chunks) and take
+precomputed embeddings, so a caller can embed the next batch while the
+previous one is being inserted.
+
+The corpus version is a per-collection counter bumped by every write, so
+caches of answers derived from the collection can tell when they are stale
+— including writes made by another process (CLI ingestion, workers).
+"""
+import uuid
+from dataclasses import dataclass, field
+
+import numpy as np
+import psycopg
+from pgvector.psycopg import register_vector
+from psycopg.types.json import Jsonb
+
+from src.config.settings import Settings
+from src.domain.entities.document import DocumentChunk, ScoredChunk
+from src.infrastructure.adapters.collection_alias import collection_id_sql, resolve_collection_sql
+from src.infrastructure.adapters.pgvector_index import scan_depth
+from src.infrastructure.adapters.mmr import cosine_similarity, maximal_marginal_relevance
+
+
+SEARCH_CANDIDATES_SQL = f"""
+    WITH candidates AS MATERIALIZED (
+        SELECT document, cmetadata, embedding, id, embedding <=> %(embedding)s AS distance
+        FROM langchain_pg_embedding
+        WHERE collection_id = {collection_id_sql("%(collection)s")}
+        ORDER BY distance
+        LIMIT %(fetch_k)s
+    )
+    SELECT document, cmetadata, embedding, id FROM candidates ORDER BY distance
+"""
+
+# One round trip for a batch of questions: the query vectors travel as one
+# vector[] and each runs its own index-backed ANN search in a LATERAL join.
+SEARCH_CANDIDATES_MANY_SQL = f"""
+    SELECT q.ord, c.document, c.cmetadata, c.embedding, c.id
+    FROM unnest(%(embeddings)s::vector[]) WITH ORDINALITY AS q(embedding, ord)
+    CROSS JOIN LATERAL (
+        SELECT e.document, e.cmetadata, e.embedding, e.id, e.embedding <=> q.embedding AS distance
+        FROM langchain_pg_embedding e
+        WHERE e.collection_id = {collection_id_sql("%(collection)s")}
+        ORDER BY e.embedding <=> q.embedding
+        LIMIT %(fetch_k)s
+    ) c
+    ORDER BY q.ord, c.distance
+"""
+
+# Query terms are OR-ed (plainto_tsquery ANDs them, which is too strict for
+# questions); ts_rank_cd still ranks chunks matching more terms first.
+HYBRID_SEARCH_SQL = f"""
+    WITH params AS (
+        SELECT
+            {collection_id_sql("%(collection)s")} AS collection_id,
+            replace(plainto_tsquery('portuguese', %(query)s)::text, ' & ', ' | ')::tsquery
+            || replace(plainto_tsquery('english', %(query)s)::text, ' & ', ' | ')::tsquery AS tsq
+    ),
+    vector_hits AS (
+        SELECT id, row_number() OVER (ORDER BY distance) AS rank
+        FROM (
+            SELECT e.id, e.embedding <=> %(embedding)s AS distance
+            FROM langchain_pg_embedding e, params p
+            WHERE e.collection_id = p.collection_id
+            ORDER BY e.embedding <=> %(embedding)s
+            LIMIT %(candidates)s
+        ) v
+    ),
+    text_hits AS (
+        SELECT id, row_number() OVER (ORDER BY score DESC) AS rank
+        FROM (
+            SELECT e.id, ts_rank_cd(e.document_tsv, p.tsq) AS score
+            FROM langchain_pg_embedding e, params p
+            WHERE e.collection_id = p.collection_id AND e.document_tsv @@ p.tsq
+            ORDER BY score DESC
+            LIMIT %(candidates)s
+        ) t
+    ),
+    fused AS (
+        SELECT coalesce(v.id, t.id) AS id,
+               coalesce(1.0 / (%(rrf_k)s + v.rank), 0) + coalesce(1.0 / (%(rrf_k)s + t.rank), 0) AS score
+        FROM vector_hits v
+        FULL OUTER JOIN text_hits t ON t.id = v.id
+    )
+    SELECT e.document, e.cmetadata, f.score, 1 - (e.embedding <=> %(embedding)s) AS similarity, e.id,
+           CASE WHEN %(include_vectors)s THEN e.embedding END AS embedding
+    FROM fused f
+    JOIN langchain_pg_embedding e ON e.id = f.id
+    ORDER BY f.score DESC
+    LIMIT %(k)s
+"""
+
+CORPUS_VERSION_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS corpus_version (
+        collection_name VARCHAR PRIMARY KEY,
+        version BIGINT NOT NULL
+    )
+"""
+
+# Takes a logical name: appends land in the collection the alias points at.
+GET_OR_CREATE_COLLECTION_SQL = f"""
+    INSERT INTO langchain_pg_collection (uuid, name)
+    VALUES (%s, {resolve_collection_sql("%s")})
+    ON CONFLICT (name) DO UPDATE SET name = EXCLUDED.name
+    RETURNING uuid
+"""
+
+_COPY_EMBEDDINGS = (
+    "COPY langchain_pg_embedding (id, collection_id, embedding, document, cmetadata) "
+    "FROM STDIN WITH (FORMAT BINARY)"
+)
+
+_COPY_TYPES = ["varchar", "uuid", "vector", "varchar", "jsonb"]
+
+_BUMP_CORPUS_VERSION = """
+    INSERT INTO corpus_version (collection_name, version) VALUES (%s, 1)
+    ON CONFLICT (collection_name) DO UPDATE SET version = corpus_version.version + 1
+    RETURNING version
+"""
+
+_READ_CORPUS_VERSION = "SELECT version FROM corpus_version WHERE collection_name = %s"
+
+# Transaction-local, so pooled connections keep their configured floors.
+_SET_SCAN_DEPTH = """
+    SELECT set_config('hnsw.ef_search', %s, true), set_config('ivfflat.probes', %s, true)
+"""
+
+
+@dataclass
+class Candidates:
+    """Nearest-neighbour rows for one query, with embeddings stacked as float32."""
+
+    documents: list[str] = field(default_factory=list)
+    metadatas: list[dict] = field(default_factory=list)
+    vectors: np.ndarray = field(default_factory=lambda: np.empty((0, 0), dtype=np.float32))
+    ids: list[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def select(
+        self, settings: Settings, query_vector: np.ndarray, k: int, include_vectors: bool = False
+    ) -> list[ScoredChunk]:
+        """The chunks for one question: MMR with MMR_LAMBDA, over up to k picks
+        (fewer with ADAPTIVE_K when the candidates' similarity curve drops early)."""
+        if settings.adaptive_k and self.documents:
+            k = score_gap_cutoff(
+                cosine_similarity(query_vector, self.vectors),
+                settings.adaptive_k_min,
+                k,
+                settings.adaptive_k_min_gap,
+            )
+        return self.select_mmr_scored(query_vector, k, settings.mmr_lambda, include_vectors)
+
+    def select_mmr(self, query_vector: np.ndarray, k: int, lambda_mult: float) -> list[DocumentChunk]:
+        """Pick k chunks by MMR, in the order MMR selected them (LangChain's MMR search order)."""
+        return self.select_mmr_scored(query_vector, k, lambda_mult)
+
+    def select_mmr_scored(
+        self, query_vector: np.ndarray, k: int, lambda_mult: float, include_vectors: bool = False
+    ) -> list[ScoredChunk]:
+        """select_mmr as ScoredChunks: cosine similarity, row id and, on request, the vector.
+
+        The selection order is kept: the first chunk is the most similar one,
+        each next one the best trade-off against those already picked.
+        """
+        selected = maximal_marginal_relevance(query_vector, self.vectors, k=k, lambda_mult=lambda_mult)
+        if not selected:
+            return []
+        similarities = cosine_similarity(query_vector, self.vectors[selected])
+        return [
+            ScoredChunk(
+                content=self.documents[i],
+                metadata=self.metadatas[i],
+                score=float(similarity),
+                id=self.ids[i] if self.ids else None,
+                # A copy, so the chunk does not keep every candidate's vector alive.
+                embedding=self.vectors[i].copy() if include_vectors else None,
+            )
+            for i, similarity in zip(selected, similarities)
+        ]
+
+
+def resolve_fetch_k(settings: Settings, k: int) -> int:
+    """Number of MMR candidates to fetch: MMR_FETCH_K, or 3 × k when unset (never below k)."""
+    return max(settings.mmr_fetch_k or k * 3, k)
+
+
+def resolve_hybrid_candidates(settings: Settings, k: int) -> int:
+    """Candidates per side before fusion: HYBRID_CANDIDATES, or 3 × k when unset (never below k)."""
+    return max(settings.hybrid_candidates or k * 3, k)
+
+
+def score_gap_cutoff(similarities: np.ndarray, min_k: int, max_k: int, min_gap: float) -> int:
+    """
+    How many chunks to keep from a similarity curve sorted best first.
+
+    Cuts at the largest drop between consecutive similarities that still
+    keeps min_k chunks. A flat curve (no drop of at least min_gap) or a drop
+    past max_k keeps max_k. Never more chunks than similarities.
+    """
+    max_k = min(max_k, len(similarities))
+    min_k = max(1, min(min_k, max_k))
+    drops = similarities[min_k - 1:-1] - similarities[min_k:]
+    if drops.size == 0:
+        return max_k
+    best = int(np.argmax(drops))
+    if drops[best] < min_gap:
+        return max_k
+    return min(min_k + best, max_k)
+
+
+def trim_adaptive(settings: Settings, scored: list[ScoredChunk], k: int) -> list[ScoredChunk]:
+    """With ADAPTIVE_K, the chunks of scored above its similarity cut, in their
+    original (e.g. fused) order; otherwise scored unchanged."""
+    if not settings.adaptive_k or not scored:
+        return scored
+    similarities = np.sort(np.fromiter((chunk.score for chunk in scored), dtype=np.float32))[::-1]
+    keep = score_gap_cutoff(similarities, settings.adaptive_k_min, k, settings.adaptive_k_min_gap)
+    threshold = similarities[keep - 1]
+    return [chunk for chunk in scored if chunk.score >= threshold][:keep]
+
+
+def _candidate_params(collection_name: str, query_vector: np.ndarray, fetch_k: int) -> dict:
+    return {
+        "collection": collection_name,
+        "embedding": np.asarray(query_vector, dtype=np.float32),
+        "fetch_k": fetch_k,
+    }
+
+
+def _scan_depth_params(settings: Settings, candidates: int) -> tuple[str, str]:
+    return tuple(str(value) for value in scan_depth(settings, candidates))
+
+
+def _candidate_many_params(collection_name: str, query_vectors: np.ndarray, fetch_k: int) -> dict:
+    return {
+        "collection": collection_name,
+        "embeddings": [np.asarray(vector, dtype=np.float32) for vector in query_vectors],
+        "fetch_k": fetch_k,
+    }
+
+
+def _hybrid_params(
+    collection_name: str,
+    query: str,
+    query_vector: np.ndarray,
+    k: int,
+    candidates: int,
+    rrf_k: int,
+    include_vectors: bool = False,
+) -> dict:
+    return {
+        "collection": collection_name,
+        "query": query,
+        "embedding": np.asarray(query_vector, dtype=np.float32),
+        "candidates": candidates,
+        "rrf_k": rrf_k,
+        "k": k,
+        "include_vectors": include_vectors,
+    }
+
+
+def _candidates_from_rows(rows: list) -> Candidates:
+    if not rows:
+        return Candidates()
+    return Candidates(
+        documents=[row[0] for row in rows],
+        metadatas=[row[1] or {} for row in rows],
+        vectors=np.stack([row[2] for row in rows]).astype(np.float32, copy=False),
+        ids=[str(row[3]) for row in rows],
+    )
+
+
+def _candidates_by_query(rows: list, n_queries: int) -> list[Candidates]:
+    """Split (ord, document, cmetadata, embedding, id) rows into one Candidates per query (ord is 1-based)."""
+    grouped: list[list] = [[] for _ in range(n_queries)]
+    for ord_, *row in rows:
+        grouped[ord_ - 1].append(row)
+    return [_candidates_from_rows(group) for group in grouped]
+
+
+def _scored_chunks_from_rows(rows: list) -> list[ScoredChunk]:
+    """(document, cmetadata, rrf score, similarity, id, embedding) rows as ScoredChunks."""
+    return [
+        ScoredChunk(content=row[0], metadata=row[1] or {}, score=float(row[3]), id=str(row[4]), embedding=row[5])
+        for row in rows
+    ]
+
+
+def _copy_rows(chunks: list[DocumentChunk], vectors: list[list[float]], collection_id) -> list[tuple]:
+    return [
+        (
+            str(uuid.uuid4()),
+            collection_id,
+            np.asarray(vector, dtype=np.float32),
+            chunk.content,
+            Jsonb(chunk.metadata),
+        )
+        for chunk, vector in zip(chunks, vectors)
+    ]
+
+
+def copy_chunks(
+    conn: psycopg.Connection,
+    collection_name: str,
+    chunks: list[DocumentChunk],
+    vectors: list[list[float]],
+) -> None:
+    """Bulk-load embedded chunks with binary COPY in the caller's transaction.
+
+    The collection (a logical name, or a shadow's physical one) is created
+    when missing.
+    """
+    ensure_vector_registered(conn)
+    collection_id = conn.execute(
+        GET_OR_CREATE_COLLECTION_SQL, (uuid.uuid4(), collection_name)
+    ).fetchone()[0]
+    with conn.cursor() as cur:
+        with cur.copy(_COPY_EMBEDDINGS) as copy:
+            copy.set_types(_COPY_TYPES)
+            for row in _copy_rows(chunks, vectors, collection_id):
+                copy.write_row(row)
+
+
+def bump_corpus_version(conn: psycopg.Connection, collection_name: str) -> int:
+    """Increment the collection's corpus version in the caller's transaction; returns the new value."""
+    conn.execute(CORPUS_VERSION_SCHEMA)
+    return conn.execute(_BUMP_CORPUS_VERSION, (collection_name,)).fetchone()[0]
+
+
+def read_corpus_version(conn: psycopg.Connection, collection_name: str) -> int:
+    """Current corpus version of a collection (0 before its first write).
+
+    Expects CORPUS_VERSION_SCHEMA to have been applied on this database.
+    """
+    row = conn.execute(_READ_CORPUS_VERSION, (collection_name,), prepare=True).fetchone()
+    return row[0] if row else 0
+
+
+def ensure_vector_registered(conn: psycopg.Connection) -> None:
+    """Register the pgvector adapters once per connection."""
+    if conn.adapters.types.get("vector") is None:
+        register_vector(conn)
+
+
+def set_scan_depth(cur: psycopg.Cursor, settings: Settings, candidates: int) -> None:
+    """Raise the ANN scan depth to `candidates` rows for the cursor's transaction."""
+    cur.execute(_SET_SCAN_DEPTH, _scan_depth_params(settings, candidates), prepare=True)
+
+
+def fetch_candidates(
+    conn: psycopg.Connection,
+    collection_name: str,
+    query_vector: np.ndarray,
+    fetch_k: int,
+    settings: Settings,
+) -> Candidates:
+    """Fetch the fetch_k nearest chunks of a collection in one prepared, binary query."""
+    ensure_vector_registered(conn)
+    with conn.cursor(binary=True) as cur:
+        set_scan_depth(cur, settings, fetch_k)
+        cur.execute(
+            SEARCH_CANDIDATES_SQL,
+            _candidate_params(collection_name, query_vector, fetch_k),
+            prepare=True,
+        )
+        return _candidates_from_rows(cur.fetchall())
+
+
+def fetch_candidates_many(
+    conn: psycopg.Connection,
+    collection_name: str,
+    query_vectors: np.ndarray,
+    fetch_k: int,
+    settings: Settings,
+) -> list[Candidates]:
+    """Fetch the fetch_k nearest chunks for each query vector in one round trip, in input order."""
+    ensure_vector_registered(conn)
+    with conn.cursor(binary=True) as cur:
+        set_scan_depth(cur, settings, fetch_k)
+        cur.execute(
+            SEARCH_CANDIDATES_MANY_SQL,
+            _candidate_many_params(collection_name, query_vectors, fetch_k),
+            prepare=True,
+        )
+        return _candidates_by_query(cur.fetchall(), len(query_vectors))
+
+
+def fetch_hybrid(
+    conn: psycopg.Connection,
+    collection_name: str,
+    query: str,
+    query_vector: np.ndarray,
+    k: int,
+    candidates: int,
+    settings: Settings,
+    rrf_k: int = 60,
+    include_vectors: bool = False,
+) -> list[ScoredChunk]:
+    """Fuse ANN and full-text candidates with RRF in one round-trip; best k first,
+    scored by cosine similarity to the query."""
+    ensure_vector_registered(conn)
+    with conn.cursor(binary=True) as cur:
+        set_scan_depth(cur, settings, candidates)
+        cur.execute(
+            HYBRID_SEARCH_SQL,
+            _hybrid_params(collection_name, query, query_vector, k, candidates, rrf_k, include_vectors),
+            prepare=True,
+        )
+        return _scored_chunks_from_rows(cur.fetchall())
+
+
+# Async counterparts for psycopg.AsyncConnection (pooled connections from
+# postgres_pool.get_async_pool already have the vector type registered).
+
+async def acopy_chunks(
+    conn: psycopg.AsyncConnection,
+    collection_name: str,
+    chunks: list[DocumentChunk],
+    vectors: list[list[float]],
+) -> None:
+    """Async copy_chunks; the async pool registers the pgvector adapters."""
+    cur = await conn.execute(GET_OR_CREATE_COLLECTION_SQL, (uuid.uuid4(), collection_name))
+    collection_id = (await cur.fetchone())[0]
+    async with conn.cursor() as cur:
+        async with cur.copy(_COPY_EMBEDDINGS) as copy:
+            copy.set_types(_COPY_TYPES)
+            for row in _copy_rows(chunks, vectors, collection_id):
+                await copy.write_row(row)
+
+
+async def abump_corpus_version(conn: psycopg.AsyncConnection, collection_name: str) -> int:
+    """Async bump_corpus_version."""
+    await conn.execute(CORPUS_VERSION_SCHEMA)
+    cur = await conn.execute(_BUMP_CORPUS_VERSION, (collection_name,))
+    return (await cur.fetchone())[0]
+
+
+async def aread_corpus_version(conn: psycopg.AsyncConnection, collection_name: str) -> int:
+    """Async read_corpus_version."""
+    cur = await conn.execute(_READ_CORPUS_VERSION, (collection_name,), prepare=True)
+    row = await cur.fetchone()
+    return row[0] if row else 0
+
+
+async def aset_scan_depth(cur: psycopg.AsyncCursor, settings: Settings, candidates: int) -> None:
+    """Async set_scan_depth."""
+    await cur.execute(_SET_SCAN_DEPTH, _scan_depth_params(settings, candidates), prepare=True)
+
+
+async def afetch_candidates(
+    conn: psycopg.AsyncConnection,
+    collection_name: str,
+    query_vector: np.ndarray,
+    fetch_k: int,
+    settings: Settings,
+) -> Candidates:
+    """Async fetch_candidates."""
+    async with conn.cursor(binary=True) as cur:
+        await aset_scan_depth(cur, settings, fetch_k)
+        await cur.execute(
+            SEARCH_CANDIDATES_SQL,
+            _candidate_params(collection_name, query_vector, fetch_k),
+            prepare=True,
+        )
+        return _candidates_from_rows(await cur.fetchall())
+
+
+async def afetch_hybrid(
+    conn: psycopg.AsyncConnection,
+    collection_name: str,
+    query: str,
+    query_vector: np.ndarray,
+    k: int,
+    candidates: int,
+    settings: Settings,
+    rrf_k: int = 60,
+    include_vectors: bool = False,
+) -> list[ScoredChunk]:
+    """Async fetch_hybrid."""
+    async with conn.cursor(binary=True) as cur:
+        await aset_scan_depth(cur, settings, candidates)
+        await cur.execute(
+            HYBRID_SEARCH_SQL,
+            _hybrid_params(collection_name, query, query_vector, k, candidates, rrf_k, include_vectors),
+            prepare=True,
+        )
+        return _scored_chunks_from_rows(await cur.fetchall())
@@ -1,116 +1,444 @@
 """
 PGVector Repository adapter.
 Implements RepositoryPort for PostgreSQL with pgVector.
+
+LangChain's PGVector owns the engine and the tables; chunks are written with
+binary COPY on that engine's connections rather than through its ORM
+(aadd_documents / adelete_by_source keep the port's thread-backed
+defaults). asearch and acorpus_version run on the shared async psycopg pool.
+
+PG_VECTOR_COLLECTION_NAME is resolved through collection_alias: appends go
+to the collection it points at, and full rebuilds load a shadow collection
+and swap the alias, so searches never see a half-built collection.
 """
-from typing import List
+import logging
+import uuid
+from typing import List, Optional
 
-from langchain_core.documents import Document as LangchainDocument
+import numpy as np
 from langchain_postgres import PGVector
 from sqlalchemy import text
 
 from src.config.settings import get_settings
-from src.domain.entities.document import DocumentChunk
+from src.domain.entities.document import DocumentChunk, ScoredChunk
 from src.domain.ports.embeddings import EmbeddingsPort
 from src.domain.ports.repository import RepositoryPort
+from src.infrastructure.adapters.collection_alias import (
+    COLLECTION_ALIAS_SCHEMA,
+    collection_id_sql,
+    drop_collection,
+    rollback_alias,
+    shadow_collection_name,
+    swap_alias,
+)
+from src.infrastructure.adapters.pgvector_index import (
+    PGVectorIndexManager,
+    VectorIndexStatus,
+    search_connection_options,
+)
+from src.infrastructure.adapters.pgvector_queries import (
+    CORPUS_VERSION_SCHEMA,
+    GET_OR_CREATE_COLLECTION_SQL,
+    afetch_candidates,
+    afetch_hybrid,
+    aread_corpus_version,
+    bump_corpus_version,
+    copy_chunks,
+    fetch_candidates,
+    fetch_candidates_many,
+    fetch_hybrid,
+    resolve_fetch_k,
+    read_corpus_version,
+    resolve_hybrid_candidates,
+    trim_adaptive,
+)
+from src.infrastructure.adapters.postgres_pool import get_async_pool
+from src.infrastructure.adapters.repository_retriever import RepositoryRetriever
 
 
+logger = logging.getLogger(__name__)
+
 class PGVectorRepository(RepositoryPort):
     """PostgreSQL with pgVector repository adapter."""
     
     def __init__(self, embeddings: EmbeddingsPort):
         self._settings = get_settings()
         self._embeddings = embeddings
+        self._index_manager = PGVectorIndexManager(settings=self._settings)
+        self._corpus_version_ready = False
+        self._text_search_checked = False
         self._vectorstore = PGVector(
             collection_name=self._settings.pg_vector_collection_name,
             connection=self._settings.sqlalchemy_database_url,
             embeddings=embeddings.get_langchain_embeddings(),
+            **self._store_options(),
         )
-    
-    def _reset_session(self) -> None:
-        """Reset the vectorstore's scoped_session to avoid stale ORM state.
-
-        Workaround for langchain-postgres scoped_session bug where
-        the internal SQLAlchemy session accumulates stale ORM objects
-        across calls, causing NotNullViolation on sequential inserts.
-        """
-        if hasattr(self._vectorstore, 'session_maker'):
-            self._vectorstore.session_maker.remove()
+        with self._vectorstore._engine.begin() as conn:
+            conn.connection.driver_connection.execute(COLLECTION_ALIAS_SCHEMA)
 
+    def _store_options(self) -> dict:
+        """Options of the live PGVector store (connection, vector size, search settings)."""
+        return {
+            "embedding_length": self._settings.embedding_dimensions,
+            # Apply hnsw.ef_search / ivfflat.probes to every pooled connection.
+            "engine_args": {
+                "connect_args": {"options": search_connection_options(self._settings)}
+            },
+        }
+    
     def add_documents(
         self,
         chunks: List[DocumentChunk],
-        clear_existing: bool = False
+        clear_existing: bool = False,
+        collection: str | None = None,
+        embeddings: Optional[List[List[float]]] = None,
     ) -> int:
-        """Add document chunks to the repository."""
-        # Convert to LangChain documents
-        langchain_docs = [
-            LangchainDocument(
-                page_content=chunk.content,
-                metadata=chunk.metadata
-            )
-            for chunk in chunks
-        ]
+        """Embed chunks (unless embeddings are given) and bulk-load them with
+        binary COPY on the vectorstore's engine, in one transaction.
+
+        With clear_existing, the chunks are loaded into a shadow collection
+        that then replaces the live one in a single alias swap.
+        """
+        if clear_existing and collection is None:
+            return self._replace(chunks, embeddings)
+        if not chunks:
+            return 0
+
+        if embeddings is None:
+            embeddings = self._embeddings.embed_documents([chunk.content for chunk in chunks])
 
-        if clear_existing:
-            self._vectorstore = PGVector.from_documents(
-                documents=langchain_docs,
-                embedding=self._embeddings.get_langchain_embeddings(),
-                collection_name=self._settings.pg_vector_collection_name,
-                connection=self._settings.sqlalchemy_database_url,
-                pre_delete_collection=True,
+        with self._vectorstore._engine.begin() as conn:
+            driver_conn = conn.connection.driver_connection
+            copy_chunks(
+                driver_conn, collection or self._settings.pg_vector_collection_name, chunks, embeddings
             )
-        else:
-            # Clean session before insert to avoid stale state
-            self._reset_session()
-            self._vectorstore.add_documents(langchain_docs)
+            if collection is None:
+                bump_corpus_version(driver_conn, self._settings.pg_vector_collection_name)
 
+        self._ensure_indexes()
         return len(chunks)
+
+    def _ensure_indexes(self) -> None:
+        if self._settings.vector_index_auto_create:
+            # First ingestion creates the table's ANN index; afterwards this is
+            # a single catalog lookup. Never fail an ingestion over the index.
+            try:
+                self._index_manager.ensure_index()
+                self._index_manager.ensure_source_index()
+            except Exception as e:
+                logger.warning("Could not ensure vector index: %s", e)
+        # The full-text setup rewrites data and builds a GIN index, so it runs
+        # from src/scripts/vector_index.py; here hybrid mode only checks (once)
+        # that it was done.
+        if self._settings.retrieval_mode == "hybrid" and not self._text_search_checked:
+            try:
+                if not self._index_manager.text_search_ready():
+                    logger.warning(
+                        "RETRIEVAL_MODE=hybrid but the full-text index is missing; "
+                        "run `python3 src/scripts/vector_index.py text-search`"
+                    )
+                self._text_search_checked = True
+            except Exception as e:
+                logger.warning("Could not check the full-text search index: %s", e)
+
+    def _replace(
+        self, chunks: List[DocumentChunk], embeddings: Optional[List[List[float]]] = None
+    ) -> int:
+        """Replace the live collection with chunks through a one-shot rebuild."""
+        shadow = self.begin_rebuild()
+        try:
+            self.add_documents(chunks, collection=shadow, embeddings=embeddings)
+            self.publish_rebuild(shadow)
+        except Exception:
+            self._discard_quietly(shadow)
+            raise
+        return len(chunks)
+
+    def begin_rebuild(self) -> str:
+        """Create an empty shadow collection and return its name."""
+        shadow = shadow_collection_name(self._settings.pg_vector_collection_name)
+        with self._vectorstore._engine.begin() as conn:
+            conn.connection.driver_connection.execute(GET_OR_CREATE_COLLECTION_SQL, (uuid.uuid4(), shadow))
+        return shadow
+
+    def publish_rebuild(self, collection: str) -> None:
+        """Swap the alias to collection; the collection it replaced is kept for
+        rollback and the one before that is dropped."""
+        self._ensure_indexes()
+        with self._vectorstore._engine.begin() as conn:
+            driver_conn = conn.connection.driver_connection
+            stale = swap_alias(driver_conn, self._settings.pg_vector_collection_name, collection)
+            bump_corpus_version(driver_conn, self._settings.pg_vector_collection_name)
+        if stale is not None:
+            self.discard_rebuild(stale)
+        logger.info("Collection '%s' now serves '%s'", collection, self._settings.pg_vector_collection_name)
+
+    def discard_rebuild(self, collection: str) -> None:
+        """Drop a collection no alias points at (an unpublished shadow)."""
+        with self._vectorstore._engine.begin() as conn:
+            drop_collection(conn.connection.driver_connection, collection)
+
+    def rollback_rebuild(self) -> str | None:
+        """Swap the alias back to the collection the last rebuild replaced."""
+        with self._vectorstore._engine.begin() as conn:
+            driver_conn = conn.connection.driver_connection
+            live = rollback_alias(driver_conn, self._settings.pg_vector_collection_name)
+            if live is not None:
+                bump_corpus_version(driver_conn, self._settings.pg_vector_collection_name)
+        return live
+
+    def _discard_quietly(self, collection: str) -> None:
+        try:
+            self.discard_rebuild(collection)
+        except Exception as e:
+            logger.warning("Could not drop shadow collection '%s': %s", collection, e)
     
     def search(self, query: str, k: int = 10) -> List[DocumentChunk]:
-        """Search for similar documents using MMR for diversity."""
-        results = self._vectorstore.max_marginal_relevance_search(
-            query, k=k, fetch_k=k * 3
-        )
-        return [
-            DocumentChunk(
-                content=doc.page_content,
-                metadata=doc.metadata
+        """Search for similar documents using MMR for diversity.
+
+        Candidates are read over the vectorstore's engine on a binary cursor
+        (float32 arrays, no text parsing) and MMR runs vectorized in NumPy,
+        instead of LangChain's max_marginal_relevance_search. With
+        RETRIEVAL_MODE=hybrid, full-text and vector candidates are fused with
+        reciprocal rank fusion instead.
+        """
+        return self.search_with_scores(query, k)
+
+    def search_with_scores(
+        self, query: str, k: int = 10, include_vectors: bool = False
+    ) -> List[ScoredChunk]:
+        """search, with each chunk's row id and cosine similarity to the query."""
+        query_vector = np.asarray(self._embeddings.embed_query(query), dtype=np.float32)
+
+        with self._vectorstore._engine.connect() as conn:
+            driver_conn = conn.connection.driver_connection
+            if self._settings.retrieval_mode == "hybrid":
+                fused = fetch_hybrid(
+                    driver_conn,
+                    self._settings.pg_vector_collection_name,
+                    query,
+                    query_vector,
+                    k,
+                    resolve_hybrid_candidates(self._settings, k),
+                    self._settings,
+                    self._settings.hybrid_rrf_k,
+                    include_vectors=include_vectors,
+                )
+                return trim_adaptive(self._settings, fused, k)
+            candidates = fetch_candidates(
+                driver_conn,
+                self._settings.pg_vector_collection_name,
+                query_vector,
+                resolve_fetch_k(self._settings, k),
+                self._settings,
             )
-            for doc in results
+
+        return candidates.select(self._settings, query_vector, k, include_vectors)
+
+    def search_many(
+        self,
+        queries: List[str],
+        k: int = 10,
+        query_embeddings: Optional[List[List[float]]] = None,
+    ) -> List[List[DocumentChunk]]:
+        """Search a batch of queries: one embedding call and one candidate query for all of them.
+
+        In hybrid mode each query runs the fused RRF statement, still on one
+        connection and with the batched query embeddings.
+        """
+        return self.search_many_with_scores(queries, k, query_embeddings=query_embeddings)
+
+    def search_many_with_scores(
+        self,
+        queries: List[str],
+        k: int = 10,
+        include_vectors: bool = False,
+        query_embeddings: Optional[List[List[float]]] = None,
+    ) -> List[List[ScoredChunk]]:
+        """search_many, with each chunk's row id and cosine similarity to its query."""
+        if not queries:
+            return []
+        if query_embeddings is None:
+            query_embeddings = self._embeddings.embed_queries(queries)
+        query_vectors = np.asarray(query_embeddings, dtype=np.float32)
+        collection = self._settings.pg_vector_collection_name
+
+        with self._vectorstore._engine.connect() as conn:
+            driver_conn = conn.connection.driver_connection
+            if self._settings.retrieval_mode == "hybrid":
+                candidates = resolve_hybrid_candidates(self._settings, k)
+                return [
+                    trim_adaptive(
+                        self._settings,
+                        fetch_hybrid(
+                            driver_conn,
+                            collection,
+                            query,
+                            vector,
+                            k,
+                            candidates,
+                            self._settings,
+                            self._settings.hybrid_rrf_k,
+                            include_vectors=include_vectors,
+                        ),
+                        k,
+                    )
+                    for query, vector in zip(queries, query_vectors)
+                ]
+            batches = fetch_candidates_many(
+                driver_conn,
+                collection,
+                query_vectors,
+                resolve_fetch_k(self._settings, k),
+                self._settings,
+            )
+
+        return [
+            candidates.select(self._settings, vector, k, include_vectors)
+            for candidates, vector in zip(batches, query_vectors)
         ]
+
+    async def asearch(self, query: str, k: int = 10) -> List[DocumentChunk]:
+        """Async search on the shared async pool (same queries as search)."""
+        return await self.asearch_with_scores(query, k)
+
+    async def asearch_with_scores(
+        self, query: str, k: int = 10, include_vectors: bool = False
+    ) -> List[ScoredChunk]:
+        """Async search_with_scores."""
+        query_vector = np.asarray(await self._embeddings.aembed_query(query), dtype=np.float32)
+
+        pool = await get_async_pool(self._settings)
+        async with pool.connection() as conn:
+            if self._settings.retrieval_mode == "hybrid":
+                fused = await afetch_hybrid(
+                    conn,
+                    self._settings.pg_vector_collection_name,
+                    query,
+                    query_vector,
+                    k,
+                    resolve_hybrid_candidates(self._settings, k),
+                    self._settings,
+                    self._settings.hybrid_rrf_k,
+                    include_vectors=include_vectors,
+                )
+                return trim_adaptive(self._settings, fused, k)
+            candidates = await afetch_candidates(
+                conn,
+                self._settings.pg_vector_collection_name,
+                query_vector,
+                resolve_fetch_k(self._settings, k),
+                self._settings,
+            )
+
+        return candidates.select(self._settings, query_vector, k, include_vectors)
     
     def delete_by_source(self, source_file: str) -> int:
         """Delete all chunks from a specific source file."""
         engine = self._vectorstore._engine
 
         with engine.connect() as conn:
-            # Get collection UUID
+            # Get the UUID of the collection the alias points at
             result = conn.execute(
-                text("SELECT uuid FROM langchain_pg_collection WHERE name = :name"),
+                text(f"SELECT {collection_id_sql(':name')}"),
                 {"name": self._settings.pg_vector_collection_name}
             )
             row = result.fetchone()
-            if not row:
+            if not row or row[0] is None:
                 return 0
             
             collection_uuid = row[0]
-            
-            # Delete embeddings where source_file matches
+            batch_size = max(1, self._settings.delete_batch_size)
+            deleted = 0
+
+            # Delete embeddings where source_file matches, committing every
+            # batch_size rows; each batch that deleted rows bumps the corpus
+            # version before its commit, so caches never outlive a deletion
+            while True:
+                result = conn.execute(
+                    text("""
+                        DELETE FROM langchain_pg_embedding
+                        WHERE id IN (
+                            SELECT id FROM langchain_pg_embedding
+                            WHERE collection_id = :collection_id
+                            AND cmetadata->>'source_file' = :source_file
+                            LIMIT :batch_size
+                        )
+                    """),
+                    {
+                        "collection_id": collection_uuid,
+                        "source_file": source_file,
+                        "batch_size": batch_size,
+                    }
+                )
+                deleted += result.rowcount
+                done = result.rowcount < batch_size
+                if result.rowcount:
+                    bump_corpus_version(
+                        conn.connection.driver_connection, self._settings.pg_vector_collection_name
+                    )
+                conn.commit()
+                if done:
+                    return deleted
+    
+    def delete_chunks(self, source_file: str, chunk_hashes: List[str]) -> int:
+        """Delete the chunks of a source file with the given chunk_hash values."""
+        if not chunk_hashes:
+            return 0
+        with self._vectorstore._engine.connect() as conn:
             result = conn.execute(
-                text("""
-                    DELETE FROM langchain_pg_embedding 
-                    WHERE collection_id = :collection_id 
+                text(f"""
+                    DELETE FROM langchain_pg_embedding
+                    WHERE collection_id = {collection_id_sql(':name')}
                     AND cmetadata->>'source_file' = :source_file
+                    AND cmetadata->>'chunk_hash' = ANY(:chunk_hashes)
                 """),
-                {"collection_id": collection_uuid, "source_file": source_file}
+                {
+                    "name": self._settings.pg_vector_collection_name,
+                    "source_file": source_file,
+                    "chunk_hashes": list(chunk_hashes),
+                }
             )
+            if result.rowcount:
+                bump_corpus_version(
+                    conn.connection.driver_connection, self._settings.pg_vector_collection_name
+                )
             conn.commit()
-            
+
             return result.rowcount
-    
+
+    def corpus_version(self) -> int:
+        """Counter bumped by every add_documents / delete_by_source on this collection."""
+        with self._vectorstore._engine.connect() as conn:
+            driver_conn = conn.connection.driver_connection
+            if not self._corpus_version_ready:
+                driver_conn.execute(CORPUS_VERSION_SCHEMA)
+                self._corpus_version_ready = True
+            version = read_corpus_version(driver_conn, self._settings.pg_vector_collection_name)
+            conn.commit()
+        return version
+
+    async def acorpus_version(self) -> int:
+        """Async corpus_version on the shared async pool."""
+        pool = await get_async_pool(self._settings)
+        async with pool.connection() as conn:
+            if not self._corpus_version_ready:
+                await conn.execute(CORPUS_VERSION_SCHEMA)
+                self._corpus_version_ready = True
+            return await aread_corpus_version(conn, self._settings.pg_vector_collection_name)
+
     def get_retriever(self, k: int = 10):
-        """Get a LangChain retriever using MMR for diversity."""
-        return self._vectorstore.as_retriever(
-            search_type="mmr",
-            search_kwargs={"k": k, "fetch_k": k * 3},
-        )
+        """Get a LangChain retriever that runs this repository's MMR search."""
+        return RepositoryRetriever(repository=self, k=k)
+
+    def ensure_index(self, concurrently: bool = False) -> bool:
+        """Create the ANN index if missing. Returns True when one was created."""
+        return self._index_manager.ensure_index(concurrently=concurrently)
+
+    def index_status(self) -> VectorIndexStatus:
+        """Report the state of the ANN index."""
+        return self._index_manager.status()
+
+    def rebuild_index(self, concurrently: bool = True) -> None:
+        """Rebuild the ANN index with current settings without blocking searches."""
+        self._index_manager.rebuild(concurrently=concurrently)
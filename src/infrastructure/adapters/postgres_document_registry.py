@@ -0,0 +1,178 @@
+"""
+Postgres document registry.
+
+One row per ingested document of a collection in the `document_registry`
+table (created on first use): the file hash and the chunk_hash of every
+stored chunk. Re-ingestion compares against it to skip unchanged files
+without parsing them, and to embed, insert and delete only the chunks of a
+changed file that differ. Hashes are stored as raw SHA-256 bytes.
+
+The same rows are the document catalog: chunk count, file size and
+ingestion time are kept next to the hashes, so `list_documents` (the
+Chainlit `/files` listing) is a primary-key range read that never touches
+the embeddings or the chunk hash arrays.
+
+Rows are keyed by the physical collection behind the alias (see
+collection_alias), resolved inside each statement. A rebuild's documents are
+saved under its new collection after the swap, and the replaced collection
+keeps its own rows, so a rollback brings its catalog back with it. Clearing
+also forgets the rows of collections the alias no longer reaches.
+
+Queries run on the process-wide pools from postgres_pool.
+"""
+from psycopg_pool import ConnectionPool
+
+from src.config.settings import get_settings
+from src.domain.entities.document import CatalogEntry, DocumentRecord
+from src.domain.ports.document_registry import DocumentRegistryPort
+from src.infrastructure.adapters.collection_alias import (
+    ALIAS_TABLE,
+    COLLECTION_ALIAS_SCHEMA,
+    resolve_collection_sql,
+)
+from src.infrastructure.adapters.postgres_pool import get_pool
+
+
+REGISTRY_TABLE = "document_registry"
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS {REGISTRY_TABLE} (
+    collection VARCHAR NOT NULL,
+    source_file VARCHAR NOT NULL,
+    file_sha256 BYTEA NOT NULL,
+    chunk_hashes BYTEA[] NOT NULL,
+    chunk_count INTEGER NOT NULL DEFAULT 0,
+    size_bytes BIGINT NOT NULL DEFAULT 0,
+    ingested_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (collection, source_file)
+);
+"""
+
+_LIVE = resolve_collection_sql("%s")
+
+# Rows written before they were keyed by physical collection sit under the
+# logical name and describe the live collection: move them there, unless the
+# live collection already has rows of its own.
+_ADOPT_LEGACY_ROWS = f"""
+    UPDATE {REGISTRY_TABLE} r SET collection = a.collection
+    FROM {ALIAS_TABLE} a
+    WHERE a.alias = %s AND r.collection = a.alias AND a.collection <> a.alias
+      AND NOT EXISTS (SELECT 1 FROM {REGISTRY_TABLE} l WHERE l.collection = a.collection)
+"""
+
+_GET = f"""
+    SELECT source_file, file_sha256, chunk_hashes, size_bytes FROM {REGISTRY_TABLE}
+    WHERE collection = {_LIVE} AND source_file = %s
+"""
+
+_SAVE = f"""
+    INSERT INTO {REGISTRY_TABLE} (collection, source_file, file_sha256, chunk_hashes, chunk_count, size_bytes)
+    VALUES ({_LIVE}, %s, %s, %s, %s, %s)
+    ON CONFLICT (collection, source_file) DO UPDATE SET
+        file_sha256 = EXCLUDED.file_sha256,
+        chunk_hashes = EXCLUDED.chunk_hashes,
+        chunk_count = EXCLUDED.chunk_count,
+        size_bytes = EXCLUDED.size_bytes,
+        ingested_at = now()
+"""
+
+_DELETE = f"DELETE FROM {REGISTRY_TABLE} WHERE collection = {_LIVE} AND source_file = %s"
+
+_CLEAR = f"DELETE FROM {REGISTRY_TABLE} WHERE collection = {_LIVE}"
+
+# Rows of the alias's own collections (the logical name or its shadows) that
+# are neither live nor kept for rollback: their collection was dropped.
+_PRUNE = f"""
+    DELETE FROM {REGISTRY_TABLE} r USING {ALIAS_TABLE} a
+    WHERE a.alias = %(alias)s
+      AND (r.collection = a.alias OR left(r.collection, length(a.alias) + 2) = a.alias || '__')
+      AND r.collection <> a.collection
+      AND r.collection IS DISTINCT FROM a.previous
+"""
+
+_SOURCES = f"SELECT source_file FROM {REGISTRY_TABLE} WHERE collection = {_LIVE} ORDER BY source_file"
+
+_LIST = f"""
+    SELECT source_file, chunk_count, size_bytes, file_sha256, ingested_at FROM {REGISTRY_TABLE}
+    WHERE collection = {_LIVE} ORDER BY source_file
+"""
+
+
+def _to_record(row) -> DocumentRecord | None:
+    if row is None:
+        return None
+    return DocumentRecord(
+        source_file=row[0],
+        file_hash=bytes(row[1]).hex(),
+        chunk_hashes=[bytes(digest).hex() for digest in row[2]],
+        size_bytes=row[3],
+    )
+
+
+def _to_entry(row) -> CatalogEntry:
+    return CatalogEntry(
+        source_file=row[0],
+        chunk_count=row[1],
+        size_bytes=row[2],
+        file_hash=bytes(row[3]).hex(),
+        ingested_at=row[4],
+    )
+
+
+class PostgresDocumentRegistry(DocumentRegistryPort):
+    """psycopg3-backed document registry for one logical collection, on the shared pool."""
+
+    def __init__(self, collection_name: str | None = None) -> None:
+        self._settings = get_settings()
+        self._collection = collection_name or self._settings.pg_vector_collection_name
+        self._pool: ConnectionPool | None = None
+        self._schema_ready = False
+
+    def _get_pool(self) -> ConnectionPool:
+        if self._pool is None:
+            self._pool = get_pool(self._settings)
+        if not self._schema_ready:
+            with self._pool.connection() as conn:
+                # Statements resolve the alias, so its table must exist too.
+                conn.execute(COLLECTION_ALIAS_SCHEMA)
+                conn.execute(_SCHEMA)
+                conn.execute(_ADOPT_LEGACY_ROWS, (self._collection,))
+            self._schema_ready = True
+        return self._pool
+
+    def get(self, source_file: str) -> DocumentRecord | None:
+        with self._get_pool().connection() as conn:
+            row = conn.execute(_GET, (self._collection, source_file), prepare=True).fetchone()
+        return _to_record(row)
+
+    def save(self, record: DocumentRecord) -> None:
+        params = (
+            self._collection,
+            record.source_file,
+            bytes.fromhex(record.file_hash),
+            [bytes.fromhex(digest) for digest in record.chunk_hashes],
+            len(record.chunk_hashes),
+            record.size_bytes,
+        )
+        with self._get_pool().connection() as conn:
+            conn.execute(_SAVE, params, prepare=True)
+
+    def delete(self, source_file: str) -> None:
+        with self._get_pool().connection() as conn:
+            conn.execute(_DELETE, (self._collection, source_file))
+
+    def clear(self) -> None:
+        with self._get_pool().connection() as conn:
+            with conn.transaction():
+                conn.execute(_CLEAR, (self._collection,))
+                conn.execute(_PRUNE, {"alias": self._collection})
+
+    def sources(self) -> list[str]:
+        with self._get_pool().connection() as conn:
+            rows = conn.execute(_SOURCES, (self._collection,)).fetchall()
+        return [row[0] for row in rows]
+
+    def list_documents(self) -> list[CatalogEntry]:
+        with self._get_pool().connection() as conn:
+            rows = conn.execute(_LIST, (self._collection,), prepare=True).fetchall()
+        return [_to_entry(row) for row in rows]
@@ -0,0 +1,178 @@
+"""
+Persistent document embedding cache.
+Decorates an EmbeddingsPort with a content-addressed cache table in Postgres.
+
+Chunks are keyed by (embedding model, SHA-256 of the chunk text), so
+re-ingesting an unchanged document — which replaces the collection by
+default — makes no embedding API calls. On each embed_documents call the
+cached vectors are read in one query, only the misses go to the provider
+(in batches), and the new vectors are written back with one binary COPY.
+Both run on the shared psycopg pool. Query embeddings pass through;
+CachedEmbeddings handles those in memory.
+"""
+import hashlib
+import logging
+from typing import List
+
+import numpy as np
+import psycopg
+from langchain_core.embeddings import Embeddings
+from psycopg_pool import ConnectionPool
+
+from src.config.settings import get_settings
+from src.domain.ports.embeddings import EmbeddingsPort
+from src.infrastructure.adapters.embeddings_bridge import PortEmbeddings
+from src.infrastructure.adapters.postgres_pool import get_pool
+
+
+logger = logging.getLogger(__name__)
+
+CACHE_TABLE = "embedding_cache"
+
+# `vector` without dimensions: one table serves every embedding model.
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS {CACHE_TABLE} (
+    model VARCHAR NOT NULL,
+    content_sha256 BYTEA NOT NULL,
+    embedding VECTOR NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (model, content_sha256)
+);
+"""
+
+_LOOKUP = f"""
+    SELECT content_sha256, embedding FROM {CACHE_TABLE}
+    WHERE model = %s AND content_sha256 = ANY(%s)
+"""
+
+_STAGE = """
+    CREATE TEMP TABLE embedding_cache_stage (
+        content_sha256 BYTEA, embedding VECTOR
+    ) ON COMMIT DROP
+"""
+
+_COPY_STAGE = "COPY embedding_cache_stage (content_sha256, embedding) FROM STDIN WITH (FORMAT BINARY)"
+
+_MERGE_STAGE = f"""
+    INSERT INTO {CACHE_TABLE} (model, content_sha256, embedding)
+    SELECT %s, content_sha256, embedding FROM embedding_cache_stage
+    ON CONFLICT (model, content_sha256) DO NOTHING
+"""
+
+
+def content_digest(text: str) -> bytes:
+    """SHA-256 of the chunk text, the content half of the cache key."""
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+
+class PostgresEmbeddingCache(EmbeddingsPort):
+    """EmbeddingsPort decorator caching document vectors in a Postgres table."""
+
+    def __init__(
+        self,
+        inner: EmbeddingsPort,
+        model: str,
+        batch_size: int = 256,
+    ):
+        self._inner = inner
+        self._model = model
+        self._settings = get_settings()
+        self._batch_size = max(1, batch_size)
+        self._pool: ConnectionPool | None = None
+        self._schema_ready = False
+        self._langchain = PortEmbeddings(self)
+
+    @property
+    def inner(self) -> EmbeddingsPort:
+        """The wrapped provider."""
+        return self._inner
+
+    def _get_pool(self) -> ConnectionPool:
+        if self._pool is None:
+            self._pool = get_pool(self._settings)
+        if not self._schema_ready:
+            with self._pool.connection() as conn:
+                conn.execute(_SCHEMA)
+            self._schema_ready = True
+        return self._pool
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Return embeddings for texts, calling the provider only for cache misses.
+
+        The cache is best effort: if the database is unreachable, every text
+        is embedded by the provider and nothing is written back.
+        """
+        if not texts:
+            return []
+
+        digests = [content_digest(text) for text in texts]
+        try:
+            cached = self._lookup(list(set(digests)))
+        except psycopg.Error as e:
+            logger.warning("Embedding cache lookup failed, embedding without cache: %s", e)
+            return self._inner.embed_documents(texts)
+
+        # First occurrence of each missing digest; duplicates reuse its vector.
+        misses: dict[bytes, str] = {}
+        for digest, text in zip(digests, texts):
+            if digest not in cached and digest not in misses:
+                misses[digest] = text
+
+        if misses:
+            computed = self._embed_misses(misses)
+            cached.update(computed)
+            try:
+                self._store(computed)
+            except psycopg.Error as e:
+                logger.warning("Embedding cache write-back failed: %s", e)
+
+        logger.info(
+            "Embedding cache: %d hit(s), %d miss(es) for %d text(s)",
+            len(set(digests)) - len(misses), len(misses), len(texts),
+        )
+        return [cached[digest].tolist() for digest in digests]
+
+    def embed_query(self, text: str) -> List[float]:
+        """Generate embedding for a query (not cached here)."""
+        return self._inner.embed_query(text)
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for a batch of queries (not cached here)."""
+        return self._inner.embed_queries(texts)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """Generate embedding for a query (not cached here)."""
+        return await self._inner.aembed_query(text)
+
+    def get_langchain_embeddings(self) -> Embeddings:
+        """LangChain embeddings routed through this cache."""
+        return self._langchain
+
+    def _lookup(self, digests: list[bytes]) -> dict[bytes, np.ndarray]:
+        with self._get_pool().connection() as conn:
+            rows = conn.execute(_LOOKUP, (self._model, digests), prepare=True).fetchall()
+        return {bytes(digest): np.asarray(vector, dtype=np.float32) for digest, vector in rows}
+
+    def _embed_misses(self, misses: dict[bytes, str]) -> dict[bytes, np.ndarray]:
+        digests = list(misses)
+        texts = list(misses.values())
+        computed: dict[bytes, np.ndarray] = {}
+        for start in range(0, len(texts), self._batch_size):
+            batch = texts[start:start + self._batch_size]
+            vectors = self._inner.embed_documents(batch)
+            for digest, vector in zip(digests[start:start + self._batch_size], vectors):
+                computed[digest] = np.asarray(vector, dtype=np.float32)
+        return computed
+
+    def _store(self, vectors: dict[bytes, np.ndarray]) -> None:
+        """Bulk write-back: binary COPY into a staging table, then one upsert."""
+        with self._get_pool().connection() as conn:
+            with conn.transaction():
+                conn.execute(_STAGE)
+                with conn.cursor() as cur:
+                    with cur.copy(_COPY_STAGE) as copy:
+                        copy.set_types(["bytea", "vector"])
+                        for digest, vector in vectors.items():
+                            copy.write_row((digest, vector))
+                conn.execute(_MERGE_STAGE, (self._model,))
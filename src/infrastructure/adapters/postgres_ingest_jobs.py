@@ -0,0 +1,244 @@
+"""
+Postgres ingestion job queue.
+
+Jobs live in the `ingest_job` table (created on first use). Workers
+(`python -m src.workers.ingest`) claim them with
+`SELECT ... FOR UPDATE SKIP LOCKED`: each worker locks a different queued
+row without waiting on the others, so any number of workers can share the
+queue and a job is never run twice at once. Progress updates double as a
+heartbeat; a running job whose worker stopped reporting for
+INGEST_JOB_STALE_SECONDS is claimed again. Failed attempts are queued again
+with a growing delay until INGEST_JOB_MAX_ATTEMPTS is reached; that bound
+also covers stale reclaims, so a job that keeps killing its worker (out of
+memory on a huge file, a parser crash) ends up failed instead of taking down
+a worker every INGEST_JOB_STALE_SECONDS. Progress, completion and failure are
+only recorded by the worker that holds the job, so a worker that was presumed
+dead cannot overwrite the run that reclaimed its job.
+
+Queries run on the process-wide pools from postgres_pool.
+"""
+import logging
+import uuid
+
+from psycopg_pool import AsyncConnectionPool, ConnectionPool
+
+from src.config.settings import get_settings
+from src.domain.entities.ingest_job import DONE, FAILED, QUEUED, RUNNING, IngestJob
+from src.domain.ports.ingest_job_queue import IngestJobQueuePort
+from src.infrastructure.adapters.postgres_pool import get_async_pool, get_pool
+
+
+logger = logging.getLogger(__name__)
+
+JOB_TABLE = "ingest_job"
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS {JOB_TABLE} (
+    id UUID PRIMARY KEY,
+    file_path TEXT NOT NULL,
+    source_name TEXT NOT NULL,
+    clear_existing BOOLEAN NOT NULL DEFAULT false,
+    after_id UUID REFERENCES {JOB_TABLE} (id) ON DELETE SET NULL,
+    status VARCHAR NOT NULL DEFAULT '{QUEUED}',
+    chunks_stored INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    worker TEXT,
+    run_after TIMESTAMPTZ NOT NULL DEFAULT now(),
+    heartbeat_at TIMESTAMPTZ,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS {JOB_TABLE}_pending_idx
+    ON {JOB_TABLE} (created_at) WHERE status IN ('{QUEUED}', '{RUNNING}');
+"""
+
+_COLUMNS = "id, file_path, source_name, clear_existing, status, chunks_stored, attempts, error"
+
+_ENQUEUE = f"""
+    INSERT INTO {JOB_TABLE} (id, file_path, source_name, clear_existing, after_id)
+    VALUES (%s, %s, %s, %s, %s)
+    RETURNING {_COLUMNS}
+"""
+
+# The inner SELECT locks one claimable row, skipping rows other workers have
+# locked; the UPDATE then takes it. A job waits for the job it depends on.
+_CLAIM = f"""
+    UPDATE {JOB_TABLE} SET
+        status = '{RUNNING}', attempts = attempts + 1, worker = %(worker)s,
+        chunks_stored = 0, error = NULL, heartbeat_at = now(), updated_at = now()
+    WHERE id = (
+        SELECT job.id FROM {JOB_TABLE} job
+        WHERE (
+            (job.status = '{QUEUED}' AND job.run_after <= now())
+            OR (
+                job.status = '{RUNNING}'
+                AND job.heartbeat_at < now() - make_interval(secs => %(stale)s)
+                AND job.attempts < %(max_attempts)s
+            )
+        )
+        AND NOT EXISTS (
+            SELECT 1 FROM {JOB_TABLE} dep
+            WHERE dep.id = job.after_id AND dep.status NOT IN ('{DONE}', '{FAILED}')
+        )
+        ORDER BY job.created_at
+        FOR UPDATE SKIP LOCKED
+        LIMIT 1
+    )
+    RETURNING {_COLUMNS}
+"""
+
+# Stale jobs that used up their attempts: their worker died on every one.
+_EXPIRE = f"""
+    UPDATE {JOB_TABLE} SET
+        status = '{FAILED}', updated_at = now(),
+        error = coalesce(error, 'Worker stopped responding on every attempt')
+    WHERE status = '{RUNNING}'
+      AND heartbeat_at < now() - make_interval(secs => %(stale)s)
+      AND attempts >= %(max_attempts)s
+"""
+
+# Writes by a job's worker apply only while it still holds the job.
+_OWNED = f"id = %(id)s AND worker = %(worker)s AND status = '{RUNNING}'"
+
+_PROGRESS = f"""
+    UPDATE {JOB_TABLE} SET chunks_stored = %(chunks)s, heartbeat_at = now(), updated_at = now()
+    WHERE {_OWNED}
+"""
+
+_COMPLETE = f"""
+    UPDATE {JOB_TABLE} SET status = '{DONE}', chunks_stored = %(chunks)s, error = NULL, updated_at = now()
+    WHERE {_OWNED}
+"""
+
+_FAIL = f"""
+    UPDATE {JOB_TABLE} SET
+        status = CASE WHEN %(retry)s AND attempts < %(max_attempts)s THEN '{QUEUED}' ELSE '{FAILED}' END,
+        run_after = now() + make_interval(secs => %(delay)s * attempts),
+        error = %(error)s, updated_at = now()
+    WHERE {_OWNED}
+    RETURNING {_COLUMNS}
+"""
+
+_GET = f"SELECT {_COLUMNS} FROM {JOB_TABLE} WHERE id = %s"
+
+
+def _to_job(row) -> IngestJob | None:
+    if row is None:
+        return None
+    return IngestJob(
+        id=str(row[0]),
+        file_path=row[1],
+        source_name=row[2],
+        clear_existing=row[3],
+        status=row[4],
+        chunks_stored=row[5],
+        attempts=row[6],
+        error=row[7],
+    )
+
+
+class PostgresIngestJobQueue(IngestJobQueuePort):
+    """psycopg3-backed ingestion job queue on the shared connection pools."""
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        stale_seconds: int = 600,
+        retry_delay_seconds: float = 30.0,
+    ) -> None:
+        self._settings = get_settings()
+        self._max_attempts = max(1, max_attempts)
+        self._stale_seconds = stale_seconds
+        self._retry_delay_seconds = retry_delay_seconds
+        self._pool: ConnectionPool | None = None
+        self._schema_ready = False
+
+    def _get_pool(self) -> ConnectionPool:
+        if self._pool is None:
+            self._pool = get_pool(self._settings)
+        if not self._schema_ready:
+            with self._pool.connection() as conn:
+                conn.execute(_SCHEMA)
+            self._schema_ready = True
+        return self._pool
+
+    async def _aget_pool(self) -> AsyncConnectionPool:
+        # Looked up on every use: async pools belong to the running event loop.
+        pool = await get_async_pool(self._settings)
+        if not self._schema_ready:
+            async with pool.connection() as conn:
+                await conn.execute(_SCHEMA)
+            self._schema_ready = True
+        return pool
+
+    def enqueue(
+        self,
+        file_path: str,
+        source_name: str,
+        clear_existing: bool = False,
+        after: str | None = None,
+    ) -> IngestJob:
+        params = (uuid.uuid4(), file_path, source_name, clear_existing, after)
+        with self._get_pool().connection() as conn:
+            row = conn.execute(_ENQUEUE, params).fetchone()
+        return _to_job(row)
+
+    def claim(self, worker: str) -> IngestJob | None:
+        params = {"worker": worker, "stale": self._stale_seconds, "max_attempts": self._max_attempts}
+        # The pool commits on return, releasing the row lock with the job marked running.
+        with self._get_pool().connection() as conn:
+            expired = conn.execute(_EXPIRE, params).rowcount
+            row = conn.execute(_CLAIM, params).fetchone()
+        if expired:
+            logger.warning("Marked %d stale job(s) failed after %d attempts", expired, self._max_attempts)
+        return _to_job(row)
+
+    def report_progress(self, job_id: str, worker: str, chunks_stored: int) -> bool:
+        params = {"id": job_id, "worker": worker, "chunks": chunks_stored}
+        with self._get_pool().connection() as conn:
+            return conn.execute(_PROGRESS, params, prepare=True).rowcount > 0
+
+    def complete(self, job_id: str, worker: str, chunks_stored: int) -> bool:
+        params = {"id": job_id, "worker": worker, "chunks": chunks_stored}
+        with self._get_pool().connection() as conn:
+            return conn.execute(_COMPLETE, params).rowcount > 0
+
+    def fail(self, job_id: str, worker: str, error: str, retry: bool = True) -> IngestJob | None:
+        params = {
+            "id": job_id,
+            "worker": worker,
+            "error": error,
+            "retry": retry,
+            "max_attempts": self._max_attempts,
+            "delay": self._retry_delay_seconds,
+        }
+        with self._get_pool().connection() as conn:
+            row = conn.execute(_FAIL, params).fetchone()
+        return _to_job(row)
+
+    def get(self, job_id: str) -> IngestJob | None:
+        with self._get_pool().connection() as conn:
+            row = conn.execute(_GET, (job_id,), prepare=True).fetchone()
+        return _to_job(row)
+
+    async def aenqueue(
+        self,
+        file_path: str,
+        source_name: str,
+        clear_existing: bool = False,
+        after: str | None = None,
+    ) -> IngestJob:
+        pool = await self._aget_pool()
+        params = (uuid.uuid4(), file_path, source_name, clear_existing, after)
+        async with pool.connection() as conn:
+            cur = await conn.execute(_ENQUEUE, params)
+            row = await cur.fetchone()
+        return _to_job(row)
+
+    async def aget(self, job_id: str) -> IngestJob | None:
+        pool = await self._aget_pool()
+        async with pool.connection() as conn:
+            cur = await conn.execute(_GET, (job_id,), prepare=True)
+            row = await cur.fetchone()
+        return _to_job(row)
@@ -0,0 +1,145 @@
+"""
+Shared psycopg connection pools.
+
+One sync ConnectionPool per DSN and one AsyncConnectionPool per (DSN, event
+loop), shared by every adapter in the process instead of each opening its
+own connections. Async pools of loops that have since closed (one per
+asyncio.run in scripts and tests) are evicted and their connections closed
+when the next loop opens its pool. Pooled connections have the pgvector adapters registered
+and the ANN search knobs (hnsw.ef_search / ivfflat.probes) applied, so
+repositories can run vector queries on them directly.
+
+Sizing, checkout timeout and idle lifetime come from the DB_POOL_* settings.
+With DB_POOL_CHECK (default on) every checkout is verified with an empty
+query, so a connection dropped by a Postgres restart or an idle timeout is
+replaced instead of failing the request.
+"""
+import asyncio
+import logging
+import threading
+
+import psycopg
+from pgvector.psycopg import register_vector, register_vector_async
+from psycopg_pool import AsyncConnectionPool, ConnectionPool
+
+from src.config.settings import Settings, get_settings
+from src.infrastructure.adapters.pgvector_index import search_connection_options
+
+
+_pools: dict[str, ConnectionPool] = {}
+_async_pools: dict[tuple[str, asyncio.AbstractEventLoop], AsyncConnectionPool] = {}
+_lock = threading.Lock()
+
+logger = logging.getLogger(__name__)
+
+
+def _configure(conn: psycopg.Connection) -> None:
+    """Register the pgvector adapters (numpy.ndarray <-> vector) on a new pooled connection."""
+    register_vector(conn)
+    # The type lookup opens a transaction; the pool requires an idle connection.
+    conn.commit()
+
+
+async def _aconfigure(conn: psycopg.AsyncConnection) -> None:
+    """Async counterpart of _configure."""
+    await register_vector_async(conn)
+    await conn.commit()
+
+
+def _pool_options(settings: Settings) -> dict:
+    """Constructor arguments shared by the sync and async pools."""
+    return {
+        "min_size": settings.db_pool_min_size,
+        "max_size": settings.db_pool_max_size,
+        "timeout": settings.db_pool_timeout,
+        "max_idle": settings.db_pool_max_idle,
+        "kwargs": {"options": search_connection_options(settings)},
+    }
+
+
+def get_pool(settings: Settings | None = None) -> ConnectionPool:
+    """Return the process-wide sync pool for DATABASE_URL, creating it on first use.
+
+    The vector extension must exist before connections can register its type,
+    so it is created (if missing) before the pool opens.
+    """
+    settings = settings or get_settings()
+    dsn = settings.database_url
+    with _lock:
+        pool = _pools.get(dsn)
+        if pool is None:
+            with psycopg.connect(dsn, autocommit=True) as conn:
+                conn.execute("CREATE EXTENSION IF NOT EXISTS vector")
+            pool = ConnectionPool(
+                dsn,
+                configure=_configure,
+                check=ConnectionPool.check_connection if settings.db_pool_check else None,
+                open=True,
+                **_pool_options(settings),
+            )
+            _pools[dsn] = pool
+    return pool
+
+
+def _evict_closed_loops() -> None:
+    """Drop the async pools whose event loop is closed and close their connections.
+
+    pool.close() cannot be awaited once the loop is gone (its worker tasks
+    died with it), so the idle connections' sockets are closed directly;
+    connections still checked out were abandoned with the loop.
+    """
+    with _lock:
+        stale = [key for key in _async_pools if key[1].is_closed()]
+        pools = [_async_pools.pop(key) for key in stale]
+    for pool in pools:
+        for conn in list(getattr(pool, "_pool", ())):
+            try:
+                conn.pgconn.finish()
+            except Exception as e:
+                logger.debug("Could not close a connection of an abandoned pool: %s", e)
+    if pools:
+        logger.info("Closed %d async pool(s) of closed event loops", len(pools))
+
+
+async def get_async_pool(settings: Settings | None = None) -> AsyncConnectionPool:
+    """Return the async pool for DATABASE_URL on the running event loop.
+
+    Async pools are bound to the loop that opened them, hence one per loop.
+    """
+    settings = settings or get_settings()
+    key = (settings.database_url, asyncio.get_running_loop())
+    pool = _async_pools.get(key)
+    if pool is not None:
+        return pool
+
+    _evict_closed_loops()
+    async with await psycopg.AsyncConnection.connect(settings.database_url, autocommit=True) as conn:
+        await conn.execute("CREATE EXTENSION IF NOT EXISTS vector")
+    pool = AsyncConnectionPool(
+        settings.database_url,
+        configure=_aconfigure,
+        check=AsyncConnectionPool.check_connection if settings.db_pool_check else None,
+        open=False,
+        **_pool_options(settings),
+    )
+    await pool.open()
+    # Another task may have opened a pool for this loop in the meantime.
+    existing = _async_pools.setdefault(key, pool)
+    if existing is not pool:
+        await pool.close()
+    return existing
+
+
+def close_pools() -> None:
+    """Close every sync pool (async pools are closed by aclose_pools)."""
+    with _lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
+
+
+async def aclose_pools() -> None:
+    """Close the async pools of the running event loop."""
+    loop = asyncio.get_running_loop()
+    for key in [key for key in _async_pools if key[1] is loop]:
+        await _async_pools.pop(key).close()
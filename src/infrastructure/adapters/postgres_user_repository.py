@@ -2,50 +2,77 @@
 Postgres user repository adapter.
 
 Targets the Chainlit `User` table (created by `src/scripts/init_chainlit_db.py`)
-augmented with a `passwordHash` column. Uses psycopg3 (already a project
-dependency) via short-lived connections — auth is infrequent and connection
-overhead is negligible.
+augmented with a `passwordHash` column. Queries run on the process-wide
+psycopg pools from postgres_pool: at shift start hundreds of users log in
+within a minute, and a fresh connection per login would spend most of each
+request on TCP/TLS setup and authentication.
 """
-import psycopg
+from psycopg_pool import AsyncConnectionPool, ConnectionPool
 
 from src.config.settings import get_settings
 from src.domain.entities.user import User
 from src.domain.ports.user_repository import UserRepositoryPort
+from src.infrastructure.adapters.postgres_pool import get_async_pool, get_pool
+
+
+_GET_BY_IDENTIFIER = (
+    'SELECT "id", "identifier", "passwordHash" '
+    'FROM "User" WHERE "identifier" = %s LIMIT 1'
+)
+
+# ON CONFLICT handles two cases safely:
+#   1. Race between two simultaneous registrations of the same identifier.
+#   2. A pre-existing Chainlit-created row without a passwordHash
+#      (legacy / first-login claim) — we attach the hash to it.
+_CREATE = (
+    'INSERT INTO "User" ("id", "identifier", "passwordHash") '
+    'VALUES (%s, %s, %s) '
+    'ON CONFLICT ("identifier") DO UPDATE '
+    'SET "passwordHash" = EXCLUDED."passwordHash", '
+    '    "updatedAt" = NOW()'
+)
+
+
+def _to_user(row) -> User | None:
+    if row is None or row[2] is None:
+        return None
+    return User(id=row[0], identifier=row[1], password_hash=row[2])
 
 
 class PostgresUserRepository(UserRepositoryPort):
-    """psycopg3-backed user repository."""
+    """psycopg3-backed user repository on the shared connection pools."""
 
     def __init__(self) -> None:
-        self._dsn = get_settings().database_url
+        self._settings = get_settings()
+        self._pool: ConnectionPool | None = None
+
+    def _get_pool(self) -> ConnectionPool:
+        if self._pool is None:
+            self._pool = get_pool(self._settings)
+        return self._pool
+
+    async def _aget_pool(self) -> AsyncConnectionPool:
+        # Looked up on every use: async pools belong to the running event loop.
+        return await get_async_pool(self._settings)
 
     def get_by_identifier(self, identifier: str) -> User | None:
-        with psycopg.connect(self._dsn) as conn:
-            with conn.cursor() as cur:
-                cur.execute(
-                    'SELECT "id", "identifier", "passwordHash" '
-                    'FROM "User" WHERE "identifier" = %s LIMIT 1',
-                    (identifier,),
-                )
-                row = cur.fetchone()
-
-        if row is None or row[2] is None:
-            return None
-        return User(id=row[0], identifier=row[1], password_hash=row[2])
+        with self._get_pool().connection() as conn:
+            row = conn.execute(_GET_BY_IDENTIFIER, (identifier,), prepare=True).fetchone()
+        return _to_user(row)
 
     def create(self, user: User) -> None:
-        # ON CONFLICT handles two cases safely:
-        #   1. Race between two simultaneous registrations of the same identifier.
-        #   2. A pre-existing Chainlit-created row without a passwordHash
-        #      (legacy / first-login claim) — we attach the hash to it.
-        with psycopg.connect(self._dsn) as conn:
-            with conn.cursor() as cur:
-                cur.execute(
-                    'INSERT INTO "User" ("id", "identifier", "passwordHash") '
-                    'VALUES (%s, %s, %s) '
-                    'ON CONFLICT ("identifier") DO UPDATE '
-                    'SET "passwordHash" = EXCLUDED."passwordHash", '
-                    '    "updatedAt" = NOW()',
-                    (user.id, user.identifier, user.password_hash),
-                )
-            conn.commit()
+        # The pool commits when the connection is returned without error.
+        with self._get_pool().connection() as conn:
+            conn.execute(_CREATE, (user.id, user.identifier, user.password_hash))
+
+    async def aget_by_identifier(self, identifier: str) -> User | None:
+        pool = await self._aget_pool()
+        async with pool.connection() as conn:
+            cur = await conn.execute(_GET_BY_IDENTIFIER, (identifier,), prepare=True)
+            row = await cur.fetchone()
+        return _to_user(row)
+
+    async def acreate(self, user: User) -> None:
+        pool = await self._aget_pool()
+        async with pool.connection() as conn:
+            await conn.execute(_CREATE, (user.id, user.identifier, user.password_hash))
@@ -0,0 +1,481 @@
+"""
+Native psycopg pgvector repository adapter.
+Implements RepositoryPort directly on psycopg 3, without LangChain's ORM.
+
+Shares the `langchain_pg_collection` / `langchain_pg_embedding` tables with
+PGVectorRepository, so the two backends are interchangeable on the same
+database. Chunks are bulk-loaded with binary COPY inside one transaction,
+and searches run as prepared statements on the process-wide pools from
+postgres_pool. The async methods use the async pool end to end, so the
+Chainlit event loop never parks a thread on a query.
+
+The collection name is a logical one resolved through collection_alias;
+full rebuilds load a shadow collection and swap the alias (see
+collection_alias), so searches never see a half-built collection.
+"""
+import asyncio
+import logging
+import uuid
+from typing import List, Optional
+
+import numpy as np
+import psycopg
+from psycopg_pool import AsyncConnectionPool, ConnectionPool
+
+from src.config.settings import get_settings
+from src.domain.entities.document import DocumentChunk, ScoredChunk
+from src.domain.ports.embeddings import EmbeddingsPort
+from src.domain.ports.repository import RepositoryPort
+from src.infrastructure.adapters.collection_alias import (
+    COLLECTION_ALIAS_SCHEMA,
+    collection_id_sql,
+    drop_collection,
+    rollback_alias,
+    shadow_collection_name,
+    swap_alias,
+)
+from src.infrastructure.adapters.pgvector_index import (
+    PGVectorIndexManager,
+    VectorIndexStatus,
+)
+from src.infrastructure.adapters.pgvector_queries import (
+    CORPUS_VERSION_SCHEMA,
+    GET_OR_CREATE_COLLECTION_SQL,
+    abump_corpus_version,
+    acopy_chunks,
+    afetch_candidates,
+    afetch_hybrid,
+    aread_corpus_version,
+    bump_corpus_version,
+    copy_chunks,
+    fetch_candidates,
+    fetch_candidates_many,
+    fetch_hybrid,
+    resolve_fetch_k,
+    read_corpus_version,
+    resolve_hybrid_candidates,
+    trim_adaptive,
+)
+from src.infrastructure.adapters.postgres_pool import get_async_pool, get_pool
+from src.infrastructure.adapters.repository_retriever import RepositoryRetriever
+
+
+logger = logging.getLogger(__name__)
+
+# Same layout langchain_postgres creates, so either backend can own the tables.
+_SCHEMA = """
+CREATE EXTENSION IF NOT EXISTS vector;
+CREATE TABLE IF NOT EXISTS langchain_pg_collection (
+    uuid UUID PRIMARY KEY,
+    name VARCHAR NOT NULL UNIQUE,
+    cmetadata JSON
+);
+CREATE TABLE IF NOT EXISTS langchain_pg_embedding (
+    id VARCHAR PRIMARY KEY,
+    collection_id UUID REFERENCES langchain_pg_collection (uuid) ON DELETE CASCADE,
+    embedding VECTOR,
+    document VARCHAR,
+    cmetadata JSONB
+);
+CREATE INDEX IF NOT EXISTS ix_cmetadata_gin
+    ON langchain_pg_embedding USING gin (cmetadata jsonb_path_ops);
+"""
+
+# One bounded batch; served by the (collection_id, source_file) index.
+_DELETE_BY_SOURCE = f"""
+    DELETE FROM langchain_pg_embedding
+    WHERE id IN (
+        SELECT id FROM langchain_pg_embedding
+        WHERE collection_id = {collection_id_sql("%s")}
+          AND cmetadata->>'source_file' = %s
+        LIMIT %s
+    )
+"""
+
+_DELETE_CHUNKS = f"""
+    DELETE FROM langchain_pg_embedding
+    WHERE collection_id = {collection_id_sql("%s")}
+      AND cmetadata->>'source_file' = %s
+      AND cmetadata->>'chunk_hash' = ANY(%s)
+"""
+
+class PsycopgVectorRepository(RepositoryPort):
+    """pgvector repository on psycopg 3 with COPY-based bulk insert."""
+
+    def __init__(self, embeddings: EmbeddingsPort):
+        self._settings = get_settings()
+        self._embeddings = embeddings
+        self._collection_name = self._settings.pg_vector_collection_name
+        self._index_manager = PGVectorIndexManager(settings=self._settings)
+        self._delete_batch_size = max(1, self._settings.delete_batch_size)
+        self._pool: ConnectionPool | None = None
+        self._schema_ready = False
+        self._text_search_checked = False
+
+    def _ensure_schema(self) -> None:
+        if not self._schema_ready:
+            with psycopg.connect(self._settings.database_url, autocommit=True) as conn:
+                conn.execute(_SCHEMA)
+                conn.execute(CORPUS_VERSION_SCHEMA)
+                conn.execute(COLLECTION_ALIAS_SCHEMA)
+            self._schema_ready = True
+
+    def _get_pool(self) -> ConnectionPool:
+        """Create the schema on first use and return the shared sync pool."""
+        if self._pool is None:
+            self._ensure_schema()
+            self._pool = get_pool(self._settings)
+        return self._pool
+
+    async def _aget_pool(self) -> AsyncConnectionPool:
+        """Create the schema on first use and return the running loop's shared async pool.
+
+        Not cached: async pools are bound to their event loop, and one
+        repository can serve several loops (Chainlit, asyncio.run in scripts).
+        """
+        if not self._schema_ready:
+            await asyncio.to_thread(self._ensure_schema)
+        return await get_async_pool(self._settings)
+
+    def close(self) -> None:
+        """Release this repository's pool reference (the pools themselves are shared)."""
+        self._pool = None
+
+    def add_documents(
+        self,
+        chunks: List[DocumentChunk],
+        clear_existing: bool = False,
+        collection: str | None = None,
+        embeddings: Optional[List[List[float]]] = None,
+    ) -> int:
+        """Embed chunks (unless embeddings are given) and bulk-load them with
+        binary COPY in one transaction.
+
+        With clear_existing, the chunks are loaded into a shadow collection
+        that then replaces the live one in a single alias swap.
+        """
+        if clear_existing and collection is None:
+            return self._replace(chunks, embeddings)
+        if not chunks:
+            return 0
+
+        if embeddings is None:
+            embeddings = self._embeddings.embed_documents([chunk.content for chunk in chunks])
+
+        with self._get_pool().connection() as conn:
+            with conn.transaction():
+                copy_chunks(conn, collection or self._collection_name, chunks, embeddings)
+                if collection is None:
+                    bump_corpus_version(conn, self._collection_name)
+
+        self._ensure_indexes()
+        return len(chunks)
+
+    async def aadd_documents(
+        self,
+        chunks: List[DocumentChunk],
+        clear_existing: bool = False,
+        collection: str | None = None,
+        embeddings: Optional[List[List[float]]] = None,
+    ) -> int:
+        """Async add_documents on the async pool."""
+        if clear_existing and collection is None:
+            return await asyncio.to_thread(self._replace, chunks, embeddings)
+        if not chunks:
+            return 0
+
+        if embeddings is None:
+            embeddings = await self._embeddings.aembed_documents([chunk.content for chunk in chunks])
+
+        pool = await self._aget_pool()
+        async with pool.connection() as conn:
+            async with conn.transaction():
+                await acopy_chunks(conn, collection or self._collection_name, chunks, embeddings)
+                if collection is None:
+                    await abump_corpus_version(conn, self._collection_name)
+
+        # The index checks and DDL are blocking sync I/O; run them in a thread.
+        await asyncio.to_thread(self._ensure_indexes)
+        return len(chunks)
+
+    def _replace(
+        self, chunks: List[DocumentChunk], embeddings: Optional[List[List[float]]] = None
+    ) -> int:
+        """Replace the live collection with chunks through a one-shot rebuild."""
+        shadow = self.begin_rebuild()
+        try:
+            self.add_documents(chunks, collection=shadow, embeddings=embeddings)
+            self.publish_rebuild(shadow)
+        except Exception:
+            self._discard_quietly(shadow)
+            raise
+        return len(chunks)
+
+    def begin_rebuild(self) -> str:
+        """Create an empty shadow collection and return its name."""
+        shadow = shadow_collection_name(self._collection_name)
+        with self._get_pool().connection() as conn:
+            conn.execute(GET_OR_CREATE_COLLECTION_SQL, (uuid.uuid4(), shadow))
+        return shadow
+
+    def publish_rebuild(self, collection: str) -> None:
+        """Swap the alias to collection; the collection it replaced is kept for
+        rollback and the one before that is dropped."""
+        self._ensure_indexes()
+        with self._get_pool().connection() as conn:
+            with conn.transaction():
+                stale = swap_alias(conn, self._collection_name, collection)
+                bump_corpus_version(conn, self._collection_name)
+            if stale is not None:
+                drop_collection(conn, stale)
+        logger.info("Collection '%s' now serves '%s'", collection, self._collection_name)
+
+    def discard_rebuild(self, collection: str) -> None:
+        """Drop an unpublished shadow collection."""
+        with self._get_pool().connection() as conn:
+            drop_collection(conn, collection)
+
+    def rollback_rebuild(self) -> str | None:
+        """Swap the alias back to the collection the last rebuild replaced."""
+        with self._get_pool().connection() as conn:
+            with conn.transaction():
+                live = rollback_alias(conn, self._collection_name)
+                if live is not None:
+                    bump_corpus_version(conn, self._collection_name)
+        return live
+
+    def _discard_quietly(self, collection: str) -> None:
+        try:
+            self.discard_rebuild(collection)
+        except Exception as e:
+            logger.warning("Could not drop shadow collection '%s': %s", collection, e)
+
+    def _ensure_indexes(self) -> None:
+        if self._settings.vector_index_auto_create:
+            try:
+                self._index_manager.ensure_index()
+                self._index_manager.ensure_source_index()
+            except Exception as e:
+                logger.warning("Could not ensure vector index: %s", e)
+        # The full-text setup rewrites data and builds a GIN index, so it runs
+        # from src/scripts/vector_index.py; here hybrid mode only checks (once)
+        # that it was done.
+        if self._settings.retrieval_mode == "hybrid" and not self._text_search_checked:
+            try:
+                if not self._index_manager.text_search_ready():
+                    logger.warning(
+                        "RETRIEVAL_MODE=hybrid but the full-text index is missing; "
+                        "run `python3 src/scripts/vector_index.py text-search`"
+                    )
+                self._text_search_checked = True
+            except Exception as e:
+                logger.warning("Could not check the full-text search index: %s", e)
+
+    def search(self, query: str, k: int = 10) -> List[DocumentChunk]:
+        """Search for similar documents using MMR, or RRF fusion in hybrid mode."""
+        return self.search_with_scores(query, k)
+
+    def search_with_scores(
+        self, query: str, k: int = 10, include_vectors: bool = False
+    ) -> List[ScoredChunk]:
+        """search, with each chunk's row id and cosine similarity to the query."""
+        query_vector = np.asarray(self._embeddings.embed_query(query), dtype=np.float32)
+
+        with self._get_pool().connection() as conn:
+            if self._settings.retrieval_mode == "hybrid":
+                fused = fetch_hybrid(
+                    conn,
+                    self._collection_name,
+                    query,
+                    query_vector,
+                    k,
+                    resolve_hybrid_candidates(self._settings, k),
+                    self._settings,
+                    self._settings.hybrid_rrf_k,
+                    include_vectors=include_vectors,
+                )
+                return trim_adaptive(self._settings, fused, k)
+            candidates = fetch_candidates(
+                conn,
+                self._collection_name,
+                query_vector,
+                resolve_fetch_k(self._settings, k),
+                self._settings,
+            )
+
+        return candidates.select(self._settings, query_vector, k, include_vectors)
+
+    def search_many(
+        self,
+        queries: List[str],
+        k: int = 10,
+        query_embeddings: Optional[List[List[float]]] = None,
+    ) -> List[List[DocumentChunk]]:
+        """Search a batch of queries: one embedding call and one candidate query for all of them.
+
+        In hybrid mode each query runs the fused RRF statement, still on one
+        pooled connection and with the batched query embeddings.
+        """
+        return self.search_many_with_scores(queries, k, query_embeddings=query_embeddings)
+
+    def search_many_with_scores(
+        self,
+        queries: List[str],
+        k: int = 10,
+        include_vectors: bool = False,
+        query_embeddings: Optional[List[List[float]]] = None,
+    ) -> List[List[ScoredChunk]]:
+        """search_many, with each chunk's row id and cosine similarity to its query."""
+        if not queries:
+            return []
+        if query_embeddings is None:
+            query_embeddings = self._embeddings.embed_queries(queries)
+        query_vectors = np.asarray(query_embeddings, dtype=np.float32)
+
+        with self._get_pool().connection() as conn:
+            if self._settings.retrieval_mode == "hybrid":
+                candidates = resolve_hybrid_candidates(self._settings, k)
+                return [
+                    trim_adaptive(
+                        self._settings,
+                        fetch_hybrid(
+                            conn,
+                            self._collection_name,
+                            query,
+                            vector,
+                            k,
+                            candidates,
+                            self._settings,
+                            self._settings.hybrid_rrf_k,
+                            include_vectors=include_vectors,
+                        ),
+                        k,
+                    )
+                    for query, vector in zip(queries, query_vectors)
+                ]
+            batches = fetch_candidates_many(
+                conn,
+                self._collection_name,
+                query_vectors,
+                resolve_fetch_k(self._settings, k),
+                self._settings,
+            )
+
+        return [
+            candidates.select(self._settings, vector, k, include_vectors)
+            for candidates, vector in zip(batches, query_vectors)
+        ]
+
+    async def asearch(self, query: str, k: int = 10) -> List[DocumentChunk]:
+        """Async search: query embedding and SQL both awaited on the event loop."""
+        return await self.asearch_with_scores(query, k)
+
+    async def asearch_with_scores(
+        self, query: str, k: int = 10, include_vectors: bool = False
+    ) -> List[ScoredChunk]:
+        """Async search_with_scores."""
+        query_vector = np.asarray(await self._embeddings.aembed_query(query), dtype=np.float32)
+
+        pool = await self._aget_pool()
+        async with pool.connection() as conn:
+            if self._settings.retrieval_mode == "hybrid":
+                fused = await afetch_hybrid(
+                    conn,
+                    self._collection_name,
+                    query,
+                    query_vector,
+                    k,
+                    resolve_hybrid_candidates(self._settings, k),
+                    self._settings,
+                    self._settings.hybrid_rrf_k,
+                    include_vectors=include_vectors,
+                )
+                return trim_adaptive(self._settings, fused, k)
+            candidates = await afetch_candidates(
+                conn,
+                self._collection_name,
+                query_vector,
+                resolve_fetch_k(self._settings, k),
+                self._settings,
+            )
+
+        return candidates.select(self._settings, query_vector, k, include_vectors)
+
+    def delete_by_source(self, source_file: str) -> int:
+        """
+        Delete all chunks from a specific source file.
+
+        Runs in batches of DELETE_BATCH_SIZE rows, each committed on its own,
+        so a large document never holds its locks in one long transaction.
+        Every batch that deleted rows bumps the corpus version in its own
+        transaction, so no committed deletion is served from a stale answer
+        cache while later batches run.
+        """
+        params = (self._collection_name, source_file, self._delete_batch_size)
+        deleted = 0
+        with self._get_pool().connection() as conn:
+            while True:
+                with conn.transaction():
+                    cur = conn.execute(_DELETE_BY_SOURCE, params, prepare=True)
+                    deleted += cur.rowcount
+                    done = cur.rowcount < self._delete_batch_size
+                    if cur.rowcount:
+                        bump_corpus_version(conn, self._collection_name)
+                if done:
+                    return deleted
+
+    def delete_chunks(self, source_file: str, chunk_hashes: List[str]) -> int:
+        """Delete the chunks of a source file with the given chunk_hash values."""
+        if not chunk_hashes:
+            return 0
+        with self._get_pool().connection() as conn:
+            with conn.transaction():
+                cur = conn.execute(
+                    _DELETE_CHUNKS, (self._collection_name, source_file, list(chunk_hashes))
+                )
+                if cur.rowcount:
+                    bump_corpus_version(conn, self._collection_name)
+            return cur.rowcount
+
+    async def adelete_by_source(self, source_file: str) -> int:
+        """Async delete_by_source."""
+        pool = await self._aget_pool()
+        params = (self._collection_name, source_file, self._delete_batch_size)
+        deleted = 0
+        async with pool.connection() as conn:
+            while True:
+                async with conn.transaction():
+                    cur = await conn.execute(_DELETE_BY_SOURCE, params, prepare=True)
+                    deleted += cur.rowcount
+                    done = cur.rowcount < self._delete_batch_size
+                    if cur.rowcount:
+                        await abump_corpus_version(conn, self._collection_name)
+                if done:
+                    return deleted
+
+    def corpus_version(self) -> int:
+        """Counter bumped by every add_documents / delete_by_source on this collection."""
+        with self._get_pool().connection() as conn:
+            return read_corpus_version(conn, self._collection_name)
+
+    async def acorpus_version(self) -> int:
+        """Async corpus_version."""
+        pool = await self._aget_pool()
+        async with pool.connection() as conn:
+            return await aread_corpus_version(conn, self._collection_name)
+
+    def get_retriever(self, k: int = 10):
+        """Get a LangChain retriever that runs this repository's MMR search."""
+        return RepositoryRetriever(repository=self, k=k)
+
+    def ensure_index(self, concurrently: bool = False) -> bool:
+        """Create the ANN index if missing. Returns True when one was created."""
+        return self._index_manager.ensure_index(concurrently=concurrently)
+
+    def index_status(self) -> VectorIndexStatus:
+        """Report the state of the ANN index."""
+        return self._index_manager.status()
+
+    def rebuild_index(self, concurrently: bool = True) -> None:
+        """Rebuild the ANN index with current settings without blocking searches."""
+        self._index_manager.rebuild(concurrently=concurrently)
@@ -0,0 +1,25 @@
+"""
+LangChain retriever backed by a RepositoryPort.
+Lets repositories that do not wrap a LangChain vector store satisfy
+`RepositoryPort.get_retriever`.
+"""
+from typing import Any, List
+
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document as LangchainDocument
+from langchain_core.retrievers import BaseRetriever
+
+
+class RepositoryRetriever(BaseRetriever):
+    """Retriever that delegates to `repository.search(query, k=k)`."""
+
+    repository: Any
+    k: int = 10
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[LangchainDocument]:
+        return [
+            LangchainDocument(page_content=chunk.content, metadata=chunk.metadata)
+            for chunk in self.repository.search(query, k=self.k)
+        ]
@@ -0,0 +1,192 @@
+"""
+Semantic answer cache.
+Implements AnswerCachePort in process memory, matching questions by embedding.
+
+A new question reuses a stored SearchResult when its embedding's cosine
+similarity to a cached question is at least the threshold and both were
+answered on the same corpus version. Seeing a newer corpus version drops
+every entry, so any add_documents / delete_by_source invalidates the cache.
+"""
+import dataclasses
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+
+import numpy as np
+
+from src.domain.entities.document import SearchResult
+from src.domain.ports.answer_cache import AnswerCachePort, AnswerCacheStats
+from src.domain.ports.embeddings import EmbeddingsPort
+from src.infrastructure.adapters.cached_embeddings import normalize_query
+
+
+# Misses scoring within this margin below the threshold are counted as near misses.
+NEAR_MISS_MARGIN = 0.05
+
+
+def _unit(embedding: list[float]) -> np.ndarray:
+    """float32 copy of an embedding scaled to unit length, so dot products are cosines."""
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+@dataclasses.dataclass
+class _Entry:
+    vector: np.ndarray
+    result: SearchResult
+    expires_at: float
+
+
+class InMemorySemanticAnswerCache(AnswerCachePort):
+    """Answer cache keyed by query embedding similarity and corpus version."""
+
+    def __init__(
+        self,
+        embeddings: EmbeddingsPort,
+        threshold: float = 0.97,
+        max_entries: int = 512,
+        ttl_seconds: float | None = 86400,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._embeddings = embeddings
+        self._threshold = threshold
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: list[_Entry] = []
+        self._matrix: np.ndarray | None = None  # stacked entry vectors, rebuilt lazily
+        self._version: int | None = None
+        # Vectors computed by lookup(), reused by the store() that follows a miss.
+        # Batches pass their embeddings to both calls instead, so this only
+        # has to cover concurrent single questions.
+        self._recent: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._stats = AnswerCacheStats(threshold=threshold)
+
+    def _vector(self, query: str, embedding: list[float] | None) -> np.ndarray:
+        """The caller's embedding when given (nothing to remember), else _embed."""
+        if embedding is not None:
+            return _unit(embedding)
+        return self._embed(query)
+
+    def _embed(self, query: str) -> np.ndarray:
+        key = normalize_query(query)
+        vector = self._recalled(key)
+        if vector is None:
+            vector = self._remember(key, self._embeddings.embed_query(key))
+        return vector
+
+    async def _aembed(self, query: str) -> np.ndarray:
+        key = normalize_query(query)
+        vector = self._recalled(key)
+        if vector is None:
+            vector = self._remember(key, await self._embeddings.aembed_query(key))
+        return vector
+
+    def _recalled(self, key: str) -> np.ndarray | None:
+        with self._lock:
+            return self._recent.get(key)
+
+    def _remember(self, key: str, embedding: list[float]) -> np.ndarray:
+        vector = _unit(embedding)
+        with self._lock:
+            self._recent[key] = vector
+            while len(self._recent) > 64:
+                self._recent.popitem(last=False)
+        return vector
+
+    def lookup(
+        self, query: str, corpus_version: int, embedding: list[float] | None = None
+    ) -> SearchResult | None:
+        """Return the result of the most similar cached question, if similar enough."""
+        return self._match(query, self._vector(query, embedding), corpus_version)
+
+    async def alookup(self, query: str, corpus_version: int) -> SearchResult | None:
+        """Async lookup; only the query embedding is awaited."""
+        return self._match(query, await self._aembed(query), corpus_version)
+
+    def store(
+        self,
+        query: str,
+        corpus_version: int,
+        result: SearchResult,
+        embedding: list[float] | None = None,
+    ) -> None:
+        """Cache a freshly generated result; results for stale versions are ignored."""
+        if self._max_entries <= 0:
+            return
+        self._insert(query, self._vector(query, embedding), corpus_version, result)
+
+    async def astore(self, query: str, corpus_version: int, result: SearchResult) -> None:
+        """Async store; only the query embedding is awaited."""
+        if self._max_entries <= 0:
+            return
+        self._insert(query, await self._aembed(query), corpus_version, result)
+
+    def _match(self, query: str, vector: np.ndarray, corpus_version: int) -> SearchResult | None:
+        with self._lock:
+            self._sync_version(corpus_version)
+            self._purge_expired()
+            if not self._entries:
+                self._stats.misses += 1
+                return None
+
+            if self._matrix is None:
+                self._matrix = np.stack([entry.vector for entry in self._entries])
+            similarities = self._matrix @ vector
+            best = int(np.argmax(similarities))
+            score = float(similarities[best])
+
+            if score < self._threshold:
+                self._stats.misses += 1
+                if score >= self._threshold - NEAR_MISS_MARGIN:
+                    self._stats.near_misses += 1
+                return None
+
+            self._stats.hits += 1
+            cached = self._entries[best].result
+        return dataclasses.replace(cached, query=query)
+
+    def _insert(
+        self, query: str, vector: np.ndarray, corpus_version: int, result: SearchResult
+    ) -> None:
+        expires_at = self._clock() + self._ttl if self._ttl else float("inf")
+        with self._lock:
+            self._sync_version(corpus_version)
+            if corpus_version != self._version:
+                return
+            self._recent.pop(normalize_query(query), None)
+            self._entries.append(_Entry(vector, result, expires_at))
+            if len(self._entries) > self._max_entries:
+                del self._entries[0]
+            self._matrix = None
+            self._stats.stores += 1
+            self._stats.entries = len(self._entries)
+
+    def stats(self) -> AnswerCacheStats:
+        """Snapshot of hit/miss/near-miss counters and current size."""
+        with self._lock:
+            return dataclasses.replace(self._stats)
+
+    def _sync_version(self, corpus_version: int) -> None:
+        """Drop every entry when the corpus moved forward; caller holds the lock."""
+        if self._version is not None and corpus_version < self._version:
+            # A result computed before the latest write; keep the newer entries.
+            return
+        if corpus_version != self._version:
+            if self._entries:
+                self._stats.invalidations += 1
+            self._entries = []
+            self._matrix = None
+            self._stats.entries = 0
+            self._version = corpus_version
+
+    def _purge_expired(self) -> None:
+        now = self._clock()
+        live = [entry for entry in self._entries if entry.expires_at > now]
+        if len(live) != len(self._entries):
+            self._entries = live
+            self._matrix = None
+            self._stats.entries = len(live)
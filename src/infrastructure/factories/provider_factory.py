@@ -3,22 +3,32 @@ Provider factory.
 Creates instances of embeddings, LLM, repository, and document loader based on configuration.
 """
 from src.config.settings import get_settings
+from src.domain.ports.answer_cache import AnswerCachePort
 from src.domain.ports.embeddings import EmbeddingsPort
 from src.domain.ports.llm import LLMPort
 from src.domain.ports.password_hasher import PasswordHasherPort
 from src.domain.ports.repository import RepositoryPort
 from src.domain.ports.document_loader import DocumentLoaderPort
+from src.domain.ports.document_registry import DocumentRegistryPort
+from src.domain.ports.ingest_job_queue import IngestJobQueuePort
 from src.domain.ports.user_repository import UserRepositoryPort
 from src.domain.exceptions import ProviderNotConfiguredError
 
 from src.infrastructure.adapters.openai_embeddings import OpenAIEmbeddingsAdapter
+from src.infrastructure.adapters.cached_embeddings import CachedEmbeddings
+from src.infrastructure.adapters.postgres_embedding_cache import PostgresEmbeddingCache
 from src.infrastructure.adapters.google_embeddings import GoogleEmbeddingsAdapter
 from src.infrastructure.adapters.openai_llm import OpenAILLMAdapter
 from src.infrastructure.adapters.google_llm import GoogleLLMAdapter
 from src.infrastructure.adapters.pgvector_repository import PGVectorRepository
+from src.infrastructure.adapters.psycopg_vector_repository import PsycopgVectorRepository
 from src.infrastructure.adapters.document_loader import MultiFormatDocumentLoader
 from src.infrastructure.adapters.argon2_password_hasher import Argon2PasswordHasher
+from src.infrastructure.adapters.bounded_password_hasher import BoundedPasswordHasher
 from src.infrastructure.adapters.postgres_user_repository import PostgresUserRepository
+from src.infrastructure.adapters.postgres_ingest_jobs import PostgresIngestJobQueue
+from src.infrastructure.adapters.postgres_document_registry import PostgresDocumentRegistry
+from src.infrastructure.adapters.semantic_answer_cache import InMemorySemanticAnswerCache
 
 
 class ProviderFactory:
@@ -30,6 +40,9 @@ class ProviderFactory:
     _document_loader: DocumentLoaderPort | None = None
     _user_repository: UserRepositoryPort | None = None
     _password_hasher: PasswordHasherPort | None = None
+    _answer_cache: AnswerCachePort | None = None
+    _ingest_job_queue: IngestJobQueuePort | None = None
+    _document_registry: DocumentRegistryPort | None = None
 
     @classmethod
     def get_embeddings(cls) -> EmbeddingsPort:
@@ -43,13 +56,29 @@ class ProviderFactory:
             if not settings.openai_api_key:
                 raise ProviderNotConfiguredError("OpenAI API key not configured")
             cls._embeddings = OpenAIEmbeddingsAdapter()
+            model = settings.openai_embedding_model
         elif settings.llm_provider == "google":
             if not settings.google_api_key:
                 raise ProviderNotConfiguredError("Google API key not configured")
             cls._embeddings = GoogleEmbeddingsAdapter()
+            model = settings.google_embedding_model
         else:
             raise ProviderNotConfiguredError(f"Unknown provider: {settings.llm_provider}")
 
+        if settings.document_embedding_cache_enabled:
+            cls._embeddings = PostgresEmbeddingCache(
+                cls._embeddings,
+                model=f"{settings.llm_provider}:{model}",
+                batch_size=settings.embedding_batch_size,
+            )
+        if settings.embedding_cache_enabled:
+            cls._embeddings = CachedEmbeddings(
+                cls._embeddings,
+                max_entries=settings.embedding_cache_max_entries,
+                max_bytes=settings.embedding_cache_max_mb * 1024 * 1024,
+                ttl_seconds=settings.embedding_cache_ttl_seconds,
+            )
+
         return cls._embeddings
 
     @classmethod
@@ -75,15 +104,36 @@ class ProviderFactory:
 
     @classmethod
     def get_repository(cls) -> RepositoryPort:
-        """Get repository instance."""
+        """Get repository instance based on the configured vector store backend."""
         if cls._repository is not None:
             return cls._repository
 
         embeddings = cls.get_embeddings()
-        cls._repository = PGVectorRepository(embeddings)
+        if get_settings().vector_store_backend == "psycopg":
+            cls._repository = PsycopgVectorRepository(embeddings)
+        else:
+            cls._repository = PGVectorRepository(embeddings)
 
         return cls._repository
 
+    @classmethod
+    def get_answer_cache(cls) -> AnswerCachePort | None:
+        """Get the shared answer cache, or None when ANSWER_CACHE_ENABLED is off."""
+        if cls._answer_cache is not None:
+            return cls._answer_cache
+
+        settings = get_settings()
+        if not settings.answer_cache_enabled:
+            return None
+
+        cls._answer_cache = InMemorySemanticAnswerCache(
+            cls.get_embeddings(),
+            threshold=settings.answer_cache_threshold,
+            max_entries=settings.answer_cache_max_entries,
+            ttl_seconds=settings.answer_cache_ttl_seconds,
+        )
+        return cls._answer_cache
+
     @classmethod
     def get_document_loader(cls) -> DocumentLoaderPort:
         """Get document loader instance."""
@@ -100,11 +150,44 @@ class ProviderFactory:
             cls._user_repository = PostgresUserRepository()
         return cls._user_repository
 
+    @classmethod
+    def get_document_registry(cls) -> DocumentRegistryPort | None:
+        """Get the document registry, or None when DOCUMENT_REGISTRY_ENABLED is off."""
+        if cls._document_registry is not None:
+            return cls._document_registry
+
+        settings = get_settings()
+        if not settings.document_registry_enabled:
+            return None
+
+        cls._document_registry = PostgresDocumentRegistry(settings.pg_vector_collection_name)
+        return cls._document_registry
+
+    @classmethod
+    def get_ingest_job_queue(cls) -> IngestJobQueuePort:
+        """Get the background ingestion job queue."""
+        if cls._ingest_job_queue is None:
+            settings = get_settings()
+            cls._ingest_job_queue = PostgresIngestJobQueue(
+                max_attempts=settings.ingest_job_max_attempts,
+                stale_seconds=settings.ingest_job_stale_seconds,
+                retry_delay_seconds=settings.ingest_job_retry_delay_seconds,
+            )
+        return cls._ingest_job_queue
+
     @classmethod
     def get_password_hasher(cls) -> PasswordHasherPort:
-        """Get password hasher instance."""
+        """Get password hasher instance, on a bounded process pool unless PASSWORD_HASH_WORKERS=0."""
         if cls._password_hasher is None:
-            cls._password_hasher = Argon2PasswordHasher()
+            settings = get_settings()
+            hasher: PasswordHasherPort = Argon2PasswordHasher()
+            if settings.password_hash_workers > 0:
+                hasher = BoundedPasswordHasher(
+                    hasher,
+                    workers=settings.password_hash_workers,
+                    max_queue=settings.password_hash_max_queue,
+                )
+            cls._password_hasher = hasher
         return cls._password_hasher
 
     @classmethod
@@ -116,3 +199,6 @@ class ProviderFactory:
         cls._document_loader = None
         cls._user_repository = None
         cls._password_hasher = None
+        cls._answer_cache = None
+        cls._ingest_job_queue = None
+        cls._document_registry = None
@@ -6,6 +6,17 @@ Usage (from project root, after `docker compose up -d`):
     python3 src/ingest.py                           # ingest PDF_PATH from .env (replaces collection)
     python3 src/ingest.py path/to/file.pdf          # ingest a specific file (replaces collection)
     python3 src/ingest.py path/to/file.pdf --append # add a file, keeping previously ingested ones
+    python3 src/ingest.py a.pdf b.docx c.md         # several files in parallel (replaces collection)
+    python3 src/ingest.py --sync docs/              # incremental: only new/changed files and chunks
+    python3 src/ingest.py --sync docs/ --prune      # ... and remove documents no longer under docs/
+    python3 src/ingest.py --rollback                # restore the collection the last replace swapped out
+
+With the document registry (DOCUMENT_REGISTRY_ENABLED, default on), --append
+and --sync skip unchanged files and replace only the chunks of a changed file
+that differ; re-adding a file never duplicates it.
+
+Replacing the collection builds a new one next to the live one and swaps
+them when it is complete, so searches keep working during the ingestion.
 """
 import os
 import sys
@@ -43,23 +54,128 @@ def ingest(file_path: str | None = None, append: bool = False):
     use_case = IngestDocumentUseCase(
         ProviderFactory.get_repository(),
         ProviderFactory.get_document_loader(),
+        registry=ProviderFactory.get_document_registry(),
+        embeddings=ProviderFactory.get_embeddings(),
     )
     return use_case.execute(file_path, clear_existing=not append)
 
 
+def ingest_many(file_paths: list[str], append: bool = False):
+    """Ingest several documents through the parallel pipeline. Returns a BatchIngestResult."""
+    from src.infrastructure.factories.provider_factory import ProviderFactory
+    from src.application.use_cases.ingest_document import IngestDocumentUseCase
+
+    resolved = []
+    for file_path in file_paths:
+        if not os.path.isabs(file_path):
+            file_path = os.path.join(PROJECT_ROOT, file_path)
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"Document not found: {file_path}")
+        resolved.append(file_path)
+
+    use_case = IngestDocumentUseCase(
+        ProviderFactory.get_repository(),
+        ProviderFactory.get_document_loader(),
+        registry=ProviderFactory.get_document_registry(),
+        embeddings=ProviderFactory.get_embeddings(),
+    )
+    return use_case.execute_many(resolved, clear_existing=not append)
+
+
+def collect_files(paths: list[str], extensions: set[str]) -> list[tuple[str, str]]:
+    """Resolve paths to (path, source_name) pairs; directories are walked for supported files.
+
+    A file found under a directory is named by its path relative to it, so
+    equal file names in different subdirectories stay distinct documents.
+    """
+    files = []
+    for path in paths:
+        if not os.path.isabs(path):
+            path = os.path.join(PROJECT_ROOT, path)
+        if os.path.isdir(path):
+            for root, dirs, names in os.walk(path):
+                dirs.sort()
+                for name in sorted(names):
+                    if os.path.splitext(name)[1].lower().lstrip(".") in extensions:
+                        full = os.path.join(root, name)
+                        files.append((full, os.path.relpath(full, path).replace(os.sep, "/")))
+        elif os.path.exists(path):
+            files.append((path, os.path.basename(path)))
+        else:
+            raise FileNotFoundError(f"Document not found: {path}")
+    return files
+
+
+def sync(paths: list[str], prune: bool = False):
+    """Incrementally re-ingest files and directories. Returns a BatchSyncResult."""
+    from src.infrastructure.factories.provider_factory import ProviderFactory
+    from src.application.use_cases.ingest_document import IngestDocumentUseCase
+
+    registry = ProviderFactory.get_document_registry()
+    if registry is None:
+        raise RuntimeError("--sync needs the document registry (DOCUMENT_REGISTRY_ENABLED=true)")
+
+    loader = ProviderFactory.get_document_loader()
+    files = collect_files(paths, set(loader.supported_extensions()))
+    if prune and not files:
+        raise ValueError("No supported files found; refusing to prune every document")
+    use_case = IngestDocumentUseCase(
+        ProviderFactory.get_repository(), loader, registry=registry, embeddings=ProviderFactory.get_embeddings()
+    )
+    return use_case.sync_many(files, prune=prune)
+
+
+def rollback():
+    """Make the collection replaced by the last full ingestion live again.
+
+    Returns its name, or None if there is nothing to roll back to. The
+    document registry keeps its rows per physical collection, so the
+    catalog follows the alias back without being touched here.
+    """
+    from src.infrastructure.factories.provider_factory import ProviderFactory
+
+    return ProviderFactory.get_repository().rollback_rebuild()
+
+
 def main():
     _ensure_venv_python()
 
     args = sys.argv[1:]
+    if "--rollback" in args:
+        try:
+            from dotenv import load_dotenv
+            load_dotenv(os.path.join(PROJECT_ROOT, ".env"))
+            collection = rollback()
+        except Exception as e:
+            print(f"❌ Rollback failed: {e}")
+            sys.exit(1)
+        if collection is None:
+            print("⚠️ Nothing to roll back to: no previous collection is kept.")
+            sys.exit(1)
+        print(f"⏪ Rolled back: searches now read collection '{collection}'.")
+        return
+
     append = "--append" in args
-    positional = [a for a in args if a != "--append"]
+    sync_mode = "--sync" in args
+    prune = "--prune" in args
+    positional = [a for a in args if a not in ("--append", "--sync", "--prune")]
     file_path = positional[0] if positional else None
 
-    print("🔄 Starting ingestion..." + (" (append mode)" if append else ""))
+    if sync_mode:
+        print("🔄 Syncing..." + (" (pruning removed documents)" if prune else ""))
+    else:
+        print("🔄 Starting ingestion..." + (" (append mode)" if append else ""))
     try:
         from dotenv import load_dotenv
         load_dotenv(os.path.join(PROJECT_ROOT, ".env"))
-        document = ingest(file_path, append=append)
+        if sync_mode:
+            if not positional:
+                raise ValueError("--sync needs at least one file or directory")
+            result = sync(positional, prune=prune)
+        elif len(positional) > 1:
+            result = ingest_many(positional, append=append)
+        else:
+            document = ingest(file_path, append=append)
     except ModuleNotFoundError as e:
         print(f"❌ Missing dependency: {e}")
         print("💡 Install dependencies first: run `python3 main.py` (option 1)")
@@ -69,7 +185,31 @@ def main():
         print("💡 Is Docker up (`docker compose up -d`)? Is `.env` configured?")
         sys.exit(1)
 
-    print(f"✅ Ingestion complete! '{document.name}' → {document.chunk_count} chunks stored.")
+    if sync_mode:
+        for error in result.errors.values():
+            print(f"❌ {error}")
+        print(
+            f"📊 {len(result.results)} files in {result.elapsed_seconds:.1f}s ({result.files_per_second:.0f} files/s): "
+            f"{result.unchanged} unchanged, {result.added} chunks added, {result.removed} removed"
+            + (f", {len(result.pruned)} documents pruned" if prune else "")
+        )
+        if result.errors and len(result.errors) == len(result.results):
+            sys.exit(1)
+    elif len(positional) > 1:
+        for document in result.documents:
+            if document is not None:
+                print(f"✅ '{document.name}' → {document.chunk_count} chunks stored.")
+        for index, error in result.errors.items():
+            print(f"❌ {positional[index]}: {error}")
+        print(
+            f"📊 {len(positional) - len(result.errors)}/{len(positional)} files, {result.chunk_count} chunks "
+            f"in {result.elapsed_seconds:.1f}s ({result.files_per_second:.2f} files/s, "
+            f"{result.chunks_per_second:.0f} chunks/s)"
+        )
+        if len(result.errors) == len(positional):
+            sys.exit(1)
+    else:
+        print(f"✅ Ingestion complete! '{document.name}' → {document.chunk_count} chunks stored.")
     print('💬 Now ask away: python3 src/chat.py "your question"')
 
 
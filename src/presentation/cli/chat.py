@@ -15,6 +15,7 @@ from dotenv import load_dotenv
 from src.infrastructure.factories.provider_factory import ProviderFactory
 from src.application.use_cases.ingest_document import IngestDocumentUseCase
 from src.application.use_cases.search_documents import SearchDocumentsUseCase
+from src.domain.entities.document import SearchResult
 
 
 def list_documents(directory: str = ".") -> list[str]:
@@ -81,7 +82,12 @@ def main():
         document_loader = ProviderFactory.get_document_loader()
 
         # Ingest document
-        ingest_use_case = IngestDocumentUseCase(repository, document_loader)
+        ingest_use_case = IngestDocumentUseCase(
+            repository,
+            document_loader,
+            registry=ProviderFactory.get_document_registry(),
+            embeddings=ProviderFactory.get_embeddings(),
+        )
         document = ingest_use_case.execute(doc_file, clear_existing=True)
         
         print(f"✅ Ingestion complete! {document.chunk_count} chunks created.")
@@ -106,8 +112,14 @@ def main():
                     break
                 
                 print("🔍 Searching...")
-                result = search_use_case.execute(question)
-                print(f"\n🧠 DocMind:\n{result.answer}\n")
+                print("\n🧠 DocMind:")
+                for item in search_use_case.stream(question):
+                    if isinstance(item, SearchResult):
+                        if item.time_to_first_token is not None:
+                            print(f"\n⏱️  First token after {item.time_to_first_token * 1000:.0f} ms")
+                    else:
+                        print(item, end="", flush=True)
+                print("\n")
                 
             except KeyboardInterrupt:
                 print("\n👋 See you later!")
@@ -4,9 +4,13 @@ Web-based chat interface for document Q&A.
 
 Run with: chainlit run chainlit_app.py --port 8000
 """
+import asyncio
 import os
+import shutil
 import sys
 import logging
+import time
+import uuid
 from pathlib import Path
 
 # Add project root to path
@@ -33,11 +37,15 @@ from typing import Optional
 import chainlit as cl
 from dotenv import load_dotenv
 
+from src.application.metrics import CONTEXT_TOKENS_SAVED, LLM_CALLS_AVOIDED, TIME_TO_FIRST_TOKEN
 from src.application.use_cases.authenticate_or_register_user import (
     AuthenticateOrRegisterUserUseCase,
 )
 from src.application.use_cases.ingest_document import IngestDocumentUseCase
 from src.application.use_cases.search_documents import SearchDocumentsUseCase
+from src.config.settings import get_settings
+from src.domain.entities.document import SearchResult
+from src.domain.entities.ingest_job import DONE, FAILED, RUNNING, IngestJob
 from src.domain.exceptions import DomainException
 from src.infrastructure.factories.provider_factory import ProviderFactory
 
@@ -57,7 +65,7 @@ async def _auth(identifier: str, password: str) -> Optional[cl.User]:
     )
     safe_id = (identifier or "").strip()[:64]
     try:
-        user = await cl.make_async(use_case.execute)(identifier, password)
+        user = await use_case.aexecute(identifier, password)
     except DomainException as exc:
         print(f"[auth] denied for '{safe_id}': {type(exc).__name__}: {exc}", file=sys.stderr)
         return None
@@ -92,7 +100,66 @@ def _is_supported_file(element) -> bool:
 
 def _create_search_use_case() -> SearchDocumentsUseCase:
     """Create a SearchDocumentsUseCase from factory singletons."""
-    return SearchDocumentsUseCase(ProviderFactory.get_repository(), ProviderFactory.get_llm())
+    return SearchDocumentsUseCase(
+        ProviderFactory.get_repository(),
+        ProviderFactory.get_llm(),
+        answer_cache=ProviderFactory.get_answer_cache(),
+        embeddings=ProviderFactory.get_embeddings(),
+    )
+
+
+def _format_cache_stats() -> str:
+    """Render time-to-first-token and cache counters for the `/stats` command."""
+    lines = ["## 📈 Cache Stats\n"]
+
+    ttft = TIME_TO_FIRST_TOKEN.stats()
+    if ttft.count:
+        lines.append(
+            f"**Time to first token:** p50 {ttft.p50 * 1000:.0f} ms • "
+            f"p95 {ttft.p95 * 1000:.0f} ms • last {ttft.last * 1000:.0f} ms "
+            f"({ttft.count} answers)\n"
+        )
+
+    floor = get_settings().relevance_floor
+    if floor is not None:
+        lines.append(
+            f"**Relevance floor** ({floor:.2f}): {LLM_CALLS_AVOIDED.value} LLM calls avoided\n"
+        )
+
+    if get_settings().context_assembly_enabled:
+        lines.append(f"**Context assembly:** ~{CONTEXT_TOKENS_SAVED.value} prompt tokens saved\n")
+
+    answer_cache = ProviderFactory.get_answer_cache()
+    if answer_cache is None:
+        lines.append("**Answer cache:** disabled (`ANSWER_CACHE_ENABLED=false`)")
+    else:
+        s = answer_cache.stats()
+        lines.append(
+            f"**Answer cache** (threshold {s.threshold:.2f}): "
+            f"{s.hits} hits / {s.misses} misses — **{s.hit_rate:.0%}** hit rate\n"
+            f"- near misses (within 0.05 of threshold): {s.near_misses}\n"
+            f"- entries: {s.entries} • stored: {s.stores} • invalidations: {s.invalidations}"
+        )
+
+    embeddings = ProviderFactory.get_embeddings()
+    if hasattr(embeddings, "stats"):
+        e = embeddings.stats()
+        lines.append(
+            f"\n**Query embedding cache:** {e.hits} hits / {e.misses} misses — "
+            f"**{e.hit_rate:.0%}** hit rate\n"
+            f"- entries: {e.entries} • {e.bytes / 1024:.0f} KB • evictions: {e.evictions}"
+        )
+
+    hasher = ProviderFactory.get_password_hasher()
+    if hasattr(hasher, "stats"):
+        h = hasher.stats()
+        lines.append(
+            f"\n**Password hashing:** {h.running}/{h.workers} workers busy • "
+            f"queue {h.queued}/{h.max_queue} (peak {h.peak_queued})\n"
+            f"- completed: {h.completed} • rejected when saturated: {h.rejected}"
+        )
+
+    return "\n".join(lines)
 
 
 @cl.on_chat_resume
@@ -153,19 +220,51 @@ async def update_thread_metadata():
 
 
 
+def _format_size(size_bytes: int) -> str:
+    if size_bytes >= 1024 * 1024:
+        return f"{size_bytes / (1024 * 1024):.1f} MB"
+    return f"{size_bytes / 1024:.0f} KB"
+
+
+async def _library() -> dict[str, tuple[int, str]]:
+    """Documents to list: name -> (chunk count, extra details).
+
+    With the document registry enabled this is the catalog of the whole
+    collection (one indexed query, no scan of the embeddings); otherwise,
+    or if the catalog cannot be read, the documents uploaded in this session.
+    """
+    registry = ProviderFactory.get_document_registry()
+    if registry is not None:
+        try:
+            entries = await registry.alist_documents()
+        except Exception as e:
+            logging.getLogger(__name__).warning("Could not read the document catalog: %s", e)
+        else:
+            return {
+                entry.source_file: (
+                    entry.chunk_count,
+                    f" • {_format_size(entry.size_bytes)}"
+                    + (f" • {entry.ingested_at:%Y-%m-%d %H:%M}" if entry.ingested_at else ""),
+                )
+                for entry in entries
+            }
+    pdf_data = cl.user_session.get("pdf_data") or {}
+    return {name: (chunks, "") for name, chunks in pdf_data.items()}
+
+
 async def show_pdf_list():
     """Display list of documents with delete buttons."""
-    pdf_data = cl.user_session.get("pdf_data") or {}
+    library = await _library()
 
-    if not pdf_data:
+    if not library:
         await cl.Message(content="📦 **No documents loaded yet!** Upload a file to get started. 🚀").send()
         return
 
     content = "📚 **Your Document Library:**\n\n"
     actions = []
 
-    for pdf_name, chunks in pdf_data.items():
-        content += f"• **{pdf_name}** ({chunks} chunks)\n"
+    for pdf_name, (chunks, details) in library.items():
+        content += f"• **{pdf_name}** ({chunks} chunks{details})\n"
         actions.append(
             cl.Action(
                 name="delete_pdf",
@@ -174,8 +273,8 @@ async def show_pdf_list():
             )
         )
 
-    total_chunks = sum(pdf_data.values())
-    content += f"\n📊 **Total:** {len(pdf_data)} document{'s' if len(pdf_data) != 1 else ''} • {total_chunks} chunks"
+    total_chunks = sum(chunks for chunks, _ in library.values())
+    content += f"\n📊 **Total:** {len(library)} document{'s' if len(library) != 1 else ''} • {total_chunks} chunks"
 
     actions.append(
         cl.Action(name="refresh_list", payload={}, label="🔄 Refresh List")
@@ -193,8 +292,13 @@ async def handle_delete_pdf(action: cl.Action):
     await msg.send()
 
     try:
+        # Unregister first: a registry entry left for deleted chunks would make
+        # the next upload of the same file look unchanged.
+        registry = ProviderFactory.get_document_registry()
+        if registry is not None:
+            await asyncio.to_thread(registry.delete, pdf_name)
         repository = ProviderFactory.get_repository()
-        deleted = await cl.make_async(repository.delete_by_source)(pdf_name)
+        deleted = await repository.adelete_by_source(pdf_name)
 
         pdf_data = cl.user_session.get("pdf_data") or {}
         if pdf_name in pdf_data:
@@ -230,13 +334,20 @@ async def handle_show_pdfs(action: cl.Action):
     await show_pdf_list()
 
 
+def _create_ingest_use_case() -> IngestDocumentUseCase:
+    return IngestDocumentUseCase(
+        ProviderFactory.get_repository(),
+        ProviderFactory.get_document_loader(),
+        registry=ProviderFactory.get_document_registry(),
+        embeddings=ProviderFactory.get_embeddings(),
+    )
+
+
 async def process_file(file_el, clear_first: bool = False) -> tuple[int, str]:
     """Process an uploaded document file."""
-    repository = ProviderFactory.get_repository()
-    document_loader = ProviderFactory.get_document_loader()
-    ingest_use_case = IngestDocumentUseCase(repository, document_loader)
+    ingest_use_case = _create_ingest_use_case()
 
-    document = await cl.make_async(ingest_use_case.execute)(
+    document = await ingest_use_case.aexecute(
         file_el.path,
         source_name=file_el.name,
         clear_existing=clear_first
@@ -245,32 +356,170 @@ async def process_file(file_el, clear_first: bool = False) -> tuple[int, str]:
     return document.chunk_count, file_el.name
 
 
-async def _ingest_files(files) -> None:
-    """Shared logic for ingesting a list of uploaded files."""
-    pdf_data = cl.user_session.get("pdf_data") or {}
-    clear_first = len(pdf_data) == 0
+async def process_files(files, clear_first: bool = False):
+    """Process several uploaded files through the parallel ingestion pipeline."""
+    ingest_use_case = _create_ingest_use_case()
+
+    return await ingest_use_case.aexecute_many(
+        [(file_el.path, file_el.name) for file_el in files],
+        clear_existing=clear_first,
+    )
+
+
+def _ready_message(file_name: str, chunk_count: int) -> "cl.Message":
+    return cl.Message(
+        content=f"✅ **{file_name}** is ready! ({chunk_count} chunks) 🎉",
+        actions=[
+            cl.Action(name="show_pdfs", payload={}, label="📚 View All Documents"),
+        ]
+    )
+
+
+async def _ingest_one(file_el, pdf_data: dict, clear_first: bool) -> None:
+    msg = cl.Message(content=f"🚀 Processing **{file_el.name}**... This will just take a moment!")
+    await msg.send()
+
+    try:
+        chunk_count, file_name = await process_file(file_el, clear_first)
+
+        pdf_data[file_name] = chunk_count
+        cl.user_session.set("pdf_data", pdf_data)
+
+        await _ready_message(file_name, chunk_count).send()
 
+    except Exception as e:
+        print(f"Error processing file: {e}")
+        await cl.Message(content=f"❌ **Oops!** Something went wrong: {str(e)}").send()
+
+
+async def _ingest_many(files, pdf_data: dict, clear_first: bool) -> None:
+    await cl.Message(
+        content=f"🚀 Processing **{len(files)} files** in parallel... This will just take a moment!"
+    ).send()
+
+    try:
+        result = await process_files(files, clear_first)
+    except Exception as e:
+        print(f"Error processing files: {e}")
+        await cl.Message(content=f"❌ **Oops!** Something went wrong: {str(e)}").send()
+        return
+
+    for document in result.documents:
+        if document is not None:
+            pdf_data[document.name] = document.chunk_count
+            await _ready_message(document.name, document.chunk_count).send()
+    cl.user_session.set("pdf_data", pdf_data)
+
+    for index, error in result.errors.items():
+        print(f"Error processing file: {error}")
+        await cl.Message(content=f"❌ **{files[index].name}**: {error}").send()
+
+    await cl.Message(
+        content=f"📊 {result.chunk_count} chunks in {result.elapsed_seconds:.1f}s "
+                f"({result.files_per_second:.2f} files/s, {result.chunks_per_second:.0f} chunks/s)"
+    ).send()
+
+
+# How often a background upload's progress is refreshed, and how long its jobs
+# may sit queued before the user is told no worker seems to be running.
+JOB_POLL_SECONDS = 1.0
+_NO_WORKER_HINT_SECONDS = 10.0
+
+
+def spool_upload(path: str, name: str, spool_dir: str) -> str:
+    """Copy an upload into the spool directory, where ingestion workers read it.
+
+    Chainlit deletes its own copy with the session; the worker deletes the
+    spooled one when the job has finished.
+    """
+    os.makedirs(spool_dir, exist_ok=True)
+    target = os.path.join(spool_dir, f"{uuid.uuid4().hex}-{Path(name).name}")
+    shutil.copyfile(path, target)
+    return target
+
+
+async def enqueue_files(files, clear_first: bool = False) -> list[IngestJob]:
+    """Spool uploaded files and queue one ingestion job per file.
+
+    With clear_first, the first job replaces the collection and the others
+    wait for it, so they are not wiped by it.
+    """
+    queue = ProviderFactory.get_ingest_job_queue()
+    spool_dir = get_settings().ingest_spool_dir
+    jobs: list[IngestJob] = []
     for file_el in files:
-        msg = cl.Message(content=f"🚀 Processing **{file_el.name}**... This will just take a moment!")
-        await msg.send()
+        path = await asyncio.to_thread(spool_upload, file_el.path, file_el.name, spool_dir)
+        first = jobs[0] if jobs else None
+        jobs.append(await queue.aenqueue(
+            path,
+            file_el.name,
+            clear_existing=clear_first and first is None,
+            after=first.id if clear_first and first is not None else None,
+        ))
+    return jobs
+
+
+def _job_line(job: IngestJob) -> str:
+    if job.status == DONE:
+        return f"✅ **{job.source_name}**: {job.chunks_stored} chunks"
+    if job.status == FAILED:
+        return f"❌ **{job.source_name}**: {job.error}"
+    if job.status == RUNNING:
+        return f"⏳ **{job.source_name}**: {job.chunks_stored} chunks stored..."
+    retry = f" (retrying after: {job.error})" if job.error else ""
+    return f"🕒 **{job.source_name}**: queued{retry}"
+
+
+async def _ingest_in_background(files, pdf_data: dict, clear_first: bool) -> None:
+    """Queue the files for the ingestion workers and follow their progress."""
+    try:
+        jobs = await enqueue_files(files, clear_first)
+    except Exception as e:
+        print(f"Error queueing files: {e}")
+        await cl.Message(content=f"❌ **Oops!** Something went wrong: {str(e)}").send()
+        return
 
+    msg = cl.Message(content="\n".join(_job_line(job) for job in jobs))
+    await msg.send()
+
+    queue = ProviderFactory.get_ingest_job_queue()
+    started = time.monotonic()
+    while not all(job.finished for job in jobs):
+        await asyncio.sleep(JOB_POLL_SECONDS)
         try:
-            chunk_count, file_name = await process_file(file_el, clear_first)
-            clear_first = False
+            jobs = [await queue.aget(job.id) or job for job in jobs]
+        except Exception as e:
+            print(f"Error polling ingestion jobs: {e}")
+            continue
+        content = "\n".join(_job_line(job) for job in jobs)
+        idle = all(job.status not in (RUNNING, DONE, FAILED) and not job.attempts for job in jobs)
+        if idle and time.monotonic() - started > _NO_WORKER_HINT_SECONDS:
+            content += "\n\n_Waiting for an ingestion worker: `python -m src.workers.ingest`_"
+        msg.content = content
+        await msg.update()
 
-            pdf_data[file_name] = chunk_count
-            cl.user_session.set("pdf_data", pdf_data)
+    for job in jobs:
+        if job.status == DONE:
+            pdf_data[job.source_name] = job.chunks_stored
+            await _ready_message(job.source_name, job.chunks_stored).send()
+    cl.user_session.set("pdf_data", pdf_data)
 
-            await cl.Message(
-                content=f"✅ **{file_name}** is ready! ({chunk_count} chunks) 🎉",
-                actions=[
-                    cl.Action(name="show_pdfs", payload={}, label="📚 View All Documents"),
-                ]
-            ).send()
 
-        except Exception as e:
-            print(f"Error processing file: {e}")
-            await cl.Message(content=f"❌ **Oops!** Something went wrong: {str(e)}").send()
+async def _ingest_files(files) -> None:
+    """Shared logic for ingesting a list of uploaded files."""
+    pdf_data = cl.user_session.get("pdf_data") or {}
+    clear_first = len(pdf_data) == 0
+
+    # INGEST_BACKGROUND hands the files to the worker processes. Otherwise
+    # several files go through the parallel pipeline: parsing, embedding and
+    # inserts of different files overlap.
+    if get_settings().ingest_background:
+        await _ingest_in_background(files, pdf_data, clear_first)
+    elif len(files) > 1:
+        await _ingest_many(files, pdf_data, clear_first)
+    else:
+        for file_el in files:
+            await _ingest_one(file_el, pdf_data, clear_first)
 
     pdf_data = cl.user_session.get("pdf_data") or {}
     if pdf_data:
@@ -299,8 +548,11 @@ async def _answer_question(question: str) -> None:
     await msg.send()
 
     try:
-        result = await cl.make_async(search_use_case.execute)(question)
-        msg.content = result.answer
+        async for item in search_use_case.astream(question):
+            if isinstance(item, SearchResult):
+                msg.content = item.answer
+            else:
+                await msg.stream_token(item)
         await msg.update()
     except Exception as e:
         msg.content = f"❌ **Oops!** Something went wrong: {str(e)}"
@@ -395,7 +647,8 @@ async def main(message: cl.Message):
                     "- `/upload` - Add new documents to your library\n"
                     "- `/files` - See all your loaded documents\n"
                     "- `/help` - Show this helpful guide\n"
-                    "- `/examples` - Get inspired with example questions\n\n"
+                    "- `/examples` - Get inspired with example questions\n"
+                    "- `/stats` - Show time to first token, cache hit rates and login load\n\n"
                     "💡 **Pro tip:** Answers come exclusively from your uploaded documents - no hallucinations, just facts!",
             actions=[
                 cl.Action(name="show_pdfs", payload={}, label="📚 View My Documents"),
@@ -403,6 +656,14 @@ async def main(message: cl.Message):
         ).send()
         return
 
+    if cmd == "/stats":
+        try:
+            content = _format_cache_stats()
+        except Exception as e:
+            content = f"❌ Could not read cache stats: {str(e)}"
+        await cl.Message(content=content).send()
+        return
+
     if cmd == "/examples":
         await cl.Message(
             content="## 💡 Question Ideas to Get Started\n\n"
@@ -0,0 +1,89 @@
+"""
+Vector index maintenance for langchain_pg_embedding.
+
+Usage (from project root, after `docker compose up -d`):
+    python3 src/scripts/vector_index.py status              # show index state and size
+    python3 src/scripts/vector_index.py create              # create it if missing (blocks writes)
+    python3 src/scripts/vector_index.py rebuild             # rebuild CONCURRENTLY and swap in
+    python3 src/scripts/vector_index.py rebuild --blocking  # faster rebuild that blocks writes
+    python3 src/scripts/vector_index.py text-search         # full-text column + GIN index (hybrid)
+
+Index type and parameters come from .env (VECTOR_INDEX_TYPE, HNSW_M,
+HNSW_EF_CONSTRUCTION, IVFFLAT_LISTS, ...). Searches keep running on the old
+index during a rebuild. With RETRIEVAL_MODE=hybrid, `create` also runs the
+`text-search` setup: the full-text column is added without rewriting the
+table, existing rows are filled --batch-size rows per transaction, and the
+GIN index is built CONCURRENTLY (unless --blocking). Run it before
+switching to hybrid retrieval; the app never does it on its own.
+"""
+import argparse
+import io
+import os
+import sys
+
+# Ensure UTF-8 output on Windows (cp1252 can't handle emojis)
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+# Add project root to path
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+
+
+def _print_status(manager) -> None:
+    status = manager.status()
+    if not status.exists:
+        print(f"⚠️ Index {status.name} does not exist (table rows ≈ {max(status.table_rows, 0)})")
+        return
+    print(f"📇 {status.name}: {status.method}, {'valid' if status.valid else 'INVALID'}")
+    print(f"   size: {status.size_bytes / 1024 / 1024:.1f} MB • rows ≈ {max(status.table_rows, 0)} • dims: {status.dimensions}")
+    print(f"   {status.definition}")
+
+
+def _ensure_text_search(manager, args) -> None:
+    created = manager.ensure_text_search(concurrently=not args.blocking, batch_size=args.batch_size)
+    print("✅ Full-text index created." if created else "ℹ️ Full-text index already exists (or no table yet).")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Manage the pgvector ANN index.")
+    parser.add_argument("command", choices=["status", "create", "rebuild", "text-search"])
+    parser.add_argument(
+        "--blocking", action="store_true",
+        help="build without CONCURRENTLY (faster, blocks inserts while it runs)",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=5000,
+        help="rows filled per transaction by the full-text backfill (default 5000)",
+    )
+    args = parser.parse_args(argv)
+
+    from dotenv import load_dotenv
+    load_dotenv(os.path.join(PROJECT_ROOT, ".env"))
+
+    from src.infrastructure.adapters.pgvector_index import PGVectorIndexManager
+
+    manager = PGVectorIndexManager()
+    try:
+        if args.command == "create":
+            created = manager.ensure_index(concurrently=not args.blocking)
+            print("✅ Index created." if created else "ℹ️ Nothing to do (index exists, disabled, or no rows yet).")
+            manager.ensure_source_index(concurrently=not args.blocking)
+            if manager._settings.retrieval_mode == "hybrid":
+                _ensure_text_search(manager, args)
+        elif args.command == "text-search":
+            _ensure_text_search(manager, args)
+        elif args.command == "rebuild":
+            print("🔄 Rebuilding index" + ("" if args.blocking else " concurrently") + "...")
+            manager.rebuild(concurrently=not args.blocking)
+            print("✅ Rebuild complete.")
+        _print_status(manager)
+    except Exception as e:
+        print(f"❌ {args.command} failed: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
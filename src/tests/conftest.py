@@ -4,11 +4,12 @@ Test configuration and fixtures.
 import pytest
 from unittest.mock import Mock, MagicMock
 
-from src.domain.entities.document import Document, DocumentChunk, SearchResult
+from src.domain.entities.document import CatalogEntry, Document, DocumentChunk, DocumentRecord, SearchResult
 from src.domain.ports.embeddings import EmbeddingsPort
 from src.domain.ports.llm import LLMPort
 from src.domain.ports.repository import RepositoryPort
 from src.domain.ports.document_loader import DocumentLoaderPort
+from src.domain.ports.document_registry import DocumentRegistryPort
 
 
 @pytest.fixture
@@ -37,6 +38,8 @@ def mock_repository() -> RepositoryPort:
         DocumentChunk(content="Test content", metadata={"page": 1})
     ]
     mock.delete_by_source.return_value = 5
+    # No rebuild support: clear_existing replaces the collection in place.
+    mock.begin_rebuild.return_value = None
     return mock
 
 
@@ -71,4 +74,45 @@ def mock_document_loader() -> DocumentLoaderPort:
         LangchainDocument(page_content="Test content from loader.", metadata={"source": "test.txt"})
     ]
     mock.supported_extensions.return_value = MultiFormatDocumentLoader().supported_extensions()
+    # Streaming ingestion reads lazy_load; route it through load so tests can stub either.
+    mock.lazy_load.side_effect = lambda path, file_name=None: iter(mock.load(path, file_name=file_name))
     return mock
+
+
+class InMemoryDocumentRegistry(DocumentRegistryPort):
+    """Dict-backed document registry."""
+
+    def __init__(self):
+        self.records: dict[str, DocumentRecord] = {}
+
+    def get(self, source_file):
+        return self.records.get(source_file)
+
+    def save(self, record):
+        self.records[record.source_file] = record
+
+    def delete(self, source_file):
+        self.records.pop(source_file, None)
+
+    def clear(self):
+        self.records.clear()
+
+    def sources(self):
+        return sorted(self.records)
+
+    def list_documents(self):
+        return [
+            CatalogEntry(
+                source_file=record.source_file,
+                chunk_count=len(record.chunk_hashes),
+                size_bytes=record.size_bytes,
+                file_hash=record.file_hash,
+            )
+            for _, record in sorted(self.records.items())
+        ]
+
+
+@pytest.fixture
+def memory_registry() -> DocumentRegistryPort:
+    """Create an in-memory document registry."""
+    return InMemoryDocumentRegistry()
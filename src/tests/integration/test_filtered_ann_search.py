@@ -0,0 +1,82 @@
+"""
+Integration test for the collection-filtered ANN search.
+
+Needs a Postgres with pgvector at DATABASE_URL and is skipped otherwise.
+Everything runs in a throwaway schema inside one transaction that is rolled
+back, so no table of the application is touched.
+"""
+import os
+
+import numpy as np
+import psycopg
+import pytest
+
+from src.config.settings import get_settings
+from src.infrastructure.adapters.collection_alias import COLLECTION_ALIAS_SCHEMA
+from src.infrastructure.adapters.pgvector_queries import fetch_candidates
+
+ROWS = 300
+DIMS = 8
+
+
+@pytest.fixture
+def conn():
+    try:
+        conn = psycopg.connect(os.environ.get("DATABASE_URL", ""), connect_timeout=2)
+    except psycopg.Error as exc:
+        pytest.skip(f"no database: {exc}")
+    try:
+        if conn.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'vector'").fetchone() is None:
+            pytest.skip("pgvector is not available")
+        conn.execute("CREATE EXTENSION IF NOT EXISTS vector")
+        version = conn.execute("SELECT extversion FROM pg_extension WHERE extname = 'vector'").fetchone()[0]
+        if tuple(int(part) for part in version.split(".")[:2]) < (0, 8):
+            pytest.skip("iterative index scans need pgvector >= 0.8")
+        conn.execute("CREATE SCHEMA filtered_ann_test")
+        conn.execute("SET LOCAL search_path = filtered_ann_test, public")
+        yield conn
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+def _load(conn, rng):
+    """A live collection and a stale rollback copy of it with the same vectors."""
+    conn.execute(COLLECTION_ALIAS_SCHEMA)
+    conn.execute("CREATE TABLE langchain_pg_collection (uuid UUID PRIMARY KEY, name VARCHAR UNIQUE)")
+    conn.execute(
+        f"CREATE TABLE langchain_pg_embedding (id VARCHAR PRIMARY KEY, collection_id UUID, "
+        f"embedding VECTOR({DIMS}), document VARCHAR, cmetadata JSONB)"
+    )
+    conn.execute(
+        "INSERT INTO langchain_pg_collection VALUES "
+        "(gen_random_uuid(), 'chunks__live'), (gen_random_uuid(), 'chunks__stale')"
+    )
+    conn.execute("INSERT INTO collection_alias (alias, collection, previous) VALUES ('chunks', 'chunks__live', 'chunks__stale')")
+    vectors = rng.standard_normal((ROWS, DIMS)).astype(np.float32)
+    with conn.cursor() as cur:
+        for name in ("chunks__stale", "chunks__live"):
+            uuid = conn.execute("SELECT uuid FROM langchain_pg_collection WHERE name = %s", (name,)).fetchone()[0]
+            with cur.copy(
+                "COPY langchain_pg_embedding (id, collection_id, embedding, document, cmetadata) FROM STDIN"
+            ) as copy:
+                for i, vector in enumerate(vectors):
+                    copy.write_row((f"{name}-{i}", uuid, str(vector.tolist()), f"{name} {i}", "{}"))
+    conn.execute("CREATE INDEX ON langchain_pg_embedding USING hnsw (embedding vector_cosine_ops)")
+    conn.execute("ANALYZE langchain_pg_embedding")
+    conn.execute("SET LOCAL enable_seqscan = off")
+    # What search_connection_options sends on every search connection.
+    conn.execute("SET LOCAL hnsw.iterative_scan = relaxed_order")
+
+
+def test_stale_collection_does_not_halve_the_candidates(conn):
+    _load(conn, np.random.default_rng(7))
+    settings = get_settings().model_copy(update={"hnsw_ef_search": 40})
+    query = np.random.default_rng(8).standard_normal(DIMS).astype(np.float32)
+
+    out = fetch_candidates(conn, "chunks", query, 60, settings)
+
+    assert len(out) == 60
+    assert all(doc.startswith("chunks__live") for doc in out.documents)
+    distances = 1 - (out.vectors @ query) / (np.linalg.norm(out.vectors, axis=1) * np.linalg.norm(query))
+    assert np.all(np.diff(distances) >= -1e-6)
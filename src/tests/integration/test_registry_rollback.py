@@ -0,0 +1,86 @@
+"""
+Integration test for the document catalog across rebuilds and rollbacks.
+
+Needs a Postgres at DATABASE_URL and is skipped otherwise. Everything runs in
+a throwaway schema inside one transaction that is rolled back, so no table of
+the application is touched.
+"""
+import os
+from contextlib import contextmanager
+from unittest.mock import MagicMock, patch
+
+import psycopg
+import pytest
+
+from src.domain.entities.document import DocumentRecord
+from src.infrastructure.adapters.collection_alias import drop_collection, rollback_alias, swap_alias
+from src.infrastructure.adapters.postgres_document_registry import PostgresDocumentRegistry
+
+
+@pytest.fixture
+def conn():
+    try:
+        conn = psycopg.connect(os.environ.get("DATABASE_URL", ""), connect_timeout=2)
+    except psycopg.Error as exc:
+        pytest.skip(f"no database: {exc}")
+    try:
+        conn.execute("CREATE SCHEMA registry_rollback_test")
+        conn.execute("SET LOCAL search_path = registry_rollback_test")
+        conn.execute("CREATE TABLE langchain_pg_collection (uuid UUID PRIMARY KEY, name VARCHAR UNIQUE)")
+        conn.execute("CREATE TABLE langchain_pg_embedding (id VARCHAR PRIMARY KEY, collection_id UUID)")
+        yield conn
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+@pytest.fixture
+def registry(conn):
+    @contextmanager
+    def connection():
+        yield conn
+
+    pool = MagicMock(name="pool")
+    pool.connection.side_effect = connection
+    with patch("src.infrastructure.adapters.postgres_document_registry.get_pool", return_value=pool):
+        yield PostgresDocumentRegistry("docs")
+
+
+def _catalog(registry):
+    return [entry.source_file for entry in registry.list_documents()]
+
+
+def _rebuild(conn, registry, collection, *sources):
+    """What a full ingestion does: fill a new collection, swap, then re-register."""
+    conn.execute("INSERT INTO langchain_pg_collection VALUES (gen_random_uuid(), %s)", (collection,))
+    stale = swap_alias(conn, "docs", collection)
+    if stale is not None:
+        drop_collection(conn, stale)
+    registry.clear()
+    for source in sources:
+        registry.save(DocumentRecord(source_file=source, file_hash="00" * 32))
+
+
+def test_rollback_restores_the_catalog_of_the_previous_collection(conn, registry):
+    conn.execute("INSERT INTO langchain_pg_collection VALUES (gen_random_uuid(), 'docs')")
+    registry.save(DocumentRecord(source_file="old.pdf", file_hash="00" * 32))
+
+    _rebuild(conn, registry, "docs__new", "new.pdf")
+    assert _catalog(registry) == ["new.pdf"]
+
+    assert rollback_alias(conn, "docs") == "docs"
+    assert _catalog(registry) == ["old.pdf"]
+
+    assert rollback_alias(conn, "docs") == "docs__new"
+    assert _catalog(registry) == ["new.pdf"]
+
+
+def test_rows_of_dropped_collections_are_pruned(conn, registry):
+    conn.execute("INSERT INTO langchain_pg_collection VALUES (gen_random_uuid(), 'docs')")
+    registry.save(DocumentRecord(source_file="old.pdf", file_hash="00" * 32))
+
+    _rebuild(conn, registry, "docs__a", "a.pdf")
+    _rebuild(conn, registry, "docs__b", "b.pdf")
+
+    rows = conn.execute("SELECT collection, source_file FROM document_registry ORDER BY 1").fetchall()
+    assert rows == [("docs__a", "a.pdf"), ("docs__b", "b.pdf")]
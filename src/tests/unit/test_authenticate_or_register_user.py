@@ -24,10 +24,13 @@ def _make_use_case(
 ):
     repo = MagicMock(spec=UserRepositoryPort)
     repo.get_by_identifier.return_value = existing
+    repo.aget_by_identifier.return_value = existing
 
     hasher = MagicMock(spec=PasswordHasherPort)
     hasher.hash.return_value = "hashed-pw"
     hasher.verify.return_value = verify_returns
+    hasher.ahash.return_value = "hashed-pw"
+    hasher.averify.return_value = verify_returns
 
     return AuthenticateOrRegisterUserUseCase(repo, hasher), repo, hasher
 
@@ -140,3 +143,46 @@ class TestPasswordValidation:
 
         assert result is existing
         hasher.verify.assert_called_once_with("shortpw", "legacy")
+
+
+class TestAsyncExecute:
+    @pytest.mark.asyncio
+    async def test_existing_user_verified_via_async_lookup(self):
+        existing = User(id="u1", identifier="alice", password_hash="stored-hash")
+        use_case, repo, hasher = _make_use_case(existing=existing)
+
+        assert await use_case.aexecute(" alice ", "correct-password") is existing
+
+        repo.aget_by_identifier.assert_awaited_once_with("alice")
+        repo.get_by_identifier.assert_not_called()
+        hasher.averify.assert_awaited_once_with("correct-password", "stored-hash")
+        hasher.verify.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_wrong_password_rejected(self):
+        existing = User(id="u1", identifier="alice", password_hash="stored-hash")
+        use_case, _, _ = _make_use_case(existing=existing, verify_returns=False)
+
+        with pytest.raises(InvalidCredentialsError):
+            await use_case.aexecute("alice", "wrong")
+
+    @pytest.mark.asyncio
+    async def test_registers_via_async_create(self):
+        use_case, repo, hasher = _make_use_case(existing=None)
+
+        result = await use_case.aexecute("bob", "supersecret")
+
+        assert result.password_hash == "hashed-pw"
+        hasher.ahash.assert_awaited_once_with("supersecret")
+        repo.acreate.assert_awaited_once_with(result)
+        repo.create.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_weak_password_rejected_before_hashing(self):
+        use_case, repo, hasher = _make_use_case(existing=None)
+
+        with pytest.raises(WeakPasswordError):
+            await use_case.aexecute("bob", "abc")
+
+        hasher.ahash.assert_not_awaited()
+        repo.acreate.assert_not_called()
@@ -0,0 +1,108 @@
+"""
+Unit tests for BoundedPasswordHasher.
+
+Most tests swap the process pool for a ThreadPoolExecutor and gate the
+wrapped hasher on an Event, so saturation is deterministic. One test runs
+the real spawn-based process pool with Argon2.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.domain.exceptions import AuthBusyError
+from src.domain.ports.password_hasher import PasswordHasherPort
+from src.infrastructure.adapters.argon2_password_hasher import Argon2PasswordHasher
+from src.infrastructure.adapters.bounded_password_hasher import (
+    BoundedPasswordHasher,
+    _hash,
+    _init_worker,
+)
+
+
+class GatedHasher(PasswordHasherPort):
+    """Hasher whose calls block until `gate` is set."""
+
+    def __init__(self):
+        self.gate = threading.Event()
+        self.started = threading.Semaphore(0)
+
+    def hash(self, password: str) -> str:
+        self.started.release()
+        self.gate.wait(timeout=5)
+        return f"h:{password}"
+
+    def verify(self, password: str, hashed: str) -> bool:
+        self.started.release()
+        self.gate.wait(timeout=5)
+        return hashed == f"h:{password}"
+
+
+@pytest.fixture
+def inner():
+    return GatedHasher()
+
+
+def _bounded(inner, workers=1, max_queue=1):
+    return BoundedPasswordHasher(
+        inner,
+        workers=workers,
+        max_queue=max_queue,
+        executor_factory=lambda: ThreadPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(inner,)
+        ),
+    )
+
+
+class TestBoundedPasswordHasher:
+    def test_hash_and_verify_delegate(self, inner):
+        inner.gate.set()
+        hasher = _bounded(inner)
+
+        assert hasher.hash("pw") == "h:pw"
+        assert hasher.verify("pw", "h:pw") is True
+        assert hasher.stats().completed == 2
+
+    def test_rejects_fast_when_workers_and_queue_are_full(self, inner):
+        hasher = _bounded(inner, workers=1, max_queue=1)
+        running = hasher._submit(_hash, "a")
+        inner.started.acquire(timeout=5)
+        queued = hasher._submit(_hash, "b")
+
+        stats = hasher.stats()
+        assert (stats.running, stats.queued) == (1, 1)
+        with pytest.raises(AuthBusyError):
+            hasher.hash("c")
+        assert hasher.stats().rejected == 1
+
+        inner.gate.set()
+        assert running.result(timeout=5) == "h:a"
+        assert queued.result(timeout=5) == "h:b"
+        stats = hasher.stats()
+        assert (stats.running, stats.queued, stats.peak_queued) == (0, 0, 1)
+
+    def test_capacity_frees_after_completion(self, inner):
+        inner.gate.set()
+        hasher = _bounded(inner, workers=1, max_queue=0)
+        for _ in range(3):
+            assert hasher.hash("pw") == "h:pw"
+        assert hasher.stats().rejected == 0
+
+    @pytest.mark.asyncio
+    async def test_async_variants_await_the_pool(self, inner):
+        inner.gate.set()
+        hasher = _bounded(inner)
+
+        assert await hasher.ahash("pw") == "h:pw"
+        assert await hasher.averify("pw", "nope") is False
+
+    def test_real_process_pool_with_argon2(self):
+        hasher = BoundedPasswordHasher(Argon2PasswordHasher(), workers=1, max_queue=4)
+        try:
+            hashed = hasher.hash("s3cret!")
+            assert hashed.startswith("$argon2id$")
+            assert hasher.verify("s3cret!", hashed) is True
+            assert hasher.verify("wrong", hashed) is False
+        finally:
+            hasher.close()
+
@@ -0,0 +1,148 @@
+"""
+Unit tests for CachedEmbeddings.
+
+The wrapped provider is a Mock; a fake clock drives TTL expiry.
+"""
+from unittest.mock import Mock
+
+import pytest
+
+from src.domain.ports.embeddings import EmbeddingsPort
+from src.infrastructure.adapters.cached_embeddings import CachedEmbeddings, normalize_query
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def inner():
+    mock = Mock(spec=EmbeddingsPort)
+    mock.embed_query.side_effect = lambda text: [float(len(text)), 0.5, 0.25]
+    mock.embed_documents.side_effect = lambda texts: [[1.0] for _ in texts]
+    return mock
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(inner, clock):
+    return CachedEmbeddings(inner, max_entries=3, ttl_seconds=60, clock=clock)
+
+
+class TestNormalizeQuery:
+    def test_collapses_whitespace(self):
+        assert normalize_query("  Qual   o\tfaturamento?\n") == "Qual o faturamento?"
+
+    def test_nfc(self):
+        assert normalize_query("é") == "é"
+
+
+class TestEmbedQuery:
+    def test_repeated_query_hits_cache(self, cache, inner):
+        first = cache.embed_query("qual o faturamento?")
+        second = cache.embed_query("qual o faturamento?")
+
+        assert first == second == [19.0, 0.5, 0.25]
+        inner.embed_query.assert_called_once_with("qual o faturamento?")
+        stats = cache.stats()
+        assert (stats.hits, stats.misses) == (1, 1)
+        assert stats.hit_rate == 0.5
+
+    def test_equivalent_text_shares_entry(self, cache, inner):
+        cache.embed_query("qual  o faturamento?")
+        cache.embed_query(" qual o faturamento? ")
+        inner.embed_query.assert_called_once()
+
+    def test_stores_float32(self, cache):
+        cache.embed_query("q")
+        assert cache.stats().bytes == 3 * 4
+
+    def test_ttl_expiry(self, cache, inner, clock):
+        cache.embed_query("q")
+        clock.now = 61
+        cache.embed_query("q")
+
+        assert inner.embed_query.call_count == 2
+        assert cache.stats().expirations == 1
+
+    def test_lru_eviction_by_entries(self, cache, inner):
+        for text in ["a", "b", "c"]:
+            cache.embed_query(text)
+        cache.embed_query("a")  # refresh "a"; "b" is now least recent
+        cache.embed_query("d")
+
+        stats = cache.stats()
+        assert stats.entries == 3
+        assert stats.evictions == 1
+        inner.embed_query.reset_mock()
+        cache.embed_query("a")
+        inner.embed_query.assert_not_called()
+        cache.embed_query("b")
+        inner.embed_query.assert_called_once_with("b")
+
+    def test_byte_limit_evicts(self, inner, clock):
+        cache = CachedEmbeddings(inner, max_entries=100, max_bytes=24, clock=clock)
+        for text in ["a", "b", "c"]:
+            cache.embed_query(text)
+        assert cache.stats().entries == 2
+        assert cache.stats().bytes == 24
+
+    def test_provider_errors_are_not_cached(self, cache, inner):
+        inner.embed_query.side_effect = RuntimeError("rate limited")
+        with pytest.raises(RuntimeError):
+            cache.embed_query("q")
+        assert cache.stats().entries == 0
+
+    def test_clear(self, cache):
+        cache.embed_query("q")
+        cache.clear()
+        assert cache.stats().entries == 0
+        assert cache.stats().bytes == 0
+
+
+class TestEmbedQueries:
+    @pytest.fixture(autouse=True)
+    def batch(self, inner):
+        inner.embed_queries.side_effect = lambda texts: [[float(len(t)), 0.5, 0.25] for t in texts]
+
+    def test_misses_embedded_in_one_call(self, cache, inner):
+        out = cache.embed_queries(["ab", "abc", "ab"])
+
+        assert out == [[2.0, 0.5, 0.25], [3.0, 0.5, 0.25], [2.0, 0.5, 0.25]]
+        inner.embed_queries.assert_called_once_with(["ab", "abc"])
+
+    def test_hits_served_from_cache(self, cache, inner):
+        cache.embed_query("ab")
+        cache.embed_queries(["ab", " abc "])
+
+        inner.embed_queries.assert_called_once_with(["abc"])
+        assert cache.embed_query("abc") == [3.0, 0.5, 0.25]
+        inner.embed_query.assert_called_once()
+
+    def test_all_hits_skip_provider(self, cache, inner):
+        cache.embed_queries(["ab"])
+        cache.embed_queries(["ab"])
+        inner.embed_queries.assert_called_once()
+
+
+class TestPassThrough:
+    def test_documents_not_cached(self, cache, inner):
+        cache.embed_documents(["x", "y"])
+        cache.embed_documents(["x", "y"])
+        assert inner.embed_documents.call_count == 2
+
+    def test_langchain_embeddings_use_cache(self, cache, inner):
+        lc = cache.get_langchain_embeddings()
+        lc.embed_query("q")
+        cache.embed_query("q")
+
+        inner.embed_query.assert_called_once()
+        assert lc.embed_documents(["x"]) == [[1.0]]
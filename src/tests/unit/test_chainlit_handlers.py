@@ -52,6 +52,13 @@ def _ensure_chainlit_stub():
 
 _ensure_chainlit_stub()
 
+from src.domain.entities.document import (  # noqa: E402
+    BatchIngestResult,
+    CatalogEntry,
+    Document,
+    DocumentChunk,
+    SearchResult,
+)
 from src.presentation.web import chainlit_app  # noqa: E402
 
 
@@ -89,16 +96,40 @@ def _patch_message():
         async def update(self):
             return None
 
+        async def stream_token(self, token):
+            self.content += token
+
     chainlit_app.cl.Message = FakeMessage
     return sent
 
 
+def _fake_astream(*items, error=None):
+    """Stand-in for SearchDocumentsUseCase.astream yielding `items`, then raising `error`."""
+    calls = []
+
+    async def astream(question):
+        calls.append(question)
+        for item in items:
+            yield item
+        if error is not None:
+            raise error
+
+    astream.calls = calls
+    return astream
+
+
 # --- tests -----------------------------------------------------------------
 
 
 class TestShowPdfList:
     """Tests for show_pdf_list()."""
 
+    @pytest.fixture(autouse=True)
+    def registry(self):
+        """No document registry unless a test installs one: the session lists."""
+        with patch.object(chainlit_app.ProviderFactory, "get_document_registry", return_value=None) as get:
+            yield get
+
     @pytest.mark.asyncio
     async def test_empty_library_message(self):
         _setup_user_session({"pdf_data": {}})
@@ -121,6 +152,39 @@ class TestShowPdfList:
         assert msg.actions is not None
         assert len(msg.actions) == 3
 
+    @pytest.mark.asyncio
+    async def test_lists_collection_catalog_when_registry_enabled(self, registry):
+        from datetime import datetime
+
+        catalog = MagicMock()
+        catalog.alist_documents = AsyncMock(return_value=[
+            CatalogEntry("a.pdf", 12, 3 * 1024 * 1024, "ab", datetime(2026, 5, 1, 9, 30)),
+            CatalogEntry("b.md", 2, 2048, "cd"),
+        ])
+        registry.return_value = catalog
+        _setup_user_session({"pdf_data": {"session-only.pdf": 1}})
+        sent = _patch_message()
+
+        await chainlit_app.show_pdf_list()
+
+        content = sent[0].content
+        assert "**a.pdf** (12 chunks • 3.0 MB • 2026-05-01 09:30)" in content
+        assert "**b.md** (2 chunks • 2 KB)" in content
+        assert "session-only.pdf" not in content
+        assert "2 documents • 14 chunks" in content
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_session_when_catalog_fails(self, registry):
+        catalog = MagicMock()
+        catalog.alist_documents = AsyncMock(side_effect=RuntimeError("db down"))
+        registry.return_value = catalog
+        _setup_user_session({"pdf_data": {"a.pdf": 5}})
+        sent = _patch_message()
+
+        await chainlit_app.show_pdf_list()
+
+        assert "**a.pdf** (5 chunks)" in sent[0].content
+
 
 class TestIngestFiles:
     """Tests for _ingest_files() — the shared upload pipeline."""
@@ -162,27 +226,55 @@ class TestIngestFiles:
         assert chainlit_app.cl.user_session.get("pdf_data") == {}
 
     @pytest.mark.asyncio
-    async def test_clear_existing_only_on_first_file_when_library_is_empty(self):
+    async def test_several_files_use_parallel_pipeline(self):
         _setup_user_session({"pdf_data": {}})
-        _patch_message()
+        sent = _patch_message()
 
         files = [
             SimpleNamespace(name="a.pdf", path="/tmp/a"),
             SimpleNamespace(name="b.pdf", path="/tmp/b"),
+            SimpleNamespace(name="c.xyz", path="/tmp/c"),
         ]
-        process = AsyncMock(side_effect=[(1, "a.pdf"), (2, "b.pdf")])
+        result = BatchIngestResult(
+            documents=[
+                Document(name="a.pdf", chunks=[DocumentChunk(content="x")]),
+                Document(name="b.pdf", chunks=[DocumentChunk(content="y"), DocumentChunk(content="z")]),
+                None,
+            ],
+            errors={2: "Unsupported format '.xyz'"},
+            elapsed_seconds=1.5,
+        )
+        process = AsyncMock(return_value=result)
 
-        with patch.object(chainlit_app, "process_file", new=process), \
+        with patch.object(chainlit_app, "process_files", new=process), \
+             patch.object(chainlit_app, "process_file", new=AsyncMock()) as single, \
              patch.object(chainlit_app, "_create_search_use_case", return_value="search-uc"), \
              patch.object(chainlit_app, "update_thread_metadata", new=AsyncMock()):
             await chainlit_app._ingest_files(files)
 
-        # First call must have clear_first=True; second must be False.
-        first_kwargs = process.call_args_list[0]
-        second_kwargs = process.call_args_list[1]
-        # process_file(file_el, clear_first) → positional args
-        assert first_kwargs.args[1] is True
-        assert second_kwargs.args[1] is False
+        # Empty library: the pipeline replaces the collection.
+        process.assert_awaited_once_with(files, True)
+        single.assert_not_called()
+        assert chainlit_app.cl.user_session.get("pdf_data") == {"a.pdf": 1, "b.pdf": 2}
+        contents = [m.content for m in sent]
+        assert any("c.xyz" in c and "Unsupported format" in c for c in contents)
+        assert any("files/s" in c and "chunks/s" in c for c in contents)
+
+    @pytest.mark.asyncio
+    async def test_pipeline_failure_does_not_crash(self):
+        _setup_user_session({"pdf_data": {"old.pdf": 2}})
+        _patch_message()
+
+        files = [SimpleNamespace(name="a.pdf", path="/tmp/a"), SimpleNamespace(name="b.pdf", path="/tmp/b")]
+        process = AsyncMock(side_effect=RuntimeError("pool down"))
+
+        with patch.object(chainlit_app, "process_files", new=process), \
+             patch.object(chainlit_app, "_create_search_use_case", return_value="search-uc"), \
+             patch.object(chainlit_app, "update_thread_metadata", new=AsyncMock()):
+            await chainlit_app._ingest_files(files)
+
+        assert process.call_args.args[1] is False
+        assert chainlit_app.cl.user_session.get("pdf_data") == {"old.pdf": 2}
 
     @pytest.mark.asyncio
     async def test_clear_existing_false_when_library_has_items(self):
@@ -200,6 +292,99 @@ class TestIngestFiles:
         assert process.call_args.args[1] is False
 
 
+class TestBackgroundIngestion:
+    """Tests for _ingest_files() with INGEST_BACKGROUND: enqueue, then follow the jobs."""
+
+    @pytest.fixture(autouse=True)
+    def background(self, monkeypatch, tmp_path):
+        from src.config.settings import get_settings
+
+        monkeypatch.setattr(get_settings(), "ingest_background", True)
+        monkeypatch.setattr(get_settings(), "ingest_spool_dir", str(tmp_path / "spool"))
+        monkeypatch.setattr(chainlit_app, "JOB_POLL_SECONDS", 0)
+
+    @staticmethod
+    def _queue(*polls):
+        """Queue whose aget returns successive snapshots of each job."""
+        from src.domain.entities.ingest_job import IngestJob
+
+        queue = MagicMock()
+        enqueued = []
+
+        async def aenqueue(path, name, clear_existing=False, after=None):
+            job = IngestJob(id=f"job-{len(enqueued)}", file_path=path, source_name=name, clear_existing=clear_existing)
+            enqueued.append((job, after))
+            return job
+
+        snapshots = {}
+        for poll in polls:
+            for job in poll:
+                snapshots.setdefault(job.id, []).append(job)
+
+        async def aget(job_id):
+            states = snapshots[job_id]
+            return states.pop(0) if len(states) > 1 else states[0]
+
+        queue.aenqueue = aenqueue
+        queue.aget = aget
+        queue.enqueued = enqueued
+        return queue
+
+    @pytest.mark.asyncio
+    async def test_enqueues_spooled_copies_and_follows_progress(self, tmp_path):
+        from src.domain.entities.ingest_job import IngestJob
+
+        _setup_user_session({"pdf_data": {}})
+        sent = _patch_message()
+        uploads = []
+        for name in ("a.pdf", "b.md"):
+            path = tmp_path / name
+            path.write_text(name)
+            uploads.append(SimpleNamespace(name=name, path=str(path)))
+
+        queue = self._queue(
+            [IngestJob(id="job-0", file_path="", source_name="a.pdf", status="running", chunks_stored=256),
+             IngestJob(id="job-1", file_path="", source_name="b.md")],
+            [IngestJob(id="job-0", file_path="", source_name="a.pdf", status="done", chunks_stored=300),
+             IngestJob(id="job-1", file_path="", source_name="b.md", status="failed", error="empty")],
+        )
+
+        with patch.object(chainlit_app.ProviderFactory, "get_ingest_job_queue", return_value=queue), \
+             patch.object(chainlit_app, "process_files", new=AsyncMock()) as in_process, \
+             patch.object(chainlit_app, "_create_search_use_case", return_value="search-uc"), \
+             patch.object(chainlit_app, "update_thread_metadata", new=AsyncMock()):
+            await chainlit_app._ingest_files(uploads)
+
+        in_process.assert_not_called()
+        (first, first_after), (second, second_after) = queue.enqueued
+        # Empty library: the first job replaces the collection, the second waits for it.
+        assert first.clear_existing and first_after is None
+        assert not second.clear_existing and second_after == "job-0"
+        spooled = sorted((tmp_path / "spool").iterdir())
+        assert {p.name.split("-", 1)[1]: p.read_text() for p in spooled} == {"a.pdf": "a.pdf", "b.md": "b.md"}
+        assert first.file_path != uploads[0].path
+
+        progress = sent[0]
+        assert "✅ **a.pdf**: 300 chunks" in progress.content
+        assert "❌ **b.md**: empty" in progress.content
+        assert chainlit_app.cl.user_session.get("pdf_data") == {"a.pdf": 300}
+        assert any("a.pdf" in m.content and "is ready" in m.content for m in sent)
+
+    @pytest.mark.asyncio
+    async def test_enqueue_failure_does_not_crash(self, tmp_path):
+        _setup_user_session({"pdf_data": {"old.pdf": 2}})
+        sent = _patch_message()
+        upload = SimpleNamespace(name="a.pdf", path=str(tmp_path / "missing.pdf"))
+
+        with patch.object(chainlit_app.ProviderFactory, "get_ingest_job_queue", return_value=self._queue()), \
+             patch.object(chainlit_app, "_create_search_use_case", return_value="search-uc"), \
+             patch.object(chainlit_app, "update_thread_metadata", new=AsyncMock()):
+            await chainlit_app._ingest_files([upload])
+
+        assert any("Oops" in m.content for m in sent)
+        assert chainlit_app.cl.user_session.get("pdf_data") == {"old.pdf": 2}
+
+
 class TestHandleDeletePdf:
     """Tests for handle_delete_pdf action callback."""
 
@@ -209,9 +394,11 @@ class TestHandleDeletePdf:
         _patch_message()
 
         fake_repo = MagicMock()
-        fake_repo.delete_by_source.return_value = 5
+        fake_repo.adelete_by_source = AsyncMock(return_value=5)
+        registry = MagicMock()
 
         with patch.object(chainlit_app.ProviderFactory, "get_repository", return_value=fake_repo), \
+             patch.object(chainlit_app.ProviderFactory, "get_document_registry", return_value=registry), \
              patch.object(chainlit_app, "_create_search_use_case", return_value="new-search"), \
              patch.object(chainlit_app, "update_thread_metadata", new=AsyncMock()), \
              patch.object(chainlit_app, "show_pdf_list", new=AsyncMock()):
@@ -224,7 +411,8 @@ class TestHandleDeletePdf:
         assert pdf_data == {"b.pdf": 3}
         # search_use_case rebuilt because library not empty
         assert chainlit_app.cl.user_session.get("search_use_case") == "new-search"
-        fake_repo.delete_by_source.assert_called_once_with("a.pdf")
+        fake_repo.adelete_by_source.assert_awaited_once_with("a.pdf")
+        registry.delete.assert_called_once_with("a.pdf")
 
     @pytest.mark.asyncio
     async def test_delete_clears_search_when_library_empty(self):
@@ -232,9 +420,11 @@ class TestHandleDeletePdf:
         _patch_message()
 
         fake_repo = MagicMock()
-        fake_repo.delete_by_source.return_value = 5
+        fake_repo.adelete_by_source = AsyncMock(return_value=5)
+        registry = MagicMock()
 
         with patch.object(chainlit_app.ProviderFactory, "get_repository", return_value=fake_repo), \
+             patch.object(chainlit_app.ProviderFactory, "get_document_registry", return_value=registry), \
              patch.object(chainlit_app, "_create_search_use_case", return_value="new-search"), \
              patch.object(chainlit_app, "update_thread_metadata", new=AsyncMock()), \
              patch.object(chainlit_app, "show_pdf_list", new=AsyncMock()):
@@ -252,9 +442,10 @@ class TestHandleDeletePdf:
         sent = _patch_message()
 
         fake_repo = MagicMock()
-        fake_repo.delete_by_source.side_effect = RuntimeError("DB fail")
+        fake_repo.adelete_by_source = AsyncMock(side_effect=RuntimeError("DB fail"))
 
-        with patch.object(chainlit_app.ProviderFactory, "get_repository", return_value=fake_repo):
+        with patch.object(chainlit_app.ProviderFactory, "get_repository", return_value=fake_repo), \
+             patch.object(chainlit_app.ProviderFactory, "get_document_registry", return_value=None):
             action = MagicMock()
             action.payload = {"pdf_name": "a.pdf"}
             await chainlit_app.handle_delete_pdf(action)
@@ -345,10 +536,11 @@ class TestProcessFile:
         fake_doc.chunk_count = 5
 
         fake_uc = MagicMock()
-        fake_uc.execute.return_value = fake_doc
+        fake_uc.aexecute = AsyncMock(return_value=fake_doc)
 
         with patch.object(chainlit_app.ProviderFactory, "get_repository", return_value="repo"), \
              patch.object(chainlit_app.ProviderFactory, "get_document_loader", return_value="loader"), \
+             patch.object(chainlit_app.ProviderFactory, "get_embeddings", return_value="embeddings"), \
              patch.object(chainlit_app, "IngestDocumentUseCase", return_value=fake_uc):
 
             file_el = SimpleNamespace(name="r.pdf", path="/tmp/abc")
@@ -356,11 +548,31 @@ class TestProcessFile:
 
         assert count == 5
         assert name == "r.pdf"
-        fake_uc.execute.assert_called_once_with(
+        fake_uc.aexecute.assert_awaited_once_with(
             "/tmp/abc", source_name="r.pdf", clear_existing=True
         )
 
 
+class TestProcessFiles:
+    """Tests for process_files() — the multi-file pipeline wiring."""
+
+    @pytest.mark.asyncio
+    async def test_passes_paths_with_display_names(self):
+        fake_uc = MagicMock()
+        fake_uc.aexecute_many = AsyncMock(return_value="result")
+
+        with patch.object(chainlit_app.ProviderFactory, "get_repository", return_value="repo"), \
+             patch.object(chainlit_app.ProviderFactory, "get_document_loader", return_value="loader"), \
+             patch.object(chainlit_app.ProviderFactory, "get_embeddings", return_value="embeddings"), \
+             patch.object(chainlit_app, "IngestDocumentUseCase", return_value=fake_uc):
+            files = [SimpleNamespace(name="a.pdf", path="/tmp/1"), SimpleNamespace(name="b.md", path="/tmp/2")]
+            assert await chainlit_app.process_files(files, clear_first=True) == "result"
+
+        fake_uc.aexecute_many.assert_awaited_once_with(
+            [("/tmp/1", "a.pdf"), ("/tmp/2", "b.md")], clear_existing=True
+        )
+
+
 class TestOnMessageRouter:
     """Tests for the @cl.on_message handler (command routing + search)."""
 
@@ -382,9 +594,9 @@ class TestOnMessageRouter:
     @pytest.mark.asyncio
     async def test_attached_files_with_question_ingests_then_answers(self):
         fake_search = MagicMock()
-        fake_result = MagicMock()
-        fake_result.answer = "The document says..."
-        fake_search.execute.return_value = fake_result
+        fake_search.astream = _fake_astream(
+            "The document ", "says...", SearchResult(query="q", answer="The document says...")
+        )
         _setup_user_session({"pdf_data": {}})
         sent = _patch_message()
 
@@ -399,7 +611,7 @@ class TestOnMessageRouter:
         with patch.object(chainlit_app, "_ingest_files", new=fake_ingest):
             await chainlit_app.main(message)
 
-        fake_search.execute.assert_called_once_with("What does the report say?")
+        assert fake_search.astream.calls == ["What does the report say?"]
         assert any(m.content == "The document says..." for m in sent)
 
     @pytest.mark.asyncio
@@ -459,6 +671,88 @@ class TestOnMessageRouter:
         await chainlit_app.main(message)
         assert any("Question Ideas" in m.content for m in sent)
 
+    @pytest.mark.asyncio
+    async def test_stats_command_reports_cache_hit_rates(self):
+        from src.domain.ports.answer_cache import AnswerCacheStats
+        from src.infrastructure.adapters.cached_embeddings import EmbeddingCacheStats
+        from src.infrastructure.adapters.bounded_password_hasher import HashingStats
+
+        _setup_user_session({"pdf_data": {}})
+        sent = _patch_message()
+        answer_cache = MagicMock()
+        answer_cache.stats.return_value = AnswerCacheStats(hits=3, misses=1, near_misses=1, threshold=0.97)
+        embeddings = MagicMock()
+        embeddings.stats.return_value = EmbeddingCacheStats(hits=1, misses=1)
+        hasher = MagicMock()
+        hasher.stats.return_value = HashingStats(workers=2, max_queue=32, running=2, queued=5, rejected=4)
+
+        message = MagicMock()
+        message.elements = []
+        message.content = "/stats"
+
+        with patch.object(chainlit_app.ProviderFactory, "get_answer_cache", return_value=answer_cache), \
+             patch.object(chainlit_app.ProviderFactory, "get_embeddings", return_value=embeddings), \
+             patch.object(chainlit_app.ProviderFactory, "get_password_hasher", return_value=hasher):
+            await chainlit_app.main(message)
+
+        assert any("75%" in m.content and "near misses" in m.content for m in sent)
+        assert any("Query embedding cache" in m.content for m in sent)
+        assert any("queue 5/32" in m.content and "rejected when saturated: 4" in m.content for m in sent)
+
+    @pytest.mark.asyncio
+    async def test_stats_command_with_answer_cache_disabled(self):
+        _setup_user_session({"pdf_data": {}})
+        sent = _patch_message()
+        message = MagicMock()
+        message.elements = []
+        message.content = "/stats"
+
+        with patch.object(chainlit_app.ProviderFactory, "get_answer_cache", return_value=None), \
+             patch.object(chainlit_app.ProviderFactory, "get_embeddings", return_value=object()), \
+             patch.object(chainlit_app.ProviderFactory, "get_password_hasher", return_value=object()):
+            await chainlit_app.main(message)
+
+        assert any("disabled" in m.content for m in sent)
+
+    @pytest.mark.asyncio
+    async def test_stats_command_reports_avoided_llm_calls(self, monkeypatch):
+        from src.config.settings import get_settings
+
+        monkeypatch.setattr(get_settings(), "relevance_floor", 0.4)
+        chainlit_app.LLM_CALLS_AVOIDED.reset()
+        chainlit_app.LLM_CALLS_AVOIDED.increment(3)
+        _setup_user_session({"pdf_data": {}})
+        sent = _patch_message()
+        message = MagicMock()
+        message.elements = []
+        message.content = "/stats"
+
+        with patch.object(chainlit_app.ProviderFactory, "get_answer_cache", return_value=None), \
+             patch.object(chainlit_app.ProviderFactory, "get_embeddings", return_value=object()), \
+             patch.object(chainlit_app.ProviderFactory, "get_password_hasher", return_value=object()):
+            await chainlit_app.main(message)
+        chainlit_app.LLM_CALLS_AVOIDED.reset()
+
+        assert any("Relevance floor** (0.40): 3 LLM calls avoided" in m.content for m in sent)
+
+    @pytest.mark.asyncio
+    async def test_stats_command_reports_context_tokens_saved(self):
+        chainlit_app.CONTEXT_TOKENS_SAVED.reset()
+        chainlit_app.CONTEXT_TOKENS_SAVED.increment(120)
+        _setup_user_session({"pdf_data": {}})
+        sent = _patch_message()
+        message = MagicMock()
+        message.elements = []
+        message.content = "/stats"
+
+        with patch.object(chainlit_app.ProviderFactory, "get_answer_cache", return_value=None), \
+             patch.object(chainlit_app.ProviderFactory, "get_embeddings", return_value=object()), \
+             patch.object(chainlit_app.ProviderFactory, "get_password_hasher", return_value=object()):
+            await chainlit_app.main(message)
+        chainlit_app.CONTEXT_TOKENS_SAVED.reset()
+
+        assert any("Context assembly:** ~120 prompt tokens saved" in m.content for m in sent)
+
     @pytest.mark.asyncio
     async def test_no_search_use_case_prompts_upload(self):
         _setup_user_session({"pdf_data": {}, "search_use_case": None})
@@ -474,14 +768,13 @@ class TestOnMessageRouter:
     @pytest.mark.asyncio
     async def test_search_executes_and_returns_answer(self):
         fake_search = MagicMock()
-        fake_result = MagicMock()
-        fake_result.answer = "RAG is..."
-        fake_search.execute.return_value = fake_result
+        fake_search.astream = _fake_astream("RAG ", "is...", SearchResult(query="q", answer="RAG is..."))
         _setup_user_session(
             {"pdf_data": {"x.pdf": 5}, "search_use_case": fake_search}
         )
 
         sent = []
+        streamed = []
 
         class FakeMessage:
             def __init__(self, content="", actions=None):
@@ -495,6 +788,10 @@ class TestOnMessageRouter:
             async def update(self):
                 return None
 
+            async def stream_token(self, token):
+                self.content += token
+                streamed.append(token)
+
         chainlit_app.cl.Message = FakeMessage
 
         message = MagicMock()
@@ -502,13 +799,14 @@ class TestOnMessageRouter:
         message.content = "What is RAG?"
 
         await chainlit_app.main(message)
-        # Last message must contain the answer
+        # Tokens are streamed into the message as they arrive
+        assert streamed == ["RAG ", "is..."]
         assert any(m.content == "RAG is..." for m in sent)
 
     @pytest.mark.asyncio
     async def test_search_error_sent_to_user(self):
         fake_search = MagicMock()
-        fake_search.execute.side_effect = RuntimeError("LLM down")
+        fake_search.astream = _fake_astream("partial", error=RuntimeError("LLM down"))
         _setup_user_session(
             {"pdf_data": {"x.pdf": 5}, "search_use_case": fake_search}
         )
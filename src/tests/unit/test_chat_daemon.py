@@ -0,0 +1,121 @@
+"""
+Unit tests for the chat daemon (src/chat_daemon.py).
+
+A real Unix socket server runs in a thread with a fake use case.
+"""
+import os
+import socket
+import tempfile
+import threading
+
+import pytest
+
+from src import chat_daemon
+from src.domain.entities.document import DocumentChunk, SearchResult
+from src.domain.exceptions import SearchError
+
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets only")
+
+
+class FakeUseCase:
+    def stream(self, question):
+        if question == "boom":
+            raise SearchError("Search failed: LLM timeout")
+        yield "4"
+        yield "2"
+        yield SearchResult(
+            query=question,
+            answer="42",
+            sources=[DocumentChunk(content="ctx", metadata={"source_file": "a.pdf", "page": 1})],
+            time_to_first_token=0.1,
+        )
+
+
+@pytest.fixture
+def path():
+    # Short directory: AF_UNIX paths are limited to ~100 bytes.
+    with tempfile.TemporaryDirectory(prefix="dm") as directory:
+        yield os.path.join(directory, "chat.sock")
+
+
+@pytest.fixture
+def server(path):
+    server = chat_daemon.create_server(FakeUseCase(), path)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestSocketPath:
+    def test_env_override(self, monkeypatch):
+        monkeypatch.setenv("CHAT_DAEMON_SOCKET", "/run/x.sock")
+        assert chat_daemon.socket_path() == "/run/x.sock"
+
+    def test_default_is_per_user_temp_file(self, monkeypatch):
+        monkeypatch.delenv("CHAT_DAEMON_SOCKET", raising=False)
+        assert chat_daemon.socket_path().startswith(tempfile.gettempdir())
+
+
+class TestConnect:
+    def test_no_socket_returns_none(self, path):
+        assert chat_daemon.connect_daemon(path) is None
+
+    def test_stale_socket_returns_none(self, path):
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(path)
+        stale.close()
+        assert chat_daemon.connect_daemon(path) is None
+
+    def test_running_daemon_returns_client(self, server, path):
+        assert isinstance(chat_daemon.connect_daemon(path), chat_daemon.DaemonClient)
+
+
+class TestRoundTrip:
+    def test_stream_yields_tokens_then_result(self, server, path):
+        items = list(chat_daemon.connect_daemon(path).stream("q?"))
+
+        assert items[:2] == ["4", "2"]
+        result = items[2]
+        assert isinstance(result, SearchResult)
+        assert (result.query, result.answer, result.time_to_first_token) == ("q?", "42", 0.1)
+        assert result.sources[0].metadata == {"source_file": "a.pdf", "page": 1}
+
+    def test_execute_returns_result(self, server, path):
+        assert chat_daemon.connect_daemon(path).execute("q?").answer == "42"
+
+    def test_errors_raised_as_search_error(self, server, path):
+        with pytest.raises(SearchError, match="LLM timeout"):
+            list(chat_daemon.connect_daemon(path).stream("boom"))
+
+    def test_concurrent_clients(self, server, path):
+        client = chat_daemon.connect_daemon(path)
+        answers = []
+        threads = [
+            threading.Thread(target=lambda: answers.append(client.execute("q").answer))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert answers == ["42"] * 8
+
+
+class TestCreateServer:
+    def test_socket_is_owner_only(self, server, path):
+        assert os.stat(path).st_mode & 0o777 == 0o600
+
+    def test_replaces_stale_socket(self, path):
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(path)
+        stale.close()
+
+        server = chat_daemon.create_server(FakeUseCase(), path)
+        server.server_close()
+
+    def test_refuses_second_daemon(self, server, path):
+        with pytest.raises(RuntimeError, match="already listening"):
+            chat_daemon.create_server(FakeUseCase(), path)
@@ -5,6 +5,7 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from src.domain.entities.document import SearchResult
 from src.infrastructure.adapters.document_loader import MultiFormatDocumentLoader
 from src.infrastructure.factories.provider_factory import ProviderFactory
 from src.presentation.cli import chat as cli_chat
@@ -93,6 +94,11 @@ class TestSelectDocument:
 class TestMain:
     """Tests for the CLI main() entry point."""
 
+    @pytest.fixture(autouse=True)
+    def _embeddings(self):
+        with patch.object(ProviderFactory, "get_embeddings"):
+            yield
+
     def test_no_documents_returns_early(self, tmp_path, monkeypatch, capsys):
         monkeypatch.chdir(tmp_path)
         cli_chat.main()
@@ -130,9 +136,9 @@ class TestMain:
         fake_ingest = MagicMock()
         fake_ingest.execute.return_value = MagicMock(chunk_count=2)
 
-        result = MagicMock(answer="the answer is 42")
+        result = SearchResult(query="what?", answer="the answer is 42", time_to_first_token=0.1)
         search_inst = MagicMock()
-        search_inst.execute.return_value = result
+        search_inst.stream.return_value = iter(["the answer ", "is 42", result])
 
         with patch.object(ProviderFactory, "get_repository"), \
              patch.object(ProviderFactory, "get_llm"), \
@@ -144,6 +150,7 @@ class TestMain:
 
         captured = capsys.readouterr()
         assert "the answer is 42" in captured.out
+        assert "First token after 100 ms" in captured.out
 
     def test_keyboard_interrupt_in_chat_exits(self, doc_dir, monkeypatch, capsys):
         monkeypatch.chdir(doc_dir)
@@ -170,9 +177,8 @@ class TestMain:
         fake_ingest = MagicMock()
         fake_ingest.execute.return_value = MagicMock(chunk_count=2)
 
-        result = MagicMock(answer="A")
         search_inst = MagicMock()
-        search_inst.execute.return_value = result
+        search_inst.stream.return_value = iter(["A"])
 
         with patch.object(ProviderFactory, "get_repository"), \
              patch.object(ProviderFactory, "get_llm"), \
@@ -182,7 +188,7 @@ class TestMain:
              patch("builtins.input", side_effect=["1", "", "real question", "exit"]):
             cli_chat.main()
 
-        assert search_inst.execute.call_count == 1
+        assert search_inst.stream.call_count == 1
 
     def test_ingest_error_exits_with_code_1(self, doc_dir, monkeypatch):
         monkeypatch.chdir(doc_dir)
@@ -0,0 +1,79 @@
+"""
+Unit tests for the collection alias helpers (blue/green rebuilds).
+"""
+from unittest.mock import MagicMock
+
+from src.infrastructure.adapters.collection_alias import (
+    collection_id_sql,
+    resolve_collection_sql,
+    rollback_alias,
+    shadow_collection_name,
+    swap_alias,
+)
+
+
+def _conn(alias_row=None, legacy_exists=False):
+    conn = MagicMock(name="conn")
+
+    def execute(sql, params=None):
+        result = MagicMock(name="result")
+        if "FOR UPDATE" in sql:
+            result.fetchone.return_value = alias_row
+        elif "SELECT 1 FROM langchain_pg_collection" in sql:
+            result.fetchone.return_value = (1,) if legacy_exists else None
+        return result
+
+    conn.execute.side_effect = execute
+    return conn
+
+
+def _set_alias_params(conn):
+    return next(c.args[1] for c in conn.execute.call_args_list if "INSERT INTO collection_alias" in c.args[0])
+
+
+class TestSql:
+    def test_name_parameter_appears_once(self):
+        assert resolve_collection_sql("%s").count("%s") == 1
+        assert collection_id_sql(":name").count(":name") == 1
+
+    def test_shadow_names_are_unique_per_alias(self):
+        a, b = shadow_collection_name("docs"), shadow_collection_name("docs")
+        assert a.startswith("docs__") and b.startswith("docs__") and a != b
+
+
+class TestSwapAlias:
+    def test_first_swap_adopts_legacy_collection_as_previous(self):
+        conn = _conn(alias_row=None, legacy_exists=True)
+        assert swap_alias(conn, "docs", "docs__b") is None
+        assert _set_alias_params(conn) == ("docs", "docs__b", "docs")
+
+    def test_first_swap_on_empty_database(self):
+        conn = _conn(alias_row=None, legacy_exists=False)
+        assert swap_alias(conn, "docs", "docs__b") is None
+        assert _set_alias_params(conn) == ("docs", "docs__b", None)
+
+    def test_returns_collection_two_generations_back(self):
+        conn = _conn(alias_row=("docs__b", "docs__a"))
+        assert swap_alias(conn, "docs", "docs__c") == "docs__a"
+        assert _set_alias_params(conn) == ("docs", "docs__c", "docs__b")
+
+    def test_never_returns_the_new_or_current_collection(self):
+        conn = _conn(alias_row=("docs__b", "docs__c"))
+        assert swap_alias(conn, "docs", "docs__c") is None
+
+    def test_analyzes_before_swapping(self):
+        conn = _conn(alias_row=None)
+        swap_alias(conn, "docs", "docs__b")
+        assert conn.execute.call_args_list[0].args[0] == "ANALYZE langchain_pg_embedding"
+
+
+class TestRollbackAlias:
+    def test_returns_restored_collection(self):
+        conn = MagicMock()
+        conn.execute.return_value.fetchone.return_value = ("docs__a",)
+        assert rollback_alias(conn, "docs") == "docs__a"
+
+    def test_none_without_previous(self):
+        conn = MagicMock()
+        conn.execute.return_value.fetchone.return_value = None
+        assert rollback_alias(conn, "docs") is None
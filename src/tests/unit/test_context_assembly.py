@@ -0,0 +1,113 @@
+"""
+Unit tests for context assembly (overlap merging and near-duplicate dropping).
+"""
+import random
+
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from src.application.context_assembly import (
+    assemble_context,
+    estimate_tokens,
+    format_docs,
+    overlap_length,
+)
+from src.domain.entities.document import DocumentChunk
+
+
+def _page_chunks(source="a.pdf", page=1, seed=7):
+    """Chunks of one page as ingestion splits them (1000 / 150 overlap), and the page text."""
+    rng = random.Random(seed)
+    words = ["".join(rng.choice("abcdefghij") for _ in range(rng.randint(2, 9))) for _ in range(900)]
+    text = " ".join(words)
+    splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=150)
+    return [
+        DocumentChunk(content=part, metadata={"source_file": source, "page": page})
+        for part in splitter.split_text(text)
+    ], text
+
+
+class TestOverlapLength:
+    """Tests for overlap_length()."""
+
+    def test_finds_shared_end_and_start(self):
+        head = "alpha beta gamma delta epsilon zeta eta theta"
+        tail = "epsilon zeta eta theta iota kappa lambda"
+        assert overlap_length(head, tail, 150) == len("epsilon zeta eta theta")
+
+    def test_short_coincidence_is_not_overlap(self):
+        assert overlap_length("ends with the end", "the end starts this one", 150) == 0
+
+    def test_limited_to_max_overlap(self):
+        shared = "the quick brown fox jumps over a lazy dog"
+        assert overlap_length("head " + shared, shared + " tail", 60) == len(shared)
+        assert overlap_length("head " + shared, shared + " tail", 30) == 0
+
+
+class TestAssembleContext:
+    """Tests for assemble_context()."""
+
+    def test_merges_neighbours_back_into_page_text(self):
+        chunks, text = _page_chunks()
+        context = assemble_context(chunks[:3], max_overlap=150)
+
+        assert len(context.passages) == 1
+        assert context.chunks_merged == 2
+        assert context.passages[0].content in text
+        assert context.passages[0].content == text[: len(context.passages[0].content)]
+        assert context.tokens_saved > 0
+
+    def test_merges_regardless_of_retrieval_order(self):
+        chunks, _ = _page_chunks()
+        in_order = assemble_context(chunks[:3], max_overlap=150)
+        shuffled = assemble_context([chunks[2], chunks[0], chunks[1]], max_overlap=150)
+
+        assert [p.content for p in shuffled.passages] == [p.content for p in in_order.passages]
+
+    def test_other_page_is_not_merged(self):
+        chunks, _ = _page_chunks()
+        other = DocumentChunk(content=chunks[1].content, metadata={"source_file": "a.pdf", "page": 2})
+        context = assemble_context([chunks[0], other], max_overlap=150, dedup_threshold=1.1)
+
+        assert context.chunks_merged == 0
+        assert len(context.passages) == 2
+
+    def test_passages_keep_rank_of_best_chunk(self):
+        chunks, _ = _page_chunks()
+        unrelated = DocumentChunk(content="a different topic entirely", metadata={"source_file": "b.pdf"})
+        context = assemble_context([chunks[1], unrelated, chunks[0]], max_overlap=150)
+
+        assert [p.source_file for p in context.passages] == ["a.pdf", "b.pdf"]
+
+    def test_drops_near_duplicate_from_other_document(self):
+        paragraph = "O prazo de entrega do relatório anual é de trinta dias após o fechamento do exercício."
+        first = DocumentChunk(content=paragraph, metadata={"source_file": "a.pdf"})
+        copy = DocumentChunk(content=paragraph.upper(), metadata={"source_file": "b.pdf"})
+        context = assemble_context([first, copy], max_overlap=150)
+
+        assert context.passages == [first]
+        assert context.chunks_dropped == 1
+        assert 'source="b.pdf"' not in context.text
+
+    def test_keeps_distinct_passages(self):
+        a = DocumentChunk(content="one two three four five", metadata={"source_file": "a.pdf"})
+        b = DocumentChunk(content="six seven eight nine ten", metadata={"source_file": "b.pdf"})
+        context = assemble_context([a, b], max_overlap=150)
+
+        assert context.passages == [a, b]
+        assert context.text == format_docs([a, b])
+        assert context.tokens_saved == 0
+
+    def test_tokens_saved_is_the_estimated_difference(self):
+        chunks, _ = _page_chunks()
+        context = assemble_context(chunks[:2], max_overlap=150)
+
+        assert context.tokens_saved == estimate_tokens(format_docs(chunks[:2])) - estimate_tokens(context.text)
+
+    def test_merged_passage_shares_metadata(self):
+        chunks, _ = _page_chunks()
+        context = assemble_context(chunks[:2], max_overlap=150)
+        assert context.passages[0].metadata is chunks[0].metadata
+
+    def test_empty(self):
+        context = assemble_context([], max_overlap=150)
+        assert (context.text, context.passages, context.tokens_saved) == ("", [], 0)
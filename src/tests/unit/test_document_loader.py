@@ -233,3 +233,37 @@ class TestJsonExtraEdgeCases:
         docs = loader.load(str(f))
         assert "olá mundo" in docs[0].page_content
         assert "açaí" in docs[0].page_content
+
+
+class TestLazyLoad:
+    """Tests for lazy_load() — page/row streaming."""
+
+    def test_yields_csv_rows_one_at_a_time(self, loader, tmp_csv_file):
+        rows = loader.lazy_load(str(tmp_csv_file))
+
+        first = next(rows)
+        assert "Alice" in first.page_content
+        assert "Bob" in next(rows).page_content
+        assert next(rows, None) is None
+
+    def test_same_documents_as_load(self, loader, tmp_json_list_file):
+        lazy = list(loader.lazy_load(str(tmp_json_list_file)))
+        assert [d.page_content for d in lazy] == [d.page_content for d in loader.load(str(tmp_json_list_file))]
+
+    def test_unsupported_format_raises_on_iteration(self, loader, tmp_path):
+        f = tmp_path / "file.xyz"
+        f.write_text("data")
+        with pytest.raises(UnsupportedFormatError):
+            next(loader.lazy_load(str(f)))
+
+    def test_port_default_delegates_to_load(self):
+        from src.domain.ports.document_loader import DocumentLoaderPort
+
+        class ListLoader(DocumentLoaderPort):
+            def load(self, file_path, file_name=None):
+                return ["p1", "p2"]
+
+            def supported_extensions(self):
+                return {"txt"}
+
+        assert list(ListLoader().lazy_load("a.txt")) == ["p1", "p2"]
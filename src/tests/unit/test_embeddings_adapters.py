@@ -1,7 +1,7 @@
 """
 Unit tests for Embeddings adapters (OpenAI, Google).
 """
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -69,6 +69,40 @@ class TestOpenAIEmbeddingsAdapter:
             assert adapter.embed_query("q") == [0.5]
             cls.return_value.embed_query.assert_called_once_with("q")
 
+    def test_embed_queries_single_batched_request(self, fake_settings):
+        with patch(
+            "src.infrastructure.adapters.openai_embeddings.get_settings",
+            return_value=fake_settings,
+        ), patch(
+            "src.infrastructure.adapters.openai_embeddings.OpenAIEmbeddings"
+        ) as cls:
+            cls.return_value.embed_documents.return_value = [[0.1], [0.2]]
+            from src.infrastructure.adapters.openai_embeddings import (
+                OpenAIEmbeddingsAdapter,
+            )
+
+            adapter = OpenAIEmbeddingsAdapter()
+            assert adapter.embed_queries(["a", "b"]) == [[0.1], [0.2]]
+            cls.return_value.embed_documents.assert_called_once_with(["a", "b"])
+            cls.return_value.embed_query.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_async_methods_use_async_client(self, fake_settings):
+        with patch(
+            "src.infrastructure.adapters.openai_embeddings.get_settings",
+            return_value=fake_settings,
+        ), patch(
+            "src.infrastructure.adapters.openai_embeddings.OpenAIEmbeddings"
+        ) as cls:
+            cls.return_value.aembed_query = AsyncMock(return_value=[0.5])
+            cls.return_value.aembed_documents = AsyncMock(return_value=[[0.1]])
+            from src.infrastructure.adapters.openai_embeddings import OpenAIEmbeddingsAdapter
+
+            adapter = OpenAIEmbeddingsAdapter()
+            assert await adapter.aembed_query("q") == [0.5]
+            assert await adapter.aembed_documents(["a"]) == [[0.1]]
+            cls.return_value.embed_query.assert_not_called()
+
     def test_get_langchain_embeddings_returns_underlying(self, fake_settings):
         with patch(
             "src.infrastructure.adapters.openai_embeddings.get_settings",
@@ -132,6 +166,40 @@ class TestGoogleEmbeddingsAdapter:
 
             assert GoogleEmbeddingsAdapter().embed_query("q") == [0.3]
 
+    def test_embed_queries_batched_with_query_task_type(self, fake_settings):
+        with patch(
+            "src.infrastructure.adapters.google_embeddings.get_settings",
+            return_value=fake_settings,
+        ), patch(
+            "src.infrastructure.adapters.google_embeddings.GoogleGenerativeAIEmbeddings"
+        ) as cls:
+            cls.return_value.embed_documents.return_value = [[0.3], [0.4]]
+            from src.infrastructure.adapters.google_embeddings import (
+                GoogleEmbeddingsAdapter,
+            )
+
+            assert GoogleEmbeddingsAdapter().embed_queries(["a", "b"]) == [[0.3], [0.4]]
+            cls.return_value.embed_documents.assert_called_once_with(
+                ["a", "b"], task_type="RETRIEVAL_QUERY"
+            )
+
+    @pytest.mark.asyncio
+    async def test_async_methods_use_async_client(self, fake_settings):
+        with patch(
+            "src.infrastructure.adapters.google_embeddings.get_settings",
+            return_value=fake_settings,
+        ), patch(
+            "src.infrastructure.adapters.google_embeddings.GoogleGenerativeAIEmbeddings"
+        ) as cls:
+            cls.return_value.aembed_query = AsyncMock(return_value=[0.5])
+            cls.return_value.aembed_documents = AsyncMock(return_value=[[0.1]])
+            from src.infrastructure.adapters.google_embeddings import GoogleEmbeddingsAdapter
+
+            adapter = GoogleEmbeddingsAdapter()
+            assert await adapter.aembed_query("q") == [0.5]
+            assert await adapter.aembed_documents(["a"]) == [[0.1]]
+            cls.return_value.embed_query.assert_not_called()
+
     def test_get_langchain_embeddings_returns_underlying(self, fake_settings):
         with patch(
             "src.infrastructure.adapters.google_embeddings.get_settings",
@@ -3,7 +3,15 @@ Unit tests for domain entities.
 """
 import pytest
 
-from src.domain.entities.document import Document, DocumentChunk, SearchResult
+from src.domain.entities.document import (
+    BatchIngestResult,
+    BatchSearchResult,
+    Document,
+    DocumentChunk,
+    ScoredChunk,
+    SearchResult,
+)
+from src.domain.entities.ingest_job import IngestJob
 
 
 class TestDocumentChunk:
@@ -28,6 +36,29 @@ class TestDocumentChunk:
         assert chunk.page_number is None
 
 
+class TestScoredChunk:
+    """Tests for ScoredChunk entity."""
+
+    def test_is_a_chunk_with_distance(self):
+        chunk = ScoredChunk(content="Test", metadata={"page": 2}, score=0.75, id="row-1")
+
+        assert isinstance(chunk, DocumentChunk)
+        assert chunk.page_number == 2
+        assert chunk.distance == pytest.approx(0.25)
+
+    def test_from_chunk_shares_metadata(self):
+        chunk = DocumentChunk(content="Test", metadata={"source_file": "test.pdf"})
+        scored = ScoredChunk.from_chunk(chunk, 0.9, id="row-1")
+
+        assert scored.metadata is chunk.metadata
+        assert (scored.content, scored.score, scored.id, scored.embedding) == ("Test", 0.9, "row-1", None)
+
+    def test_embedding_is_not_compared(self):
+        a = ScoredChunk(content="Test", score=0.5, embedding=[1.0, 0.0])
+        b = ScoredChunk(content="Test", score=0.5)
+        assert a == b
+
+
 class TestDocument:
     """Tests for Document entity."""
     
@@ -44,6 +75,12 @@ class TestDocument:
         
         assert doc.chunk_count == 0
 
+    def test_stored_chunks_overrides_count(self):
+        """Streaming ingestion reports the count without keeping the chunks."""
+        doc = Document(name="big.pdf", stored_chunks=1200)
+        assert doc.chunk_count == 1200
+        assert doc.chunks == []
+
 
 class TestSearchResult:
     """Tests for SearchResult entity."""
@@ -59,3 +96,47 @@ class TestSearchResult:
         assert result.query == "What is this?"
         assert result.answer == "This is a test."
         assert len(result.sources) == 2
+
+
+class TestBatchSearchResult:
+    """Tests for BatchSearchResult entity."""
+
+    def test_questions_per_second(self):
+        batch = BatchSearchResult(
+            results=[SearchResult(query="a", answer="x"), None],
+            errors={1: "Search failed: timeout"},
+            elapsed_seconds=0.5,
+        )
+        assert batch.questions_per_second == 4.0
+
+    def test_zero_elapsed(self):
+        assert BatchSearchResult().questions_per_second == 0.0
+
+
+class TestBatchIngestResult:
+    """Tests for BatchIngestResult entity."""
+
+    def test_throughput(self, sample_chunks):
+        batch = BatchIngestResult(
+            documents=[Document(name="a.pdf", chunks=sample_chunks), None],
+            errors={1: "Document 'b.pdf' is empty"},
+            elapsed_seconds=2.0,
+        )
+        assert batch.chunk_count == 2
+        assert batch.files_per_second == 1.0
+        assert batch.chunks_per_second == 1.0
+
+    def test_zero_elapsed(self):
+        batch = BatchIngestResult()
+        assert (batch.files_per_second, batch.chunks_per_second) == (0.0, 0.0)
+
+
+class TestIngestJob:
+    """Tests for IngestJob entity."""
+
+    @pytest.mark.parametrize("status,finished", [
+        ("queued", False), ("running", False), ("done", True), ("failed", True),
+    ])
+    def test_finished(self, status, finished):
+        job = IngestJob(id="j", file_path="/spool/a.pdf", source_name="a.pdf", status=status)
+        assert job.finished is finished
@@ -1,9 +1,23 @@
 """
 Unit tests for IngestDocumentUseCase.
 """
+import pickle
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from unittest.mock import Mock
+
 import pytest
+from langchain_core.documents import Document as LangchainDocument
 
-from src.application.use_cases.ingest_document import IngestDocumentUseCase
+from src.application.use_cases.ingest_document import (
+    IngestDocumentUseCase,
+    _parse_pool,
+    _split_in_worker,
+    file_hash,
+)
+from src.domain.entities.document import DocumentRecord
+from src.domain.ports.embeddings import EmbeddingsPort
 from src.domain.exceptions import UnsupportedFormatError, InvalidDocumentError, IngestionError
 
 
@@ -61,3 +75,734 @@ class TestIngestDocumentUseCase:
 
         with pytest.raises(IngestionError, match="Failed to ingest"):
             use_case.execute("/path/to/test.txt")
+
+    @pytest.mark.asyncio
+    async def test_aexecute_stores_through_async_port(self, mock_repository, mock_document_loader):
+        """Test that aexecute awaits aadd_documents instead of the sync method."""
+        use_case = IngestDocumentUseCase(mock_repository, mock_document_loader)
+
+        result = await use_case.aexecute("/path/to/test.txt", clear_existing=True)
+
+        assert result.name == "test.txt"
+        mock_repository.aadd_documents.assert_awaited_once()
+        assert mock_repository.aadd_documents.call_args.kwargs["clear_existing"] is True
+        mock_repository.add_documents.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_aexecute_empty_document_raises(self, mock_repository, mock_document_loader):
+        """Test that aexecute keeps execute's validation errors."""
+        mock_document_loader.load.return_value = []
+        use_case = IngestDocumentUseCase(mock_repository, mock_document_loader)
+
+        with pytest.raises(InvalidDocumentError, match="is empty"):
+            await use_case.aexecute("/path/to/empty.txt")
+
+
+class TestStreamingIngestion:
+    """Tests for execute()/aexecute() streaming pages and storing fixed-size batches."""
+
+    @pytest.fixture(autouse=True)
+    def small_batches(self, monkeypatch):
+        from src.config.settings import get_settings
+
+        monkeypatch.setattr(get_settings(), "ingest_batch_size", 2)
+        monkeypatch.setattr(get_settings(), "ingest_batch_retries", 0)
+        monkeypatch.setattr(get_settings(), "ingest_retry_backoff_seconds", 0)
+
+    @pytest.fixture
+    def five_pages(self, mock_document_loader):
+        pulled = []
+
+        def pages(path, file_name=None):
+            for i in range(5):
+                pulled.append(i)
+                yield LangchainDocument(page_content=f"page {i}", metadata={"page": i})
+
+        mock_document_loader.lazy_load.side_effect = pages
+        return pulled
+
+    def test_stores_fixed_size_batches(self, mock_repository, mock_document_loader, five_pages):
+        use_case = IngestDocumentUseCase(mock_repository, mock_document_loader)
+
+        result = use_case.execute("/d/big.pdf", clear_existing=True)
+
+        batches = [c.args[0] for c in mock_repository.add_documents.call_args_list]
+        assert [len(b) for b in batches] == [2, 2, 1]
+        assert [c.kwargs["clear_existing"] for c in mock_repository.add_documents.call_args_list] == [True, False, False]
+        metadata = dict(batches[2][0].metadata)
+        assert len(metadata.pop("chunk_hash")) == 64
+        assert metadata == {"page": 4, "source_file": "big.pdf"}
+        assert result.chunk_count == 5
+        assert result.chunks == []
+
+    def test_pages_pulled_only_as_batches_are_stored(self, mock_repository, mock_document_loader, five_pages):
+        seen = []
+        mock_repository.add_documents.side_effect = lambda chunks, **kwargs: seen.append(len(five_pages))
+        use_case = IngestDocumentUseCase(mock_repository, mock_document_loader)
+
+        use_case.execute("/d/big.pdf")
+
+        # The loader is never more than one batch ahead of storage.
+        assert seen == [2, 4, 5]
+        mock_document_loader.load.assert_not_called()
+
+    def test_next_batch_embedded_while_current_one_is_inserted(
+        self, mock_repository, mock_document_loader, five_pages
+    ):
+        embeddings = Mock(spec=EmbeddingsPort)
+        embedded = []
+        second_batch_embedding = threading.Event()
+
+        def embed_documents(texts):
+            embedded.append(texts)
+            if len(embedded) == 2:
+                second_batch_embedding.set()
+            return [[float(len(embedded)), 0.0] for _ in texts]
+
+        embeddings.embed_documents.side_effect = embed_documents
+        overlapped, ahead = [], []
+
+        def add_documents(chunks, **kwargs):
+            if not overlapped:
+                overlapped.append(second_batch_embedding.wait(timeout=5))
+            ahead.append(len(embedded) - len(ahead))
+            return len(chunks)
+
+        mock_repository.add_documents.side_effect = add_documents
+        use_case = IngestDocumentUseCase(mock_repository, mock_document_loader, embeddings=embeddings)
+
+        result = use_case.execute("/d/big.pdf")
+
+        # Batch 2 was embedded while batch 1 was being inserted, never more than one batch ahead.
+        assert overlapped == [True]
+        assert max(ahead) <= 2
+        assert [c.kwargs["embeddings"] for c in mock_repository.add_documents.call_args_list] == [
+            [[1.0, 0.0]] * 2, [[2.0, 0.0]] * 2, [[3.0, 0.0]],
+        ]
+        assert [len(texts) for texts in embedded] == [2, 2, 1]
+        assert result.chunk_count == 5
+
+    def test_failed_batch_removes_only_the_chunks_it_stored(self, mock_repository, mock_document_loader, five_pages):
+        mock_repository.add_documents.side_effect = [2, RuntimeError("embedding quota")]
+        use_case = IngestDocumentUseCase(mock_repository, mock_document_loader)
+
+        with pytest.raises(IngestionError, match="embedding quota"):
+            use_case.execute("/d/big.pdf")
+
+        first_batch = mock_repository.add_documents.call_args_list[0].args[0]
+        mock_repository.delete_chunks.assert_called_once_with(
+            "big.pdf", [chunk.metadata["chunk_hash"] for chunk in first_batch]
+        )
+        # Chunks of big.pdf stored by earlier runs are left alone.
+        mock_repository.delete_by_source.assert_not_called()
+
+    def test_first_batch_failure_has_nothing_to_remove(self, mock_repository, mock_document_loader, five_pages):
+        mock_repository.add_documents.side_effect = RuntimeError("db down")
+        use_case = IngestDocumentUseCase(mock_repository, mock_document_loader)
+
+        with pytest.raises(IngestionError):
+            use_case.execute("/d/big.pdf")
+
+        mock_repository.delete_chunks.assert_not_called()
+        mock_repository.delete_by_source.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_aexecute_streams_batches(self, mock_repository, mock_document_loader, five_pages):
+        use_case = IngestDocumentUseCase(mock_repository, mock_document_loader)
+
+        result = await use_case.aexecute("/d/big.pdf", clear_existing=True)
+
+        calls = mock_repository.aadd_documents.call_args_list
+        assert [len(c.args[0]) for c in calls] == [2, 2, 1]
+        assert [c.kwargs["clear_existing"] for c in calls] == [True, False, False]
+        assert result.chunk_count == 5
+
+    @pytest.mark.asyncio
+    async def test_aexecute_failure_removes_stored_part(self, mock_repository, mock_document_loader, five_pages):
+        mock_repository.aadd_documents.side_effect = [2, RuntimeError("pool closed")]
+        use_case = IngestDocumentUseCase(mock_repository, mock_document_loader)
+
+        with pytest.raises(IngestionError):
+            await use_case.aexecute("/d/big.pdf")
+
+        first_batch = mock_repository.aadd_documents.call_args_list[0].args[0]
+        mock_repository.delete_chunks.assert_called_once_with(
+            "big.pdf", [chunk.metadata["chunk_hash"] for chunk in first_batch]
+        )
+        mock_repository.adelete_by_source.assert_not_called()
+
+    def test_reports_progress_after_each_batch(self, mock_repository, mock_document_loader, five_pages):
+        progress = []
+        use_case = IngestDocumentUseCase(mock_repository, mock_document_loader)
+
+        use_case.execute("/d/big.pdf", on_progress=progress.append)
+
+        assert progress == [2, 4, 5]
+
+    def test_failed_batch_is_retried(self, mock_repository, mock_document_loader, five_pages, monkeypatch):
+        from src.config.settings import get_settings
+
+        monkeypatch.setattr(get_settings(), "ingest_batch_retries", 2)
+        mock_repository.add_documents.side_effect = [2, RuntimeError("rate limited"), 2, 1]
+        use_case = IngestDocumentUseCase(mock_repository, mock_document_loader)
+
+        result = use_case.execute("/d/big.pdf", clear_existing=True)
+
+        calls = mock_repository.add_documents.call_args_list
+        assert [len(c.args[0]) for c in calls] == [2, 2, 2, 1]
+        assert calls[1].args[0] == calls[2].args[0]
+        assert [c.kwargs["clear_existing"] for c in calls] == [True, False, False, False]
+        assert result.chunk_count == 5
+        mock_repository.delete_by_source.assert_not_called()
+
+    def test_gives_up_after_retries(self, mock_repository, mock_document_loader, five_pages, monkeypatch):
+        from src.config.settings import get_settings
+
+        monkeypatch.setattr(get_settings(), "ingest_batch_retries", 1)
+        mock_repository.add_documents.side_effect = RuntimeError("db down")
+        use_case = IngestDocumentUseCase(mock_repository, mock_document_loader)
+
+        with pytest.raises(IngestionError, match="db down"):
+            use_case.execute("/d/big.pdf")
+
+        assert mock_repository.add_documents.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_aexecute_retries_and_reports_progress(self, mock_repository, mock_document_loader, five_pages, monkeypatch):
+        from src.config.settings import get_settings
+
+        monkeypatch.setattr(get_settings(), "ingest_batch_retries", 1)
+        mock_repository.aadd_documents.side_effect = [RuntimeError("timeout"), 2, 2, 1]
+        progress = []
+        use_case = IngestDocumentUseCase(mock_repository, mock_document_loader)
+
+        result = await use_case.aexecute("/d/big.pdf", on_progress=progress.append)
+
+        assert mock_repository.aadd_documents.await_count == 4
+        assert progress == [2, 4, 5]
+        assert result.chunk_count == 5
+
+
+def _thread_pool(workers):
+    """Parse executor for tests: Mock loaders cannot be pickled into worker processes."""
+    return ThreadPoolExecutor(max_workers=max(1, workers))
+
+
+class TestExecuteMany:
+    """Tests for execute_many() — the multi-file pipeline."""
+
+    @pytest.fixture(autouse=True)
+    def no_retries(self, monkeypatch):
+        from src.config.settings import get_settings
+
+        monkeypatch.setattr(get_settings(), "ingest_batch_retries", 0)
+
+    def _use_case(self, repository, loader):
+        return IngestDocumentUseCase(repository, loader, parse_executor_factory=_thread_pool)
+
+    def test_documents_in_input_order(self, mock_repository, mock_document_loader):
+        use_case = self._use_case(mock_repository, mock_document_loader)
+
+        result = use_case.execute_many(["/d/a.txt", ("/tmp/upload-1", "b.txt"), "/d/c.txt"])
+
+        assert [d.name for d in result.documents] == ["a.txt", "b.txt", "c.txt"]
+        assert result.errors == {}
+        assert mock_repository.add_documents.call_count == 3
+        assert result.chunk_count == 3
+        mock_document_loader.load.assert_any_call("/tmp/upload-1", file_name="b.txt")
+
+    def test_failed_file_is_isolated(self, mock_repository, mock_document_loader):
+        pages = mock_document_loader.load.return_value
+
+        def load(path, file_name=None):
+            if file_name == "bad.xyz":
+                raise UnsupportedFormatError("Unsupported format '.xyz'")
+            if file_name == "empty.txt":
+                return []
+            return pages
+
+        mock_document_loader.load.side_effect = load
+        use_case = self._use_case(mock_repository, mock_document_loader)
+
+        result = use_case.execute_many(["/d/a.txt", "/d/bad.xyz", "/d/empty.txt"])
+
+        assert result.documents[0].name == "a.txt"
+        assert result.documents[1:] == [None, None]
+        assert result.errors == {1: "Unsupported format '.xyz'", 2: "Document 'empty.txt' is empty"}
+        mock_repository.add_documents.assert_called_once()
+
+    def test_storage_failure_is_isolated(self, mock_repository, mock_document_loader):
+        def add_documents(chunks, **kwargs):
+            if chunks[0].metadata["source_file"] == "b.txt":
+                raise RuntimeError("embedding quota")
+            return len(chunks)
+
+        mock_repository.add_documents.side_effect = add_documents
+        use_case = self._use_case(mock_repository, mock_document_loader)
+
+        result = use_case.execute_many(["/d/a.txt", "/d/b.txt"])
+
+        assert result.documents[0] is not None
+        assert result.documents[1] is None
+        assert result.errors == {1: "Failed to ingest '/d/b.txt': embedding quota"}
+
+    def test_storage_failure_removes_only_the_batches_of_this_run(
+        self, mock_repository, mock_document_loader, monkeypatch
+    ):
+        from src.config.settings import get_settings
+
+        monkeypatch.setattr(get_settings(), "ingest_batch_size", 1)
+        mock_document_loader.load.return_value = [
+            LangchainDocument(page_content=f"page {i}", metadata={"page": i}) for i in range(3)
+        ]
+        mock_repository.add_documents.side_effect = [1, RuntimeError("embedding quota")]
+        use_case = self._use_case(mock_repository, mock_document_loader)
+
+        result = use_case.execute_many(["/d/a.txt"])
+
+        stored = mock_repository.add_documents.call_args_list[0].args[0]
+        mock_repository.delete_chunks.assert_called_once_with("a.txt", [stored[0].metadata["chunk_hash"]])
+        mock_repository.delete_by_source.assert_not_called()
+        assert result.errors == {0: "Failed to ingest '/d/a.txt': embedding quota"}
+
+    def test_clear_existing_applies_to_first_stored_file_only(self, mock_repository, mock_document_loader):
+        use_case = self._use_case(mock_repository, mock_document_loader)
+
+        use_case.execute_many(["/d/a.txt", "/d/b.txt", "/d/c.txt"], clear_existing=True)
+
+        clears = [c.kwargs["clear_existing"] for c in mock_repository.add_documents.call_args_list]
+        assert clears == [True, False, False]
+
+    def test_clear_moves_on_when_first_store_fails(self, mock_repository, mock_document_loader):
+        mock_repository.add_documents.side_effect = [RuntimeError("db down"), 1]
+        use_case = IngestDocumentUseCase(
+            mock_repository, mock_document_loader, parse_executor_factory=lambda n: ThreadPoolExecutor(1)
+        )
+
+        result = use_case.execute_many(["/d/a.txt", "/d/b.txt"], clear_existing=True)
+
+        clears = [c.kwargs["clear_existing"] for c in mock_repository.add_documents.call_args_list]
+        assert clears == [True, True]
+        assert list(result.errors) == [0]
+
+    def test_embedding_overlaps_across_files(self, mock_repository, mock_document_loader, monkeypatch):
+        from src.config.settings import get_settings
+
+        monkeypatch.setattr(get_settings(), "ingest_embed_workers", 3)
+        in_flight, peak = 0, 0
+        lock = threading.Lock()
+
+        def add_documents(chunks, **kwargs):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.02)
+            with lock:
+                in_flight -= 1
+            return len(chunks)
+
+        mock_repository.add_documents.side_effect = add_documents
+        use_case = self._use_case(mock_repository, mock_document_loader)
+
+        use_case.execute_many([f"/d/{i}.txt" for i in range(6)])
+
+        assert 1 < peak <= 3
+
+    def test_single_file_embeds_next_batch_while_inserting(
+        self, mock_repository, mock_document_loader, monkeypatch
+    ):
+        from src.config.settings import get_settings
+
+        monkeypatch.setattr(get_settings(), "ingest_batch_size", 1)
+        mock_document_loader.load.return_value = [
+            LangchainDocument(page_content=f"page {i}", metadata={"page": i}) for i in range(3)
+        ]
+        embeddings = Mock(spec=EmbeddingsPort)
+        second_batch_embedding = threading.Event()
+
+        def embed_documents(texts):
+            if embeddings.embed_documents.call_count == 2:
+                second_batch_embedding.set()
+            return [[1.0, 0.0] for _ in texts]
+
+        embeddings.embed_documents.side_effect = embed_documents
+        overlapped = []
+        mock_repository.add_documents.side_effect = lambda chunks, **kwargs: overlapped.append(
+            second_batch_embedding.wait(timeout=5)
+        )
+        use_case = IngestDocumentUseCase(
+            mock_repository, mock_document_loader, parse_executor_factory=_thread_pool, embeddings=embeddings
+        )
+
+        result = use_case.execute_many(["/d/a.txt"])
+
+        assert overlapped[0] is True
+        assert mock_repository.add_documents.call_count == embeddings.embed_documents.call_count == 3
+        assert result.errors == {}
+
+    def test_throughput(self, mock_repository, mock_document_loader):
+        result = self._use_case(mock_repository, mock_document_loader).execute_many(["/d/a.txt"])
+        assert result.elapsed_seconds > 0
+        assert result.files_per_second == pytest.approx(1 / result.elapsed_seconds)
+        assert result.chunks_per_second == pytest.approx(result.chunk_count / result.elapsed_seconds)
+
+    @pytest.mark.asyncio
+    async def test_aexecute_many(self, mock_repository, mock_document_loader):
+        use_case = self._use_case(mock_repository, mock_document_loader)
+        result = await use_case.aexecute_many(["/d/a.txt"])
+        assert result.documents[0].name == "a.txt"
+
+    def test_single_file_parsed_on_a_thread(self, mock_repository, mock_document_loader):
+        factory = Mock(side_effect=_thread_pool)
+        use_case = IngestDocumentUseCase(mock_repository, mock_document_loader, parse_executor_factory=factory)
+
+        use_case.execute_many(["/d/a.txt"])
+        use_case.execute_many(["/d/a.txt", "/d/b.txt"])
+
+        assert [c.args[0] for c in factory.call_args_list] == [0, 2]
+
+
+class TestParsePool:
+    """Tests for the default parse executor."""
+
+    def test_spawned_process_pool(self):
+        with _parse_pool(2) as pool:
+            assert isinstance(pool, ProcessPoolExecutor)
+            assert pool._mp_context.get_start_method() == "spawn"
+
+    def test_zero_workers_uses_a_thread(self):
+        with _parse_pool(0) as pool:
+            assert isinstance(pool, ThreadPoolExecutor)
+
+    def test_worker_arguments_are_picklable(self, tmp_path):
+        """What a worker process receives: the real loader and plain arguments."""
+        from src.infrastructure.adapters.document_loader import MultiFormatDocumentLoader
+
+        path = tmp_path / "a.txt"
+        path.write_text("conteúdo", encoding="utf-8")
+        loader = pickle.loads(pickle.dumps(MultiFormatDocumentLoader()))
+
+        chunks = _split_in_worker(loader, 1000, 150, str(path), "a.txt")
+
+        assert [c.content for c in chunks] == ["conteúdo"]
+        assert chunks[0].metadata["source_file"] == "a.txt"
+
+
+class TestIncrementalSync:
+    """Tests for sync()/sync_many() and the registry bookkeeping of the other paths."""
+
+    @pytest.fixture(autouse=True)
+    def no_retries(self, monkeypatch):
+        from src.config.settings import get_settings
+
+        monkeypatch.setattr(get_settings(), "ingest_batch_retries", 0)
+
+    @pytest.fixture
+    def registry(self, memory_registry):
+        return memory_registry
+
+    @pytest.fixture
+    def pages(self, mock_document_loader):
+        """Page texts the loader returns; tests edit them to change the document."""
+        texts = ["alpha", "beta", "gamma"]
+        mock_document_loader.load.side_effect = lambda path, file_name=None: [
+            LangchainDocument(page_content=text, metadata={"page": i}) for i, text in enumerate(texts)
+        ]
+        return texts
+
+    @pytest.fixture
+    def doc(self, tmp_path):
+        path = tmp_path / "doc.txt"
+        path.write_text("v1")
+        return path
+
+    @staticmethod
+    def _stored(repository):
+        return [chunk.content for call in repository.add_documents.call_args_list for chunk in call.args[0]]
+
+    def test_first_sync_replaces_unregistered_document(self, mock_repository, mock_document_loader, registry, pages, doc):
+        from src.config.settings import get_settings
+
+        use_case = IngestDocumentUseCase(mock_repository, mock_document_loader, registry=registry)
+
+        result = use_case.sync(str(doc))
+
+        mock_repository.delete_by_source.assert_called_once_with("doc.txt")
+        assert self._stored(mock_repository) == ["alpha", "beta", "gamma"]
+        assert (result.added, result.removed, result.chunk_count) == (3, 0, 3)
+        record = registry.get("doc.txt")
+        settings = get_settings()
+        assert record.file_hash == file_hash(str(doc), settings.chunk_size, settings.chunk_overlap)
+        assert len(record.chunk_hashes) == 3
+
+    def test_catalog_lists_chunk_count_and_size(self, mock_repository, mock_document_loader, registry, pages, doc):
+        use_case = IngestDocumentUseCase(mock_repository, mock_document_loader, registry=registry)
+
+        use_case.sync(str(doc))
+
+        [entry] = registry.list_documents()
+        assert (entry.source_file, entry.chunk_count, entry.size_bytes) == ("doc.txt", 3, doc.stat().st_size)
+
+    def test_unchanged_file_is_skipped_without_parsing(self, mock_repository, mock_document_loader, registry, pages, doc):
+        use_case = IngestDocumentUseCase(mock_repository, mock_document_loader, registry=registry)
+        use_case.sync(str(doc))
+        mock_repository.reset_mock()
+        mock_document_loader.load.reset_mock()
+
+        result = use_case.sync(str(doc))
+
+        assert result.unchanged and result.chunk_count == 3
+        mock_document_loader.load.assert_not_called()
+        mock_repository.add_documents.assert_not_called()
+        mock_repository.delete_chunks.assert_not_called()
+
+    def test_changed_file_only_replaces_differing_chunks(self, mock_repository, mock_document_loader, registry, pages, doc):
+        use_case = IngestDocumentUseCase(mock_repository, mock_document_loader, registry=registry)
+        use_case.sync(str(doc))
+        old_hashes = registry.get("doc.txt").chunk_hashes
+        mock_repository.reset_mock()
+        mock_repository.delete_chunks.return_value = 1
+
+        doc.write_text("v2")
+        pages[1] = "BETA"
+        result = use_case.sync(str(doc))
+
+        assert self._stored(mock_repository) == ["BETA"]
+        mock_repository.delete_chunks.assert_called_once_with("doc.txt", [old_hashes[1]])
+        mock_repository.delete_by_source.assert_not_called()
+        assert (result.added, result.removed, result.chunk_count) == (1, 1, 3)
+        new_hashes = registry.get("doc.txt").chunk_hashes
+        assert new_hashes[0] == old_hashes[0] and new_hashes[2] == old_hashes[2]
+
+    def test_same_document_from_another_path_adds_nothing(
+        self, mock_repository, mock_document_loader, registry, pages, tmp_path
+    ):
+        # PDF loaders report the file path and modification date; neither may change the hashes.
+        mock_document_loader.load.side_effect = lambda path, file_name=None: [
+            LangchainDocument(
+                page_content=text,
+                metadata={"source": path, "moddate": f"D:{len(path)}", "total_pages": len(pages), "page": i},
+            )
+            for i, text in enumerate(pages)
+        ]
+        first = tmp_path / "upload-1" / "doc.txt"
+        second = tmp_path / "spool" / "0f1e2d-doc.txt"
+        for path, content in ((first, "v1"), (second, "v1 re-saved")):
+            path.parent.mkdir()
+            path.write_text(content)
+        use_case = IngestDocumentUseCase(mock_repository, mock_document_loader, registry=registry)
+        use_case.sync(str(first), "doc.txt")
+        mock_repository.reset_mock()
+
+        result = use_case.sync(str(second), "doc.txt")
+
+        assert (result.added, result.removed, result.chunk_count) == (0, 0, 3)
+        mock_repository.add_documents.assert_not_called()
+        mock_repository.delete_chunks.assert_not_called()
+
+    def test_identical_chunks_get_distinct_hashes(self, mock_repository, mock_document_loader, registry, pages, doc):
+        pages[:] = ["same", "same"]
+        mock_document_loader.load.side_effect = lambda path, file_name=None: [
+            LangchainDocument(page_content=text, metadata={}) for text in pages
+        ]
+        use_case = IngestDocumentUseCase(mock_repository, mock_document_loader, registry=registry)
+
+        use_case.sync(str(doc))
+
+        hashes = registry.get("doc.txt").chunk_hashes
+        assert len(set(hashes)) == 2
+
+    def test_failed_sync_removes_inserted_chunks(self, mock_repository, mock_document_loader, registry, pages, doc):
+        use_case = IngestDocumentUseCase(mock_repository, mock_document_loader, registry=registry)
+        use_case.sync(str(doc))
+        before = registry.get("doc.txt")
+        mock_repository.reset_mock()
+        mock_repository.delete_chunks.side_effect = [RuntimeError("db down"), 1]
+
+        doc.write_text("v2")
+        pages[1] = "BETA"
+        with pytest.raises(IngestionError, match="db down"):
+            use_case.sync(str(doc))
+
+        added = mock_repository.add_documents.call_args.args[0][0].metadata["chunk_hash"]
+        assert mock_repository.delete_chunks.call_args_list[-1].args == ("doc.txt", [added])
+        assert registry.get("doc.txt") == before
+
+    def test_sync_requires_registry(self, mock_repository, mock_document_loader, doc):
+        use_case = IngestDocumentUseCase(mock_repository, mock_document_loader)
+
+        with pytest.raises(IngestionError, match="registry"):
+            use_case.sync(str(doc))
+
+    def test_execute_append_goes_through_sync(self, mock_repository, mock_document_loader, registry, pages, doc):
+        use_case = IngestDocumentUseCase(mock_repository, mock_document_loader, registry=registry)
+        use_case.execute(str(doc))
+        mock_repository.reset_mock()
+
+        document = use_case.execute(str(doc))
+
+        assert document.chunk_count == 3
+        mock_repository.add_documents.assert_not_called()
+
+    def test_execute_replace_resets_registry(self, mock_repository, mock_document_loader, registry, pages, doc):
+        registry.save(DocumentRecord(source_file="old.pdf", file_hash="00" * 32))
+        use_case = IngestDocumentUseCase(mock_repository, mock_document_loader, registry=registry)
+
+        use_case.execute(str(doc), clear_existing=True)
+
+        assert registry.sources() == ["doc.txt"]
+        assert len(registry.get("doc.txt").chunk_hashes) == 3
+
+    @pytest.mark.asyncio
+    async def test_aexecute_replace_registers_document(self, mock_repository, mock_document_loader, registry, pages, doc):
+        use_case = IngestDocumentUseCase(mock_repository, mock_document_loader, registry=registry)
+
+        await use_case.aexecute(str(doc), clear_existing=True)
+
+        assert len(registry.get("doc.txt").chunk_hashes) == 3
+
+    def test_execute_many_skips_unchanged_files(self, mock_repository, mock_document_loader, registry, pages, tmp_path):
+        a, b = tmp_path / "a.txt", tmp_path / "b.txt"
+        a.write_text("a")
+        b.write_text("b")
+        use_case = IngestDocumentUseCase(
+            mock_repository, mock_document_loader, parse_executor_factory=_thread_pool, registry=registry
+        )
+        use_case.execute_many([str(a), str(b)])
+        mock_document_loader.load.reset_mock()
+        mock_repository.reset_mock()
+
+        b.write_text("b2")
+        result = use_case.execute_many([str(a), str(b)])
+
+        assert [d.chunk_count for d in result.documents] == [3, 3]
+        mock_document_loader.load.assert_called_once_with(str(b), file_name="b.txt")
+        # Same page texts: b's chunks are all already stored.
+        mock_repository.add_documents.assert_not_called()
+
+    def test_sync_many_prunes_missing_documents(self, mock_repository, mock_document_loader, registry, pages, tmp_path):
+        registry.save(DocumentRecord(source_file="gone.pdf", file_hash="00" * 32))
+        a = tmp_path / "a.txt"
+        a.write_text("a")
+        use_case = IngestDocumentUseCase(mock_repository, mock_document_loader, registry=registry)
+
+        result = use_case.sync_many([str(a), str(tmp_path / "missing.txt")], prune=True)
+
+        assert result.results[0].added == 3
+        assert 1 in result.errors
+        assert result.pruned == ["gone.pdf"]
+        mock_repository.delete_by_source.assert_any_call("gone.pdf")
+        assert registry.sources() == ["a.txt"]
+
+
+class TestRebuild:
+    """Tests for clear_existing through the repository's shadow-collection rebuild."""
+
+    @pytest.fixture(autouse=True)
+    def small_batches(self, monkeypatch):
+        from src.config.settings import get_settings
+
+        monkeypatch.setattr(get_settings(), "ingest_batch_size", 2)
+        monkeypatch.setattr(get_settings(), "ingest_batch_retries", 0)
+
+    @pytest.fixture
+    def repository(self, mock_repository):
+        mock_repository.begin_rebuild.return_value = "chunks__shadow"
+        return mock_repository
+
+    @pytest.fixture
+    def pages(self, mock_document_loader):
+        mock_document_loader.load.side_effect = lambda path, file_name=None: [
+            LangchainDocument(page_content=f"page {i}", metadata={"page": i}) for i in range(3)
+        ]
+
+    def test_batches_go_to_shadow_then_publish(self, repository, mock_document_loader, pages):
+        use_case = IngestDocumentUseCase(repository, mock_document_loader)
+
+        result = use_case.execute("/d/a.txt", clear_existing=True)
+
+        calls = repository.add_documents.call_args_list
+        assert [c.kwargs["collection"] for c in calls] == ["chunks__shadow", "chunks__shadow"]
+        assert not any(c.kwargs["clear_existing"] for c in calls)
+        repository.publish_rebuild.assert_called_once_with("chunks__shadow")
+        repository.discard_rebuild.assert_not_called()
+        assert result.chunk_count == 3
+
+    def test_failed_batch_discards_shadow_and_keeps_live_collection(self, repository, mock_document_loader, pages):
+        repository.add_documents.side_effect = [2, RuntimeError("embedding quota")]
+        use_case = IngestDocumentUseCase(repository, mock_document_loader)
+
+        with pytest.raises(IngestionError):
+            use_case.execute("/d/a.txt", clear_existing=True)
+
+        repository.publish_rebuild.assert_not_called()
+        repository.discard_rebuild.assert_called_once_with("chunks__shadow")
+        repository.delete_by_source.assert_not_called()
+
+    def test_registry_replaced_only_after_publish(
+        self, repository, mock_document_loader, memory_registry, pages, tmp_path
+    ):
+        doc = tmp_path / "a.txt"
+        doc.write_text("a")
+        memory_registry.save(DocumentRecord(source_file="old.pdf", file_hash="00" * 32))
+        use_case = IngestDocumentUseCase(repository, mock_document_loader, registry=memory_registry)
+
+        repository.publish_rebuild.side_effect = RuntimeError("lock timeout")
+        with pytest.raises(IngestionError):
+            use_case.execute(str(doc), clear_existing=True)
+        assert memory_registry.sources() == ["old.pdf"]
+
+        repository.publish_rebuild.side_effect = None
+        use_case.execute(str(doc), clear_existing=True)
+        assert memory_registry.sources() == ["a.txt"]
+        assert len(memory_registry.get("a.txt").chunk_hashes) == 3
+
+    @pytest.mark.asyncio
+    async def test_aexecute_loads_shadow(self, repository, mock_document_loader, pages):
+        use_case = IngestDocumentUseCase(repository, mock_document_loader)
+
+        await use_case.aexecute("/d/a.txt", clear_existing=True)
+
+        assert {c.kwargs["collection"] for c in repository.aadd_documents.call_args_list} == {"chunks__shadow"}
+        repository.publish_rebuild.assert_called_once_with("chunks__shadow")
+
+    def test_execute_many_loads_every_file_into_one_shadow(self, repository, mock_document_loader, pages):
+        def add_documents(chunks, **kwargs):
+            if chunks[0].metadata["source_file"] == "b.txt":
+                raise RuntimeError("embedding quota")
+            return len(chunks)
+
+        repository.add_documents.side_effect = add_documents
+        use_case = IngestDocumentUseCase(repository, mock_document_loader, parse_executor_factory=_thread_pool)
+
+        result = use_case.execute_many(["/d/a.txt", "/d/b.txt", "/d/c.txt"], clear_existing=True)
+
+        assert {c.kwargs["collection"] for c in repository.add_documents.call_args_list} == {"chunks__shadow"}
+        assert not any(c.kwargs["clear_existing"] for c in repository.add_documents.call_args_list)
+        assert [d is not None for d in result.documents] == [True, False, True]
+        repository.begin_rebuild.assert_called_once()
+        repository.publish_rebuild.assert_called_once_with("chunks__shadow")
+
+    def test_execute_many_discards_shadow_when_nothing_stored(self, repository, mock_document_loader, pages):
+        repository.add_documents.side_effect = RuntimeError("embedding quota")
+        use_case = IngestDocumentUseCase(repository, mock_document_loader, parse_executor_factory=_thread_pool)
+
+        result = use_case.execute_many(["/d/a.txt", "/d/b.txt"], clear_existing=True)
+
+        assert result.documents == [None, None]
+        repository.publish_rebuild.assert_not_called()
+        repository.discard_rebuild.assert_called_once_with("chunks__shadow")
+
+    def test_execute_many_publish_failure_fails_every_file(self, repository, mock_document_loader, pages):
+        repository.publish_rebuild.side_effect = RuntimeError("lock timeout")
+        use_case = IngestDocumentUseCase(repository, mock_document_loader, parse_executor_factory=_thread_pool)
+
+        result = use_case.execute_many(["/d/a.txt", "/d/b.txt"], clear_existing=True)
+
+        assert result.documents == [None, None]
+        assert result.errors == {
+            0: "Failed to publish the rebuilt collection: lock timeout",
+            1: "Failed to publish the rebuilt collection: lock timeout",
+        }
+        repository.discard_rebuild.assert_called_once_with("chunks__shadow")
@@ -0,0 +1,189 @@
+"""
+Unit tests for the background ingestion worker (src/workers/ingest.py).
+"""
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.domain.entities.document import Document
+from src.domain.entities.ingest_job import IngestJob
+from src.domain.exceptions import IngestionError, UnsupportedFormatError
+from src.domain.ports.ingest_job_queue import IngestJobQueuePort
+from src.workers.ingest import IngestWorker, parse_args
+
+
+def _job(path="/spool/a.pdf", **kwargs):
+    return IngestJob(id="job-1", file_path=path, source_name="a.pdf", status="running", attempts=1, **kwargs)
+
+
+@pytest.fixture
+def queue():
+    return MagicMock(spec=IngestJobQueuePort)
+
+
+@pytest.fixture
+def use_case():
+    return MagicMock(name="use_case")
+
+
+class TestRunOnce:
+    def test_empty_queue(self, queue, use_case):
+        queue.claim.return_value = None
+
+        assert IngestWorker(queue, use_case, "w1").run_once() is None
+        use_case.execute.assert_not_called()
+
+    def test_runs_job_and_reports_progress(self, queue, use_case):
+        queue.claim.return_value = _job(clear_existing=True)
+
+        def execute(path, source_name, clear_existing, on_progress):
+            on_progress(256)
+            on_progress(300)
+            return Document(name=source_name, stored_chunks=300)
+
+        use_case.execute.side_effect = execute
+
+        job = IngestWorker(queue, use_case, "w1").run_once()
+
+        queue.claim.assert_called_once_with("w1")
+        assert use_case.execute.call_args.kwargs["clear_existing"] is True
+        assert [c.args for c in queue.report_progress.call_args_list] == [("job-1", "w1", 256), ("job-1", "w1", 300)]
+        queue.complete.assert_called_once_with("job-1", "w1", 300)
+        assert job.status == "done"
+        assert job.chunks_stored == 300
+
+    def test_failure_is_retried_by_the_queue(self, queue, use_case):
+        queue.claim.return_value = _job()
+        use_case.execute.side_effect = IngestionError("rate limited")
+        queue.fail.return_value = _job(error="rate limited")
+        queue.fail.return_value.status = "queued"
+
+        IngestWorker(queue, use_case, "w1").run_once()
+
+        queue.fail.assert_called_once_with("job-1", "w1", "rate limited")
+        queue.complete.assert_not_called()
+
+    def test_reclaimed_job_is_left_to_its_new_worker(self, queue, use_case):
+        queue.claim.return_value = _job()
+        use_case.execute.return_value = Document(name="a.pdf", stored_chunks=300)
+        queue.complete.return_value = False
+
+        job = IngestWorker(queue, use_case, "w1").run_once()
+
+        assert job.status == "running"
+        assert job.chunks_stored == 0
+
+    def test_reclaimed_job_is_aborted_at_the_next_batch(self, queue, use_case):
+        queue.claim.return_value = _job()
+        queue.report_progress.side_effect = [True, False]
+        batches = []
+
+        def execute(path, source_name, clear_existing, on_progress):
+            for stored in (256, 512, 768):
+                batches.append(stored)
+                try:
+                    on_progress(stored)
+                except Exception as e:
+                    raise IngestionError(f"Failed to ingest '{path}': {e}") from e
+            return Document(name=source_name, stored_chunks=768)
+
+        use_case.execute.side_effect = execute
+
+        job = IngestWorker(queue, use_case, "w1").run_once()
+
+        assert batches == [256, 512]
+        queue.fail.assert_not_called()
+        queue.complete.assert_not_called()
+        assert job.status == "running"
+
+    def test_unsupported_document_fails_without_retry(self, queue, use_case):
+        queue.claim.return_value = _job()
+        use_case.execute.side_effect = UnsupportedFormatError("Unsupported format '.xyz'")
+        queue.fail.return_value = _job()
+
+        IngestWorker(queue, use_case, "w1").run_once()
+
+        assert queue.fail.call_args.kwargs == {"retry": False}
+
+
+class TestSpool:
+    def test_finished_spooled_file_is_deleted(self, queue, use_case, tmp_path):
+        spooled = tmp_path / "abc-a.pdf"
+        spooled.write_bytes(b"%PDF")
+        queue.claim.return_value = _job(path=str(spooled))
+        queue.complete.return_value = True
+        use_case.execute.return_value = Document(name="a.pdf", stored_chunks=1)
+
+        IngestWorker(queue, use_case, "w1", spool_dir=str(tmp_path)).run_once()
+
+        assert not spooled.exists()
+
+    def test_file_kept_while_job_will_be_retried(self, queue, use_case, tmp_path):
+        spooled = tmp_path / "abc-a.pdf"
+        spooled.write_bytes(b"%PDF")
+        queue.claim.return_value = _job(path=str(spooled))
+        use_case.execute.side_effect = IngestionError("db down")
+        queue.fail.return_value = IngestJob(id="job-1", file_path=str(spooled), source_name="a.pdf", attempts=1)
+
+        IngestWorker(queue, use_case, "w1", spool_dir=str(tmp_path)).run_once()
+
+        assert spooled.exists()
+
+    def test_spooled_file_missing_on_this_host_fails_the_attempt(self, queue, use_case, tmp_path):
+        queue.claim.return_value = _job(path=str(tmp_path / "abc-a.pdf"))
+        queue.fail.return_value = IngestJob(id="job-1", file_path="", source_name="a.pdf", attempts=1)
+
+        IngestWorker(queue, use_case, "w1", spool_dir=str(tmp_path)).run_once()
+
+        use_case.execute.assert_not_called()
+        error = queue.fail.call_args.args[2]
+        assert "shared storage" in error
+        assert queue.fail.call_args.kwargs == {}
+
+    def test_files_outside_spool_are_never_deleted(self, queue, use_case, tmp_path):
+        own = tmp_path / "mine.pdf"
+        own.write_bytes(b"%PDF")
+        queue.claim.return_value = _job(path=str(own))
+        use_case.execute.return_value = Document(name="a.pdf", stored_chunks=1)
+
+        IngestWorker(queue, use_case, "w1", spool_dir=str(tmp_path / "spool")).run_once()
+
+        assert own.exists()
+
+
+class TestLoop:
+    def test_drain_runs_until_queue_empty(self, queue, use_case):
+        queue.claim.side_effect = [_job(), _job(), None]
+        use_case.execute.return_value = Document(name="a.pdf", stored_chunks=1)
+
+        assert IngestWorker(queue, use_case, "w1").drain() == 2
+
+    def test_run_stops_when_event_set(self, queue, use_case):
+        stop = threading.Event()
+        queue.claim.side_effect = lambda worker: stop.set()
+
+        IngestWorker(queue, use_case, "w1").run(stop, poll_interval=0)
+
+        queue.claim.assert_called_once()
+
+    def test_run_survives_queue_errors(self, queue, use_case):
+        stop = threading.Event()
+        calls = []
+
+        def claim(worker):
+            calls.append(worker)
+            if len(calls) == 1:
+                raise OSError("connection refused")
+            stop.set()
+
+        queue.claim.side_effect = claim
+
+        IngestWorker(queue, use_case, "w1").run(stop, poll_interval=0)
+
+        assert calls == ["w1", "w1"]
+
+    def test_parse_args(self):
+        args = parse_args(["--once", "--poll-interval", "5", "--worker-id", "w9"])
+        assert (args.once, args.poll_interval, args.worker_id) == (True, 5.0, "w9")
+        assert ":" in parse_args([]).worker_id
@@ -4,7 +4,7 @@ Unit tests for LLM adapters (OpenAI, Google).
 LangChain client classes are patched so no real network call is made
 and we only validate the adapter wiring (settings → client → response).
 """
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -58,6 +58,22 @@ class TestOpenAILLMAdapter:
             assert out == "hello"
             cls.return_value.invoke.assert_called_once_with("prompt")
 
+    @pytest.mark.asyncio
+    async def test_agenerate_uses_async_client(self, fake_settings):
+        with patch(
+            "src.infrastructure.adapters.openai_llm.get_settings",
+            return_value=fake_settings,
+        ), patch(
+            "src.infrastructure.adapters.openai_llm.ChatOpenAI"
+        ) as cls:
+            cls.return_value.ainvoke = AsyncMock(return_value=MagicMock(content="async hello"))
+            from src.infrastructure.adapters.openai_llm import OpenAILLMAdapter
+
+            adapter = OpenAILLMAdapter()
+            assert await adapter.agenerate("prompt") == "async hello"
+            cls.return_value.ainvoke.assert_awaited_once_with("prompt")
+            cls.return_value.invoke.assert_not_called()
+
     def test_get_langchain_llm_returns_underlying(self, fake_settings):
         with patch(
             "src.infrastructure.adapters.openai_llm.get_settings",
@@ -109,6 +125,22 @@ class TestGoogleLLMAdapter:
             assert adapter.generate("p") == "world"
             cls.return_value.invoke.assert_called_once_with("p")
 
+    @pytest.mark.asyncio
+    async def test_agenerate_uses_async_client(self, fake_settings):
+        with patch(
+            "src.infrastructure.adapters.google_llm.get_settings",
+            return_value=fake_settings,
+        ), patch(
+            "src.infrastructure.adapters.google_llm.ChatGoogleGenerativeAI"
+        ) as cls:
+            cls.return_value.ainvoke = AsyncMock(return_value=MagicMock(content="async hello"))
+            from src.infrastructure.adapters.google_llm import GoogleLLMAdapter
+
+            adapter = GoogleLLMAdapter()
+            assert await adapter.agenerate("prompt") == "async hello"
+            cls.return_value.ainvoke.assert_awaited_once_with("prompt")
+            cls.return_value.invoke.assert_not_called()
+
     def test_get_langchain_llm_returns_underlying(self, fake_settings):
         with patch(
             "src.infrastructure.adapters.google_llm.get_settings",
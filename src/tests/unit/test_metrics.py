@@ -0,0 +1,53 @@
+"""
+Unit tests for the latency recorders in src/application/metrics.py.
+"""
+import pytest
+
+from src.application.metrics import EventCounter, LatencyRecorder, LatencyStats
+
+
+class TestLatencyRecorder:
+    def test_empty_recorder_has_no_percentiles(self):
+        assert LatencyRecorder().stats() == LatencyStats()
+
+    def test_single_sample(self):
+        recorder = LatencyRecorder()
+        recorder.record(0.3)
+        stats = recorder.stats()
+        assert (stats.count, stats.last, stats.p50, stats.p95) == (1, 0.3, 0.3, 0.3)
+
+    def test_percentiles_over_samples(self):
+        recorder = LatencyRecorder()
+        for ms in range(1, 101):
+            recorder.record(ms / 1000)
+
+        stats = recorder.stats()
+        assert stats.count == 100
+        assert stats.last == pytest.approx(0.1)
+        assert stats.p50 == pytest.approx(0.0505)
+        assert stats.p95 == pytest.approx(0.09505)
+
+    def test_window_keeps_recent_samples_but_counts_all(self):
+        recorder = LatencyRecorder(window=2)
+        for seconds in (10.0, 1.0, 1.0):
+            recorder.record(seconds)
+
+        stats = recorder.stats()
+        assert stats.count == 3
+        assert stats.p95 == 1.0
+
+    def test_reset(self):
+        recorder = LatencyRecorder()
+        recorder.record(1.0)
+        recorder.reset()
+        assert recorder.stats().count == 0
+
+
+class TestEventCounter:
+    def test_counts_and_resets(self):
+        counter = EventCounter()
+        counter.increment()
+        counter.increment(2)
+        assert counter.value == 3
+        counter.reset()
+        assert counter.value == 0
@@ -0,0 +1,186 @@
+"""
+Unit tests for the vectorized MMR implementation.
+"""
+import numpy as np
+import pytest
+from langchain_postgres.vectorstores import maximal_marginal_relevance as reference_mmr
+
+from src.infrastructure.adapters.mmr import maximal_marginal_relevance
+from src.domain.entities.document import ScoredChunk
+from src.infrastructure.adapters.pgvector_queries import (
+    Candidates,
+    resolve_fetch_k,
+    score_gap_cutoff,
+    trim_adaptive,
+)
+from src.config.settings import get_settings
+
+
+class TestMaximalMarginalRelevance:
+    """Tests for maximal_marginal_relevance()."""
+
+    @pytest.mark.parametrize("lambda_mult", [0.0, 0.3, 0.5, 1.0])
+    def test_matches_langchain_reference(self, lambda_mult):
+        rng = np.random.default_rng(42)
+        query = rng.normal(size=64).astype(np.float32)
+        candidates = rng.normal(size=(60, 64)).astype(np.float32)
+
+        ours = maximal_marginal_relevance(query, candidates, k=10, lambda_mult=lambda_mult)
+        reference = reference_mmr(query, list(candidates), k=10, lambda_mult=lambda_mult)
+
+        assert ours == reference
+
+    def test_first_pick_is_most_relevant(self):
+        query = np.array([1.0, 0.0], dtype=np.float32)
+        candidates = np.array([[0.0, 1.0], [1.0, 0.1], [0.5, 0.5]], dtype=np.float32)
+        assert maximal_marginal_relevance(query, candidates, k=1) == [1]
+
+    def test_prefers_diverse_over_duplicate(self):
+        query = np.array([0.8, 0.6], dtype=np.float32)
+        candidates = np.array([[1.0, 0.0], [0.999, -0.01], [0.0, 1.0]], dtype=np.float32)
+        assert maximal_marginal_relevance(query, candidates, k=2) == [0, 2]
+
+    def test_k_larger_than_candidates(self):
+        candidates = np.eye(3, dtype=np.float32)
+        out = maximal_marginal_relevance(np.ones(3, dtype=np.float32), candidates, k=10)
+        assert sorted(out) == [0, 1, 2]
+
+    def test_empty_candidates(self):
+        empty = np.empty((0, 4), dtype=np.float32)
+        assert maximal_marginal_relevance(np.ones(4, dtype=np.float32), empty, k=5) == []
+
+    def test_zero_vectors_do_not_produce_nan(self):
+        candidates = np.array([[0.0, 0.0], [1.0, 0.0]], dtype=np.float32)
+        out = maximal_marginal_relevance(np.zeros(2, dtype=np.float32), candidates, k=2)
+        assert sorted(out) == [0, 1]
+
+
+class TestCandidates:
+    """Tests for Candidates.select_mmr() and resolve_fetch_k()."""
+
+    def test_select_mmr_skips_near_duplicates(self):
+        candidates = Candidates(
+            documents=["A", "A dup", "B"],
+            metadatas=[{"i": 0}, {"i": 1}, {"i": 2}],
+            vectors=np.array([[1.0, 0.0], [0.999, -0.01], [0.0, 1.0]], dtype=np.float32),
+        )
+        chunks = candidates.select_mmr(np.array([0.8, 0.6], dtype=np.float32), k=2, lambda_mult=0.5)
+        assert [c.content for c in chunks] == ["A", "B"]
+        assert chunks[1].metadata == {"i": 2}
+
+    def test_selection_order_is_kept(self):
+        """Candidates arrive by distance; MMR picks B before the closer duplicate
+        of A, and the chunks must come back in that order, not re-sorted."""
+        candidates = Candidates(
+            documents=["A", "A dup", "B"],
+            metadatas=[{}, {}, {}],
+            vectors=np.array([[1.0, 0.0], [0.999, -0.01], [0.0, 1.0]], dtype=np.float32),
+        )
+        query = np.array([0.8, 0.6], dtype=np.float32)
+        settings = get_settings().model_copy(update={"adaptive_k": False, "mmr_lambda": 0.5})
+
+        scored = candidates.select_mmr_scored(query, k=3, lambda_mult=0.5)
+        selected = candidates.select(settings, query, k=3)
+
+        assert [c.content for c in scored] == ["A", "B", "A dup"]
+        assert [c.content for c in selected] == ["A", "B", "A dup"]
+
+    def test_select_mmr_scored_reports_cosine_similarity(self):
+        candidates = Candidates(
+            documents=["A", "B"],
+            metadatas=[{}, {}],
+            vectors=np.array([[2.0, 0.0], [0.0, 1.0]], dtype=np.float32),
+        )
+        scored = candidates.select_mmr_scored(np.array([0.8, 0.6], dtype=np.float32), k=2, lambda_mult=0.5)
+        assert [(c.content, round(c.score, 3)) for c in scored] == [("A", 0.8), ("B", 0.6)]
+        assert [round(c.distance, 3) for c in scored] == [0.2, 0.4]
+
+    def test_select_mmr_scored_carries_ids_and_shares_metadata(self):
+        metadata = {"source_file": "a.pdf"}
+        candidates = Candidates(
+            documents=["A"],
+            metadatas=[metadata],
+            vectors=np.array([[1.0, 0.0]], dtype=np.float32),
+            ids=["row-1"],
+        )
+        [chunk] = candidates.select_mmr_scored(np.array([1.0, 0.0], dtype=np.float32), k=1, lambda_mult=0.5)
+        assert chunk.id == "row-1"
+        assert chunk.metadata is metadata
+        assert chunk.embedding is None
+
+    def test_select_mmr_scored_include_vectors_reuses_candidate_vectors(self):
+        candidates = Candidates(
+            documents=["A", "B"],
+            metadatas=[{}, {}],
+            vectors=np.array([[1.0, 0.0], [0.0, 1.0]], dtype=np.float32),
+        )
+        scored = candidates.select_mmr_scored(
+            np.array([0.8, 0.6], dtype=np.float32), k=2, lambda_mult=0.5, include_vectors=True
+        )
+        assert [list(c.embedding) for c in scored] == [[1.0, 0.0], [0.0, 1.0]]
+        assert all(c.id is None for c in scored)
+
+    def test_select_mmr_scored_empty(self):
+        assert Candidates().select_mmr_scored(np.array([1.0, 0.0], dtype=np.float32), k=3, lambda_mult=0.5) == []
+
+    def test_resolve_fetch_k_defaults_to_3k(self):
+        assert resolve_fetch_k(get_settings().model_copy(update={"mmr_fetch_k": None}), 10) == 30
+
+    def test_resolve_fetch_k_never_below_k(self):
+        assert resolve_fetch_k(get_settings().model_copy(update={"mmr_fetch_k": 5}), 10) == 10
+
+
+def _adaptive(**update):
+    return get_settings().model_copy(
+        update={"adaptive_k": True, "adaptive_k_min": 2, "adaptive_k_min_gap": 0.1, **update}
+    )
+
+
+class TestAdaptiveK:
+    """Tests for ADAPTIVE_K — cutting k at the largest similarity drop."""
+
+    def test_cuts_at_largest_gap(self):
+        curve = np.array([0.82, 0.80, 0.79, 0.45, 0.44, 0.40], dtype=np.float32)
+        assert score_gap_cutoff(curve, min_k=1, max_k=6, min_gap=0.1) == 3
+
+    def test_flat_curve_keeps_max(self):
+        curve = np.array([0.60, 0.58, 0.57, 0.55, 0.54], dtype=np.float32)
+        assert score_gap_cutoff(curve, min_k=1, max_k=4, min_gap=0.1) == 4
+
+    def test_never_below_min_k(self):
+        curve = np.array([0.9, 0.3, 0.29, 0.28, 0.1], dtype=np.float32)
+        # The drop after the first chunk is out of reach; the next largest one counts.
+        assert score_gap_cutoff(curve, min_k=2, max_k=5, min_gap=0.1) == 4
+
+    def test_gap_past_max_keeps_max(self):
+        curve = np.array([0.8, 0.79, 0.78, 0.77, 0.3], dtype=np.float32)
+        assert score_gap_cutoff(curve, min_k=1, max_k=3, min_gap=0.1) == 3
+
+    def test_short_curve(self):
+        assert score_gap_cutoff(np.array([0.5], dtype=np.float32), min_k=3, max_k=10, min_gap=0.1) == 1
+        assert score_gap_cutoff(np.array([], dtype=np.float32), min_k=3, max_k=10, min_gap=0.1) == 0
+
+    def test_select_cuts_mmr_picks_at_candidate_elbow(self):
+        # Two near the query, three far from it.
+        candidates = Candidates(
+            documents=list("ABCDE"),
+            metadatas=[{}] * 5,
+            vectors=np.array([[1, 0], [0.99, 0.1], [0, 1], [-0.1, 1], [0.1, -1]], dtype=np.float32),
+        )
+        query = np.array([1.0, 0.0], dtype=np.float32)
+
+        assert [c.content for c in candidates.select(_adaptive(), query, k=4)] == ["A", "B"]
+        assert len(candidates.select(_adaptive(adaptive_k=False), query, k=4)) == 4
+
+    def test_trim_keeps_fused_order(self):
+        fused = [
+            ScoredChunk(content="exact", score=0.41),
+            ScoredChunk(content="semantic", score=0.87),
+            ScoredChunk(content="close", score=0.85),
+            ScoredChunk(content="far", score=0.20),
+        ]
+        assert [c.content for c in trim_adaptive(_adaptive(), fused, k=4)] == ["semantic", "close"]
+
+    def test_trim_disabled_returns_input(self):
+        fused = [ScoredChunk(content="a", score=0.9), ScoredChunk(content="b", score=0.1)]
+        assert trim_adaptive(_adaptive(adaptive_k=False), fused, k=2) is fused
@@ -0,0 +1,322 @@
+"""
+Unit tests for PGVectorIndexManager.
+
+psycopg.connect is patched with a scripted fake connection; we validate the
+SQL the manager issues for each lifecycle step.
+"""
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.config.settings import get_settings
+from src.infrastructure.adapters.pgvector_index import (
+    INDEX_NAME,
+    SOURCE_INDEX_NAME,
+    TEXT_SEARCH_INDEX_NAME,
+    PGVectorIndexManager,
+    index_ddl,
+    scan_depth,
+    search_connection_options,
+)
+
+
+class FakeConnection:
+    """Records executed SQL and answers catalog queries from a dict."""
+
+    def __init__(self, table_exists=True, index_row=None, typmod=-1, sample_dims=1536,
+                 text_column=None, text_trigger=False, text_index=None, source_index=False,
+                 backfill_bounds=()):
+        self.executed = []
+        self.params = []
+        # text_column is pg_attribute.attgenerated ("" or "s"); text_index is indisvalid.
+        self._text_index_row = None if text_index is None else (text_index, "gin", "", 0)
+        self._backfill_bounds = list(backfill_bounds)
+        self._answers = {
+            "to_regclass(%s) IS NOT NULL": (table_exists,),
+            "attgenerated": None if text_column is None else (text_column,),
+            "pg_trigger": (1,) if text_trigger else None,
+            "source_index": ("oid",) if source_index else (None,),
+            "pg_get_indexdef": index_row,
+            "atttypmod": (typmod,),
+            "vector_dims": (sample_dims,) if sample_dims else None,
+            "reltuples": (1000,),
+        }
+
+    def execute(self, sql, params=None):
+        self.executed.append(sql)
+        self.params.append(params)
+        result = MagicMock()
+        result.rowcount = 1
+        if "pg_get_indexdef" in sql and params == (TEXT_SEARCH_INDEX_NAME,):
+            answer = self._text_index_row
+        elif "max(id)" in sql:
+            answer = (self._backfill_bounds.pop(0) if self._backfill_bounds else None,)
+        else:
+            answer = next((answer for key, answer in self._answers.items() if key in sql), None)
+        result.fetchone.return_value = answer
+        return result
+
+    def transaction(self):
+        return MagicMock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def _settings(**overrides):
+    return get_settings().model_copy(update=overrides)
+
+
+def _manager(conn, **overrides):
+    manager = PGVectorIndexManager(dsn="postgresql://x", settings=_settings(**overrides))
+    patcher = patch(
+        "src.infrastructure.adapters.pgvector_index.psycopg.connect", return_value=conn
+    )
+    return manager, patcher
+
+
+class TestIndexDdl:
+    """Tests for the CREATE INDEX builder."""
+
+    def test_hnsw_uses_m_and_ef_construction(self):
+        ddl = index_ddl(_settings(vector_index_type="hnsw", hnsw_m=24, hnsw_ef_construction=100))
+        assert "USING hnsw (embedding vector_cosine_ops)" in ddl
+        assert "m = 24, ef_construction = 100" in ddl
+
+    def test_ivfflat_uses_lists(self):
+        ddl = index_ddl(_settings(vector_index_type="ivfflat", ivfflat_lists=500))
+        assert "USING ivfflat" in ddl
+        assert "lists = 500" in ddl
+
+    def test_concurrently_flag(self):
+        assert "CREATE INDEX CONCURRENTLY IF NOT EXISTS" in index_ddl(_settings(), concurrently=True)
+
+    def test_none_disables_index(self):
+        assert index_ddl(_settings(vector_index_type="none")) is None
+
+    def test_search_options_set_both_knobs(self):
+        options = search_connection_options(_settings(hnsw_ef_search=80, ivfflat_probes=7))
+        assert "-c hnsw.ef_search=80" in options
+        assert "-c ivfflat.probes=7" in options
+
+    def test_search_options_enable_iterative_scan(self):
+        options = search_connection_options(_settings(vector_iterative_scan="strict_order"))
+        assert "-c hnsw.iterative_scan=strict_order" in options
+        assert "-c ivfflat.iterative_scan=relaxed_order" in options
+
+    def test_iterative_scan_off_sends_no_option(self):
+        assert "iterative_scan" not in search_connection_options(_settings(vector_iterative_scan="off"))
+
+    @pytest.mark.parametrize("candidates, expected", [(10, (40, 10)), (40, (40, 10)), (120, (120, 30)), (5000, (5000, 100))])
+    def test_scan_depth_grows_with_candidates(self, candidates, expected):
+        settings = _settings(hnsw_ef_search=40, ivfflat_probes=10, ivfflat_lists=100)
+        assert scan_depth(settings, candidates) == expected
+
+
+class TestEnsureIndex:
+    """Tests for ensure_index()."""
+
+    def test_missing_table_is_noop(self):
+        conn = FakeConnection(table_exists=False)
+        manager, patcher = _manager(conn)
+        with patcher:
+            assert manager.ensure_index() is False
+        assert not any("CREATE INDEX" in sql for sql in conn.executed)
+
+    def test_existing_index_is_noop(self):
+        conn = FakeConnection(index_row=(True, "hnsw", "CREATE INDEX ...", 1024))
+        manager, patcher = _manager(conn)
+        with patcher:
+            assert manager.ensure_index() is False
+        assert not any("CREATE INDEX" in sql for sql in conn.executed)
+
+    def test_types_column_then_creates_index(self):
+        conn = FakeConnection(typmod=-1, sample_dims=768)
+        manager, patcher = _manager(conn)
+        with patcher:
+            assert manager.ensure_index() is True
+        alter = next(sql for sql in conn.executed if "ALTER TABLE" in sql)
+        assert "vector(768)" in alter
+        assert conn.executed.index(alter) < next(
+            i for i, sql in enumerate(conn.executed) if "CREATE INDEX" in sql
+        )
+
+    def test_empty_table_without_dimensions_is_noop(self):
+        conn = FakeConnection(typmod=-1, sample_dims=None)
+        manager, patcher = _manager(conn)
+        with patcher:
+            assert manager.ensure_index() is False
+
+    def test_typed_column_is_not_altered(self):
+        conn = FakeConnection(typmod=1536)
+        manager, patcher = _manager(conn)
+        with patcher:
+            assert manager.ensure_index() is True
+        assert not any("ALTER TABLE" in sql for sql in conn.executed)
+
+
+class TestRebuild:
+    """Tests for rebuild() — build aside, swap by rename, drop old."""
+
+    def test_rebuild_concurrently_swaps_by_rename(self):
+        conn = FakeConnection(typmod=1536)
+        manager, patcher = _manager(conn)
+        with patcher:
+            manager.rebuild(concurrently=True)
+
+        create = next(sql for sql in conn.executed if sql.startswith("CREATE INDEX"))
+        assert "CONCURRENTLY" in create
+        assert f"{INDEX_NAME}_new" in create
+        renames = [sql for sql in conn.executed if "RENAME" in sql]
+        assert renames == [
+            f"ALTER INDEX IF EXISTS {INDEX_NAME} RENAME TO {INDEX_NAME}_old",
+            f"ALTER INDEX {INDEX_NAME}_new RENAME TO {INDEX_NAME}",
+        ]
+        assert conn.executed[-1] == f"DROP INDEX CONCURRENTLY IF EXISTS {INDEX_NAME}_old"
+
+    def test_rebuild_blocking_omits_concurrently(self):
+        conn = FakeConnection(typmod=1536)
+        manager, patcher = _manager(conn)
+        with patcher:
+            manager.rebuild(concurrently=False)
+        assert not any("CONCURRENTLY" in sql for sql in conn.executed)
+
+    def test_rebuild_disabled_raises(self):
+        manager, patcher = _manager(FakeConnection(), vector_index_type="none")
+        with patcher, pytest.raises(ValueError):
+            manager.rebuild()
+
+    def test_rebuild_without_rows_raises(self):
+        conn = FakeConnection(typmod=-1, sample_dims=None)
+        manager, patcher = _manager(conn)
+        with patcher, pytest.raises(RuntimeError, match="ingest a document first"):
+            manager.rebuild()
+
+
+class TestEnsureTextSearch:
+    """Tests for ensure_text_search() — online tsvector column + GIN index setup."""
+
+    def test_missing_table_is_noop(self):
+        conn = FakeConnection(table_exists=False)
+        manager, patcher = _manager(conn)
+        with patcher:
+            assert manager.ensure_text_search() is False
+        assert not any("ALTER TABLE" in sql for sql in conn.executed)
+
+    def test_adds_plain_column_and_trigger_without_rewriting_the_table(self):
+        conn = FakeConnection()
+        manager, patcher = _manager(conn)
+        with patcher:
+            assert manager.ensure_text_search() is True
+
+        alter = next(sql for sql in conn.executed if "ADD COLUMN" in sql)
+        assert alter.endswith("document_tsv tsvector")
+        assert "GENERATED" not in alter and "DEFAULT" not in alter
+        function = next(sql for sql in conn.executed if "CREATE OR REPLACE FUNCTION" in sql)
+        assert "to_tsvector('portuguese'" in function and "to_tsvector('english'" in function
+        assert any("CREATE TRIGGER" in sql and "BEFORE INSERT OR UPDATE OF document" in sql for sql in conn.executed)
+
+    def test_backfills_in_primary_key_batches_then_builds_index_concurrently(self):
+        conn = FakeConnection(backfill_bounds=["id-2", "id-4"])
+        manager, patcher = _manager(conn)
+        with patcher:
+            manager.ensure_text_search(batch_size=2)
+
+        bounds = [p for sql, p in zip(conn.executed, conn.params) if "max(id)" in sql]
+        assert bounds == [{"after": "", "limit": 2}, {"after": "id-2", "limit": 2}, {"after": "id-4", "limit": 2}]
+        fills = [p for sql, p in zip(conn.executed, conn.params) if sql.startswith("UPDATE")]
+        assert fills == [{"after": "", "last": "id-2"}, {"after": "id-2", "last": "id-4"}]
+        assert all("document_tsv IS NULL" in sql for sql in conn.executed if sql.startswith("UPDATE"))
+        create = conn.executed[-1]
+        assert "CREATE INDEX CONCURRENTLY IF NOT EXISTS" in create
+        assert TEXT_SEARCH_INDEX_NAME in create and "USING gin (document_tsv)" in create
+
+    def test_blocking_build(self):
+        conn = FakeConnection(text_column="", text_trigger=True)
+        manager, patcher = _manager(conn)
+        with patcher:
+            manager.ensure_text_search(concurrently=False)
+        assert "CONCURRENTLY" not in conn.executed[-1]
+
+    def test_generated_column_from_earlier_versions_needs_no_backfill(self):
+        conn = FakeConnection(text_column="s")
+        manager, patcher = _manager(conn)
+        with patcher:
+            assert manager.ensure_text_search() is True
+        assert not any("ADD COLUMN" in sql or sql.startswith("UPDATE") for sql in conn.executed)
+        assert "CREATE INDEX CONCURRENTLY" in conn.executed[-1]
+
+    def test_invalid_index_is_dropped_and_rebuilt(self):
+        conn = FakeConnection(text_column="", text_trigger=True, text_index=False)
+        manager, patcher = _manager(conn)
+        with patcher:
+            assert manager.ensure_text_search() is True
+        assert f"DROP INDEX CONCURRENTLY IF EXISTS {TEXT_SEARCH_INDEX_NAME}" in conn.executed
+        assert "CREATE INDEX CONCURRENTLY" in conn.executed[-1]
+
+    def test_complete_setup_is_noop(self):
+        conn = FakeConnection(text_column="", text_trigger=True, text_index=True)
+        manager, patcher = _manager(conn)
+        with patcher:
+            assert manager.ensure_text_search() is False
+        assert not any("CREATE" in sql or sql.startswith("UPDATE") for sql in conn.executed)
+
+    @pytest.mark.parametrize("text_index, ready", [(None, False), (False, False), (True, True)])
+    def test_ready_only_with_a_valid_index(self, text_index, ready):
+        conn = FakeConnection(text_index=text_index)
+        manager, patcher = _manager(conn)
+        with patcher:
+            assert manager.text_search_ready() is ready
+
+
+class TestEnsureSourceIndex:
+    """Tests for ensure_source_index() — (collection_id, source_file) btree index."""
+
+    def test_missing_table_is_noop(self):
+        conn = FakeConnection(table_exists=False)
+        manager, patcher = _manager(conn)
+        with patcher:
+            assert manager.ensure_source_index() is False
+        assert not any("CREATE INDEX" in sql for sql in conn.executed)
+
+    def test_creates_expression_index(self):
+        conn = FakeConnection()
+        manager, patcher = _manager(conn)
+        with patcher:
+            assert manager.ensure_source_index() is True
+
+        create = next(sql for sql in conn.executed if "CREATE INDEX" in sql)
+        assert SOURCE_INDEX_NAME in create
+        assert "(collection_id, (cmetadata->>'source_file'))" in create
+
+    def test_existing_index_is_noop_and_remembered(self):
+        conn = FakeConnection(source_index=True)
+        manager, patcher = _manager(conn)
+        with patcher as connect:
+            assert manager.ensure_source_index() is False
+            assert manager.ensure_source_index() is False
+        assert not any("CREATE INDEX" in sql for sql in conn.executed)
+        connect.assert_called_once()
+
+
+class TestStatus:
+    """Tests for status()."""
+
+    def test_reports_existing_index(self):
+        conn = FakeConnection(typmod=1536, index_row=(True, "hnsw", "CREATE INDEX x", 4096))
+        manager, patcher = _manager(conn)
+        with patcher:
+            status = manager.status()
+        assert status.exists and status.valid
+        assert status.method == "hnsw"
+        assert status.size_bytes == 4096
+        assert status.dimensions == 1536
+        assert status.table_rows == 1000
+
+    def test_reports_missing_table(self):
+        manager, patcher = _manager(FakeConnection(table_exists=False))
+        with patcher:
+            assert manager.status().exists is False
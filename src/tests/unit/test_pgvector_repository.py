@@ -1,23 +1,25 @@
 """
 Unit tests for PGVectorRepository.
 
-PGVector itself is mocked — we validate that the adapter correctly
-delegates to it and contains the workaround for the langchain-postgres
-session bug.
+PGVector itself is mocked — we validate that the adapter runs its SQL on
+the vectorstore's engine and bulk-loads chunks with COPY.
 """
 from unittest.mock import MagicMock, Mock, patch
 
+import numpy as np
 import pytest
-from langchain_core.documents import Document as LangchainDocument
 
-from src.domain.entities.document import DocumentChunk
+from src.domain.entities.document import DocumentChunk, ScoredChunk
 from src.domain.ports.embeddings import EmbeddingsPort
+from src.infrastructure.adapters.pgvector_queries import Candidates
+from src.infrastructure.adapters.repository_retriever import RepositoryRetriever
 
 
 @pytest.fixture
 def fake_embeddings():
     mock = Mock(spec=EmbeddingsPort)
     mock.get_langchain_embeddings.return_value = MagicMock(name="lc_embeddings")
+    mock.embed_documents.side_effect = lambda texts: [[float(i), 1.0] for i, _ in enumerate(texts)]
     return mock
 
 
@@ -26,16 +28,16 @@ def repository(fake_embeddings):
     """Build PGVectorRepository with PGVector class patched."""
     with patch(
         "src.infrastructure.adapters.pgvector_repository.PGVector"
-    ) as pgv_cls:
-        instance = MagicMock(name="pgvector_instance")
-        # session_maker default; specific tests can override.
-        instance.session_maker = MagicMock(name="session_maker")
-        pgv_cls.return_value = instance
+    ) as pgv_cls, patch(
+        "src.infrastructure.adapters.pgvector_repository.PGVectorIndexManager"
+    ) as index_cls:
+        pgv_cls.return_value = MagicMock(name="pgvector_instance")
         from src.infrastructure.adapters.pgvector_repository import (
             PGVectorRepository,
         )
         repo = PGVectorRepository(fake_embeddings)
         repo._pgv_cls = pgv_cls  # expose for assertions
+        repo._index_cls = index_cls
         yield repo
 
 
@@ -53,99 +55,213 @@ class TestConstruction:
         assert "postgresql" in kwargs["connection"]
         assert kwargs["embeddings"] is fake_embeddings.get_langchain_embeddings.return_value
 
+    def test_connections_carry_ann_search_options(self, repository):
+        """ef_search / probes are applied to every connection via libpq options."""
+        kwargs = repository._pgv_cls.call_args.kwargs
+        options = kwargs["engine_args"]["connect_args"]["options"]
+        assert "hnsw.ef_search=" in options
+        assert "ivfflat.probes=" in options
 
-class TestResetSession:
-    """Regression tests for the langchain-postgres session bug workaround."""
 
-    def test_reset_session_calls_session_maker_remove(self, repository):
-        repository._reset_session()
-        repository._vectorstore.session_maker.remove.assert_called_once()
-
-    def test_reset_session_no_op_without_session_maker(self, repository):
-        # Simulate older/newer langchain-postgres versions without session_maker.
-        del repository._vectorstore.session_maker
-        # Must not raise.
-        repository._reset_session()
+class TestAddDocuments:
+    """Tests for add_documents() — binary COPY on the engine's connection."""
 
+    @pytest.fixture
+    def copy(self):
+        with patch("src.infrastructure.adapters.pgvector_repository.copy_chunks") as copy:
+            yield copy
 
-class TestAddDocuments:
-    """Tests for add_documents()."""
+    def _driver_conn(self, repository):
+        sa_conn = repository._vectorstore._engine.begin.return_value.__enter__.return_value
+        return sa_conn.connection.driver_connection
 
-    def test_add_without_clear_calls_reset_session_and_add(self, repository):
+    def test_embeds_and_copies_into_logical_collection(self, repository, copy, fake_embeddings):
         chunks = [
             DocumentChunk(content="A", metadata={"source_file": "f.pdf"}),
             DocumentChunk(content="B", metadata={"source_file": "f.pdf"}),
         ]
         n = repository.add_documents(chunks, clear_existing=False)
 
-        # session reset must happen BEFORE add_documents (regression for bug).
-        repository._vectorstore.session_maker.remove.assert_called_once()
-        repository._vectorstore.add_documents.assert_called_once()
-        passed = repository._vectorstore.add_documents.call_args.args[0]
-        assert len(passed) == 2
-        assert all(isinstance(d, LangchainDocument) for d in passed)
-        assert passed[0].page_content == "A"
-        assert passed[0].metadata == {"source_file": "f.pdf"}
+        fake_embeddings.embed_documents.assert_called_once_with(["A", "B"])
+        conn, collection, copied, vectors = copy.call_args.args
+        assert conn is self._driver_conn(repository)
+        assert collection == "document_chunks"
+        assert copied == chunks
+        assert vectors == [[0.0, 1.0], [1.0, 1.0]]
         assert n == 2
 
-    def test_add_with_clear_uses_from_documents_with_pre_delete(
-        self, repository, fake_embeddings
-    ):
-        chunks = [DocumentChunk(content="X", metadata={"source_file": "x.pdf"})]
-        pgv_cls = repository._pgv_cls
-        # Reset call count from constructor.
-        pgv_cls.from_documents = MagicMock(return_value=MagicMock())
+    def test_given_embeddings_skip_the_embedding_call(self, repository, copy, fake_embeddings):
+        repository.add_documents([DocumentChunk(content="A")], embeddings=[[0.5, 0.5]])
 
-        n = repository.add_documents(chunks, clear_existing=True)
+        fake_embeddings.embed_documents.assert_not_called()
+        assert copy.call_args.args[3] == [[0.5, 0.5]]
 
-        pgv_cls.from_documents.assert_called_once()
-        kwargs = pgv_cls.from_documents.call_args.kwargs
-        assert kwargs["pre_delete_collection"] is True
-        assert kwargs["embedding"] is fake_embeddings.get_langchain_embeddings.return_value
-        assert "collection_name" in kwargs
-        assert "connection" in kwargs
+    def test_add_with_clear_loads_shadow_collection_and_swaps_alias(self, repository, copy):
+        chunks = [DocumentChunk(content="X", metadata={"source_file": "x.pdf"})]
+
+        with patch(
+            "src.infrastructure.adapters.pgvector_repository.swap_alias", return_value=None
+        ) as swap, patch(
+            "src.infrastructure.adapters.pgvector_repository.bump_corpus_version"
+        ) as bump:
+            n = repository.add_documents(chunks, clear_existing=True)
+
+        shadow = copy.call_args.args[1]
+        assert shadow.startswith("document_chunks__")
+        created = self._driver_conn(repository).execute.call_args_list[-1].args[1]
+        assert created[1] == shadow
+        assert swap.call_args.args[1:] == ("document_chunks", shadow)
+        # Only the swap is visible to searches: one bump, none for the shadow load.
+        bump.assert_called_once()
         assert n == 1
 
-    def test_add_empty_list_returns_zero(self, repository):
-        assert repository.add_documents([], clear_existing=False) == 0
+    def test_failed_rebuild_drops_shadow(self, repository, copy):
+        copy.side_effect = RuntimeError("disk full")
 
-    def test_chunk_metadata_preserved(self, repository):
-        chunks = [
-            DocumentChunk(
-                content="X",
-                metadata={"source_file": "f.pdf", "page": 3, "extra": "y"},
-            )
-        ]
-        repository.add_documents(chunks, clear_existing=False)
-        passed = repository._vectorstore.add_documents.call_args.args[0]
-        assert passed[0].metadata["page"] == 3
-        assert passed[0].metadata["extra"] == "y"
+        with patch(
+            "src.infrastructure.adapters.pgvector_repository.drop_collection"
+        ) as drop, patch(
+            "src.infrastructure.adapters.pgvector_repository.swap_alias"
+        ) as swap:
+            with pytest.raises(RuntimeError):
+                repository.add_documents([DocumentChunk(content="X")], clear_existing=True)
 
+        swap.assert_not_called()
+        assert drop.call_args.args[1].startswith("document_chunks__")
 
-class TestSearch:
-    """Tests for search() — uses MMR for diversity."""
+    def test_add_empty_list_returns_zero(self, repository, copy):
+        assert repository.add_documents([], clear_existing=False) == 0
+        copy.assert_not_called()
+
+
+class TestRebuild:
+    """Tests for the blue/green rebuild methods."""
+
+    def test_publish_drops_the_collection_two_rebuilds_back(self, repository):
+        with patch(
+            "src.infrastructure.adapters.pgvector_repository.swap_alias", return_value="document_chunks__old"
+        ), patch(
+            "src.infrastructure.adapters.pgvector_repository.bump_corpus_version"
+        ), patch(
+            "src.infrastructure.adapters.pgvector_repository.drop_collection"
+        ) as drop:
+            repository.publish_rebuild("document_chunks__new")
+
+        assert drop.call_args.args[1] == "document_chunks__old"
+        repository._index_manager.ensure_index.assert_called_once()
+
+    def test_rollback_bumps_version_when_swapped(self, repository):
+        with patch(
+            "src.infrastructure.adapters.pgvector_repository.rollback_alias", return_value="document_chunks__old"
+        ), patch(
+            "src.infrastructure.adapters.pgvector_repository.bump_corpus_version"
+        ) as bump:
+            assert repository.rollback_rebuild() == "document_chunks__old"
+        bump.assert_called_once()
+
+    def test_rollback_without_previous(self, repository):
+        with patch(
+            "src.infrastructure.adapters.pgvector_repository.rollback_alias", return_value=None
+        ), patch(
+            "src.infrastructure.adapters.pgvector_repository.bump_corpus_version"
+        ) as bump:
+            assert repository.rollback_rebuild() is None
+        bump.assert_not_called()
+
+
+class TestVectorIndex:
+    """Tests for ANN index lifecycle delegation."""
+
+    @pytest.fixture(autouse=True)
+    def copy(self):
+        with patch("src.infrastructure.adapters.pgvector_repository.copy_chunks") as copy:
+            yield copy
+
+    def test_add_documents_ensures_index(self, repository):
+        repository.add_documents([DocumentChunk(content="A")], clear_existing=False)
+        repository._index_manager.ensure_index.assert_called_once()
+
+    def test_add_documents_skips_index_when_disabled(self, repository):
+        repository._settings = repository._settings.model_copy(
+            update={"vector_index_auto_create": False}
+        )
+        repository.add_documents([DocumentChunk(content="A")], clear_existing=False)
+        repository._index_manager.ensure_index.assert_not_called()
 
-    def test_search_uses_mmr_with_fetch_k_3x(self, repository):
-        repository._vectorstore.max_marginal_relevance_search.return_value = []
-        repository.search("query", k=5)
+    def test_index_failure_does_not_fail_ingestion(self, repository):
+        repository._index_manager.ensure_index.side_effect = RuntimeError("no perms")
+        assert repository.add_documents([DocumentChunk(content="A")]) == 1
 
-        repository._vectorstore.max_marginal_relevance_search.assert_called_once_with(
-            "query", k=5, fetch_k=15
+    def test_hybrid_checks_text_search_once_and_never_builds_it(self, repository, caplog):
+        repository._settings = repository._settings.model_copy(
+            update={"vector_index_auto_create": False, "retrieval_mode": "hybrid"}
         )
+        repository._index_manager.text_search_ready.return_value = False
+        repository.add_documents([DocumentChunk(content="A")], clear_existing=False)
+        repository.add_documents([DocumentChunk(content="B")], clear_existing=False)
 
-    def test_search_default_k(self, repository):
-        repository._vectorstore.max_marginal_relevance_search.return_value = []
-        repository.search("q")
+        repository._index_manager.text_search_ready.assert_called_once()
+        repository._index_manager.ensure_text_search.assert_not_called()
+        assert "vector_index.py text-search" in caplog.text
 
-        kwargs_or_args = repository._vectorstore.max_marginal_relevance_search.call_args
-        assert kwargs_or_args.kwargs["k"] == 10
-        assert kwargs_or_args.kwargs["fetch_k"] == 30
+    def test_text_search_check_failure_does_not_fail_ingestion(self, repository):
+        repository._settings = repository._settings.model_copy(update={"retrieval_mode": "hybrid"})
+        repository._index_manager.text_search_ready.side_effect = RuntimeError("no perms")
+        assert repository.add_documents([DocumentChunk(content="A")]) == 1
+        repository._index_manager.ensure_index.assert_called_once()
 
-    def test_search_returns_document_chunks(self, repository):
-        repository._vectorstore.max_marginal_relevance_search.return_value = [
-            LangchainDocument(page_content="A", metadata={"source_file": "f.pdf"}),
-            LangchainDocument(page_content="B", metadata={"source_file": "g.pdf"}),
-        ]
+    def test_rebuild_index_delegates_concurrently(self, repository):
+        repository.rebuild_index()
+        repository._index_manager.rebuild.assert_called_once_with(concurrently=True)
+
+    def test_index_status_delegates(self, repository):
+        repository._index_manager.status.return_value = "status"
+        assert repository.index_status() == "status"
+
+
+class TestSearch:
+    """Tests for search() — binary candidate fetch + NumPy MMR."""
+
+    @pytest.fixture
+    def fetch(self, repository, fake_embeddings):
+        fake_embeddings.embed_query.return_value = [1.0, 0.0]
+        with patch(
+            "src.infrastructure.adapters.pgvector_repository.fetch_candidates"
+        ) as fetch:
+            fetch.return_value = Candidates()
+            yield fetch
+
+    def test_fetches_3x_candidates_on_engine_connection(self, repository, fetch):
+        repository.search("query", k=5)
+
+        fetch.assert_called_once()
+        conn, collection, query_vector, fetch_k, settings = fetch.call_args.args
+        sa_conn = repository._vectorstore._engine.connect.return_value.__enter__.return_value
+        assert conn is sa_conn.connection.driver_connection
+        assert collection == "document_chunks"
+        assert query_vector.dtype == np.float32
+        assert fetch_k == 15
+        assert settings is repository._settings
+
+    def test_search_default_k(self, repository, fetch):
+        repository.search("q")
+        assert fetch.call_args.args[3] == 30
+
+    def test_fetch_k_from_settings(self, repository, fetch):
+        repository._settings = repository._settings.model_copy(update={"mmr_fetch_k": 100})
+        repository.search("q", k=5)
+        assert fetch.call_args.args[3] == 100
+
+    def test_query_embedded_through_port(self, repository, fetch, fake_embeddings):
+        repository.search("what?")
+        fake_embeddings.embed_query.assert_called_once_with("what?")
+
+    def test_search_returns_document_chunks(self, repository, fetch):
+        fetch.return_value = Candidates(
+            documents=["A", "B"],
+            metadatas=[{"source_file": "f.pdf"}, {"source_file": "g.pdf"}],
+            vectors=np.array([[1.0, 0.0], [0.0, 1.0]], dtype=np.float32),
+        )
         out = repository.search("q", k=2)
 
         assert len(out) == 2
@@ -153,10 +269,49 @@ class TestSearch:
         assert out[0].content == "A"
         assert out[0].metadata["source_file"] == "f.pdf"
 
-    def test_search_empty_returns_empty(self, repository):
-        repository._vectorstore.max_marginal_relevance_search.return_value = []
+    def test_search_empty_returns_empty(self, repository, fetch):
         assert repository.search("q") == []
 
+    def test_hybrid_mode_uses_rrf_query(self, repository, fetch):
+        repository._settings = repository._settings.model_copy(update={"retrieval_mode": "hybrid"})
+        fused = [ScoredChunk(content="exact match", score=0.8, id="id-1")]
+        with patch(
+            "src.infrastructure.adapters.pgvector_repository.fetch_hybrid", return_value=fused
+        ) as fetch_hybrid:
+            out = repository.search("ABC-123", k=5)
+
+        assert out == fused
+        fetch.assert_not_called()
+        conn, collection, query, query_vector, k, candidates, settings, rrf_k = fetch_hybrid.call_args.args
+        assert (collection, query, k, candidates, rrf_k) == ("document_chunks", "ABC-123", 5, 15, 60)
+        assert fetch_hybrid.call_args.kwargs == {"include_vectors": False}
+
+
+class TestSearchMany:
+    """Tests for search_many() — batched embedding and candidate fetch."""
+
+    def test_one_embedding_call_and_one_fetch(self, repository, fake_embeddings):
+        fake_embeddings.embed_queries.return_value = [[1.0, 0.0], [0.0, 1.0]]
+        with patch(
+            "src.infrastructure.adapters.pgvector_repository.fetch_candidates_many"
+        ) as fetch:
+            fetch.return_value = [
+                Candidates(
+                    documents=["A"],
+                    metadatas=[{"source_file": "a.pdf"}],
+                    vectors=np.array([[1.0, 0.0]], dtype=np.float32),
+                ),
+                Candidates(),
+            ]
+            out = repository.search_many(["q1", "q2"], k=5)
+
+        assert [[c.content for c in chunks] for chunks in out] == [["A"], []]
+        fake_embeddings.embed_queries.assert_called_once_with(["q1", "q2"])
+        conn, collection, query_vectors, fetch_k, settings = fetch.call_args.args
+        assert collection == "document_chunks"
+        assert query_vectors.shape == (2, 2)
+        assert fetch_k == 15
+
 
 class TestDeleteBySource:
     """Tests for delete_by_source() — raw SQL."""
@@ -207,23 +362,123 @@ class TestDeleteBySource:
         params = delete_call.args[1]
         assert params["source_file"] == "doc.pdf"
         assert params["collection_id"] == "x"
+        assert params["batch_size"] == repository._settings.delete_batch_size
+
+    def test_delete_by_source_commits_each_batch(self, repository):
+        conn = self._wire_engine(repository, collection_uuid="x")
+        repository._settings = repository._settings.model_copy(update={"delete_batch_size": 2})
+        select = MagicMock()
+        select.fetchone.return_value = ("x",)
+        conn.execute.side_effect = [select, MagicMock(rowcount=2), MagicMock(rowcount=2), MagicMock(rowcount=0)]
+        with patch(
+            "src.infrastructure.adapters.pgvector_repository.bump_corpus_version"
+        ) as bump:
+            assert repository.delete_by_source("doc.pdf") == 4
+        assert conn.commit.call_count == 3
+        # Each batch that deleted rows bumps the version before its own commit.
+        assert bump.call_count == 2
+
+    def test_delete_bumps_corpus_version_before_commit(self, repository):
+        conn = self._wire_engine(repository, collection_uuid="x", rowcount=3)
+        with patch(
+            "src.infrastructure.adapters.pgvector_repository.bump_corpus_version"
+        ) as bump:
+            repository.delete_by_source("doc.pdf")
+        bump.assert_called_once_with(conn.connection.driver_connection, "document_chunks")
+
+    def test_noop_delete_keeps_corpus_version(self, repository):
+        self._wire_engine(repository, collection_uuid="x", rowcount=0)
+        with patch(
+            "src.infrastructure.adapters.pgvector_repository.bump_corpus_version"
+        ) as bump:
+            repository.delete_by_source("doc.pdf")
+        bump.assert_not_called()
+
+
+class TestDeleteChunks:
+    """Tests for delete_chunks() — incremental re-ingestion."""
+
+    def _wire_engine(self, repository, rowcount):
+        fake_conn = MagicMock(name="conn")
+        fake_conn.execute.return_value.rowcount = rowcount
+        ctx = MagicMock()
+        ctx.__enter__.return_value = fake_conn
+        repository._vectorstore._engine = MagicMock(name="engine")
+        repository._vectorstore._engine.connect.return_value = ctx
+        return fake_conn
+
+    def test_deletes_by_chunk_hash_and_bumps_version(self, repository):
+        conn = self._wire_engine(repository, rowcount=2)
+        with patch(
+            "src.infrastructure.adapters.pgvector_repository.bump_corpus_version"
+        ) as bump:
+            assert repository.delete_chunks("doc.pdf", ["h1", "h2"]) == 2
+
+        sql, params = conn.execute.call_args.args
+        assert "cmetadata->>'chunk_hash' = ANY(:chunk_hashes)" in str(sql)
+        assert params == {"name": "document_chunks", "source_file": "doc.pdf", "chunk_hashes": ["h1", "h2"]}
+        bump.assert_called_once()
+        conn.commit.assert_called_once()
+
+    def test_empty_list_is_noop(self, repository):
+        conn = self._wire_engine(repository, rowcount=0)
+        assert repository.delete_chunks("doc.pdf", []) == 0
+        conn.execute.assert_not_called()
+
+
+class TestCorpusVersion:
+    """Tests for corpus_version() and its bump after add_documents()."""
+
+    def test_insert_and_bump_share_one_transaction(self, repository):
+        with patch(
+            "src.infrastructure.adapters.pgvector_repository.copy_chunks"
+        ) as copy, patch(
+            "src.infrastructure.adapters.pgvector_repository.bump_corpus_version"
+        ) as bump:
+            repository.add_documents([DocumentChunk(content="A")])
+        sa_conn = repository._vectorstore._engine.begin.return_value.__enter__.return_value
+        assert copy.call_args.args[0] is sa_conn.connection.driver_connection
+        bump.assert_called_once_with(sa_conn.connection.driver_connection, "document_chunks")
+
+    def test_failed_insert_does_not_bump_version(self, repository):
+        with patch(
+            "src.infrastructure.adapters.pgvector_repository.copy_chunks",
+            side_effect=RuntimeError("disk full"),
+        ), patch(
+            "src.infrastructure.adapters.pgvector_repository.bump_corpus_version"
+        ) as bump, pytest.raises(RuntimeError):
+            repository.add_documents([DocumentChunk(content="A")])
+        bump.assert_not_called()
+
+    def test_reads_version_and_creates_table_once(self, repository):
+        with patch(
+            "src.infrastructure.adapters.pgvector_repository.read_corpus_version",
+            side_effect=[4, 5],
+        ) as read:
+            assert repository.corpus_version() == 4
+            assert repository.corpus_version() == 5
+        sa_conn = repository._vectorstore._engine.connect.return_value.__enter__.return_value
+        driver = sa_conn.connection.driver_connection
+        assert driver.execute.call_count == 1
+        assert "CREATE TABLE IF NOT EXISTS corpus_version" in driver.execute.call_args.args[0]
+        read.assert_called_with(driver, "document_chunks")
 
 
 class TestGetRetriever:
-    """Tests for get_retriever() — uses MMR."""
+    """Tests for get_retriever() — shares the NumPy MMR search path."""
 
-    def test_returns_mmr_retriever_with_fetch_k(self, repository):
-        repository._vectorstore.as_retriever.return_value = "retriever"
+    def test_returns_repository_retriever(self, repository):
         out = repository.get_retriever(k=7)
 
-        assert out == "retriever"
-        repository._vectorstore.as_retriever.assert_called_once_with(
-            search_type="mmr",
-            search_kwargs={"k": 7, "fetch_k": 21},
-        )
+        assert isinstance(out, RepositoryRetriever)
+        assert out.repository is repository
+        assert out.k == 7
 
     def test_default_k_is_ten(self, repository):
-        repository.get_retriever()
-        kwargs = repository._vectorstore.as_retriever.call_args.kwargs
-        assert kwargs["search_kwargs"]["k"] == 10
-        assert kwargs["search_kwargs"]["fetch_k"] == 30
+        assert repository.get_retriever().k == 10
+
+    def test_retriever_runs_search(self, repository):
+        repository.search = MagicMock(return_value=[DocumentChunk(content="A")])
+        docs = repository.get_retriever(k=4).invoke("q")
+        repository.search.assert_called_once_with("q", k=4)
+        assert docs[0].page_content == "A"
@@ -0,0 +1,110 @@
+"""
+Unit tests for PostgresDocumentRegistry.
+
+The shared pool is replaced with a MagicMock; we check the collection
+scoping and the hex <-> bytea mapping of the hashes.
+"""
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.domain.entities.document import CatalogEntry, DocumentRecord
+from src.infrastructure.adapters.collection_alias import COLLECTION_ALIAS_SCHEMA
+from src.infrastructure.adapters.postgres_document_registry import (
+    PostgresDocumentRegistry,
+    _ADOPT_LEGACY_ROWS,
+    _PRUNE,
+    _SCHEMA,
+)
+
+
+FILE_HASH = "ab" * 32
+CHUNK_HASHES = ["01" * 32, "02" * 32]
+
+
+@pytest.fixture
+def conn():
+    return MagicMock(name="conn")
+
+
+@pytest.fixture
+def registry(conn):
+    @contextmanager
+    def connection():
+        yield conn
+
+    pool = MagicMock(name="pool")
+    pool.connection.side_effect = connection
+    with patch("src.infrastructure.adapters.postgres_document_registry.get_pool", return_value=pool):
+        yield PostgresDocumentRegistry("docs")
+
+
+class TestRegistry:
+    def test_schema_created_once(self, registry, conn):
+        registry.delete("a.pdf")
+        registry.delete("b.pdf")
+        assert [c.args[0] for c in conn.execute.call_args_list].count(_SCHEMA) == 1
+
+    def test_schema_setup_creates_alias_table_and_adopts_legacy_rows(self, registry, conn):
+        registry.delete("a.pdf")
+
+        calls = conn.execute.call_args_list
+        assert calls[0].args == (COLLECTION_ALIAS_SCHEMA,)
+        assert calls[2].args == (_ADOPT_LEGACY_ROWS, ("docs",))
+
+    def test_statements_resolve_the_physical_collection(self, registry, conn):
+        registry.delete("a.pdf")
+        assert "collection_alias" in conn.execute.call_args.args[0]
+
+    def test_get_maps_bytes_to_hex(self, registry, conn):
+        conn.execute.return_value.fetchone.return_value = (
+            "a.pdf", bytes.fromhex(FILE_HASH), [bytes.fromhex(h) for h in CHUNK_HASHES], 2048,
+        )
+
+        record = registry.get("a.pdf")
+
+        assert record == DocumentRecord(
+            source_file="a.pdf", file_hash=FILE_HASH, chunk_hashes=CHUNK_HASHES, size_bytes=2048
+        )
+        assert conn.execute.call_args.args[1] == ("docs", "a.pdf")
+
+    def test_get_missing(self, registry, conn):
+        conn.execute.return_value.fetchone.return_value = None
+        assert registry.get("a.pdf") is None
+
+    def test_save_upserts_raw_digests(self, registry, conn):
+        registry.save(DocumentRecord(
+            source_file="a.pdf", file_hash=FILE_HASH, chunk_hashes=CHUNK_HASHES, size_bytes=2048
+        ))
+
+        sql, params = conn.execute.call_args.args
+        assert "ON CONFLICT (collection, source_file)" in sql
+        assert params == (
+            "docs", "a.pdf", bytes.fromhex(FILE_HASH), [bytes.fromhex(h) for h in CHUNK_HASHES], 2, 2048,
+        )
+
+    def test_clear_and_sources_are_scoped_to_collection(self, registry, conn):
+        conn.execute.return_value.fetchall.return_value = [("a.pdf",), ("b.pdf",)]
+
+        registry.clear()
+        assert conn.execute.call_args_list[-2].args[1] == ("docs",)
+        assert conn.execute.call_args.args == (_PRUNE, {"alias": "docs"})
+        assert registry.sources() == ["a.pdf", "b.pdf"]
+        assert conn.execute.call_args.args[1] == ("docs",)
+
+    def test_list_documents_reads_catalog_columns_only(self, registry, conn):
+        ingested = datetime(2026, 1, 2, tzinfo=timezone.utc)
+        conn.execute.return_value.fetchall.return_value = [
+            ("a.pdf", 12, 2048, bytes.fromhex(FILE_HASH), ingested),
+        ]
+
+        entries = registry.list_documents()
+
+        assert entries == [CatalogEntry(
+            source_file="a.pdf", chunk_count=12, size_bytes=2048, file_hash=FILE_HASH, ingested_at=ingested,
+        )]
+        sql, params = conn.execute.call_args.args
+        assert "chunk_hashes" not in sql
+        assert params == ("docs",)
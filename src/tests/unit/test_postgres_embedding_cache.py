@@ -0,0 +1,144 @@
+"""
+Unit tests for PostgresEmbeddingCache.
+
+The shared pool is patched with a fake connection whose lookup returns the
+rows of an in-memory table; we validate that only misses reach the provider
+and that new vectors are written back with COPY.
+"""
+from unittest.mock import MagicMock, Mock, patch
+
+import numpy as np
+import psycopg
+import pytest
+
+from src.domain.ports.embeddings import EmbeddingsPort
+from src.infrastructure.adapters.postgres_embedding_cache import (
+    PostgresEmbeddingCache,
+    content_digest,
+)
+
+
+def fake_connection(table):
+    """Connection whose cache lookup reads from `table` and whose COPY rows land in `conn.copied`."""
+    conn = MagicMock(name="conn")
+    conn.copied = []
+
+    def execute(sql, params=None, **kwargs):
+        result = MagicMock()
+        if "content_sha256 = ANY" in sql:
+            result.fetchall.return_value = [
+                (digest, table[digest]) for digest in params[1] if digest in table
+            ]
+        return result
+
+    conn.execute.side_effect = execute
+    copy = MagicMock(name="copy")
+    copy.write_row.side_effect = conn.copied.append
+    cursor = MagicMock(name="cursor")
+    cursor.copy.return_value.__enter__.return_value = copy
+    conn.cursor.return_value.__enter__.return_value = cursor
+    conn.__enter__.return_value = conn
+    return conn
+
+
+@pytest.fixture
+def inner():
+    mock = Mock(spec=EmbeddingsPort)
+    mock.embed_documents.side_effect = lambda texts: [[float(len(t)), 1.0] for t in texts]
+    mock.embed_query.return_value = [0.0, 1.0]
+    return mock
+
+
+def _cache(inner, conn, batch_size=256):
+    cache = PostgresEmbeddingCache(inner, model="openai:test", batch_size=batch_size)
+    pool = MagicMock(name="pool")
+    pool.connection.return_value = conn
+    patcher = patch(
+        "src.infrastructure.adapters.postgres_embedding_cache.get_pool", return_value=pool
+    )
+    return cache, patcher, pool
+
+
+class TestEmbedDocuments:
+    def test_cold_cache_embeds_and_writes_back(self, inner):
+        conn = fake_connection({})
+        cache, patcher, pool = _cache(inner, conn)
+        with patcher:
+            out = cache.embed_documents(["aa", "bbb"])
+
+        assert out == [[2.0, 1.0], [3.0, 1.0]]
+        inner.embed_documents.assert_called_once_with(["aa", "bbb"])
+        assert {row[0] for row in conn.copied} == {content_digest("aa"), content_digest("bbb")}
+        assert any("ON CONFLICT" in c.args[0] for c in conn.execute.call_args_list)
+
+    def test_warm_cache_makes_no_provider_calls(self, inner):
+        table = {
+            content_digest("aa"): np.array([9.0, 9.0], dtype=np.float32),
+            content_digest("bbb"): np.array([8.0, 8.0], dtype=np.float32),
+        }
+        conn = fake_connection(table)
+        cache, patcher, pool = _cache(inner, conn)
+        with patcher:
+            out = cache.embed_documents(["bbb", "aa"])
+
+        assert out == [[8.0, 8.0], [9.0, 9.0]]
+        inner.embed_documents.assert_not_called()
+        assert conn.copied == []
+
+    def test_only_misses_go_to_provider_deduplicated(self, inner):
+        table = {content_digest("aa"): np.array([9.0, 9.0], dtype=np.float32)}
+        conn = fake_connection(table)
+        cache, patcher, pool = _cache(inner, conn)
+        with patcher:
+            out = cache.embed_documents(["aa", "new", "new"])
+
+        inner.embed_documents.assert_called_once_with(["new"])
+        assert out == [[9.0, 9.0], [3.0, 1.0], [3.0, 1.0]]
+        assert len(conn.copied) == 1
+
+    def test_misses_embedded_in_batches(self, inner):
+        conn = fake_connection({})
+        cache, patcher, pool = _cache(inner, conn, batch_size=2)
+        with patcher:
+            cache.embed_documents(["a", "b", "c", "d", "e"])
+
+        assert [len(c.args[0]) for c in inner.embed_documents.call_args_list] == [2, 2, 1]
+
+    def test_uses_shared_pool_and_creates_schema_once(self, inner):
+        conn = fake_connection({})
+        cache, patcher, pool = _cache(inner, conn)
+        with patcher as get_pool:
+            cache.embed_documents(["aa"])
+            cache.embed_documents(["bbb"])
+
+        get_pool.assert_called_once_with(cache._settings)
+        schema = [c for c in conn.execute.call_args_list if "CREATE TABLE" in c.args[0]]
+        assert len(schema) == 1
+
+    def test_unreachable_database_falls_back_to_provider(self, inner):
+        cache = PostgresEmbeddingCache(inner, model="m")
+        with patch(
+            "src.infrastructure.adapters.postgres_embedding_cache.get_pool",
+            side_effect=psycopg.OperationalError("down"),
+        ):
+            out = cache.embed_documents(["aa"])
+        assert out == [[2.0, 1.0]]
+
+    def test_empty_input(self, inner):
+        cache = PostgresEmbeddingCache(inner, model="m")
+        assert cache.embed_documents([]) == []
+
+
+class TestPassThrough:
+    def test_query_not_cached(self, inner):
+        cache = PostgresEmbeddingCache(inner, model="m")
+        assert cache.embed_query("q") == [0.0, 1.0]
+        inner.embed_query.assert_called_once_with("q")
+
+    def test_langchain_embeddings_route_through_cache(self, inner):
+        conn = fake_connection({content_digest("aa"): np.array([9.0, 9.0], dtype=np.float32)})
+        cache, patcher, pool = _cache(inner, conn)
+        with patcher:
+            out = cache.get_langchain_embeddings().embed_documents(["aa"])
+        assert out == [[9.0, 9.0]]
+        inner.embed_documents.assert_not_called()
@@ -0,0 +1,164 @@
+"""
+Unit tests for PostgresIngestJobQueue.
+
+The shared pools are replaced with MagicMocks; we check the SKIP LOCKED claim,
+the retry bookkeeping and the row -> IngestJob mapping.
+"""
+import uuid
+from contextlib import asynccontextmanager, contextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.domain.entities.ingest_job import IngestJob
+from src.infrastructure.adapters.postgres_ingest_jobs import PostgresIngestJobQueue, _SCHEMA
+
+
+JOB_ID = uuid.UUID("00000000-0000-0000-0000-000000000001")
+
+
+def _row(status="queued", chunks=0, attempts=0, error=None):
+    return (JOB_ID, "/spool/a.pdf", "a.pdf", True, status, chunks, attempts, error)
+
+
+@pytest.fixture
+def conn():
+    return MagicMock(name="conn")
+
+
+@pytest.fixture
+def aconn():
+    conn = MagicMock(name="aconn")
+    cursor = MagicMock(name="acursor")
+    cursor.fetchone = AsyncMock(return_value=None)
+    conn.execute = AsyncMock(return_value=cursor)
+    conn._cursor = cursor
+    return conn
+
+
+@pytest.fixture
+def queue(conn, aconn):
+    @contextmanager
+    def connection():
+        yield conn
+
+    @asynccontextmanager
+    async def aconnection():
+        yield aconn
+
+    pool = MagicMock(name="pool")
+    pool.connection.side_effect = connection
+    apool = MagicMock(name="apool")
+    apool.connection.side_effect = aconnection
+
+    with patch(
+        "src.infrastructure.adapters.postgres_ingest_jobs.get_pool", return_value=pool
+    ), patch(
+        "src.infrastructure.adapters.postgres_ingest_jobs.get_async_pool",
+        new=AsyncMock(return_value=apool),
+    ):
+        yield PostgresIngestJobQueue(max_attempts=3, stale_seconds=120, retry_delay_seconds=5)
+
+
+def _statements(conn) -> list[str]:
+    return [c.args[0] for c in conn.execute.call_args_list]
+
+
+class TestSchema:
+    def test_created_once(self, queue, conn):
+        conn.execute.return_value.fetchone.return_value = None
+        queue.get(str(JOB_ID))
+        queue.get(str(JOB_ID))
+
+        assert _statements(conn).count(_SCHEMA) == 1
+
+
+class TestQueue:
+    def test_enqueue_maps_row(self, queue, conn):
+        conn.execute.return_value.fetchone.return_value = _row()
+
+        job = queue.enqueue("/spool/a.pdf", "a.pdf", clear_existing=True, after="dep-id")
+
+        assert job == IngestJob(id=str(JOB_ID), file_path="/spool/a.pdf", source_name="a.pdf", clear_existing=True)
+        sql, params = conn.execute.call_args.args
+        assert "INSERT INTO ingest_job" in sql
+        assert params[1:] == ("/spool/a.pdf", "a.pdf", True, "dep-id")
+
+    def test_claim_skips_locked_rows(self, queue, conn):
+        conn.execute.return_value.rowcount = 0
+        conn.execute.return_value.fetchone.return_value = _row(status="running", attempts=1)
+
+        job = queue.claim("host:1")
+
+        sql, params = conn.execute.call_args.args
+        assert "FOR UPDATE SKIP LOCKED" in sql
+        assert "after_id" in sql
+        assert params == {"worker": "host:1", "stale": 120, "max_attempts": 3}
+        assert job.status == "running"
+        assert job.attempts == 1
+
+    def test_stale_reclaim_is_bounded_by_attempts(self, queue, conn):
+        conn.execute.return_value.rowcount = 1
+        conn.execute.return_value.fetchone.return_value = None
+
+        queue.claim("host:1")
+
+        (expire_sql, _), (claim_sql, _) = [c.args for c in conn.execute.call_args_list[-2:]]
+        assert "status = 'failed'" in expire_sql
+        assert "attempts >= %(max_attempts)s" in expire_sql
+        assert "job.attempts < %(max_attempts)s" in claim_sql
+
+    def test_claim_empty_queue(self, queue, conn):
+        conn.execute.return_value.rowcount = 0
+        conn.execute.return_value.fetchone.return_value = None
+        assert queue.claim("host:1") is None
+
+    def test_progress_and_complete(self, queue, conn):
+        conn.execute.return_value.rowcount = 1
+        assert queue.report_progress("id-1", "host:1", 256) is True
+        sql, params = conn.execute.call_args.args
+        assert "worker = %(worker)s AND status = 'running'" in sql
+        assert params == {"id": "id-1", "worker": "host:1", "chunks": 256}
+
+        assert queue.complete("id-1", "host:1", 300) is True
+        sql, params = conn.execute.call_args.args
+        assert "'done'" in sql
+        assert "worker = %(worker)s AND status = 'running'" in sql
+        assert params == {"id": "id-1", "worker": "host:1", "chunks": 300}
+
+    def test_reclaimed_job_is_not_completed(self, queue, conn):
+        conn.execute.return_value.rowcount = 0
+        assert queue.report_progress("id-1", "host:1", 256) is False
+        assert queue.complete("id-1", "host:1", 300) is False
+
+    @pytest.mark.parametrize("retry", [True, False])
+    def test_fail_passes_retry_policy(self, queue, conn, retry):
+        conn.execute.return_value.fetchone.return_value = _row(status="queued", attempts=1, error="quota")
+
+        job = queue.fail("id-1", "host:1", "quota", retry=retry)
+
+        sql, params = conn.execute.call_args.args
+        assert "attempts < %(max_attempts)s" in sql
+        assert "worker = %(worker)s" in sql
+        assert params == {
+            "id": "id-1", "worker": "host:1", "error": "quota", "retry": retry, "max_attempts": 3, "delay": 5,
+        }
+        assert job.error == "quota"
+
+    def test_fail_by_former_owner_is_ignored(self, queue, conn):
+        conn.execute.return_value.fetchone.return_value = None
+        assert queue.fail("id-1", "host:1", "quota") is None
+
+
+class TestAsync:
+    @pytest.mark.asyncio
+    async def test_aenqueue_and_aget_use_async_pool(self, queue, aconn, conn):
+        aconn._cursor.fetchone.return_value = _row(status="running", chunks=10, attempts=1)
+
+        job = await queue.aenqueue("/spool/a.pdf", "a.pdf")
+        assert job.id == str(JOB_ID)
+
+        job = await queue.aget(str(JOB_ID))
+        assert job.chunks_stored == 10
+        assert not job.finished
+        conn.execute.assert_not_called()
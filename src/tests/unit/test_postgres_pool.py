@@ -0,0 +1,135 @@
+"""
+Unit tests for the shared psycopg pools.
+
+psycopg.connect and the pool classes are patched; we check that pools are
+shared per DSN (and per event loop for async) and closed on request.
+"""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.config.settings import Settings
+from src.infrastructure.adapters import postgres_pool
+
+
+MODULE = "src.infrastructure.adapters.postgres_pool"
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    postgres_pool._pools.clear()
+    postgres_pool._async_pools.clear()
+    yield
+    postgres_pool._pools.clear()
+    postgres_pool._async_pools.clear()
+
+
+def _settings(url="postgresql://u:p@localhost:5432/a"):
+    return Settings(database_url=url, db_pool_min_size=1, db_pool_max_size=4)
+
+
+class TestGetPool:
+    def test_one_pool_per_dsn(self):
+        with patch(f"{MODULE}.psycopg.connect"), patch(f"{MODULE}.ConnectionPool") as pool_cls:
+            first = postgres_pool.get_pool(_settings())
+            second = postgres_pool.get_pool(_settings())
+            other = postgres_pool.get_pool(_settings("postgresql://u:p@localhost:5432/b"))
+
+        assert first is second
+        assert pool_cls.call_count == 2
+        assert other is pool_cls.return_value
+
+    def test_pool_sized_and_configured_from_settings(self):
+        with patch(f"{MODULE}.psycopg.connect") as connect, patch(f"{MODULE}.ConnectionPool") as pool_cls:
+            postgres_pool.get_pool(_settings())
+
+        connect.return_value.__enter__.return_value.execute.assert_called_once_with(
+            "CREATE EXTENSION IF NOT EXISTS vector"
+        )
+        kwargs = pool_cls.call_args.kwargs
+        assert kwargs["min_size"] == 1
+        assert kwargs["max_size"] == 4
+        assert kwargs["timeout"] == 30.0
+        assert kwargs["configure"] is postgres_pool._configure
+        assert kwargs["check"] is pool_cls.check_connection
+        assert "options" in kwargs["kwargs"]
+
+    def test_health_check_can_be_disabled(self):
+        settings = _settings().model_copy(update={"db_pool_check": False})
+        with patch(f"{MODULE}.psycopg.connect"), patch(f"{MODULE}.ConnectionPool") as pool_cls:
+            postgres_pool.get_pool(settings)
+
+        assert pool_cls.call_args.kwargs["check"] is None
+
+    def test_close_pools(self):
+        with patch(f"{MODULE}.psycopg.connect"), patch(f"{MODULE}.ConnectionPool") as pool_cls:
+            postgres_pool.get_pool(_settings())
+            postgres_pool.close_pools()
+
+        pool_cls.return_value.close.assert_called_once()
+        assert postgres_pool._pools == {}
+
+
+class TestGetAsyncPool:
+    @pytest.fixture
+    def async_connect(self):
+        conn = MagicMock()
+        conn.execute = AsyncMock()
+        conn.__aenter__.return_value = conn
+        with patch(f"{MODULE}.psycopg.AsyncConnection.connect", new=AsyncMock(return_value=conn)):
+            yield conn
+
+    @pytest.mark.asyncio
+    async def test_one_pool_per_loop(self, async_connect):
+        with patch(f"{MODULE}.AsyncConnectionPool") as pool_cls:
+            pool_cls.return_value.open = AsyncMock()
+            first = await postgres_pool.get_async_pool(_settings())
+            second = await postgres_pool.get_async_pool(_settings())
+
+        assert first is second
+        pool_cls.assert_called_once()
+        first.open.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_aclose_pools(self, async_connect):
+        with patch(f"{MODULE}.AsyncConnectionPool") as pool_cls:
+            pool_cls.return_value.open = AsyncMock()
+            pool_cls.return_value.close = AsyncMock()
+            await postgres_pool.get_async_pool(_settings())
+            await postgres_pool.aclose_pools()
+
+        pool_cls.return_value.close.assert_awaited_once()
+        assert postgres_pool._async_pools == {}
+
+    @pytest.mark.asyncio
+    async def test_pools_of_closed_loops_are_evicted_and_closed(self, async_connect):
+        dead_loop = asyncio.new_event_loop()
+        dead_loop.close()
+        idle = MagicMock(name="idle-conn")
+        dead_pool = MagicMock(name="dead-pool", _pool=[idle])
+        settings = _settings()
+        postgres_pool._async_pools[(settings.database_url, dead_loop)] = dead_pool
+
+        with patch(f"{MODULE}.AsyncConnectionPool") as pool_cls:
+            pool_cls.return_value.open = AsyncMock()
+            pool = await postgres_pool.get_async_pool(settings)
+
+        assert list(postgres_pool._async_pools.values()) == [pool]
+        idle.pgconn.finish.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_pools_of_open_loops_are_kept(self, async_connect):
+        other_loop = asyncio.new_event_loop()
+        other_pool = MagicMock(name="other-pool")
+        settings = _settings()
+        postgres_pool._async_pools[(settings.database_url, other_loop)] = other_pool
+        try:
+            with patch(f"{MODULE}.AsyncConnectionPool") as pool_cls:
+                pool_cls.return_value.open = AsyncMock()
+                await postgres_pool.get_async_pool(settings)
+        finally:
+            other_loop.close()
+
+        assert other_pool in postgres_pool._async_pools.values()
+        assert len(postgres_pool._async_pools) == 2
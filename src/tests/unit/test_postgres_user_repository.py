@@ -0,0 +1,114 @@
+"""
+Unit tests for PostgresUserRepository.
+
+The shared pools are replaced with MagicMocks; we check that queries run on
+pooled connections (never a fresh psycopg.connect) and rows map to User.
+"""
+import asyncio
+from contextlib import asynccontextmanager, contextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.domain.entities.user import User
+from src.infrastructure.adapters.postgres_user_repository import PostgresUserRepository
+
+
+@pytest.fixture
+def conn():
+    return MagicMock(name="conn")
+
+
+@pytest.fixture
+def aconn():
+    conn = MagicMock(name="aconn")
+    cursor = MagicMock(name="acursor")
+    cursor.fetchone = AsyncMock(return_value=None)
+    conn.execute = AsyncMock(return_value=cursor)
+    conn._cursor = cursor
+    return conn
+
+
+@pytest.fixture
+def repository(conn, aconn):
+    @contextmanager
+    def connection():
+        yield conn
+
+    @asynccontextmanager
+    async def aconnection():
+        yield aconn
+
+    pool = MagicMock(name="pool")
+    pool.connection.side_effect = connection
+    apool = MagicMock(name="apool")
+    apool.connection.side_effect = aconnection
+
+    with patch(
+        "src.infrastructure.adapters.postgres_user_repository.get_pool", return_value=pool
+    ), patch(
+        "src.infrastructure.adapters.postgres_user_repository.get_async_pool",
+        new=AsyncMock(return_value=apool),
+    ), patch("psycopg.connect") as connect:
+        yield PostgresUserRepository()
+        connect.assert_not_called()
+
+
+class TestSync:
+    def test_get_by_identifier_maps_row(self, repository, conn):
+        conn.execute.return_value.fetchone.return_value = ("u1", "alice", "hash")
+
+        assert repository.get_by_identifier("alice") == User(id="u1", identifier="alice", password_hash="hash")
+        sql, params = conn.execute.call_args.args
+        assert 'FROM "User"' in sql
+        assert params == ("alice",)
+        assert conn.execute.call_args.kwargs["prepare"] is True
+
+    @pytest.mark.parametrize("row", [None, ("u1", "alice", None)])
+    def test_missing_or_unclaimed_user_is_none(self, repository, conn, row):
+        conn.execute.return_value.fetchone.return_value = row
+        assert repository.get_by_identifier("alice") is None
+
+    def test_create_upserts(self, repository, conn):
+        repository.create(User(id="u1", identifier="alice", password_hash="hash"))
+
+        sql, params = conn.execute.call_args.args
+        assert "ON CONFLICT" in sql
+        assert params == ("u1", "alice", "hash")
+
+
+class TestAsync:
+    @pytest.mark.asyncio
+    async def test_aget_by_identifier_on_async_pool(self, repository, aconn):
+        aconn._cursor.fetchone.return_value = ("u1", "alice", "hash")
+
+        user = await repository.aget_by_identifier("alice")
+
+        assert user.identifier == "alice"
+        assert aconn.execute.call_args.args[1] == ("alice",)
+
+    @pytest.mark.asyncio
+    async def test_acreate_on_async_pool(self, repository, aconn):
+        await repository.acreate(User(id="u1", identifier="alice", password_hash="hash"))
+        assert aconn.execute.call_args.args[1] == ("u1", "alice", "hash")
+
+    def test_each_event_loop_gets_its_own_pool(self, aconn):
+        """The async pool is looked up per call, so a second loop never reuses
+        a pool bound to the first (closed) one."""
+        @asynccontextmanager
+        async def aconnection():
+            yield aconn
+
+        pools = [MagicMock(name="apool-1"), MagicMock(name="apool-2")]
+        for pool in pools:
+            pool.connection.side_effect = aconnection
+        repository = PostgresUserRepository()
+
+        with patch(
+            "src.infrastructure.adapters.postgres_user_repository.get_async_pool",
+            new=AsyncMock(side_effect=pools),
+        ):
+            asyncio.run(repository.aget_by_identifier("alice"))
+            asyncio.run(repository.aget_by_identifier("alice"))
+
+        assert all(pool.connection.called for pool in pools)
@@ -9,6 +9,11 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 from src.domain.exceptions import ProviderNotConfiguredError
+from src.infrastructure.adapters.argon2_password_hasher import Argon2PasswordHasher
+from src.infrastructure.adapters.bounded_password_hasher import BoundedPasswordHasher
+from src.infrastructure.adapters.cached_embeddings import CachedEmbeddings
+from src.infrastructure.adapters.postgres_embedding_cache import PostgresEmbeddingCache
+from src.infrastructure.adapters.semantic_answer_cache import InMemorySemanticAnswerCache
 from src.infrastructure.factories.provider_factory import ProviderFactory
 
 
@@ -26,6 +31,8 @@ def _settings(**overrides):
         "llm_provider": "openai",
         "openai_api_key": "sk-test",
         "google_api_key": "g-test",
+        "embedding_cache_enabled": False,
+        "document_embedding_cache_enabled": False,
     }
     defaults.update(overrides)
     return MagicMock(**defaults)
@@ -57,6 +64,39 @@ class TestGetEmbeddings:
             out = ProviderFactory.get_embeddings()
             assert out == "google-emb"
 
+    def test_cache_enabled_wraps_adapter(self):
+        with patch(
+            "src.infrastructure.factories.provider_factory.get_settings",
+            return_value=_settings(
+                embedding_cache_enabled=True,
+                embedding_cache_max_entries=8,
+                embedding_cache_max_mb=1,
+                embedding_cache_ttl_seconds=60,
+            ),
+        ), patch(
+            "src.infrastructure.factories.provider_factory.OpenAIEmbeddingsAdapter"
+        ) as adapter_cls:
+            out = ProviderFactory.get_embeddings()
+            assert isinstance(out, CachedEmbeddings)
+            assert out.inner is adapter_cls.return_value
+
+    def test_document_cache_keyed_by_provider_and_model(self):
+        with patch(
+            "src.infrastructure.factories.provider_factory.get_settings",
+            return_value=_settings(
+                document_embedding_cache_enabled=True,
+                openai_embedding_model="text-embedding-3-small",
+                database_url="postgresql://x",
+                embedding_batch_size=64,
+            ),
+        ), patch(
+            "src.infrastructure.factories.provider_factory.OpenAIEmbeddingsAdapter"
+        ) as adapter_cls:
+            out = ProviderFactory.get_embeddings()
+            assert isinstance(out, PostgresEmbeddingCache)
+            assert out.inner is adapter_cls.return_value
+            assert out._model == "openai:text-embedding-3-small"
+
     def test_openai_missing_key_raises(self):
         with patch(
             "src.infrastructure.factories.provider_factory.get_settings",
@@ -173,6 +213,24 @@ class TestGetRepository:
             assert out == "repo"
             repo_cls.assert_called_once_with("emb")
 
+    def test_psycopg_backend_returns_native_repository(self):
+        with patch(
+            "src.infrastructure.factories.provider_factory.get_settings",
+            return_value=_settings(llm_provider="openai", vector_store_backend="psycopg"),
+        ), patch(
+            "src.infrastructure.factories.provider_factory.OpenAIEmbeddingsAdapter"
+        ) as emb_cls, patch(
+            "src.infrastructure.factories.provider_factory.PsycopgVectorRepository"
+        ) as repo_cls, patch(
+            "src.infrastructure.factories.provider_factory.PGVectorRepository"
+        ) as pgvector_cls:
+            emb_cls.return_value = "emb"
+            repo_cls.return_value = "native-repo"
+
+            assert ProviderFactory.get_repository() == "native-repo"
+            repo_cls.assert_called_once_with("emb")
+            pgvector_cls.assert_not_called()
+
     def test_singleton(self):
         with patch(
             "src.infrastructure.factories.provider_factory.get_settings",
@@ -208,6 +266,44 @@ class TestGetDocumentLoader:
             loader_cls.assert_called_once()
 
 
+class TestGetDocumentRegistry:
+    """Tests for get_document_registry()."""
+
+    def test_registry_for_collection(self):
+        with patch(
+            "src.infrastructure.factories.provider_factory.get_settings",
+            return_value=_settings(document_registry_enabled=True, pg_vector_collection_name="docs"),
+        ), patch(
+            "src.infrastructure.factories.provider_factory.PostgresDocumentRegistry"
+        ) as registry_cls:
+            registry_cls.return_value = MagicMock()
+            assert ProviderFactory.get_document_registry() is ProviderFactory.get_document_registry()
+            registry_cls.assert_called_once_with("docs")
+
+    def test_disabled_returns_none(self):
+        with patch(
+            "src.infrastructure.factories.provider_factory.get_settings",
+            return_value=_settings(document_registry_enabled=False),
+        ):
+            assert ProviderFactory.get_document_registry() is None
+
+
+class TestGetIngestJobQueue:
+    """Tests for get_ingest_job_queue()."""
+
+    def test_built_from_settings_once(self):
+        with patch(
+            "src.infrastructure.factories.provider_factory.get_settings",
+            return_value=_settings(ingest_job_max_attempts=5, ingest_job_stale_seconds=60,
+                                   ingest_job_retry_delay_seconds=2.0),
+        ), patch(
+            "src.infrastructure.factories.provider_factory.PostgresIngestJobQueue"
+        ) as queue_cls:
+            queue_cls.return_value = MagicMock()
+            assert ProviderFactory.get_ingest_job_queue() is ProviderFactory.get_ingest_job_queue()
+            queue_cls.assert_called_once_with(max_attempts=5, stale_seconds=60, retry_delay_seconds=2.0)
+
+
 class TestReset:
     """Tests for reset() — clears all caches."""
 
@@ -245,3 +341,58 @@ class TestReset:
             # repo_cls also called twice (relies on embeddings being recreated).
             assert repo_cls.call_count == 2
             assert loader_cls.call_count == 2
+
+
+class TestGetAnswerCache:
+    """Tests for get_answer_cache()."""
+
+    def test_disabled_returns_none(self):
+        with patch(
+            "src.infrastructure.factories.provider_factory.get_settings",
+            return_value=_settings(answer_cache_enabled=False),
+        ):
+            assert ProviderFactory.get_answer_cache() is None
+
+    def test_enabled_builds_singleton_on_embeddings(self):
+        with patch(
+            "src.infrastructure.factories.provider_factory.get_settings",
+            return_value=_settings(
+                answer_cache_enabled=True,
+                answer_cache_threshold=0.9,
+                answer_cache_max_entries=10,
+                answer_cache_ttl_seconds=60,
+            ),
+        ), patch(
+            "src.infrastructure.factories.provider_factory.OpenAIEmbeddingsAdapter"
+        ) as adapter_cls:
+            first = ProviderFactory.get_answer_cache()
+            second = ProviderFactory.get_answer_cache()
+
+        assert isinstance(first, InMemorySemanticAnswerCache)
+        assert first is second
+        assert first._embeddings is adapter_cls.return_value
+        assert first.stats().threshold == 0.9
+
+
+class TestGetPasswordHasher:
+    """Tests for get_password_hasher()."""
+
+    def test_wraps_argon2_in_bounded_pool(self):
+        with patch(
+            "src.infrastructure.factories.provider_factory.get_settings",
+            return_value=_settings(password_hash_workers=3, password_hash_max_queue=7),
+        ):
+            hasher = ProviderFactory.get_password_hasher()
+
+        assert isinstance(hasher, BoundedPasswordHasher)
+        assert isinstance(hasher._inner, Argon2PasswordHasher)
+        stats = hasher.stats()
+        assert (stats.workers, stats.max_queue) == (3, 7)
+        assert ProviderFactory.get_password_hasher() is hasher
+
+    def test_zero_workers_uses_argon2_directly(self):
+        with patch(
+            "src.infrastructure.factories.provider_factory.get_settings",
+            return_value=_settings(password_hash_workers=0),
+        ):
+            assert isinstance(ProviderFactory.get_password_hasher(), Argon2PasswordHasher)
@@ -0,0 +1,567 @@
+"""
+Unit tests for PsycopgVectorRepository.
+
+The connection pool is replaced with MagicMocks; we validate the COPY
+bulk-load, the prepared MMR candidate query and the delete statement.
+"""
+from contextlib import asynccontextmanager, contextmanager
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+import numpy as np
+import pytest
+from langchain_core.documents import Document as LangchainDocument
+
+from src.domain.entities.document import DocumentChunk
+from src.domain.ports.embeddings import EmbeddingsPort
+from src.infrastructure.adapters.psycopg_vector_repository import PsycopgVectorRepository
+
+
+def _searches(cursor):
+    """Cursor executes other than the per-search scan-depth SET."""
+    return [c for c in cursor.execute.call_args_list if "set_config" not in c.args[0]]
+
+
+@pytest.fixture
+def fake_embeddings():
+    mock = Mock(spec=EmbeddingsPort)
+    mock.embed_documents.side_effect = lambda texts: [[float(i), 1.0] for i, _ in enumerate(texts)]
+    mock.embed_query.return_value = [1.0, 0.0]
+    return mock
+
+
+@pytest.fixture
+def conn():
+    """Fake psycopg connection with a cursor that supports COPY."""
+    conn = MagicMock(name="conn")
+    conn.execute.return_value.fetchone.return_value = ("collection-uuid",)
+    cursor = MagicMock(name="cursor")
+    copy = MagicMock(name="copy")
+    cursor.copy.return_value.__enter__.return_value = copy
+    conn.cursor.return_value.__enter__.return_value = cursor
+    conn._cursor = cursor
+    conn._copy = copy
+    return conn
+
+
+@pytest.fixture
+def repository(fake_embeddings, conn):
+    with patch(
+        "src.infrastructure.adapters.psycopg_vector_repository.PGVectorIndexManager"
+    ):
+        repo = PsycopgVectorRepository(fake_embeddings)
+
+    @contextmanager
+    def connection():
+        yield conn
+
+    pool = MagicMock(name="pool")
+    pool.connection.side_effect = connection
+    repo._pool = pool
+    return repo
+
+
+@pytest.fixture
+def aconn():
+    """Fake psycopg.AsyncConnection: awaited execute/fetch, async COPY."""
+    conn = MagicMock(name="aconn")
+    result = MagicMock(name="result")
+    result.fetchone = AsyncMock(return_value=("collection-uuid",))
+    conn.execute = AsyncMock(return_value=result)
+    cursor = MagicMock(name="acursor")
+    cursor.execute = AsyncMock()
+    cursor.fetchall = AsyncMock(return_value=[])
+    copy = MagicMock(name="acopy")
+    copy.write_row = AsyncMock()
+    cursor.copy.return_value.__aenter__.return_value = copy
+    conn.cursor.return_value.__aenter__.return_value = cursor
+    conn._result = result
+    conn._cursor = cursor
+    conn._copy = copy
+    return conn
+
+
+@pytest.fixture
+def async_repository(repository, aconn, fake_embeddings, monkeypatch):
+    @asynccontextmanager
+    async def connection():
+        yield aconn
+
+    async def aembed_query(text):
+        return [1.0, 0.0]
+
+    async def aembed_documents(texts):
+        return [[float(i), 1.0] for i, _ in enumerate(texts)]
+
+    fake_embeddings.aembed_query.side_effect = aembed_query
+    fake_embeddings.aembed_documents.side_effect = aembed_documents
+    apool = MagicMock(name="apool")
+    apool.connection.side_effect = connection
+    monkeypatch.setattr(
+        "src.infrastructure.adapters.psycopg_vector_repository.get_async_pool", AsyncMock(return_value=apool)
+    )
+    repository._schema_ready = True
+    return repository
+
+
+class TestAddDocuments:
+    """Tests for add_documents() — binary COPY bulk load."""
+
+    def test_copies_one_row_per_chunk(self, repository, conn, fake_embeddings):
+        chunks = [
+            DocumentChunk(content="A", metadata={"source_file": "f.pdf", "page": 1}),
+            DocumentChunk(content="B", metadata={"source_file": "f.pdf", "page": 2}),
+        ]
+        n = repository.add_documents(chunks)
+
+        assert n == 2
+        fake_embeddings.embed_documents.assert_called_once_with(["A", "B"])
+        copy_sql = conn._cursor.copy.call_args.args[0]
+        assert copy_sql.startswith("COPY langchain_pg_embedding")
+        assert "FORMAT BINARY" in copy_sql
+        conn._copy.set_types.assert_called_once_with(["varchar", "uuid", "vector", "varchar", "jsonb"])
+        rows = [c.args[0] for c in conn._copy.write_row.call_args_list]
+        assert len(rows) == 2
+        _, collection_id, vector, document, metadata = rows[0]
+        assert collection_id == "collection-uuid"
+        assert vector.dtype == np.float32
+        assert document == "A"
+        assert metadata.obj == {"source_file": "f.pdf", "page": 1}
+
+    def test_append_resolves_collection_through_alias(self, repository, conn):
+        repository.add_documents([DocumentChunk(content="A")])
+        sql, params = conn.execute.call_args_list[0].args
+        assert "INSERT INTO langchain_pg_collection" in sql
+        assert "collection_alias" in sql
+        assert params[1] == "document_chunks"
+
+    def test_empty_append_is_noop(self, repository, conn, fake_embeddings):
+        assert repository.add_documents([]) == 0
+        fake_embeddings.embed_documents.assert_not_called()
+        repository._pool.connection.assert_not_called()
+
+    def test_ensures_index_after_insert(self, repository):
+        repository.add_documents([DocumentChunk(content="A")])
+        repository._index_manager.ensure_index.assert_called_once()
+
+
+class TestSearch:
+    """Tests for search() — prepared candidate query + MMR."""
+
+    def test_fetches_3k_candidates_with_prepared_statement(self, repository, conn):
+        conn._cursor.fetchall.return_value = []
+        repository.search("q", k=4)
+
+        sql, params = conn._cursor.execute.call_args.args
+        assert "ORDER BY distance" in sql
+        assert params["collection"] == "document_chunks"
+        assert params["fetch_k"] == 12
+        assert conn._cursor.execute.call_args.kwargs["prepare"] is True
+        conn.cursor.assert_called_with(binary=True)
+
+    @pytest.mark.parametrize("fetch_k, expected", [(12, ("40", "10")), (1000, ("1000", "100"))])
+    def test_scan_depth_follows_fetch_k(self, repository, conn, fetch_k, expected):
+        repository._settings = repository._settings.model_copy(
+            update={"mmr_fetch_k": fetch_k, "hnsw_ef_search": 40, "ivfflat_probes": 10, "ivfflat_lists": 100}
+        )
+        conn._cursor.fetchall.return_value = []
+        repository.search("q", k=4)
+
+        (depth_sql, depth), (search_sql, _) = [c.args for c in conn._cursor.execute.call_args_list]
+        assert "set_config('hnsw.ef_search', %s, true)" in depth_sql
+        assert depth == expected
+        assert "WITH candidates AS MATERIALIZED" in search_sql
+
+    def test_returns_mmr_selection_as_chunks(self, repository, conn):
+        conn._cursor.fetchall.return_value = [
+            ("A", {"source_file": "a.pdf"}, np.array([1.0, 0.0], dtype=np.float32), "id-a"),
+            ("A dup", {"source_file": "a.pdf"}, np.array([0.999, -0.01], dtype=np.float32), "id-dup"),
+            ("B", {"source_file": "b.pdf"}, np.array([0.0, 1.0], dtype=np.float32), "id-b"),
+        ]
+        repository._embeddings.embed_query.return_value = [0.8, 0.6]
+        out = repository.search("q", k=2)
+
+        assert [c.content for c in out] == ["A", "B"]
+        assert all(isinstance(c, DocumentChunk) for c in out)
+        assert out[1].metadata == {"source_file": "b.pdf"}
+
+    def test_empty_collection_returns_empty(self, repository, conn):
+        conn._cursor.fetchall.return_value = []
+        assert repository.search("q") == []
+
+    def test_search_with_scores_reports_cosine_similarity_and_ids(self, repository, conn):
+        conn._cursor.fetchall.return_value = [
+            ("A", {}, np.array([1.0, 0.0], dtype=np.float32), "id-a"),
+            ("B", {}, np.array([0.0, 2.0], dtype=np.float32), "id-b"),
+        ]
+        repository._embeddings.embed_query.return_value = [0.8, 0.6]
+        out = repository.search_with_scores("q", k=2)
+
+        assert [(c.content, c.id, round(c.score, 3)) for c in out] == [("A", "id-a", 0.8), ("B", "id-b", 0.6)]
+        assert all(c.embedding is None for c in out)
+        assert "SELECT document, cmetadata, embedding, id" in conn._cursor.execute.call_args.args[0]
+
+    def test_search_with_scores_include_vectors_needs_no_extra_query(self, repository, conn):
+        conn._cursor.fetchall.return_value = [("A", {}, np.array([1.0, 0.0], dtype=np.float32), "id-a")]
+        repository._embeddings.embed_query.return_value = [1.0, 0.0]
+        [chunk] = repository.search_with_scores("q", k=1, include_vectors=True)
+
+        assert list(chunk.embedding) == [1.0, 0.0]
+        assert len(_searches(conn._cursor)) == 1
+
+    @pytest.mark.asyncio
+    async def test_asearch_with_scores(self, async_repository, aconn):
+        aconn._cursor.fetchall.return_value = [("A", {}, np.array([1.0, 0.0], dtype=np.float32), "id-a")]
+        async_repository._embeddings.aembed_query = AsyncMock(return_value=[1.0, 0.0])
+        [chunk] = await async_repository.asearch_with_scores("q", k=1)
+
+        assert chunk.content == "A" and chunk.id == "id-a" and chunk.score == pytest.approx(1.0)
+
+
+class TestSearchMany:
+    """Tests for search_many() — one embedding call, one LATERAL candidate query."""
+
+    @pytest.fixture(autouse=True)
+    def batch_embeddings(self, fake_embeddings):
+        fake_embeddings.embed_queries.side_effect = lambda texts: [[1.0, 0.0], [0.0, 1.0]][:len(texts)]
+
+    def test_single_round_trip_for_all_queries(self, repository, conn, fake_embeddings):
+        conn._cursor.fetchall.return_value = []
+        assert repository.search_many(["q1", "q2"], k=4) == [[], []]
+
+        fake_embeddings.embed_queries.assert_called_once_with(["q1", "q2"])
+        fake_embeddings.embed_query.assert_not_called()
+        [search] = _searches(conn._cursor)
+        sql, params = search.args
+        assert "CROSS JOIN LATERAL" in sql
+        assert params["collection"] == "document_chunks"
+        assert params["fetch_k"] == 12
+        assert [v.dtype for v in params["embeddings"]] == [np.float32, np.float32]
+
+    def test_groups_rows_by_query_in_input_order(self, repository, conn):
+        conn._cursor.fetchall.return_value = [
+            (1, "A", {"source_file": "a.pdf"}, np.array([1.0, 0.0], dtype=np.float32), "id-a"),
+            (2, "B", {"source_file": "b.pdf"}, np.array([0.0, 1.0], dtype=np.float32), "id-b"),
+            (2, "C", None, np.array([0.1, 0.9], dtype=np.float32), "id-c"),
+        ]
+        out = repository.search_many(["q1", "q2"], k=2)
+
+        assert [[c.content for c in chunks] for chunks in out] == [["A"], ["B", "C"]]
+        assert out[1][1].metadata == {}
+        assert [[c.id for c in chunks] for chunks in out] == [["id-a"], ["id-b", "id-c"]]
+
+    def test_caller_embeddings_skip_the_embedding_call(self, repository, conn, fake_embeddings):
+        conn._cursor.fetchall.return_value = []
+        repository.search_many(["q1", "q2"], k=4, query_embeddings=[[0.0, 1.0], [1.0, 0.0]])
+
+        fake_embeddings.embed_queries.assert_not_called()
+        [search] = _searches(conn._cursor)
+        assert [list(v) for v in search.args[1]["embeddings"]] == [[0.0, 1.0], [1.0, 0.0]]
+
+    def test_empty_batch_is_noop(self, repository, fake_embeddings):
+        assert repository.search_many([]) == []
+        fake_embeddings.embed_queries.assert_not_called()
+        repository._pool.connection.assert_not_called()
+
+    def test_hybrid_runs_fused_query_per_question_on_one_connection(self, repository, conn):
+        repository._settings = repository._settings.model_copy(update={"retrieval_mode": "hybrid"})
+        conn._cursor.fetchall.return_value = []
+        repository.search_many(["q1", "q2"], k=4)
+
+        queries = [c.args[1]["query"] for c in _searches(conn._cursor)]
+        assert queries == ["q1", "q2"]
+        repository._pool.connection.assert_called_once()
+
+
+class TestHybridSearch:
+    """Tests for search() with RETRIEVAL_MODE=hybrid — one fused RRF query."""
+
+    @pytest.fixture(autouse=True)
+    def hybrid(self, repository):
+        repository._settings = repository._settings.model_copy(update={"retrieval_mode": "hybrid"})
+
+    def test_runs_single_fused_query(self, repository, conn):
+        conn._cursor.fetchall.return_value = []
+        repository.search("código ABC-123", k=4)
+
+        [search] = _searches(conn._cursor)
+        sql, params = search.args
+        assert "document_tsv @@" in sql
+        assert "FULL OUTER JOIN" in sql
+        assert params["query"] == "código ABC-123"
+        assert params["collection"] == "document_chunks"
+        assert params["k"] == 4
+        assert params["candidates"] == 12
+        assert params["rrf_k"] == 60
+        assert params["embedding"].dtype == np.float32
+        assert conn._cursor.execute.call_args.kwargs["prepare"] is True
+
+    def test_candidates_and_rrf_k_from_settings(self, repository, conn):
+        repository._settings = repository._settings.model_copy(
+            update={"hybrid_candidates": 50, "hybrid_rrf_k": 10}
+        )
+        conn._cursor.fetchall.return_value = []
+        repository.search("q", k=4)
+
+        params = conn._cursor.execute.call_args.args[1]
+        assert params["candidates"] == 50
+        assert params["rrf_k"] == 10
+
+    def test_returns_fused_rows_in_order(self, repository, conn):
+        conn._cursor.fetchall.return_value = [
+            ("exact", {"source_file": "a.pdf"}, 0.032, 0.41, "id-exact", None),
+            ("semantic", None, 0.016, 0.87, "id-semantic", None),
+        ]
+        out = repository.search("q", k=2)
+
+        assert [c.content for c in out] == ["exact", "semantic"]
+        assert out[1].metadata == {}
+
+    def test_scores_are_vector_similarity_not_rrf(self, repository, conn):
+        conn._cursor.fetchall.return_value = [("exact", {}, 0.032, 0.41, "id-exact", None)]
+        [chunk] = repository.search_with_scores("q", k=1)
+
+        assert chunk.content == "exact" and chunk.score == pytest.approx(0.41)
+        assert chunk.id == "id-exact" and chunk.embedding is None
+        assert "1 - (e.embedding <=> %(embedding)s)" in conn._cursor.execute.call_args.args[0]
+        assert conn._cursor.execute.call_args.args[1]["include_vectors"] is False
+
+    def test_include_vectors_is_a_parameter_of_the_fused_query(self, repository, conn):
+        vector = np.array([1.0, 0.0], dtype=np.float32)
+        conn._cursor.fetchall.return_value = [("exact", {}, 0.032, 0.41, "id-exact", vector)]
+        [chunk] = repository.search_with_scores("q", k=1, include_vectors=True)
+
+        assert chunk.embedding is vector
+        [search] = _searches(conn._cursor)
+        assert search.args[1]["include_vectors"] is True
+
+    def test_adaptive_k_trims_fused_rows_below_the_gap(self, repository, conn):
+        repository._settings = repository._settings.model_copy(
+            update={"adaptive_k": True, "adaptive_k_min": 1, "adaptive_k_min_gap": 0.1}
+        )
+        conn._cursor.fetchall.return_value = [
+            ("exact", {}, 0.032, 0.81, "id-exact", None),
+            ("semantic", {}, 0.016, 0.87, "id-semantic", None),
+            ("noise", {}, 0.015, 0.35, "id-noise", None),
+        ]
+        out = repository.search("q", k=3)
+
+        assert [c.content for c in out] == ["exact", "semantic"]
+        assert conn._cursor.execute.call_args.args[1]["k"] == 3
+
+    def test_checks_text_search_once_and_never_builds_it(self, repository):
+        repository.add_documents([DocumentChunk(content="A")])
+        repository.add_documents([DocumentChunk(content="B")])
+        repository._index_manager.text_search_ready.assert_called_once()
+        repository._index_manager.ensure_text_search.assert_not_called()
+
+    def test_missing_text_search_index_is_reported(self, repository, caplog):
+        repository._index_manager.text_search_ready.return_value = False
+        repository.add_documents([DocumentChunk(content="A")])
+        assert "vector_index.py text-search" in caplog.text
+
+    def test_text_search_check_does_not_depend_on_index_auto_create(self, repository):
+        repository._settings = repository._settings.model_copy(update={"vector_index_auto_create": False})
+        repository.add_documents([DocumentChunk(content="A")])
+
+        repository._index_manager.ensure_index.assert_not_called()
+        repository._index_manager.text_search_ready.assert_called_once()
+
+    def test_ann_index_failure_still_checks_text_search(self, repository):
+        repository._index_manager.ensure_index.side_effect = RuntimeError("no perms")
+        repository.add_documents([DocumentChunk(content="A")])
+        repository._index_manager.text_search_ready.assert_called_once()
+
+
+def _route_alias(conn, alias_row):
+    """Answer the alias lock with alias_row and every other query like the fixture."""
+    def execute(sql, params=None, **kwargs):
+        result = MagicMock(name="result")
+        result.fetchone.return_value = alias_row if "FOR UPDATE" in sql else ("collection-uuid",)
+        return result
+    conn.execute.side_effect = execute
+
+
+class TestRebuild:
+    """Tests for blue/green rebuilds: shadow collection + alias swap."""
+
+    def test_clear_existing_loads_shadow_then_swaps(self, repository, conn):
+        _route_alias(conn, ("document_chunks__old", None))
+
+        repository.add_documents([DocumentChunk(content="A")], clear_existing=True)
+
+        calls = [c.args for c in conn.execute.call_args_list]
+        statements = [sql for sql, *_ in calls]
+        shadow = calls[0][1][1]
+        assert shadow.startswith("document_chunks__")
+        assert not any("DELETE FROM langchain_pg_collection" in sql for sql in statements)
+        swap = next(i for i, sql in enumerate(statements) if "INSERT INTO collection_alias" in sql)
+        assert calls[swap][1] == ("document_chunks", shadow, "document_chunks__old")
+        assert conn._copy.write_row.call_count == 1
+        # The shadow load is invisible to searches: only the swap bumps the version.
+        bumps = [i for i, sql in enumerate(statements) if "corpus_version.version + 1" in sql]
+        assert len(bumps) == 1 and bumps[0] > swap
+
+    def test_first_swap_keeps_legacy_collection_as_previous(self, repository, conn):
+        _route_alias(conn, None)
+        repository.publish_rebuild("document_chunks__new")
+        params = next(c.args[1] for c in conn.execute.call_args_list if "INSERT INTO collection_alias" in c.args[0])
+        assert params == ("document_chunks", "document_chunks__new", "document_chunks")
+
+    def test_publish_drops_collection_two_rebuilds_back(self, repository, conn):
+        _route_alias(conn, ("document_chunks__b", "document_chunks__a"))
+        repository.publish_rebuild("document_chunks__c")
+
+        sql, params = conn.execute.call_args.args
+        assert "DELETE FROM langchain_pg_collection" in sql
+        assert "NOT IN (SELECT collection FROM collection_alias)" in sql
+        assert params == ("document_chunks__a",)
+
+    def test_failed_load_discards_shadow(self, repository, conn, fake_embeddings):
+        fake_embeddings.embed_documents.side_effect = RuntimeError("quota")
+        with pytest.raises(RuntimeError):
+            repository.add_documents([DocumentChunk(content="A")], clear_existing=True)
+
+        statements = [c.args[0] for c in conn.execute.call_args_list]
+        assert not any("collection_alias (alias" in sql for sql in statements)
+        assert "DELETE FROM langchain_pg_collection" in statements[-1]
+
+    def test_rollback_swaps_back_and_bumps(self, repository, conn):
+        conn.execute.return_value.fetchone.return_value = ("document_chunks__a",)
+        assert repository.rollback_rebuild() == "document_chunks__a"
+        statements = [c.args[0] for c in conn.execute.call_args_list]
+        assert "previous = collection" in statements[0]
+        assert any("corpus_version.version + 1" in sql for sql in statements[1:])
+
+    def test_rollback_without_previous(self, repository, conn):
+        conn.execute.return_value.fetchone.return_value = None
+        assert repository.rollback_rebuild() is None
+        assert conn.execute.call_count == 1
+
+
+class TestDeleteBySource:
+    """Tests for delete_by_source()."""
+
+    def test_returns_rowcount_and_filters_by_source(self, repository, conn):
+        conn.execute.return_value.rowcount = 3
+        assert repository.delete_by_source("doc.pdf") == 3
+        sql, params = conn.execute.call_args_list[0].args
+        assert "cmetadata->>'source_file' = %s" in sql
+        assert "LIMIT %s" in sql
+        assert params == ("document_chunks", "doc.pdf", repository._delete_batch_size)
+
+    def test_deletes_in_bounded_batches_until_short_batch(self, repository, conn):
+        repository._delete_batch_size = 2
+        deleted = iter([2, 2, 1])
+        conn.execute.side_effect = lambda sql, *args, **kwargs: MagicMock(
+            rowcount=next(deleted) if "DELETE" in sql else 1
+        )
+        assert repository.delete_by_source("doc.pdf") == 5
+        statements = [c.args[0] for c in conn.execute.call_args_list]
+        assert sum("DELETE" in sql for sql in statements) == 3
+        # One transaction per batch, and every batch bumps the version in it,
+        # so a deletion is never committed without invalidating cached answers.
+        assert conn.transaction.call_count == 3
+        kinds = ["delete" if "DELETE" in sql else "bump" for sql in statements if "CREATE TABLE" not in sql]
+        assert kinds == ["delete", "bump"] * 3
+
+    def test_delete_bumps_corpus_version(self, repository, conn):
+        conn.execute.return_value.rowcount = 3
+        repository.delete_by_source("doc.pdf")
+        assert any("corpus_version.version + 1" in c.args[0] for c in conn.execute.call_args_list)
+
+    def test_noop_delete_keeps_corpus_version(self, repository, conn):
+        conn.execute.return_value.rowcount = 0
+        repository.delete_by_source("missing.pdf")
+        assert not any("corpus_version" in c.args[0] for c in conn.execute.call_args_list)
+
+
+class TestDeleteChunks:
+    """Tests for delete_chunks() — incremental re-ingestion."""
+
+    def test_filters_by_source_and_chunk_hash(self, repository, conn):
+        conn.execute.return_value.rowcount = 2
+        assert repository.delete_chunks("doc.pdf", ["h1", "h2"]) == 2
+        sql, params = conn.execute.call_args_list[0].args
+        assert "cmetadata->>'chunk_hash' = ANY(%s)" in sql
+        assert params == ("document_chunks", "doc.pdf", ["h1", "h2"])
+        assert any("corpus_version.version + 1" in c.args[0] for c in conn.execute.call_args_list)
+
+    def test_empty_list_is_noop(self, repository, conn):
+        assert repository.delete_chunks("doc.pdf", []) == 0
+        conn.execute.assert_not_called()
+
+
+class TestCorpusVersion:
+    """Tests for corpus_version() and its bump on writes."""
+
+    def test_reads_counter_for_collection(self, repository, conn):
+        conn.execute.return_value.fetchone.return_value = (7,)
+        assert repository.corpus_version() == 7
+        sql, params = conn.execute.call_args.args
+        assert "FROM corpus_version" in sql
+        assert params == ("document_chunks",)
+
+    def test_zero_before_first_write(self, repository, conn):
+        conn.execute.return_value.fetchone.return_value = None
+        assert repository.corpus_version() == 0
+
+    def test_add_documents_bumps_in_same_transaction(self, repository, conn):
+        repository.add_documents([DocumentChunk(content="A")])
+        statements = [c.args[0] for c in conn.execute.call_args_list]
+        assert "corpus_version.version + 1" in statements[-1]
+
+
+class TestGetRetriever:
+    """Tests for get_retriever() — LangChain retriever over search()."""
+
+    def test_retriever_delegates_to_search(self, repository):
+        repository.search = MagicMock(
+            return_value=[DocumentChunk(content="A", metadata={"source_file": "a.pdf"})]
+        )
+        docs = repository.get_retriever(k=3).invoke("q")
+
+        repository.search.assert_called_once_with("q", k=3)
+        assert docs == [LangchainDocument(page_content="A", metadata={"source_file": "a.pdf"})]
+
+
+class TestAsync:
+    """Tests for the async methods on the shared async pool."""
+
+    @pytest.mark.asyncio
+    async def test_asearch_runs_prepared_candidate_query(self, async_repository, aconn, fake_embeddings):
+        aconn._cursor.fetchall.return_value = [
+            ("A", {"source_file": "a.pdf"}, np.array([1.0, 0.0], dtype=np.float32), "id-a"),
+        ]
+        out = await async_repository.asearch("q", k=4)
+
+        assert [c.content for c in out] == ["A"]
+        sql, params = aconn._cursor.execute.call_args.args
+        assert "WITH candidates AS MATERIALIZED" in sql
+        assert params["fetch_k"] == 12
+        assert aconn._cursor.execute.call_args.kwargs["prepare"] is True
+        fake_embeddings.embed_query.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_aadd_documents_copies_and_bumps(self, async_repository, aconn, fake_embeddings):
+        with patch("asyncio.to_thread", new=AsyncMock()) as to_thread:
+            n = await async_repository.aadd_documents([DocumentChunk(content="A"), DocumentChunk(content="B")])
+
+        assert n == 2
+        assert aconn._copy.write_row.await_count == 2
+        statements = [c.args[0] for c in aconn.execute.call_args_list]
+        assert "corpus_version.version + 1" in statements[-1]
+        to_thread.assert_awaited_once_with(async_repository._ensure_indexes)
+        fake_embeddings.embed_documents.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_adelete_by_source_bumps_when_rows_deleted(self, async_repository, aconn):
+        aconn._result.rowcount = 2
+        assert await async_repository.adelete_by_source("doc.pdf") == 2
+        sql, params = aconn.execute.call_args_list[0].args
+        assert params == ("document_chunks", "doc.pdf", async_repository._delete_batch_size)
+        assert any("corpus_version.version + 1" in c.args[0] for c in aconn.execute.call_args_list)
+
+    @pytest.mark.asyncio
+    async def test_acorpus_version_reads_counter(self, async_repository, aconn):
+        aconn._result.fetchone.return_value = (5,)
+        assert await async_repository.acorpus_version() == 5
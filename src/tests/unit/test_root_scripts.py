@@ -1,6 +1,10 @@
 """
 Unit tests for the CLI entry points (src/ingest.py, src/chat.py).
 """
+import io
+import json
+import threading
+import time
 from unittest.mock import Mock, patch
 
 import pytest
@@ -18,9 +22,22 @@ def _reset_factory():
     ProviderFactory.reset()
 
 
+@pytest.fixture(autouse=True)
+def _no_chat_daemon(monkeypatch, tmp_path):
+    """Keep a locally running chat daemon out of the chat.py tests."""
+    monkeypatch.setenv("CHAT_DAEMON_SOCKET", str(tmp_path / "missing.sock"))
+
+
 class TestIngestScript:
     """Tests for src/ingest.py."""
 
+    @pytest.fixture(autouse=True)
+    def _registry(self, memory_registry):
+        # No embeddings port: the mock repository embeds on its own, as before.
+        with patch.object(ProviderFactory, "get_document_registry", return_value=memory_registry), \
+             patch.object(ProviderFactory, "get_embeddings", return_value=None):
+            yield memory_registry
+
     def test_ingest_default_uses_pdf_path_setting(self, mock_repository, mock_document_loader, tmp_path, monkeypatch):
         doc = tmp_path / "document.pdf"
         doc.write_text("content")
@@ -74,6 +91,104 @@ class TestIngestScript:
         _, kwargs = mock_repository.add_documents.call_args
         assert kwargs.get("clear_existing") is False
 
+    def test_main_several_files_use_pipeline(self, mock_repository, mock_document_loader, tmp_path, monkeypatch, capsys):
+        from src.config.settings import get_settings
+
+        for name in ("a.pdf", "b.pdf"):
+            (tmp_path / name).write_text("content")
+        monkeypatch.setattr(ingest_script, "PROJECT_ROOT", str(tmp_path))
+        # Mock loaders cannot be pickled into parse worker processes.
+        monkeypatch.setattr(get_settings(), "ingest_parse_workers", 0)
+        monkeypatch.setattr("sys.argv", ["ingest.py", "a.pdf", "b.pdf"])
+
+        with patch.object(ProviderFactory, "get_repository", return_value=mock_repository), \
+             patch.object(ProviderFactory, "get_document_loader", return_value=mock_document_loader):
+            ingest_script.main()
+
+        assert mock_repository.add_documents.call_count == 2
+        clears = sorted(c.kwargs["clear_existing"] for c in mock_repository.add_documents.call_args_list)
+        assert clears == [False, True]
+        out = capsys.readouterr().out
+        assert "2/2 files" in out
+        assert "files/s" in out
+
+    def test_append_same_file_twice_does_not_duplicate(self, mock_repository, mock_document_loader, tmp_path, monkeypatch):
+        (tmp_path / "extra.pdf").write_text("content")
+        monkeypatch.setattr(ingest_script, "PROJECT_ROOT", str(tmp_path))
+
+        with patch.object(ProviderFactory, "get_repository", return_value=mock_repository), \
+             patch.object(ProviderFactory, "get_document_loader", return_value=mock_document_loader):
+            ingest_script.ingest("extra.pdf", append=True)
+            document = ingest_script.ingest("extra.pdf", append=True)
+
+        assert mock_repository.add_documents.call_count == 1
+        assert document.chunk_count == 1
+
+    def test_collect_files_walks_directories(self, tmp_path, monkeypatch):
+        corpus = tmp_path / "corpus"
+        (corpus / "sub").mkdir(parents=True)
+        (corpus / "a.pdf").write_text("a")
+        (corpus / "sub" / "a.pdf").write_text("a2")
+        (corpus / "notes.xyz").write_text("skip")
+        single = tmp_path / "b.md"
+        single.write_text("b")
+        monkeypatch.setattr(ingest_script, "PROJECT_ROOT", str(tmp_path))
+
+        files = ingest_script.collect_files(["corpus", str(single)], {"pdf", "md"})
+
+        assert [name for _, name in files] == ["a.pdf", "sub/a.pdf", "b.md"]
+        assert files[1][0] == str(corpus / "sub" / "a.pdf")
+
+    def test_main_sync_prunes_and_reports(self, mock_repository, mock_document_loader, memory_registry,
+                                          tmp_path, monkeypatch, capsys):
+        from src.domain.entities.document import DocumentRecord
+
+        corpus = tmp_path / "corpus"
+        corpus.mkdir()
+        (corpus / "a.txt").write_text("a")
+        memory_registry.save(DocumentRecord(source_file="gone.pdf", file_hash="00" * 32))
+        monkeypatch.setattr(ingest_script, "PROJECT_ROOT", str(tmp_path))
+        monkeypatch.setattr("sys.argv", ["ingest.py", "--sync", "corpus", "--prune"])
+
+        with patch.object(ProviderFactory, "get_repository", return_value=mock_repository), \
+             patch.object(ProviderFactory, "get_document_loader", return_value=mock_document_loader):
+            ingest_script.main()
+            monkeypatch.setattr("sys.argv", ["ingest.py", "--sync", "corpus"])
+            ingest_script.main()
+
+        assert memory_registry.sources() == ["a.txt"]
+        mock_repository.delete_by_source.assert_any_call("gone.pdf")
+        assert mock_repository.add_documents.call_count == 1
+        out = capsys.readouterr().out
+        assert "0 unchanged, 1 chunks added" in out and "1 documents pruned" in out
+        assert "1 unchanged, 0 chunks added" in out
+
+    def test_main_rollback_restores_previous_collection(self, mock_repository, memory_registry, monkeypatch, capsys):
+        from src.domain.entities.document import DocumentRecord
+
+        memory_registry.save(DocumentRecord(source_file="new.pdf", file_hash="00" * 32))
+        mock_repository.rollback_rebuild.return_value = "document_chunks__old"
+        monkeypatch.setattr("sys.argv", ["ingest.py", "--rollback"])
+
+        with patch.object(ProviderFactory, "get_repository", return_value=mock_repository):
+            ingest_script.main()
+
+        assert "document_chunks__old" in capsys.readouterr().out
+        # The registry keys rows by physical collection and follows the alias itself.
+        assert memory_registry.sources() == ["new.pdf"]
+        mock_repository.add_documents.assert_not_called()
+
+    def test_main_rollback_without_previous_exits_nonzero(self, mock_repository, monkeypatch, capsys):
+        mock_repository.rollback_rebuild.return_value = None
+        monkeypatch.setattr("sys.argv", ["ingest.py", "--rollback"])
+
+        with patch.object(ProviderFactory, "get_repository", return_value=mock_repository), \
+             pytest.raises(SystemExit) as exc:
+            ingest_script.main()
+
+        assert exc.value.code == 1
+        assert "Nothing to roll back" in capsys.readouterr().out
+
     def test_ingest_missing_file_raises(self, tmp_path, monkeypatch):
         monkeypatch.setattr(ingest_script, "PROJECT_ROOT", str(tmp_path))
 
@@ -105,9 +220,30 @@ class TestChatScript:
         assert chat_script.ask(use_case, "q") == "The answer"
         use_case.execute.assert_called_once_with("q")
 
+    def test_stream_answer_prints_tokens_and_returns_result(self, capsys):
+        result = SearchResult(query="q", answer="4 2", sources=[], time_to_first_token=0.25)
+        use_case = Mock()
+        use_case.stream.return_value = iter(["4", " 2", result])
+
+        assert chat_script.stream_answer(use_case, "q") is result
+
+        out = capsys.readouterr().out
+        assert "4 2" in out
+        assert "First token after 250 ms" in out
+        assert "Context assembly" not in out
+
+    def test_stream_answer_reports_context_tokens_saved(self, capsys):
+        result = SearchResult(query="q", answer="42", sources=[], context_tokens_saved=37)
+        use_case = Mock()
+        use_case.stream.return_value = iter(["42", result])
+
+        chat_script.stream_answer(use_case, "q")
+
+        assert "Context assembly saved ~37 prompt tokens" in capsys.readouterr().out
+
     def test_main_one_shot_prints_answer_and_exits(self, monkeypatch, capsys):
         use_case = Mock()
-        use_case.execute.return_value = SearchResult(query="q", answer="42", sources=[])
+        use_case.stream.return_value = iter(["42", SearchResult(query="q", answer="42", sources=[])])
         monkeypatch.setattr("sys.argv", ["chat.py", "what", "is", "it?"])
 
         with patch.object(chat_script, "build_search_use_case", return_value=use_case):
@@ -115,7 +251,34 @@ class TestChatScript:
 
         out = capsys.readouterr().out
         assert "42" in out
-        use_case.execute.assert_called_once_with("what is it?")
+        use_case.stream.assert_called_once_with("what is it?")
+
+    def test_main_uses_running_daemon(self, monkeypatch, capsys):
+        daemon = Mock()
+        daemon.stream.return_value = iter(["42", SearchResult(query="q", answer="42", sources=[])])
+        monkeypatch.setattr("sys.argv", ["chat.py", "what?"])
+
+        with patch("src.chat_daemon.connect_daemon", return_value=daemon), \
+             patch.object(chat_script, "_ensure_venv_python") as venv, \
+             patch.object(chat_script, "build_search_use_case") as build:
+            chat_script.main()
+
+        daemon.stream.assert_called_once_with("what?")
+        build.assert_not_called()
+        venv.assert_not_called()
+        assert "42" in capsys.readouterr().out
+
+    def test_main_no_daemon_flag_answers_in_process(self, monkeypatch):
+        use_case = Mock()
+        use_case.stream.return_value = iter([SearchResult(query="q", answer="", sources=[])])
+        monkeypatch.setattr("sys.argv", ["chat.py", "--no-daemon", "what?"])
+
+        with patch("src.chat_daemon.connect_daemon") as connect, \
+             patch.object(chat_script, "build_search_use_case", return_value=use_case):
+            chat_script.main()
+
+        connect.assert_not_called()
+        use_case.stream.assert_called_once_with("what?")
 
     def test_main_exits_nonzero_on_failure(self, monkeypatch, capsys):
         monkeypatch.setattr("sys.argv", ["chat.py", "question"])
@@ -129,7 +292,7 @@ class TestChatScript:
 
     def test_chat_loop_answers_then_exits(self, monkeypatch, capsys):
         use_case = Mock()
-        use_case.execute.return_value = SearchResult(query="q", answer="hello!", sources=[])
+        use_case.stream.return_value = iter(["hello!", SearchResult(query="q", answer="hello!", sources=[])])
         answers = iter(["my question", "exit"])
         monkeypatch.setattr("builtins.input", lambda *a: next(answers))
 
@@ -138,4 +301,111 @@ class TestChatScript:
         out = capsys.readouterr().out
         assert "hello!" in out
         assert "See you later" in out
-        use_case.execute.assert_called_once_with("my question")
+        use_case.stream.assert_called_once_with("my question")
+
+
+class TestChatBatchMode:
+    """Tests for `src/chat.py --batch`."""
+
+    @staticmethod
+    def _use_case():
+        def execute(question):
+            if question == "boom":
+                raise RuntimeError("LLM timeout")
+            return SearchResult(
+                query=question,
+                answer=f"answer to {question}",
+                sources=[
+                    DocumentChunk(content="c", metadata={"source_file": "a.pdf", "page": 3}),
+                    DocumentChunk(content="d", metadata={"source_file": "notes.txt"}),
+                ],
+            )
+
+        use_case = Mock()
+        use_case.execute.side_effect = execute
+        return use_case
+
+    def test_read_questions_txt_skips_blank_lines(self, tmp_path):
+        path = tmp_path / "q.txt"
+        path.write_text("first?\n\n  second?  \n", encoding="utf-8")
+        assert chat_script.read_questions(str(path)) == [{"question": "first?"}, {"question": "second?"}]
+
+    def test_read_questions_jsonl_objects_and_strings(self, tmp_path):
+        path = tmp_path / "q.jsonl"
+        path.write_text('{"id": "a1", "question": "first?"}\n"second?"\n', encoding="utf-8")
+        assert chat_script.read_questions(str(path)) == [
+            {"id": "a1", "question": "first?"},
+            {"question": "second?"},
+        ]
+
+    def test_read_questions_jsonl_requires_question(self, tmp_path):
+        path = tmp_path / "q.jsonl"
+        path.write_text('{"id": 1}\n', encoding="utf-8")
+        with pytest.raises(ValueError, match="q.jsonl:1"):
+            chat_script.read_questions(str(path))
+
+    def test_run_batch_writes_jsonl_in_input_order(self):
+        output = io.StringIO()
+        records = [{"question": f"q{i}", "id": i} for i in range(5)] + [{"question": "boom"}]
+
+        summary = chat_script.run_batch(self._use_case(), records, concurrency=3, output=output)
+
+        lines = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert [line["index"] for line in lines] == list(range(6))
+        assert lines[0]["id"] == 0
+        assert lines[0]["answer"] == "answer to q0"
+        assert lines[0]["sources"] == ["a.pdf#page=3", "notes.txt"]
+        assert lines[0]["latency_ms"] >= 0
+        assert lines[5]["error"] == "LLM timeout"
+        assert "answer" not in lines[5]
+        assert summary["questions"] == 6
+        assert summary["errors"] == 1
+
+    def test_run_batch_respects_concurrency(self):
+        in_flight, peak = 0, 0
+        lock = threading.Lock()
+
+        def execute(question):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.01)
+            with lock:
+                in_flight -= 1
+            return SearchResult(query=question, answer="a", sources=[])
+
+        use_case = Mock()
+        use_case.execute.side_effect = execute
+        records = [{"question": f"q{i}"} for i in range(12)]
+
+        chat_script.run_batch(use_case, records, concurrency=2, output=io.StringIO())
+
+        assert peak <= 2
+
+    def test_main_batch_writes_output_file(self, tmp_path, monkeypatch, capsys):
+        questions = tmp_path / "q.txt"
+        questions.write_text("q1\nq2\n", encoding="utf-8")
+        output = tmp_path / "out.jsonl"
+        monkeypatch.setattr(
+            "sys.argv", ["chat.py", "--batch", str(questions), "--concurrency", "2", "-o", str(output)]
+        )
+
+        with patch.object(chat_script, "build_search_use_case", return_value=self._use_case()):
+            chat_script.main()
+
+        assert len(output.read_text(encoding="utf-8").splitlines()) == 2
+        captured = capsys.readouterr()
+        assert captured.out == ""
+        assert "2 question(s), 0 error(s)" in captured.err
+
+    def test_main_batch_stdout_is_only_jsonl(self, tmp_path, monkeypatch, capsys):
+        questions = tmp_path / "q.txt"
+        questions.write_text("q1\n", encoding="utf-8")
+        monkeypatch.setattr("sys.argv", ["chat.py", "--batch", str(questions)])
+
+        with patch.object(chat_script, "build_search_use_case", return_value=self._use_case()):
+            chat_script.main()
+
+        out = capsys.readouterr().out
+        assert json.loads(out)["question"] == "q1"
@@ -1,17 +1,24 @@
 """
 Unit tests for SearchDocumentsUseCase.
 """
-from unittest.mock import MagicMock, Mock, patch
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 import pytest
-from langchain_core.documents import Document as LangchainDocument
 
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+from src.application.metrics import CONTEXT_TOKENS_SAVED, LLM_CALLS_AVOIDED, TIME_TO_FIRST_TOKEN
 from src.application.use_cases.search_documents import (
+    NO_ANSWER,
     PROMPT_TEMPLATE,
     SearchDocumentsUseCase,
+    format_docs,
 )
-from src.domain.entities.document import DocumentChunk, SearchResult
+from src.domain.entities.document import BatchSearchResult, DocumentChunk, ScoredChunk, SearchResult
 from src.domain.exceptions import SearchError
+from src.domain.ports.answer_cache import AnswerCachePort
+from src.domain.ports.embeddings import EmbeddingsPort
 from src.domain.ports.llm import LLMPort
 from src.domain.ports.repository import RepositoryPort
 
@@ -38,16 +45,14 @@ def _make_repo_mock(chunks=None, retriever=None):
 class TestSearchDocumentsUseCaseConstruction:
     """Tests for construction and chain wiring."""
 
-    def test_get_retriever_called_with_settings_k(self):
-        """Constructor must request retriever with retriever_k from settings."""
+    def test_retriever_not_requested(self):
+        """Retrieval happens in execute(); the chain must not embed a second retriever."""
         repo = _make_repo_mock()
         llm, _ = _make_llm_mock()
 
         SearchDocumentsUseCase(repo, llm)
 
-        repo.get_retriever.assert_called_once()
-        kwargs = repo.get_retriever.call_args.kwargs
-        assert kwargs.get("k") == 10
+        repo.get_retriever.assert_not_called()
 
     def test_chain_built_on_init(self):
         """Chain should be built during __init__ (cached)."""
@@ -92,10 +97,10 @@ class TestSearchDocumentsExecute:
         use_case.execute("q")
 
         repo.search.assert_called_once()
-        assert repo.search.call_args.kwargs.get("k") == 15
+        assert repo.search.call_args.kwargs.get("k") == 10
 
-    def test_chain_invoke_called_with_query(self):
-        """Chain.invoke must receive the user query."""
+    def test_chain_invoke_called_with_query_and_retrieved_context(self):
+        """Chain.invoke must receive the user query and the retrieved chunks as context."""
         repo = _make_repo_mock()
         llm, _ = _make_llm_mock()
         use_case = SearchDocumentsUseCase(repo, llm)
@@ -104,7 +109,25 @@ class TestSearchDocumentsExecute:
 
         use_case.execute("My question")
 
-        use_case._chain.invoke.assert_called_once_with("My question")
+        use_case._chain.invoke.assert_called_once()
+        payload = use_case._chain.invoke.call_args.args[0]
+        assert payload["question"] == "My question"
+        assert '<document source="doc.pdf" id=0>' in payload["context"]
+        assert "ctx" in payload["context"]
+
+    def test_single_retrieval_per_question(self):
+        """Each question embeds and retrieves once: one search, no retriever."""
+        repo = _make_repo_mock()
+        llm, _ = _make_llm_mock()
+        use_case = SearchDocumentsUseCase(repo, llm)
+        use_case._chain = MagicMock()
+        use_case._chain.invoke.return_value = "ok"
+
+        use_case.execute("q1")
+        use_case.execute("q2")
+
+        assert repo.search.call_count == 2
+        repo.get_retriever.assert_not_called()
 
     def test_empty_retrieval_still_returns_result(self):
         """If retriever returns nothing, still call the chain (LLM will say it doesn't know)."""
@@ -153,6 +176,499 @@ class TestSearchDocumentsExecute:
         assert isinstance(exc_info.value.__cause__, RuntimeError)
 
 
+class TestAnswerCache:
+    """Tests for execute() with an AnswerCachePort."""
+
+    def _use_case(self, cache, version=3):
+        repo = _make_repo_mock()
+        repo.corpus_version.return_value = version
+        llm, _ = _make_llm_mock()
+        use_case = SearchDocumentsUseCase(repo, llm, answer_cache=cache)
+        use_case._chain = MagicMock()
+        use_case._chain.invoke.return_value = "fresh"
+        return use_case, repo, use_case._chain
+
+    def test_hit_skips_retrieval_and_llm(self):
+        cached = SearchResult(query="q", answer="cached", sources=[])
+        cache = Mock(spec=AnswerCachePort)
+        cache.lookup.return_value = cached
+        use_case, repo, chain = self._use_case(cache)
+
+        assert use_case.execute("q") is cached
+        cache.lookup.assert_called_once_with("q", 3)
+        repo.search.assert_not_called()
+        chain.invoke.assert_not_called()
+        cache.store.assert_not_called()
+
+    def test_miss_generates_and_stores_under_version(self):
+        cache = Mock(spec=AnswerCachePort)
+        cache.lookup.return_value = None
+        use_case, repo, _ = self._use_case(cache, version=7)
+
+        result = use_case.execute("q")
+
+        assert result.answer == "fresh"
+        cache.store.assert_called_once_with("q", 7, result, embedding=None)
+
+    def test_untracked_corpus_version_bypasses_cache(self):
+        cache = Mock(spec=AnswerCachePort)
+        use_case, repo, _ = self._use_case(cache, version=None)
+
+        assert use_case.execute("q").answer == "fresh"
+        cache.lookup.assert_not_called()
+        cache.store.assert_not_called()
+
+    def test_no_cache_does_not_read_version(self):
+        repo = _make_repo_mock()
+        llm, _ = _make_llm_mock()
+        use_case = SearchDocumentsUseCase(repo, llm)
+        use_case._chain = MagicMock()
+        use_case.execute("q")
+        repo.corpus_version.assert_not_called()
+
+
+class TestAsyncExecute:
+    """Tests for aexecute() — the event-loop path used by Chainlit."""
+
+    def _use_case(self, cache=None, version=3):
+        repo = _make_repo_mock()
+        repo.asearch.return_value = repo.search.return_value
+        repo.acorpus_version.return_value = version
+        llm, _ = _make_llm_mock()
+        use_case = SearchDocumentsUseCase(repo, llm, answer_cache=cache)
+        use_case._chain = MagicMock()
+        use_case._chain.ainvoke = AsyncMock(return_value="fresh")
+        return use_case, repo, use_case._chain
+
+    @pytest.mark.asyncio
+    async def test_awaits_async_ports_only(self):
+        use_case, repo, chain = self._use_case()
+
+        result = await use_case.aexecute("q")
+
+        assert result.answer == "fresh"
+        assert result.sources == repo.asearch.return_value
+        repo.asearch.assert_awaited_once_with("q", k=use_case._settings.retriever_k)
+        chain.ainvoke.assert_awaited_once()
+        repo.search.assert_not_called()
+        chain.invoke.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_skips_retrieval(self):
+        cached = SearchResult(query="q", answer="cached", sources=[])
+        cache = Mock(spec=AnswerCachePort)
+        cache.alookup.return_value = cached
+        use_case, repo, chain = self._use_case(cache)
+
+        assert await use_case.aexecute("q") is cached
+        cache.alookup.assert_awaited_once_with("q", 3)
+        repo.asearch.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_miss_stores_under_version(self):
+        cache = Mock(spec=AnswerCachePort)
+        cache.alookup.return_value = None
+        use_case, _, _ = self._use_case(cache, version=7)
+
+        result = await use_case.aexecute("q")
+        cache.astore.assert_awaited_once_with("q", 7, result)
+
+    @pytest.mark.asyncio
+    async def test_errors_wrapped_as_search_error(self):
+        use_case, repo, _ = self._use_case()
+        repo.asearch.side_effect = RuntimeError("pool closed")
+
+        with pytest.raises(SearchError, match="pool closed"):
+            await use_case.aexecute("q")
+
+
+class TestExecuteMany:
+    """Tests for execute_many() — batched retrieval, bounded LLM fan-out."""
+
+    def _use_case(self, cache=None, version=3, embeddings=None):
+        repo = _make_repo_mock()
+        repo.corpus_version.return_value = version
+        repo.search_many.side_effect = lambda queries, k, query_embeddings=None: [
+            [DocumentChunk(content=f"ctx {q}")] for q in queries
+        ]
+        llm, _ = _make_llm_mock()
+        use_case = SearchDocumentsUseCase(repo, llm, answer_cache=cache, embeddings=embeddings)
+        use_case._chain = MagicMock()
+        use_case._chain.batch.side_effect = lambda inputs, **kwargs: [
+            f"answer {i['question']}" for i in inputs
+        ]
+        return use_case, repo, use_case._chain
+
+    def test_results_in_input_order(self):
+        use_case, repo, chain = self._use_case()
+
+        batch = use_case.execute_many(["q1", "q2", "q3"])
+
+        assert isinstance(batch, BatchSearchResult)
+        assert [r.answer for r in batch.results] == ["answer q1", "answer q2", "answer q3"]
+        assert batch.results[1].sources[0].content == "ctx q2"
+        assert batch.errors == {}
+        repo.search_many.assert_called_once_with(
+            ["q1", "q2", "q3"], k=use_case._settings.retriever_k, query_embeddings=None
+        )
+        repo.search.assert_not_called()
+        chain.invoke.assert_not_called()
+
+    def test_llm_concurrency_from_settings(self):
+        use_case, _, chain = self._use_case()
+        use_case._settings = use_case._settings.model_copy(update={"llm_max_concurrency": 3})
+
+        use_case.execute_many(["q1", "q2"])
+
+        kwargs = chain.batch.call_args.kwargs
+        assert kwargs["config"] == {"max_concurrency": 3}
+        assert kwargs["return_exceptions"] is True
+
+    def test_retrieval_sliced_by_batch_size(self):
+        use_case, repo, _ = self._use_case()
+        use_case._settings = use_case._settings.model_copy(update={"search_batch_size": 2})
+
+        batch = use_case.execute_many(["q1", "q2", "q3"])
+
+        assert [c.args[0] for c in repo.search_many.call_args_list] == [["q1", "q2"], ["q3"]]
+        assert [r.answer for r in batch.results] == ["answer q1", "answer q2", "answer q3"]
+
+    def test_failed_question_reported_by_index(self):
+        use_case, _, chain = self._use_case()
+        chain.batch.side_effect = lambda inputs, **kwargs: ["a0", RuntimeError("rate limited"), "a2"]
+
+        batch = use_case.execute_many(["q0", "q1", "q2"])
+
+        assert batch.results[1] is None
+        assert batch.errors == {1: "Search failed: rate limited"}
+        assert [batch.results[0].answer, batch.results[2].answer] == ["a0", "a2"]
+
+    def test_cache_hits_skip_retrieval_and_misses_stored(self):
+        cached = SearchResult(query="q1", answer="cached", sources=[])
+        cache = Mock(spec=AnswerCachePort)
+        cache.lookup.side_effect = lambda query, version, embedding=None: cached if query == "q1" else None
+        use_case, repo, _ = self._use_case(cache, version=5)
+
+        batch = use_case.execute_many(["q0", "q1"])
+
+        assert batch.results[1] is cached
+        repo.corpus_version.assert_called_once()
+        repo.search_many.assert_called_once_with(["q0"], k=use_case._settings.retriever_k, query_embeddings=None)
+        cache.store.assert_called_once_with("q0", 5, batch.results[0], embedding=None)
+
+    def test_one_embedding_call_per_slice_shared_by_cache_and_retrieval(self):
+        embeddings = Mock(spec=EmbeddingsPort)
+        embeddings.embed_queries.side_effect = lambda texts: [[float(len(t)), 1.0] for t in texts]
+        cached = SearchResult(query="q1", answer="cached", sources=[])
+        cache = Mock(spec=AnswerCachePort)
+        cache.lookup.side_effect = lambda query, version, embedding=None: cached if query == "q1" else None
+        use_case, repo, _ = self._use_case(cache, version=5, embeddings=embeddings)
+        use_case._settings = use_case._settings.model_copy(update={"search_batch_size": 2})
+
+        batch = use_case.execute_many(["q0", "q1", "q22"])
+
+        assert [c.args[0] for c in embeddings.embed_queries.call_args_list] == [["q0", "q1"], ["q22"]]
+        embeddings.embed_query.assert_not_called()
+        assert [c.args[2] for c in cache.lookup.call_args_list] == [[2.0, 1.0], [2.0, 1.0], [3.0, 1.0]]
+        assert [c.kwargs["query_embeddings"] for c in repo.search_many.call_args_list] == [[[2.0, 1.0]], [[3.0, 1.0]]]
+        assert [c.kwargs["embedding"] for c in cache.store.call_args_list] == [[2.0, 1.0], [3.0, 1.0]]
+        assert batch.results[1] is cached
+
+    def test_retrieval_error_wrapped_as_search_error(self):
+        use_case, repo, _ = self._use_case()
+        repo.search_many.side_effect = RuntimeError("db down")
+
+        with pytest.raises(SearchError, match="db down"):
+            use_case.execute_many(["q"])
+
+    def test_throughput(self):
+        use_case, _, _ = self._use_case()
+        batch = use_case.execute_many(["q1", "q2"])
+        assert batch.elapsed_seconds > 0
+        assert batch.questions_per_second == pytest.approx(2 / batch.elapsed_seconds)
+
+    def test_empty_batch(self):
+        use_case, repo, _ = self._use_case()
+        batch = use_case.execute_many([])
+        assert batch.results == []
+        repo.search_many.assert_not_called()
+
+
+class TestStream:
+    """Tests for stream() / astream() — tokens first, then the SearchResult."""
+
+    def _use_case(self, tokens, cache=None, version=3):
+        repo = _make_repo_mock()
+        repo.asearch.return_value = repo.search.return_value
+        repo.corpus_version.return_value = version
+        repo.acorpus_version.return_value = version
+        llm, _ = _make_llm_mock()
+        use_case = SearchDocumentsUseCase(repo, llm, answer_cache=cache)
+        use_case._chain = MagicMock()
+        use_case._chain.stream.return_value = iter(tokens)
+
+        async def astream(_inputs):
+            for token in tokens:
+                yield token
+
+        use_case._chain.astream = astream
+        return use_case, repo
+
+    def test_yields_tokens_then_result_with_sources_and_ttft(self):
+        use_case, repo = self._use_case(["", "Olá", ", ", "mundo"])
+
+        items = list(use_case.stream("q"))
+
+        assert items[:-1] == ["Olá", ", ", "mundo"]
+        result = items[-1]
+        assert isinstance(result, SearchResult)
+        assert result.answer == "Olá, mundo"
+        assert result.sources == repo.search.return_value
+        assert result.time_to_first_token is not None and result.time_to_first_token >= 0
+
+    def test_records_time_to_first_token(self):
+        TIME_TO_FIRST_TOKEN.reset()
+        use_case, _ = self._use_case(["a", "b"])
+
+        list(use_case.stream("q"))
+
+        assert TIME_TO_FIRST_TOKEN.stats().count == 1
+
+    def test_streams_through_real_chain(self):
+        repo = _make_repo_mock()
+        llm = Mock(spec=LLMPort)
+        llm.get_langchain_llm.return_value = GenericFakeChatModel(
+            messages=iter([AIMessage(content="resposta em partes")])
+        )
+        use_case = SearchDocumentsUseCase(repo, llm)
+
+        items = list(use_case.stream("q"))
+
+        assert len(items) > 2
+        assert "".join(items[:-1]) == "resposta em partes"
+        assert items[-1].answer == "resposta em partes"
+
+    def test_cache_hit_streams_cached_answer_once(self):
+        cached = SearchResult(query="q", answer="cached", sources=[])
+        cache = Mock(spec=AnswerCachePort)
+        cache.lookup.return_value = cached
+        use_case, repo = self._use_case(["unused"], cache=cache)
+
+        items = list(use_case.stream("q"))
+
+        assert items[0] == "cached"
+        assert items[1].answer == "cached"
+        assert items[1].time_to_first_token is not None
+        repo.search.assert_not_called()
+
+    def test_miss_stores_full_answer(self):
+        cache = Mock(spec=AnswerCachePort)
+        cache.lookup.return_value = None
+        use_case, _ = self._use_case(["a", "b"], cache=cache, version=5)
+
+        result = list(use_case.stream("q"))[-1]
+        cache.store.assert_called_once_with("q", 5, result, embedding=None)
+
+    def test_error_mid_stream_wrapped_as_search_error(self):
+        use_case, _ = self._use_case([])
+
+        def broken(_inputs):
+            yield "partial"
+            raise RuntimeError("connection reset")
+
+        use_case._chain.stream = broken
+        stream = use_case.stream("q")
+        assert next(stream) == "partial"
+        with pytest.raises(SearchError, match="connection reset"):
+            next(stream)
+
+    @pytest.mark.asyncio
+    async def test_astream_yields_tokens_then_result(self):
+        use_case, repo = self._use_case(["x", "y"])
+
+        items = [item async for item in use_case.astream("q")]
+
+        assert items[:-1] == ["x", "y"]
+        assert items[-1].answer == "xy"
+        repo.asearch.assert_awaited_once()
+        repo.search.assert_not_called()
+
+
+class TestRelevanceFloor:
+    """Tests for RELEVANCE_FLOOR — out-of-context questions skip the LLM."""
+
+    STRONG = DocumentChunk(content="on topic", metadata={"source_file": "doc.pdf"})
+    WEAK = DocumentChunk(content="off topic", metadata={"source_file": "doc.pdf"})
+
+    @pytest.fixture(autouse=True)
+    def reset_counter(self):
+        LLM_CALLS_AVOIDED.reset()
+        yield
+        LLM_CALLS_AVOIDED.reset()
+
+    def _use_case(self, scored, floor=0.5):
+        repo = _make_repo_mock()
+        repo.search_with_scores.return_value = scored
+        repo.asearch_with_scores.return_value = scored
+        llm, _ = _make_llm_mock()
+        use_case = SearchDocumentsUseCase(repo, llm)
+        use_case._settings = use_case._settings.model_copy(update={"relevance_floor": floor})
+        use_case._chain = MagicMock()
+        use_case._chain.invoke.return_value = "generated"
+        use_case._chain.ainvoke = AsyncMock(return_value="generated")
+        use_case._chain.stream.return_value = iter(["gen", "erated"])
+        return use_case, repo, use_case._chain
+
+    def test_below_floor_returns_refusal_without_llm(self):
+        use_case, repo, chain = self._use_case([ScoredChunk.from_chunk(self.WEAK, 0.31)])
+
+        result = use_case.execute("capital da França?")
+
+        assert result.answer == NO_ANSWER
+        assert result.sources == []
+        chain.invoke.assert_not_called()
+        repo.search.assert_not_called()
+        assert LLM_CALLS_AVOIDED.value == 1
+
+    def test_best_chunk_at_floor_calls_llm_with_all_chunks(self):
+        use_case, _, chain = self._use_case(
+            [ScoredChunk.from_chunk(self.STRONG, 0.5), ScoredChunk.from_chunk(self.WEAK, 0.2)]
+        )
+
+        result = use_case.execute("q")
+
+        assert result.answer == "generated"
+        assert [c.content for c in result.sources] == [self.STRONG.content, self.WEAK.content]
+        assert result.sources[0].metadata is self.STRONG.metadata
+        chain.invoke.assert_called_once()
+        assert LLM_CALLS_AVOIDED.value == 0
+
+    def test_empty_retrieval_is_refused(self):
+        use_case, _, chain = self._use_case([])
+        assert use_case.execute("q").answer == NO_ANSWER
+        chain.invoke.assert_not_called()
+
+    def test_unset_floor_uses_plain_search(self):
+        use_case, repo, chain = self._use_case([ScoredChunk.from_chunk(self.WEAK, 0.0)], floor=None)
+
+        assert use_case.execute("q").answer == "generated"
+        repo.search_with_scores.assert_not_called()
+        repo.search.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_aexecute_below_floor(self):
+        use_case, repo, chain = self._use_case([ScoredChunk.from_chunk(self.WEAK, 0.1)])
+
+        result = await use_case.aexecute("q")
+
+        assert result.answer == NO_ANSWER
+        repo.asearch_with_scores.assert_awaited_once_with("q", k=use_case._settings.retriever_k)
+        chain.ainvoke.assert_not_called()
+
+    def test_stream_yields_refusal_as_one_token(self):
+        use_case, _, chain = self._use_case([ScoredChunk.from_chunk(self.WEAK, 0.1)])
+
+        items = list(use_case.stream("q"))
+
+        assert items[0] == NO_ANSWER
+        assert items[1].answer == NO_ANSWER and items[1].time_to_first_token is not None
+        chain.stream.assert_not_called()
+
+    def test_refusal_is_cached(self):
+        cache = Mock(spec=AnswerCachePort)
+        cache.lookup.return_value = None
+        use_case, repo, _ = self._use_case([ScoredChunk.from_chunk(self.WEAK, 0.1)])
+        use_case._answer_cache = cache
+        repo.corpus_version.return_value = 4
+
+        result = use_case.execute("q")
+
+        cache.store.assert_called_once_with("q", 4, result, embedding=None)
+
+    def test_stream_caches_refusal_like_execute(self):
+        cache = Mock(spec=AnswerCachePort)
+        cache.lookup.return_value = None
+        use_case, repo, _ = self._use_case([ScoredChunk.from_chunk(self.WEAK, 0.1)])
+        use_case._answer_cache = cache
+        repo.corpus_version.return_value = 4
+
+        list(use_case.stream("q"))
+
+        stored = cache.store.call_args.args
+        assert stored[:2] == ("q", 4)
+        assert stored[2] == use_case._refusal("q")
+
+    def test_execute_many_generates_only_relevant_questions(self):
+        use_case, repo, chain = self._use_case([])
+        repo.search_many_with_scores.return_value = [
+            [ScoredChunk.from_chunk(self.WEAK, 0.1)],
+            [ScoredChunk.from_chunk(self.STRONG, 0.9)],
+        ]
+        chain.batch.side_effect = lambda inputs, **kwargs: [f"answer {i['question']}" for i in inputs]
+
+        batch = use_case.execute_many(["off", "on"])
+
+        assert [r.answer for r in batch.results] == [NO_ANSWER, "answer on"]
+        assert [i["question"] for i in chain.batch.call_args.args[0]] == ["on"]
+        repo.search_many.assert_not_called()
+        assert LLM_CALLS_AVOIDED.value == 1
+
+    def test_refusal_matches_prompt_rule(self):
+        assert NO_ANSWER in PROMPT_TEMPLATE
+
+
+class TestContextAssembly:
+    """Tests for context assembly between retrieval and the prompt."""
+
+    PARAGRAPH = "O prazo de entrega do relatório anual é de trinta dias após o fechamento do exercício."
+    CHUNKS = [
+        DocumentChunk(content=PARAGRAPH, metadata={"source_file": "a.pdf"}),
+        DocumentChunk(content=PARAGRAPH, metadata={"source_file": "b.pdf"}),
+    ]
+
+    @pytest.fixture(autouse=True)
+    def reset_counter(self):
+        CONTEXT_TOKENS_SAVED.reset()
+        yield
+        CONTEXT_TOKENS_SAVED.reset()
+
+    def _use_case(self, enabled=True):
+        llm, _ = _make_llm_mock()
+        use_case = SearchDocumentsUseCase(_make_repo_mock(chunks=self.CHUNKS), llm)
+        use_case._settings = use_case._settings.model_copy(update={"context_assembly_enabled": enabled})
+        use_case._chain = MagicMock()
+        use_case._chain.invoke.return_value = "generated"
+        use_case._chain.batch.side_effect = lambda inputs, **kwargs: ["generated"] * len(inputs)
+        return use_case, use_case._chain
+
+    def test_prompt_gets_deduplicated_context_and_result_reports_savings(self):
+        use_case, chain = self._use_case()
+
+        result = use_case.execute("q")
+
+        context = chain.invoke.call_args.args[0]["context"]
+        assert context.count(self.PARAGRAPH) == 1
+        assert result.context_tokens_saved > 0
+        assert result.sources == self.CHUNKS
+        assert CONTEXT_TOKENS_SAVED.value == result.context_tokens_saved
+
+    def test_execute_many_reports_savings_per_question(self):
+        use_case, chain = self._use_case()
+        use_case._repository.search_many.return_value = [self.CHUNKS, self.CHUNKS[:1]]
+
+        batch = use_case.execute_many(["dup", "single"])
+
+        assert [r.context_tokens_saved > 0 for r in batch.results] == [True, False]
+
+    def test_disabled_sends_chunks_as_is(self):
+        use_case, chain = self._use_case(enabled=False)
+
+        result = use_case.execute("q")
+
+        assert chain.invoke.call_args.args[0]["context"] == format_docs(self.CHUNKS)
+        assert result.context_tokens_saved == 0
+
+
 class TestSearchSync:
     """Tests for the convenience search_sync()."""
 
@@ -192,24 +708,15 @@ class TestPromptAndFormatting:
         assert "did not find sufficient information" in PROMPT_TEMPLATE
 
     def test_format_docs_includes_source_attribution_via_real_chain(self):
-        """Exercise the real format_docs closure by running the chain end-to-end
-        with a fake retriever and fake LLM that records the prompt it receives."""
+        """Exercise format_docs by running the real chain end-to-end with a
+        fake repository and fake LLM that records the prompt it receives."""
         from langchain_core.runnables import RunnableLambda
 
-        # Fake retriever: returns a fixed list of LangchainDocuments.
-        fake_docs = [
-            LangchainDocument(
-                page_content="hello",
-                metadata={"source_file": "x.pdf"},
-            ),
-            LangchainDocument(
-                page_content="world",
-                metadata={},  # forces "unknown"
-            ),
+        chunks = [
+            DocumentChunk(content="hello", metadata={"source_file": "x.pdf"}),
+            DocumentChunk(content="world", metadata={}),  # forces "unknown"
         ]
-        fake_retriever = RunnableLambda(lambda _q: fake_docs)
-
-        repo = _make_repo_mock(retriever=fake_retriever)
+        repo = _make_repo_mock(chunks=chunks)
 
         # Fake LangChain LLM: any Runnable that captures input.
         captured = {}
@@ -230,9 +737,11 @@ class TestPromptAndFormatting:
         result = use_case.execute("what?")
 
         assert result.answer == "answer"
+        assert result.sources == chunks
         # Prompt must contain the formatted documents with source attribution.
         prompt_str = captured["prompt"]
         assert '<document source="x.pdf" id=0>' in prompt_str
         assert "hello" in prompt_str
         assert '<document source="unknown" id=1>' in prompt_str
         assert "world" in prompt_str
+        assert "what?" in prompt_str
@@ -0,0 +1,155 @@
+"""
+Unit tests for InMemorySemanticAnswerCache.
+
+Embeddings are a Mock mapping each question to a fixed vector, so cosine
+similarities between questions are known exactly.
+"""
+from unittest.mock import Mock
+
+import pytest
+
+from src.domain.entities.document import DocumentChunk, SearchResult
+from src.domain.ports.embeddings import EmbeddingsPort
+from src.infrastructure.adapters.semantic_answer_cache import InMemorySemanticAnswerCache
+
+
+VECTORS = {
+    "qual o faturamento?": [1.0, 0.0, 0.0],
+    "qual é o faturamento?": [0.99, 0.1, 0.0],       # cos ≈ 0.995
+    "qual o faturamento em 2021?": [0.95, 0.31, 0.0],  # cos ≈ 0.951
+    "quem fundou a empresa?": [0.0, 0.0, 1.0],
+}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def embeddings():
+    mock = Mock(spec=EmbeddingsPort)
+    mock.embed_query.side_effect = lambda text: VECTORS[text]
+    return mock
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(embeddings, clock):
+    return InMemorySemanticAnswerCache(embeddings, threshold=0.97, ttl_seconds=60, clock=clock)
+
+
+def _result(answer="R$ 10 mi"):
+    return SearchResult(query="qual o faturamento?", answer=answer, sources=[DocumentChunk(content="ctx")])
+
+
+class TestLookup:
+    def test_empty_cache_misses(self, cache):
+        assert cache.lookup("qual o faturamento?", 1) is None
+        assert cache.stats().misses == 1
+
+    def test_similar_question_hits_with_new_query(self, cache):
+        cache.store("qual o faturamento?", 1, _result())
+        hit = cache.lookup("qual é o faturamento?", 1)
+
+        assert hit.answer == "R$ 10 mi"
+        assert hit.query == "qual é o faturamento?"
+        assert hit.sources[0].content == "ctx"
+        assert cache.stats().hits == 1
+
+    def test_below_threshold_is_near_miss(self, cache):
+        cache.store("qual o faturamento?", 1, _result())
+        assert cache.lookup("qual o faturamento em 2021?", 1) is None
+        stats = cache.stats()
+        assert (stats.misses, stats.near_misses) == (1, 1)
+
+    def test_unrelated_question_misses(self, cache):
+        cache.store("qual o faturamento?", 1, _result())
+        assert cache.lookup("quem fundou a empresa?", 1) is None
+        assert cache.stats().near_misses == 0
+
+    def test_ttl_expiry(self, cache, clock):
+        cache.store("qual o faturamento?", 1, _result())
+        clock.now = 61
+        assert cache.lookup("qual o faturamento?", 1) is None
+        assert cache.stats().entries == 0
+
+
+class TestInvalidation:
+    def test_new_corpus_version_drops_entries(self, cache):
+        cache.store("qual o faturamento?", 1, _result())
+        assert cache.lookup("qual o faturamento?", 2) is None
+        stats = cache.stats()
+        assert stats.invalidations == 1
+        assert stats.entries == 0
+
+    def test_store_for_stale_version_is_ignored(self, cache):
+        cache.lookup("quem fundou a empresa?", 2)
+        cache.store("qual o faturamento?", 1, _result())
+        assert cache.stats().entries == 0
+
+
+class TestStore:
+    def test_lookup_vector_reused_by_store(self, cache, embeddings):
+        cache.lookup("qual o faturamento?", 1)
+        cache.store("qual o faturamento?", 1, _result())
+        embeddings.embed_query.assert_called_once()
+
+    def test_caller_embeddings_skip_the_embedding_call(self, cache, embeddings):
+        questions = [f"pergunta {i}" for i in range(100)]
+        vectors = [[1.0, i / 10, 0.0] for i in range(100)]
+        for question, vector in zip(questions, vectors):
+            assert cache.lookup(question, 1, vector) is None
+        for question, vector in zip(questions, vectors):
+            cache.store(question, 1, _result(question), embedding=vector)
+
+        embeddings.embed_query.assert_not_called()
+        assert cache.lookup("qual o faturamento?", 1, [2.0, 0.0, 0.0]).answer == "pergunta 0"
+
+    def test_max_entries_drops_oldest(self, embeddings):
+        cache = InMemorySemanticAnswerCache(embeddings, max_entries=1)
+        cache.store("qual o faturamento?", 1, _result("old"))
+        cache.store("quem fundou a empresa?", 1, _result("new"))
+
+        assert cache.stats().entries == 1
+        assert cache.lookup("qual o faturamento?", 1) is None
+
+    def test_hit_rate(self, cache):
+        cache.store("qual o faturamento?", 1, _result())
+        cache.lookup("qual o faturamento?", 1)
+        cache.lookup("quem fundou a empresa?", 1)
+        assert cache.stats().hit_rate == pytest.approx(0.5)
+        assert cache.stats().threshold == 0.97
+
+
+class TestAsync:
+    @pytest.fixture
+    def async_cache(self, embeddings, clock):
+        async def aembed_query(text):
+            return VECTORS[text]
+        embeddings.aembed_query.side_effect = aembed_query
+        return InMemorySemanticAnswerCache(embeddings, threshold=0.97, ttl_seconds=60, clock=clock)
+
+    @pytest.mark.asyncio
+    async def test_alookup_hits_after_astore(self, async_cache, embeddings):
+        assert await async_cache.alookup("qual o faturamento?", 1) is None
+        await async_cache.astore("qual o faturamento?", 1, _result())
+
+        hit = await async_cache.alookup("qual é o faturamento?", 1)
+
+        assert hit.answer == "R$ 10 mi"
+        assert hit.query == "qual é o faturamento?"
+        embeddings.embed_query.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_astore_reuses_lookup_vector(self, async_cache, embeddings):
+        await async_cache.alookup("qual o faturamento?", 1)
+        await async_cache.astore("qual o faturamento?", 1, _result())
+        assert embeddings.aembed_query.await_count == 1
@@ -46,6 +46,8 @@ class TestDefaults:
         assert s.chunk_overlap == 150
         assert s.retriever_k == 10
         assert s.llm_timeout == 60
+        assert s.search_batch_size == 128
+        assert s.llm_max_concurrency == 8
 
     def test_provider_defaults(self, monkeypatch):
         monkeypatch.setenv("DATABASE_URL", "postgresql://x:y@h/d")
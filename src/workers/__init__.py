@@ -0,0 +1 @@
+"""Background workers (run with `python -m src.workers.<name>`)."""
@@ -0,0 +1,206 @@
+"""
+Background ingestion worker.
+
+Claims jobs from the `ingest_job` table (see adapters/postgres_ingest_jobs.py)
+and runs them through IngestDocumentUseCase, reporting the stored-chunk count
+after every batch. Workers claim with FOR UPDATE SKIP LOCKED, so start as
+many processes (on as many hosts) as the embedding quota allows. A failed job
+is queued again up to INGEST_JOB_MAX_ATTEMPTS times; unsupported or empty
+documents fail at once. A worker whose job was reclaimed as stale in the
+meantime stops at its next batch and leaves the job to the worker that now
+holds it. Files the Chainlit app spooled into INGEST_SPOOL_DIR are deleted
+once their job has finished.
+
+Jobs carry the spooled file's path, not its content: INGEST_SPOOL_DIR must
+be storage every worker host shares with the app (e.g. an NFS mount at the
+same path), or workers must run on the app's host only. A worker that
+cannot see a spooled file fails the attempt, so the job is retried,
+possibly on another host.
+
+Usage (from project root):
+    python -m src.workers.ingest                  # serve the queue until Ctrl+C / SIGTERM
+    python -m src.workers.ingest --once           # drain the queue, then exit
+    python -m src.workers.ingest --poll-interval 5
+"""
+import argparse
+import logging
+import os
+import signal
+import socket
+import threading
+
+from src.application.use_cases.ingest_document import IngestDocumentUseCase
+from src.domain.entities.ingest_job import DONE, IngestJob
+from src.domain.exceptions import InvalidDocumentError, UnsupportedFormatError
+from src.domain.ports.ingest_job_queue import IngestJobQueuePort
+
+
+logger = logging.getLogger(__name__)
+
+
+class _JobReclaimed(Exception):
+    """Raised from the progress callback once another worker holds the job."""
+
+
+class IngestWorker:
+    """Runs queued ingestion jobs one at a time."""
+
+    def __init__(
+        self,
+        queue: IngestJobQueuePort,
+        use_case: IngestDocumentUseCase,
+        worker_id: str,
+        spool_dir: str | None = None,
+    ):
+        self._queue = queue
+        self._use_case = use_case
+        self._worker_id = worker_id
+        self._spool_dir = os.path.abspath(spool_dir) if spool_dir else None
+
+    def run_once(self) -> IngestJob | None:
+        """Claim and run one job. Returns it with its new status, or None if the queue is empty."""
+        job = self._queue.claim(self._worker_id)
+        if job is None:
+            return None
+
+        logger.info("Ingesting '%s' (job %s, attempt %d)", job.source_name, job.id, job.attempts)
+        claimed = job
+
+        def on_progress(stored: int) -> None:
+            if not self._queue.report_progress(claimed.id, self._worker_id, stored):
+                raise _JobReclaimed(claimed.id)
+
+        try:
+            if self._is_spooled(job.file_path) and not os.path.exists(job.file_path):
+                raise FileNotFoundError(
+                    f"{job.file_path} is not on this worker's host; INGEST_SPOOL_DIR must be shared storage"
+                )
+            document = self._use_case.execute(
+                job.file_path,
+                source_name=job.source_name,
+                clear_existing=job.clear_existing,
+                on_progress=on_progress,
+            )
+        except (InvalidDocumentError, UnsupportedFormatError) as e:
+            job = self._queue.fail(job.id, self._worker_id, str(e), retry=False)
+        except Exception as e:
+            # The use case wraps errors, so look for the abort in the chain.
+            job = None if _caused_by(e, _JobReclaimed) else self._queue.fail(job.id, self._worker_id, str(e))
+        else:
+            if self._queue.complete(job.id, self._worker_id, document.chunk_count):
+                job.status, job.chunks_stored = DONE, document.chunk_count
+            else:
+                job = None
+
+        if job is None:
+            logger.warning(
+                "Job %s for '%s' was reclaimed by another worker; leaving its outcome to it",
+                claimed.id, claimed.source_name,
+            )
+            return claimed
+        if job.status == DONE:
+            logger.info("Ingested '%s': %d chunks", job.source_name, job.chunks_stored)
+        else:
+            logger.warning("Job %s for '%s' %s: %s", job.id, job.source_name, job.status, job.error)
+        if job.finished:
+            self._discard_spooled(job.file_path)
+        return job
+
+    def drain(self) -> int:
+        """Run jobs until none is runnable. Returns the number run."""
+        count = 0
+        while self.run_once() is not None:
+            count += 1
+        return count
+
+    def run(self, stop: threading.Event, poll_interval: float = 1.0) -> None:
+        """Run jobs until stop is set, polling the queue when it is empty.
+
+        The job in progress when stop is set runs to completion. Queue errors
+        (database restart, network blip) are logged and retried after
+        poll_interval instead of stopping the worker."""
+        while not stop.is_set():
+            try:
+                job = self.run_once()
+            except Exception:
+                logger.exception("Ingestion worker %s failed to run a job; retrying", self._worker_id)
+                job = None
+            if job is None:
+                stop.wait(poll_interval)
+
+    def _is_spooled(self, file_path: str) -> bool:
+        return self._spool_dir is not None and os.path.dirname(os.path.abspath(file_path)) == self._spool_dir
+
+    def _discard_spooled(self, file_path: str) -> None:
+        """Delete a finished job's file if the app spooled it for the worker."""
+        if not self._is_spooled(file_path):
+            return
+        try:
+            os.remove(file_path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning("Could not remove spooled file %s: %s", file_path, e)
+
+
+def _caused_by(error: BaseException | None, kind: type[BaseException]) -> bool:
+    """Whether error or any exception it was raised from is a kind."""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        if isinstance(error, kind):
+            return True
+        seen.add(id(error))
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--once", action="store_true", help="run the queued jobs, then exit")
+    parser.add_argument("--poll-interval", type=float, default=1.0,
+                        help="seconds between polls of an empty queue (default: 1)")
+    parser.add_argument("--worker-id", default=f"{socket.gethostname()}:{os.getpid()}",
+                        help="name recorded on claimed jobs (default: host:pid)")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+
+    from dotenv import load_dotenv
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    from src.config.settings import get_settings
+    from src.infrastructure.adapters.postgres_pool import close_pools
+    from src.infrastructure.factories.provider_factory import ProviderFactory
+
+    worker = IngestWorker(
+        ProviderFactory.get_ingest_job_queue(),
+        IngestDocumentUseCase(
+            ProviderFactory.get_repository(),
+            ProviderFactory.get_document_loader(),
+            registry=ProviderFactory.get_document_registry(),
+            embeddings=ProviderFactory.get_embeddings(),
+        ),
+        args.worker_id,
+        spool_dir=get_settings().ingest_spool_dir,
+    )
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+
+    logger.info("Ingestion worker %s started", args.worker_id)
+    try:
+        if args.once:
+            logger.info("Ran %d job(s)", worker.drain())
+        else:
+            worker.run(stop, args.poll_interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        close_pools()
+        logger.info("Ingestion worker %s stopped", args.worker_id)
+
+
+if __name__ == "__main__":
+    main()